@@ -179,6 +179,35 @@ class Cache(object):
         fun = '{0}.fetch'.format(self.driver)
         return self.modules[fun](bank, key, **self._kwargs)
 
+    def fetch_many(self, banks, key):
+        '''
+        Fetch the same key from a number of banks
+
+        Drivers providing a ``fetch_many`` function read all of the banks in
+        bulk, others fall back to a ``fetch`` per bank.
+
+        :param banks:
+            An iterable of the names of the locations inside the cache which
+            hold the key.
+
+        :param key:
+            The name of the key to fetch from every bank.
+
+        :return:
+            Return a dict mapping each bank name to the python object fetched
+            from it, with the same value ``fetch`` returns for a missing key.
+
+        :raises SaltCacheError:
+            Raises an exception if cache driver detected an error accessing data
+            in the cache backend (auth, permissions, etc).
+        '''
+        fun = '{0}.fetch_many'.format(self.driver)
+        if fun in self.modules:
+            return self.modules[fun](banks, key, **self._kwargs)
+        fun = '{0}.fetch'.format(self.driver)
+        return dict((bank, self.modules[fun](bank, key, **self._kwargs))
+                    for bank in banks)
+
     def updated(self, bank, key):
         '''
         Get the last updated epoch for the specified key
@@ -342,6 +371,41 @@ class MemCache(Cache):
         self.storage[(bank, key)] = [now, data]
         return data
 
+    def fetch_many(self, banks, key):
+        now = time.time()
+        ret = {}
+        missing = []
+        for bank in banks:
+            if self.debug:
+                self.call += 1
+            record = self.storage.pop((bank, key), None)
+            if record is not None and record[0] + self.expire >= now:
+                if self.debug:
+                    self.hit += 1
+                record[0] = now
+                self.storage[(bank, key)] = record
+                ret[bank] = record[1]
+            else:
+                missing.append(bank)
+        if self.debug:
+            log.debug(
+                'MemCache stats (call/hit/rate): %s/%s/%s',
+                self.call, self.hit, float(self.hit) / max(self.call, 1)
+            )
+        if not missing:
+            return ret
+
+        # Fetch everything which is not cached, or expired, in bulk
+        for bank, data in six.iteritems(super(MemCache, self).fetch_many(missing, key)):
+            if len(self.storage) >= self.max:
+                if self.cleanup:
+                    MemCache.__cleanup(self.expire)
+                if len(self.storage) >= self.max:
+                    self.storage.popitem(last=False)
+            self.storage[(bank, key)] = [now, data]
+            ret[bank] = data
+        return ret
+
     def store(self, bank, key, data):
         self.storage.pop((bank, key), None)
         super(MemCache, self).store(bank, key, data)
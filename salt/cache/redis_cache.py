@@ -174,6 +174,9 @@ _KEY_PREFIX = '$KEY'
 _BANK_KEYS_PREFIX = '$BANKEYS'
 _SEPARATOR = '_'
 
+# Number of keys read per round trip by fetch_many
+_FETCH_MANY_CHUNK = 1000
+
 REDIS_SERVER = None
 
 # -----------------------------------------------------------------------------
@@ -376,6 +379,38 @@ def fetch(bank, key):
     return __context__['serial'].loads(redis_value)
 
 
+def fetch_many(banks, key):
+    '''
+    Fetch the same key from several banks of the Redis cache.
+    The reads are pipelined, so that there is one interaction with the remote
+    server per chunk of keys instead of one per bank.
+    '''
+    redis_server = _get_redis_server()
+    banks = list(banks)
+    ret = {}
+    for start in range(0, len(banks), _FETCH_MANY_CHUNK):
+        chunk = banks[start:start + _FETCH_MANY_CHUNK]
+        redis_pipe = redis_server.pipeline(transaction=False)
+        for bank in chunk:
+            redis_pipe.get(_get_key_redis_key(bank, key))
+        try:
+            redis_values = redis_pipe.execute()
+        except (RedisConnectionError, RedisResponseError) as rerr:
+            mesg = 'Cannot fetch the Redis cache key {key} of {count} banks: {rerr}'.format(
+                key=key,
+                count=len(chunk),
+                rerr=rerr
+            )
+            log.error(mesg)
+            raise SaltCacheError(mesg)
+        for bank, redis_value in zip(chunk, redis_values):
+            if redis_value is None:
+                ret[bank] = {}
+            else:
+                ret[bank] = __context__['serial'].loads(redis_value)
+    return ret
+
+
 def flush(bank, key=None):
     '''
     Remove the key from the cache bank with all the key content. If no key is specified, remove
@@ -6,11 +6,10 @@ Execute batch runs
 # Import python libs
 from __future__ import absolute_import, print_function, unicode_literals
 import math
-import time
-import copy
 from datetime import datetime, timedelta
 
 # Import salt libs
+import salt.utils.minions
 import salt.utils.stringutils
 import salt.client
 import salt.output
@@ -25,6 +24,10 @@ import logging
 
 log = logging.getLogger(__name__)
 
+# The longest time, in seconds, a batch run blocks on the event bus before it
+# checks its running jobs for timeouts again
+BATCH_EVENT_WAIT = 0.5
+
 
 class Batch(object):
     '''
@@ -43,6 +46,8 @@ class Batch(object):
         '''
         Return a list of minions to use for the batch run
         '''
+        if self.opts.get('batch_presence'):
+            return self.__gather_present_minions()
         args = [self.opts['tgt'],
                 'test.ping',
                 [],
@@ -79,6 +84,23 @@ class Batch(object):
                     fret.add(m)
         return (list(fret), ping_gen, nret.difference(fret))
 
+    def __gather_present_minions(self):
+        '''
+        Return a list of minions to use for the batch run, based on the
+        minions the master sees connected rather than on a test.ping
+        '''
+        ckminions = salt.utils.minions.CkMinions(self.opts)
+        selected_target_option = self.opts.get('selected_target_option', None)
+        if selected_target_option is None:
+            selected_target_option = self.opts.get('tgt_type', 'glob')
+        targeted = ckminions.check_minions(self.opts['tgt'],
+                                           selected_target_option)['minions']
+        present = ckminions.connected_ids(subset=targeted)
+        minions = [minion for minion in targeted if minion in present]
+        if not minions and not self.quiet:
+            salt.utils.stringutils.print_cli('No minions matched the target.')
+        return (minions, iter(()), set(targeted).difference(present))
+
     def get_bnum(self):
         '''
         Return the active number of minions to maintain
@@ -106,6 +128,17 @@ class Batch(object):
         if i:
             del wait[:i]
 
+    def __wait_for_returns(self, wait):
+        '''
+        Block until a return for one of the running jobs arrives, or until the
+        next batch_wait slot frees up
+        '''
+        timeout = BATCH_EVENT_WAIT
+        if wait:
+            until_free = (wait[0] - datetime.now()).total_seconds()
+            timeout = max(0, min(timeout, until_free))
+        self.local.event.wait_for_subscribed(wait=timeout)
+
     def run(self):
         '''
         Execute the batch run
@@ -120,8 +153,8 @@ class Batch(object):
         # No targets to run
         if not self.minions:
             return
-        to_run = copy.deepcopy(self.minions)
-        active = []
+        to_run = list(self.minions)
+        active = set()
         ret = {}
         iters = []
         # wait the specified time before decide a job is actually done
@@ -167,7 +200,7 @@ class Batch(object):
                         else:
                             next_.append(minion_id)
 
-            active += next_
+            active.update(next_)
             args[0] = next_
 
             if next_:
@@ -189,8 +222,6 @@ class Batch(object):
                 minion_tracker[new_iter]['minions'] = next_
                 minion_tracker[new_iter]['active'] = True
 
-            else:
-                time.sleep(0.02)
             parts = {}
 
             # see if we found more minions
@@ -205,15 +236,10 @@ class Batch(object):
             for queue in iters:
                 try:
                     # Gather returns until we get to the bottom
-                    ncnt = 0
                     while True:
                         part = next(queue)
                         if part is None:
-                            time.sleep(0.01)
-                            ncnt += 1
-                            if ncnt > 5:
-                                break
-                            continue
+                            break
                         if self.opts.get('raw'):
                             parts.update({part['data']['id']: part})
                             if part['data']['id'] in minion_tracker[queue]['minions']:
@@ -243,6 +269,11 @@ class Batch(object):
                                 parts[minion] = {}
                                 parts[minion]['ret'] = {}
 
+            if not next_ and not parts:
+                # Nothing to start and nothing returned, sleep until something
+                # does instead of polling the running jobs
+                self.__wait_for_returns(wait)
+
             for minion, data in six.iteritems(parts):
                 if minion in active:
                     active.remove(minion)
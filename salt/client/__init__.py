@@ -518,6 +518,10 @@ class LocalClient(object):
 
         :param batch: The batch identifier of systems to execute on
 
+        :param batch_presence: Pick the minions to run on from the minions
+            the master sees connected, instead of pinging the target first.
+            Requires ``minion_data_cache``.
+
         :returns: A generator of minion returns
 
         .. code-block:: python
@@ -554,6 +558,8 @@ class LocalClient(object):
             opts['gather_job_timeout'] = kwargs['gather_job_timeout']
         if 'batch_wait' in kwargs:
             opts['batch_wait'] = int(kwargs['batch_wait'])
+        if 'batch_presence' in kwargs:
+            opts['batch_presence'] = kwargs['batch_presence']
 
         eauth = {}
         if 'eauth' in kwargs:
@@ -222,6 +222,10 @@ class SSH(object):
             raise salt.exceptions.SaltSystemExit(code=-1,
                 msg='No ssh binary found in path -- ssh must be installed for salt-ssh to run. Exiting.')
         self.opts['_ssh_version'] = ssh_version()
+        if self.opts.get('ssh_control_persist'):
+            cm_dir = salt.client.ssh.shell.control_dir(self.opts)
+            if not os.path.isdir(cm_dir):
+                os.makedirs(cm_dir, 0o700)
         self.tgt_type = self.opts['selected_target_option'] \
             if self.opts['selected_target_option'] else 'glob'
         self._expand_target()
@@ -593,17 +597,23 @@ class SSH(object):
                 running[host] = {'thread': routine}
                 continue
             ret = {}
-            try:
-                ret = que.get(False)
+            # Wait briefly for the first return instead of sleeping, then
+            # drain every return which has already arrived so that results
+            # are reported as soon as they come in.
+            block = True
+            while True:
+                try:
+                    ret = que.get(block, 0.1)
+                except Exception:  # pylint: disable=broad-except
+                    # This bare exception is here to catch spurious exceptions
+                    # thrown by que.get during healthy operation. Please do
+                    # not worry about this bare exception, it is entirely here
+                    # to control program flow.
+                    break
+                block = False
                 if 'id' in ret:
                     returned.add(ret['id'])
                     yield {ret['id']: ret['ret']}
-            except Exception:  # pylint: disable=broad-except
-                # This bare exception is here to catch spurious exceptions
-                # thrown by que.get during healthy operation. Please do not
-                # worry about this bare exception, it is entirely here to
-                # control program flow.
-                pass
             for host in running:
                 if not running[host]['thread'].is_alive():
                     if host not in returned:
@@ -632,9 +642,6 @@ class SSH(object):
                     running.pop(host)
             if len(rets) >= len(self.targets):
                 break
-            # Sleep when limit or all threads started
-            if len(running) >= self.opts.get('ssh_max_procs', 25) or len(self.targets) >= len(running):
-                time.sleep(0.1)
 
     def run_iter(self, mine=False, jid=None):
         '''
@@ -49,6 +49,14 @@ def gen_key(path):
     subprocess.call(cmd, shell=True)
 
 
+def control_dir(opts):
+    '''
+    Return the directory holding the ControlPath sockets used to share a
+    single persistent connection between all ssh/scp calls made to a host
+    '''
+    return os.path.join(opts['cachedir'], 'salt-ssh-control')
+
+
 def gen_shell(opts, **kwargs):
     '''
     Return the correct shell interface for the target system
@@ -197,6 +205,26 @@ class Shell(object):
         return ' '.join(['-o {0}'.format(opt)
                           for opt in self.ssh_options])
 
+    def _control_opts(self):
+        '''
+        Return options to multiplex the separate ssh and scp invocations made
+        for the shim, thin deployment and command over one master connection,
+        which is kept open for ssh_control_persist seconds after the last use
+        '''
+        persist = self.opts.get('ssh_control_persist')
+        if not persist:
+            return ''
+        if self.opts.get('_ssh_version', (0,)) >= (6, 7):
+            # %C is a hash of the local host, remote host, port and user
+            socket_name = '%C'
+        else:
+            socket_name = '%r@%h:%p'
+        options = ['ControlMaster=auto',
+                   'ControlPath={0}'.format(
+                       os.path.join(control_dir(self.opts), socket_name)),
+                   'ControlPersist={0}'.format(persist)]
+        return ''.join(['-o {0} '.format(option) for option in options])
+
     def _copy_id_str_old(self):
         '''
         Return the string to execute ssh-copy-id
@@ -261,6 +289,8 @@ class Shell(object):
                                       for item in self.remote_port_forwards.split(',')]))
         if self.ssh_options:
             command.append(self._ssh_opts())
+        if self.opts.get('ssh_control_persist'):
+            command.append(self._control_opts())
 
         command.append(cmd)
 
@@ -220,6 +220,33 @@ VALID_OPTS = immutabletypes.freeze({
     # Flag to cache jobs locally.
     'cache_jobs': bool,
 
+    # Keep the list of installed packages in the minion cachedir until the package database changes
+    'pkg_inventory_cache': bool,
+
+    # The number of seconds the latest versions and upgrades of the packages are kept in the
+    # minion cachedir, unless the package database or repository metadata changes first. 0
+    # disables this cache.
+    'pkg_metadata_cache_ttl': int,
+
+    # The number of bytes of the beginning and of the end of the output of a command run by a job
+    # which are returned, the rest is spooled to the minion cachedir. 0 keeps the whole output.
+    'cmd_output_limit': int,
+
+    # Fire the output of the commands run by a job on the minion event bus while they run
+    'cmd_output_events': bool,
+
+    # The number of hours the spooled output of the commands is kept in the minion cachedir
+    'cmd_output_keep': int,
+
+    # Keep the hashes of large files in the minion cachedir, keyed on the stat of the files
+    'file_hash_cache': bool,
+
+    # The number of hours an unused entry of the file hash cache is kept
+    'file_hash_cache_keep': int,
+
+    # Largest diff of two files returned by the file module, in characters
+    'file_diff_max_size': int,
+
     # The path to the salt configuration file
     'conf_file': six.string_types,
 
@@ -552,6 +579,10 @@ VALID_OPTS = immutabletypes.freeze({
     # `event_return_queue` events won't get stale.
     'event_return_queue_max_seconds': int,
 
+    # The number of events each event returner can have waiting to be stored. Once it is full, the
+    # oldest events are dropped so a slow returner cannot hold up the master.
+    'event_return_buffer_size': int,
+
     # Only forward events to an event returner if it matches one of the tags in this list
     'event_return_whitelist': list,
 
@@ -721,6 +752,15 @@ VALID_OPTS = immutabletypes.freeze({
     # Specify a list of external pillar systems to use
     'ext_pillar': list,
 
+    # The number of threads fetching the independent ext_pillars concurrently
+    'ext_pillar_concurrency': int,
+
+    # The ext_pillars which do not use the pillar data compiled before them
+    'ext_pillar_independent': list,
+
+    # Return the time spent in each ext_pillar in the _ext_pillar_timing pillar key
+    'ext_pillar_timing': bool,
+
     # Reserved for future use to version the pillar structure
     'pillar_version': int,
 
@@ -761,6 +801,10 @@ VALID_OPTS = immutabletypes.freeze({
     'default_top': six.string_types,
 
     'ping_on_rotate': bool,
+
+    # Have the master publishers keep track of the connected minions, instead of
+    # scanning the TCP connections of the master to find them
+    'presence_tracking': bool,
     'peer': dict,
     'preserve_minion_cache': bool,
     'syndic_master': (six.string_types, list),
@@ -843,6 +887,10 @@ VALID_OPTS = immutabletypes.freeze({
     # reply from executions.
     'minion_data_cache': bool,
 
+    # The number of seconds the master workers keep the mine data they read from the minion data
+    # cache and their responses to mine.get requests. 0 reads the mine data for every request.
+    'mine_get_cache_ttl': int,
+
     # The number of seconds between AES key rotations on the master
     'publish_session': int,
 
@@ -858,6 +906,9 @@ VALID_OPTS = immutabletypes.freeze({
     # The queue size for workers in the reactor
     'reactor_worker_hwm': int,
 
+    # The number of threads rendering reactions in the reactor
+    'reactor_render_threads': int,
+
     # Defines engines. See https://docs.saltstack.com/en/latest/topics/engines/
     'engines': list,
 
@@ -994,6 +1045,12 @@ VALID_OPTS = immutabletypes.freeze({
     # The length that the syndic event queue must hit before events are popped off and forwarded
     'syndic_jid_forward_cache_hwm': int,
 
+    # The largest number of minion returns a syndic forwards in one request, 0 for no limit
+    'syndic_return_batch_size': int,
+
+    # Compress the minion returns a syndic forwards to its masters
+    'syndic_return_compression': bool,
+
     # Salt SSH configuration
     'ssh_passwd': six.string_types,
     'ssh_port': six.string_types,
@@ -1004,6 +1061,7 @@ VALID_OPTS = immutabletypes.freeze({
     'ssh_scan_ports': six.string_types,
     'ssh_scan_timeout': float,
     'ssh_identities_only': bool,
+    'ssh_control_persist': int,
     'ssh_log_file': six.string_types,
     'ssh_config_file': six.string_types,
     'ssh_merge_pillar': bool,
@@ -1225,6 +1283,14 @@ DEFAULT_MINION_OPTS = immutabletypes.freeze({
     'grains_cache': False,
     'grains_cache_expiration': 300,
     'grains_deep_merge': False,
+    'pkg_inventory_cache': True,
+    'pkg_metadata_cache_ttl': 300,
+    'cmd_output_limit': 0,
+    'cmd_output_events': False,
+    'cmd_output_keep': 24,
+    'file_hash_cache': True,
+    'file_hash_cache_keep': 168,
+    'file_diff_max_size': 1048576,
     'conf_file': os.path.join(salt.syspaths.CONFIG_DIR, 'minion'),
     'sock_dir': os.path.join(salt.syspaths.SOCK_DIR, 'minion'),
     'sock_pool_size': 1,
@@ -1386,7 +1452,7 @@ DEFAULT_MINION_OPTS = immutabletypes.freeze({
     'state_output_diff': False,
     'state_auto_order': True,
     'state_events': False,
-    'state_aggregate': False,
+    'state_aggregate': ['pkg'],
     'snapper_states': False,
     'snapper_states_config': 'root',
     'acceptance_wait_time': 10,
@@ -1430,6 +1496,7 @@ DEFAULT_MINION_OPTS = immutabletypes.freeze({
     'reactor_refresh_interval': 60,
     'reactor_worker_threads': 10,
     'reactor_worker_hwm': 10000,
+    'reactor_render_threads': 1,
     'engines': [],
     'tcp_keepalive': True,
     'tcp_keepalive_idle': 300,
@@ -1601,6 +1668,9 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze({
     'minionfs_whitelist': [],
     'minionfs_blacklist': [],
     'ext_pillar': [],
+    'ext_pillar_concurrency': 0,
+    'ext_pillar_independent': [],
+    'ext_pillar_timing': False,
     'pillar_version': 2,
     'pillar_opts': False,
     'pillar_safe_render_error': True,
@@ -1611,6 +1681,7 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze({
     'pillar_cache_ttl': 3600,
     'pillar_cache_backend': 'disk',
     'ping_on_rotate': False,
+    'presence_tracking': True,
     'peer': {},
     'preserve_minion_cache': False,
     'syndic_master': 'masterofmasters',
@@ -1665,6 +1736,7 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze({
     'job_cache_store_endtime': False,
     'minion_data_cache': True,
     'enforce_mine_cache': False,
+    'mine_get_cache_ttl': 0,
     'ipc_mode': _DFLT_IPC_MODE,
     'ipc_write_buffer': _DFLT_IPC_WBUFFER,
     'ipv6': None,
@@ -1690,9 +1762,11 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze({
     'reactor_refresh_interval': 60,
     'reactor_worker_threads': 10,
     'reactor_worker_hwm': 10000,
+    'reactor_render_threads': 1,
     'engines': [],
     'event_return': '',
     'event_return_queue': 0,
+    'event_return_buffer_size': 10000,
     'event_return_whitelist': [],
     'event_return_blacklist': [],
     'event_match_type': 'startswith',
@@ -1704,7 +1778,7 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze({
     'state_output_diff': False,
     'state_auto_order': True,
     'state_events': False,
-    'state_aggregate': False,
+    'state_aggregate': ['pkg'],
     'search': '',
     'loop_interval': 60,
     'nodegroups': {},
@@ -1748,6 +1822,8 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze({
     'gather_job_timeout': 10,
     'syndic_event_forward_timeout': 0.5,
     'syndic_jid_forward_cache_hwm': 100,
+    'syndic_return_batch_size': 0,
+    'syndic_return_compression': False,
     'regen_thin': False,
     'ssh_passwd': '',
     'ssh_priv_passwd': '',
@@ -1759,6 +1835,7 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze({
     'ssh_scan_ports': '22',
     'ssh_scan_timeout': 0.01,
     'ssh_identities_only': False,
+    'ssh_control_persist': 0,
     'ssh_log_file': os.path.join(salt.syspaths.LOGS_DIR, 'ssh'),
     'ssh_config_file': os.path.join(salt.syspaths.HOME_DIR, '.ssh', 'config'),
     'cluster_mode': False,
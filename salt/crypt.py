@@ -206,15 +206,19 @@ def get_rsa_pub_key(path):
     Read a public key off the disk.
     '''
     log.debug('salt.crypt.get_rsa_pub_key: Loading public key')
+    with salt.utils.files.fopen(path, 'rb' if HAS_M2 else 'r') as f:
+        return load_rsa_pub_key(f.read())
+
+
+def load_rsa_pub_key(data):
+    '''
+    Load a public key from its PEM representation.
+    '''
     if HAS_M2:
-        with salt.utils.files.fopen(path, 'rb') as f:
-            data = f.read().replace(b'RSA ', b'')
-        bio = BIO.MemoryBuffer(data)
-        key = RSA.load_pub_key_bio(bio)
-    else:
-        with salt.utils.files.fopen(path) as f:
-            key = RSA.importKey(f.read())
-    return key
+        data = salt.utils.stringutils.to_bytes(data)
+        bio = BIO.MemoryBuffer(data.replace(b'RSA ', b''))
+        return RSA.load_pub_key_bio(bio)
+    return RSA.importKey(data)
 
 
 def sign_message(privkey_path, message, passphrase=None):
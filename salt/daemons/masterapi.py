@@ -428,6 +428,8 @@ class RemoteFuncs(object):
                 rend=False)
         self.__setup_fileserver()
         self.cache = salt.cache.factory(opts)
+        self.mine_index = salt.utils.mine.MineIndex(
+            self.opts.get('mine_get_cache_ttl', 0))
 
     def __setup_fileserver(self):
         '''
@@ -593,23 +595,46 @@ class RemoteFuncs(object):
             match_type = 'pillar_exact'
         if match_type.lower() == 'compound':
             match_type = 'compound_pillar_exact'
+        # Identical requests get the same response, up to the minion-side ACL
+        # which depends on the requesting minion
+        result_key = (repr(load['tgt']), match_type, tuple(functions_allowed))
+        result = self.mine_index.get_result(result_key)
+        if result is None:
+            result = self.__mine_get_entries(load['tgt'], match_type, functions_allowed)
+            self.mine_index.set_result(result_key, result)
+        entries, minion_side_acl = result
+        for minion, function, mine_result in entries:
+            if salt.utils.mine.minion_side_acl_denied(minion_side_acl, minion, function, load['id']):
+                continue
+            if _ret_dict:
+                ret.setdefault(function, {})[minion] = mine_result
+            else:
+                # There is only one function in functions_allowed.
+                ret[minion] = mine_result
+        return ret
+
+    def __mine_get_entries(self, tgt, match_type, functions):
+        '''
+        Return the mine entries of the given functions for the targeted
+        minions, as a list of ``(minion, function, result)`` tuples, along
+        with the minion-side ACL of the entries which define one
+        '''
         checker = salt.utils.minions.CkMinions(self.opts)
         _res = checker.check_minions(
-                load['tgt'],
+                tgt,
                 match_type,
                 greedy=False
                 )
         minions = _res['minions']
+        mine_index = self.mine_index.get(self.cache, minions, functions)
+        entries = []
         minion_side_acl = {}  # Cache minion-side ACL
         for minion in minions:
-            mine_data = self.cache.fetch('minions/{0}'.format(minion), 'mine')
-            if not isinstance(mine_data, dict):
-                continue
-            for function in functions_allowed:
-                if function not in mine_data:
+            for function in functions:
+                if minion not in mine_index[function]:
                     continue
-                mine_entry = mine_data[function]
-                mine_result = mine_data[function]
+                mine_entry = mine_index[function][minion]
+                mine_result = mine_entry
                 if isinstance(mine_entry, dict) and salt.utils.mine.MINE_ITEM_ACL_ID in mine_entry:
                     mine_result = mine_entry[salt.utils.mine.MINE_ITEM_ACL_DATA]
                     # Check and fill minion-side ACL cache
@@ -625,14 +650,8 @@ class RemoteFuncs(object):
                                     mine_entry.get('allow_tgt_type', 'glob')
                                 )['minions']
                             )
-                if salt.utils.mine.minion_side_acl_denied(minion_side_acl, minion, function, load['id']):
-                    continue
-                if _ret_dict:
-                    ret.setdefault(function, {})[minion] = mine_result
-                else:
-                    # There is only one function in functions_allowed.
-                    ret[minion] = mine_result
-        return ret
+                entries.append((minion, function, mine_result))
+        return entries, minion_side_acl
 
     def _mine(self, load, skip_verify=False):
         '''
@@ -644,12 +663,14 @@ class RemoteFuncs(object):
         if self.opts.get('minion_data_cache', False) or self.opts.get('enforce_mine_cache', False):
             cbank = 'minions/{0}'.format(load['id'])
             ckey = 'mine'
-            new_data = load['data']
+            data = load['data']
             if not load.get('clear', False):
-                data = self.cache.fetch(cbank, ckey)
-                if isinstance(data, dict):
-                    data.update(new_data)
+                old_data = self.cache.fetch(cbank, ckey)
+                if isinstance(old_data, dict):
+                    old_data.update(data)
+                    data = old_data
             self.cache.store(cbank, ckey, data)
+            self.mine_index.update(load['id'], data)
         return True
 
     def _mine_delete(self, load):
@@ -668,6 +689,7 @@ class RemoteFuncs(object):
                 if load['fun'] in data:
                     del data[load['fun']]
                     self.cache.store(cbank, ckey, data)
+                    self.mine_index.update(load['id'], data)
             except OSError:
                 return False
         return True
@@ -679,6 +701,7 @@ class RemoteFuncs(object):
         if not skip_verify and 'id' not in load:
             return False
         if self.opts.get('minion_data_cache', False) or self.opts.get('enforce_mine_cache', False):
+            self.mine_index.update(load['id'], None)
             return self.cache.flush('minions/{0}'.format(load['id']), 'mine')
         return True
 
@@ -7,6 +7,7 @@ used to manage salt keys directly without interfacing with the CLI.
 # Import python libs
 from __future__ import absolute_import, print_function, unicode_literals
 import os
+import re
 import shutil
 import fnmatch
 import logging
@@ -26,6 +27,7 @@ import salt.utils.files
 import salt.utils.json
 import salt.utils.kinds
 import salt.utils.master
+import salt.utils.minions
 import salt.utils.sdb
 import salt.utils.stringutils
 import salt.utils.user
@@ -37,6 +39,35 @@ from salt.ext.six.moves import input, zip_longest
 
 log = logging.getLogger(__name__)
 
+# Characters which make a match string a glob rather than a literal key name
+_GLOB_CHARS = frozenset('*?[')
+
+
+def _compile_match(match):
+    '''
+    Turn a glob, or a list of globs, into a function that tells whether a key
+    name matches it. Literal names are looked up in a set, and all of the
+    remaining globs are evaluated as one regular expression.
+    '''
+    if not isinstance(match, list):
+        match = [match]
+    literals = set()
+    globs = []
+    for item in match:
+        item = os.path.normcase(item)
+        if _GLOB_CHARS.intersection(item):
+            globs.append(fnmatch.translate(item))
+        else:
+            literals.add(item)
+    regex = re.compile('|'.join(globs)).match if globs else None
+
+    def _matches(key):
+        key = os.path.normcase(key)
+        if key in literals:
+            return True
+        return regex is not None and regex(key) is not None
+    return _matches
+
 
 def get_key(opts):
     return Key(opts)
@@ -424,10 +455,11 @@ class Key(object):
         '''
         if preserve_minions is None:
             preserve_minions = []
+        preserve_minions = set(preserve_minions)
         keys = self.list_keys()
-        minions = []
+        minions = set()
         for key, val in six.iteritems(keys):
-            minions.extend(val)
+            minions.update(val)
         if not self.opts.get('preserve_minion_cache', False):
             m_cache = os.path.join(self.opts['cachedir'], self.ACC)
             if os.path.isdir(m_cache):
@@ -474,19 +506,11 @@ class Key(object):
         ret = {}
         if ',' in match and isinstance(match, six.string_types):
             match = match.split(',')
+        matcher = _compile_match(match)
         for status, keys in six.iteritems(matches):
             for key in salt.utils.data.sorted_ignorecase(keys):
-                if isinstance(match, list):
-                    for match_item in match:
-                        if fnmatch.fnmatch(key, match_item):
-                            if status not in ret:
-                                ret[status] = []
-                            ret[status].append(key)
-                else:
-                    if fnmatch.fnmatch(key, match):
-                        if status not in ret:
-                            ret[status] = []
-                        ret[status].append(key)
+                if matcher(key):
+                    ret.setdefault(status, []).append(key)
         return ret
 
     def dict_match(self, match_dict):
@@ -496,10 +520,17 @@ class Key(object):
         '''
         ret = {}
         cur_keys = self.list_keys()
+        cur_sets = dict(
+            (keydir, set(keys)) for keydir, keys in six.iteritems(cur_keys)
+        )
         for status, keys in six.iteritems(match_dict):
             for key in salt.utils.data.sorted_ignorecase(keys):
                 for keydir in (self.ACC, self.PEND, self.REJ, self.DEN):
-                    if keydir and fnmatch.filter(cur_keys.get(keydir, []), key):
+                    if not keydir:
+                        continue
+                    if key in cur_sets.get(keydir, ()) \
+                            or (_GLOB_CHARS.intersection(key)
+                                and fnmatch.filter(cur_keys.get(keydir, []), key)):
                         ret.setdefault(keydir, []).append(key)
         return ret
 
@@ -528,12 +559,7 @@ class Key(object):
                 continue
             ret[os.path.basename(dir_)] = []
             try:
-                for fn_ in salt.utils.data.sorted_ignorecase(os.listdir(dir_)):
-                    if not fn_.startswith('.'):
-                        if os.path.isfile(os.path.join(dir_, fn_)):
-                            ret[os.path.basename(dir_)].append(
-                                salt.utils.stringutils.to_unicode(fn_)
-                            )
+                ret[os.path.basename(dir_)] = salt.utils.minions.list_key_dir(dir_)
             except (OSError, IOError):
                 # key dir kind is not created yet, just skip
                 continue
@@ -552,34 +578,19 @@ class Key(object):
         Return a dict of managed keys under a named status
         '''
         acc, pre, rej, den = self._check_minions_directories()
-        ret = {}
         if match.startswith('acc'):
-            ret[os.path.basename(acc)] = []
-            for fn_ in salt.utils.data.sorted_ignorecase(os.listdir(acc)):
-                if not fn_.startswith('.'):
-                    if os.path.isfile(os.path.join(acc, fn_)):
-                        ret[os.path.basename(acc)].append(fn_)
+            dir_ = acc
         elif match.startswith('pre') or match.startswith('un'):
-            ret[os.path.basename(pre)] = []
-            for fn_ in salt.utils.data.sorted_ignorecase(os.listdir(pre)):
-                if not fn_.startswith('.'):
-                    if os.path.isfile(os.path.join(pre, fn_)):
-                        ret[os.path.basename(pre)].append(fn_)
+            dir_ = pre
         elif match.startswith('rej'):
-            ret[os.path.basename(rej)] = []
-            for fn_ in salt.utils.data.sorted_ignorecase(os.listdir(rej)):
-                if not fn_.startswith('.'):
-                    if os.path.isfile(os.path.join(rej, fn_)):
-                        ret[os.path.basename(rej)].append(fn_)
+            dir_ = rej
         elif match.startswith('den') and den is not None:
-            ret[os.path.basename(den)] = []
-            for fn_ in salt.utils.data.sorted_ignorecase(os.listdir(den)):
-                if not fn_.startswith('.'):
-                    if os.path.isfile(os.path.join(den, fn_)):
-                        ret[os.path.basename(den)].append(fn_)
+            dir_ = den
         elif match.startswith('all'):
             return self.all_keys()
-        return ret
+        else:
+            return {}
+        return {os.path.basename(dir_): salt.utils.minions.list_key_dir(dir_)}
 
     def key_str(self, match):
         '''
@@ -19,6 +19,7 @@ import logging
 import collections
 import multiprocessing
 import threading
+import zlib
 import salt.serializers.msgpack
 
 # pylint: disable=import-error,no-name-in-module,redefined-builtin
@@ -195,6 +196,8 @@ class Maintenance(salt.utils.process.SignalHandlingProcess):
         self.ckminions = salt.utils.minions.CkMinions(self.opts)
         # Make Event bus for firing
         self.event = salt.utils.event.get_master_event(self.opts, self.opts['sock_dir'], listen=False)
+        # Accepted keys last written to the key cache
+        self._key_cache_keys = None
         # Init any values needed by the git ext pillar
         self.git_pillar = salt.daemons.masterapi.init_git_pillar(self.opts)
 
@@ -251,24 +254,27 @@ class Maintenance(salt.utils.process.SignalHandlingProcess):
         which contains a list
         '''
         if self.opts['key_cache'] == 'sched':
-            keys = []
             #TODO DRY from CKMinions
             if self.opts['transport'] in ('zeromq', 'tcp'):
                 acc = 'minions'
             else:
                 acc = 'accepted'
 
-            for fn_ in os.listdir(os.path.join(self.opts['pki_dir'], acc)):
-                if not fn_.startswith('.') and os.path.isfile(os.path.join(self.opts['pki_dir'], acc, fn_)):
-                    keys.append(fn_)
+            acc_dir = os.path.join(self.opts['pki_dir'], acc)
+            cache_fn = os.path.join(acc_dir, '.key_cache')
+            keys = salt.utils.minions.list_key_dir(acc_dir)
+            if keys == self._key_cache_keys and os.path.exists(cache_fn):
+                # Nothing was accepted or deleted since the last write
+                return
             log.debug('Writing master key cache')
             # Write a temporary file securely
             if six.PY2:
-                with salt.utils.atomicfile.atomic_open(os.path.join(self.opts['pki_dir'], acc, '.key_cache')) as cache_file:
+                with salt.utils.atomicfile.atomic_open(cache_fn) as cache_file:
                     self.serial.dump(keys, cache_file)
             else:
-                with salt.utils.atomicfile.atomic_open(os.path.join(self.opts['pki_dir'], acc, '.key_cache'), mode='wb') as cache_file:
+                with salt.utils.atomicfile.atomic_open(cache_fn, mode='wb') as cache_file:
                     self.serial.dump(keys, cache_file)
+            self._key_cache_keys = keys
 
     def handle_key_rotate(self, now):
         '''
@@ -1647,8 +1653,15 @@ class AESFuncs(object):
         :param dict load: The minion payload
         '''
         loads = load.get('load')
+        if load.get('compression') == 'zlib':
+            try:
+                loads = salt.serializers.msgpack.deserialize(zlib.decompress(loads))
+            except Exception as exc:  # pylint: disable=broad-except
+                log.error('Failed to decompress the returns from syndic: %s', exc)
+                return
         if not isinstance(loads, list):
             loads = [load]  # support old syndics not aggregating returns
+        rets = []
         for load in loads:
             # Verify the load
             if any(key not in load for key in ('return', 'jid', 'id')):
@@ -1682,7 +1695,20 @@ class AESFuncs(object):
                     ret['out'] = load['out']
                 if 'sig' in load:
                     ret['sig'] = load['sig']
+                rets.append(ret)
+
+        if self.opts['require_minion_sign_messages'] \
+                or any('sig' in ret for ret in rets):
+            # Signatures are verified one return at a time
+            for ret in rets:
                 self._return(ret)
+            return
+        try:
+            salt.utils.job.store_jobs(
+                self.opts, rets, event=self.event, mminion=self.mminion)
+        except salt.exceptions.SaltCacheError:
+            log.error('Could not store job information for %s syndic returns',
+                      len(rets))
 
     def minion_runner(self, clear_load):
         '''
@@ -17,6 +17,7 @@ import threading
 import traceback
 import contextlib
 import multiprocessing
+import zlib
 from random import randint, shuffle
 from stat import S_IMODE
 import salt.serializers.msgpack
@@ -2079,6 +2080,12 @@ class Minion(MinionBase):
 
         load = {'cmd': ret_cmd,
                 'load': list(six.itervalues(jids))}
+        if ret_cmd == '_syndic_return' and self.opts['syndic_return_compression']:
+            # Job returns of many minions compress well, send them as one
+            # compressed blob
+            load['load'] = zlib.compress(
+                salt.serializers.msgpack.serialize(load['load']))
+            load['compression'] = 'zlib'
 
         def timeout_handler(*_):
             log.warning(
@@ -3295,10 +3302,21 @@ class SyndicManager(MinionBase):
             res = self._return_pub_syndic(self.delayed)
             if res:
                 self.delayed = []
+        batch_size = self.opts['syndic_return_batch_size']
         for master in list(six.iterkeys(self.job_rets)):
-            values = list(six.itervalues(self.job_rets[master]))
-            res = self._return_pub_syndic(values, master_id=master)
-            if res:
+            job_rets = self.job_rets[master]
+            while job_rets:
+                # Send at most syndic_return_batch_size minion returns per
+                # request, what is left goes out once the master took this one
+                tags = list(job_rets)
+                if batch_size > 0:
+                    tags = tags[:batch_size]
+                values = [job_rets[tag] for tag in tags]
+                if not self._return_pub_syndic(values, master_id=master):
+                    break
+                for tag in tags:
+                    del job_rets[tag]
+            if not job_rets:
                 del self.job_rets[master]
 
 
@@ -275,21 +275,28 @@ def latest_version(*names, **kwargs):
     if refresh:
         refresh_db(cache_valid_time)
 
+    metadata_ttl, metadata_stamp = _metadata_cache()
     for name in names:
-        cmd = ['apt-cache', '-q', 'policy', name]
-        if repo is not None:
-            cmd.extend(repo)
-        out = _call_apt(cmd, scope=False)
-
-        candidate = ''
-        for line in salt.utils.itertools.split(out['stdout'], '\n'):
-            if 'Candidate' in line:
-                comps = line.split()
-                if len(comps) >= 2:
-                    candidate = comps[-1]
-                    if candidate.lower() == '(none)':
-                        candidate = ''
-                break
+        cache_name = salt.utils.pkg.cache_name('candidate', name, fromrepo)
+        candidate = salt.utils.pkg.read_cache(
+            __opts__, cache_name, metadata_stamp, metadata_ttl)
+        if candidate is None:
+            cmd = ['apt-cache', '-q', 'policy', name]
+            if repo is not None:
+                cmd.extend(repo)
+            out = _call_apt(cmd, scope=False)
+
+            candidate = ''
+            for line in salt.utils.itertools.split(out['stdout'], '\n'):
+                if 'Candidate' in line:
+                    comps = line.split()
+                    if len(comps) >= 2:
+                        candidate = comps[-1]
+                        if candidate.lower() == '(none)':
+                            candidate = ''
+                    break
+            salt.utils.pkg.write_cache(
+                __opts__, cache_name, metadata_stamp, candidate)
 
         installed = pkgs.get(name, [])
         if not installed:
@@ -335,6 +342,18 @@ def version(*names, **kwargs):
     return __salt__['pkg_resource.version'](*names, **kwargs)
 
 
+def _metadata_cache():
+    '''
+    Return the ttl of the package metadata cache and the stamp of the package
+    database and lists the cached metadata was derived from, the stamp being
+    None when the cache is disabled
+    '''
+    ttl = __opts__.get('pkg_metadata_cache_ttl', 300)
+    if ttl <= 0:
+        return ttl, None
+    return ttl, salt.utils.pkg.db_stamp(salt.utils.pkg.deb.APT_METADATA_PATHS)
+
+
 def refresh_db(cache_valid_time=0, failhard=False):
     '''
     Updates the APT database to latest packages based upon repositories
@@ -810,6 +829,7 @@ def install(name=None,
                 errors.append(out['stderr'])
 
         __context__.pop('pkg.list_pkgs', None)
+        salt.utils.pkg.clear_cache(__opts__)
         new = list_pkgs()
         ret = salt.utils.data.compare_dicts(old, new)
 
@@ -858,6 +878,7 @@ def _uninstall(action='remove', name=None, pkgs=None, **kwargs):
         errors = []
 
     __context__.pop('pkg.list_pkgs', None)
+    salt.utils.pkg.clear_cache(__opts__)
     new = list_pkgs()
     new_removed = list_pkgs(removed=True)
 
@@ -930,6 +951,7 @@ def autoremove(list_only=False, purge=False):
         cmd.append('autoremove')
         _call_apt(cmd, ignore_retcode=True)
         __context__.pop('pkg.list_pkgs', None)
+        salt.utils.pkg.clear_cache(__opts__)
         new = list_pkgs()
         return salt.utils.data.compare_dicts(old, new)
 
@@ -1100,6 +1122,7 @@ def upgrade(refresh=True, dist_upgrade=False, **kwargs):
     cmd.append('dist-upgrade' if dist_upgrade else 'upgrade')
     result = _call_apt(cmd, env=DPKG_ENV_VARS.copy())
     __context__.pop('pkg.list_pkgs', None)
+    salt.utils.pkg.clear_cache(__opts__)
     new = list_pkgs()
     ret = salt.utils.data.compare_dicts(old, new)
 
@@ -1306,45 +1329,54 @@ def list_pkgs(versions_as_list=False,
             __salt__['pkg_resource.stringify'](ret)
         return ret
 
-    ret = {'installed': {}, 'removed': {}, 'purge_desired': {}}
-    cmd = ['dpkg-query', '--showformat',
-           '${Status} ${Package} ${Version} ${Architecture}\n', '-W']
-
-    out = __salt__['cmd.run_stdout'](
-            cmd,
-            output_loglevel='trace',
-            python_shell=False)
-    # Typical lines of output:
-    # install ok installed zsh 4.3.17-1ubuntu1 amd64
-    # deinstall ok config-files mc 3:4.8.1-2ubuntu1 amd64
-    for line in out.splitlines():
-        cols = line.split()
-        try:
-            linetype, status, name, version_num, arch = \
-                [cols[x] for x in (0, 2, 3, 4, 5)]
-        except (ValueError, IndexError):
-            continue
-        if __grains__.get('cpuarch', '') == 'x86_64':
-            osarch = __grains__.get('osarch', '')
-            if arch != 'all' and osarch == 'amd64' and osarch != arch:
-                name += ':{0}'.format(arch)
-        if cols:
-            if ('install' in linetype or 'hold' in linetype) and \
-                    'installed' in status:
-                __salt__['pkg_resource.add_pkg'](ret['installed'],
-                                                 name,
-                                                 version_num)
-            elif 'deinstall' in linetype:
-                __salt__['pkg_resource.add_pkg'](ret['removed'],
-                                                 name,
-                                                 version_num)
-            elif 'purge' in linetype and status == 'installed':
-                __salt__['pkg_resource.add_pkg'](ret['purge_desired'],
-                                                 name,
-                                                 version_num)
-
-    for pkglist_type in ('installed', 'removed', 'purge_desired'):
-        __salt__['pkg_resource.sort_pkglist'](ret[pkglist_type])
+    # The inventory is kept in the cachedir across jobs until the dpkg
+    # database changes
+    stamp = None
+    if __opts__.get('pkg_inventory_cache', True):
+        stamp = salt.utils.pkg.db_stamp(salt.utils.pkg.deb.DPKG_DB_PATHS)
+    ret = salt.utils.pkg.read_cache(__opts__, 'list_pkgs', stamp)
+    if ret is None:
+        ret = {'installed': {}, 'removed': {}, 'purge_desired': {}}
+        cmd = ['dpkg-query', '--showformat',
+               '${Status} ${Package} ${Version} ${Architecture}\n', '-W']
+
+        out = __salt__['cmd.run_stdout'](
+                cmd,
+                output_loglevel='trace',
+                python_shell=False)
+        # Typical lines of output:
+        # install ok installed zsh 4.3.17-1ubuntu1 amd64
+        # deinstall ok config-files mc 3:4.8.1-2ubuntu1 amd64
+        for line in out.splitlines():
+            cols = line.split()
+            try:
+                linetype, status, name, version_num, arch = \
+                    [cols[x] for x in (0, 2, 3, 4, 5)]
+            except (ValueError, IndexError):
+                continue
+            if __grains__.get('cpuarch', '') == 'x86_64':
+                osarch = __grains__.get('osarch', '')
+                if arch != 'all' and osarch == 'amd64' and osarch != arch:
+                    name += ':{0}'.format(arch)
+            if cols:
+                if ('install' in linetype or 'hold' in linetype) and \
+                        'installed' in status:
+                    __salt__['pkg_resource.add_pkg'](ret['installed'],
+                                                     name,
+                                                     version_num)
+                elif 'deinstall' in linetype:
+                    __salt__['pkg_resource.add_pkg'](ret['removed'],
+                                                     name,
+                                                     version_num)
+                elif 'purge' in linetype and status == 'installed':
+                    __salt__['pkg_resource.add_pkg'](ret['purge_desired'],
+                                                     name,
+                                                     version_num)
+
+        for pkglist_type in ('installed', 'removed', 'purge_desired'):
+            __salt__['pkg_resource.sort_pkglist'](ret[pkglist_type])
+
+        salt.utils.pkg.write_cache(__opts__, 'list_pkgs', stamp, ret)
 
     __context__['pkg.list_pkgs'] = copy.deepcopy(ret)
 
@@ -1435,7 +1467,15 @@ def list_upgrades(refresh=True, dist_upgrade=True, **kwargs):
     cache_valid_time = kwargs.pop('cache_valid_time', 0)
     if salt.utils.data.is_true(refresh):
         refresh_db(cache_valid_time)
-    return _get_upgradable(dist_upgrade, **kwargs)
+    metadata_ttl, metadata_stamp = _metadata_cache()
+    cache_name = salt.utils.pkg.cache_name(
+        'upgrades', bool(dist_upgrade), kwargs.get('fromrepo'))
+    ret = salt.utils.pkg.read_cache(
+        __opts__, cache_name, metadata_stamp, metadata_ttl)
+    if ret is None:
+        ret = _get_upgradable(dist_upgrade, **kwargs)
+        salt.utils.pkg.write_cache(__opts__, cache_name, metadata_stamp, ret)
+    return ret
 
 
 def upgrade_available(name):
@@ -21,10 +21,12 @@ import fnmatch
 import base64
 import re
 import tempfile
+import threading
 
 # Import salt libs
 import salt.utils.args
 import salt.utils.data
+import salt.utils.event
 import salt.utils.files
 import salt.utils.json
 import salt.utils.path
@@ -247,6 +249,94 @@ def _check_avail(cmd):
     return bret and wret
 
 
+class _OutputEvents(object):
+    '''
+    Fire the output of a command as progress events on the minion event bus
+    while it runs, at most once per ``interval`` seconds. Only the latest
+    output received in between is fired.
+    '''
+    def __init__(self, jid, cmd, interval=1):
+        self.tag = salt.utils.event.tagify(
+            [jid, 'prog', __opts__['id'], 'cmd'], 'job')
+        self.cmd = cmd
+        self.interval = interval
+        self.pending = {}
+        self.sizes = {}
+        self.last_fired = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, stream, data):
+        with self.lock:
+            pending = self.pending.setdefault(stream, bytearray())
+            pending += data
+            if len(pending) > salt.utils.timed_subprocess.READ_SIZE:
+                del pending[:len(pending) - salt.utils.timed_subprocess.READ_SIZE]
+            self.sizes[stream] = self.sizes.get(stream, 0) + len(data)
+            if time.time() - self.last_fired >= self.interval:
+                self._fire()
+
+    def flush(self):
+        '''
+        Fire the output received since the last event
+        '''
+        with self.lock:
+            self._fire()
+
+    def _fire(self):
+        for stream, pending in six.iteritems(self.pending):
+            if not pending:
+                continue
+            __salt__['event.fire']({
+                'cmd': self.cmd,
+                'stream': stream,
+                'output': salt.utils.stringutils.to_unicode(
+                    bytes(pending), errors='replace'),
+                'size': self.sizes[stream]}, self.tag)
+            del pending[:]
+        self.last_fired = time.time()
+
+
+def _prune_spools(spool_dir):
+    '''
+    Remove the output spool files older than cmd_output_keep hours
+    '''
+    keep = __opts__.get('cmd_output_keep', 24) * 3600
+    try:
+        names = os.listdir(spool_dir)
+    except OSError:
+        return
+    now = time.time()
+    for name in names:
+        path = os.path.join(spool_dir, name)
+        try:
+            if now - os.stat(path).st_mtime > keep:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+def _output_spools(jid, output_limit, events):
+    '''
+    Return the spools collecting the stdout and stderr of a command whose
+    output is streamed. The output beyond the limit is spooled to files in the
+    cmd_output directory of the minion cachedir, which can be retrieved with
+    cp.push.
+    '''
+    spool_dir = None
+    if output_limit and __opts__.get('cachedir'):
+        spool_dir = os.path.join(__opts__['cachedir'], 'cmd_output')
+        _prune_spools(spool_dir)
+    spools = []
+    for stream in ('stdout', 'stderr'):
+        spools.append(salt.utils.timed_subprocess.OutputSpool(
+            limit=output_limit or None,
+            spool_dir=spool_dir,
+            prefix='{0}_'.format(jid or 'local'),
+            suffix='.{0}'.format(stream),
+            callback=functools.partial(events, stream) if events else None))
+    return spools
+
+
 def _run(cmd,
          cwd=None,
          stdin=None,
@@ -614,6 +704,24 @@ def _run(cmd,
     if 'stdin_raw_newlines' in kwargs:
         new_kwargs['stdin_raw_newlines'] = kwargs['stdin_raw_newlines']
 
+    output_limit = kwargs.get('output_limit')
+    output_events = kwargs.get('output_events')
+    if '__pub_jid' in kwargs:
+        # Only the commands run by a job directly default to the configured
+        # streaming, other modules parse the output of the commands they run
+        if output_limit is None:
+            output_limit = __opts__.get('cmd_output_limit', 0)
+        if output_events is None:
+            output_events = __opts__.get('cmd_output_events', False)
+    output_limit = int(output_limit or 0)
+    spools = events = None
+    if (output_limit or output_events) and not use_vt and not bg:
+        if output_events and output_loglevel is not None \
+                and kwargs.get('__pub_jid'):
+            events = _OutputEvents(kwargs['__pub_jid'], cmd)
+        spools = _output_spools(kwargs.get('__pub_jid'), output_limit, events)
+        new_kwargs['stdout_spool'], new_kwargs['stderr_spool'] = spools
+
     if umask is not None:
         _umask = six.text_type(umask).lstrip('0')
 
@@ -690,6 +798,15 @@ def _run(cmd,
             # ok return code for timeouts?
             ret['retcode'] = 1
             return ret
+        finally:
+            if events is not None:
+                events.flush()
+
+        if spools is not None:
+            # Point at the full output of the streams which were truncated
+            for stream, spool in zip(('stdout', 'stderr'), spools):
+                if spool.path:
+                    ret['{0}_spool'.format(stream)] = spool.path
 
         if output_loglevel != 'quiet' and output_encoding is not None:
             log.debug('Decoding output from command %s using %s encoding',
@@ -1111,6 +1228,18 @@ def run(cmd,
 
       .. versionadded:: 2019.2.0
 
+    :param int output_limit: Stream the output of the command instead of
+        buffering it, returning only this number of bytes of the beginning and
+        of the end of stdout and stderr. The full output of a truncated stream
+        is spooled to the minion cachedir, see :conf_minion:`cmd_output_limit`.
+
+      .. versionadded:: Neon
+
+    :param bool output_events: Fire the output of the command on the minion
+        event bus while it runs, see :conf_minion:`cmd_output_events`.
+
+      .. versionadded:: Neon
+
     CLI Example:
 
     .. code-block:: bash
@@ -2028,6 +2157,18 @@ def run_all(cmd,
 
       .. versionadded:: 2019.2.0
 
+    :param int output_limit: Stream the output of the command instead of
+        buffering it, returning only this number of bytes of the beginning and
+        of the end of stdout and stderr. The full output of a truncated stream
+        is spooled to the minion cachedir, see :conf_minion:`cmd_output_limit`.
+
+      .. versionadded:: Neon
+
+    :param bool output_events: Fire the output of the command on the minion
+        event bus while it runs, see :conf_minion:`cmd_output_events`.
+
+      .. versionadded:: Neon
+
     CLI Example:
 
     .. code-block:: bash
@@ -117,6 +117,16 @@ def _get_instance(hosts=None, profile=None):
         hosts = ['127.0.0.1:9200']
     if isinstance(hosts, six.string_types):
         hosts = [hosts]
+
+    # Clients are kept for the life of the process so that their HTTP
+    # connection pools are reused. The connection check below only runs when
+    # a client is created, ping() checks cached clients again.
+    instances = __context__.setdefault('elasticsearch.instances', {})
+    instance_key = repr((hosts, proxies, use_ssl, ca_certs, verify_certs,
+                         http_auth, timeout))
+    if instance_key in instances:
+        return instances[instance_key]
+
     try:
         if proxies:
             # Custom connection class to use requests module with proxies
@@ -151,6 +161,7 @@ def _get_instance(hosts=None, profile=None):
     except elasticsearch.exceptions.TransportError as err:
         raise CommandExecutionError(
             'Could not connect to Elasticsearch host/ cluster {0} due to {1}'.format(hosts, err))
+    instances[instance_key] = es
     return es
 
 
@@ -169,7 +180,14 @@ def ping(allow_failure=False, hosts=None, profile=None):
         salt myminion elasticsearch.ping profile=elasticsearch-extra
     '''
     try:
-        _get_instance(hosts, profile)
+        es = _get_instance(hosts, profile)
+        # A cached client says nothing about the cluster being up now
+        es.info()
+    except elasticsearch.exceptions.TransportError as err:
+        if allow_failure:
+            raise CommandExecutionError(
+                'Could not connect to Elasticsearch host/ cluster {0} due to {1}'.format(hosts, err))
+        return False
     except CommandExecutionError as e:
         if allow_failure:
             six.reraise(*sys.exc_info())
@@ -459,6 +477,38 @@ def document_create(index, doc_type, body=None, id=None, hosts=None, profile=Non
         raise CommandExecutionError("Cannot create document in index {0}, server returned code {1} with message {2}".format(index, e.status_code, e.error))
 
 
+def document_bulk(body, index=None, doc_type=None, hosts=None, profile=None):
+    '''
+    .. versionadded:: Neon
+
+    Run several document operations in a single request to the bulk API
+
+    body
+        Newline delimited JSON with an action line, followed by its document
+        where the action takes one, for every operation
+    index
+        Default index for actions which don't specify one
+    doc_type
+        Default type for actions which don't specify one
+
+    CLI example::
+
+        salt myminion elasticsearch.document_bulk '{"index": {}}\n{"a": 1}\n' testindex doctype1
+    '''
+    es = _get_instance(hosts, profile)
+    try:
+        ret = es.bulk(body=body, index=index, doc_type=doc_type)
+    except elasticsearch.TransportError as e:
+        raise CommandExecutionError("Cannot run bulk request on index {0}, server returned code {1} with message {2}".format(index, e.status_code, e.error))
+    if ret.get('errors'):
+        failed = [item for item in ret.get('items', [])
+                  if any('error' in result for result in item.values())]
+        log.error('%s of the %s bulk operations failed, first error: %s',
+                  len(failed), len(ret.get('items', [])),
+                  failed[0] if failed else None)
+    return ret
+
+
 def document_delete(index, doc_type, id, hosts=None, profile=None):
     '''
     Delete a document from an index
@@ -11,6 +11,7 @@ group, mode, and data
 from __future__ import absolute_import, print_function, unicode_literals
 
 # Import python libs
+import contextlib
 import datetime
 import errno
 import fnmatch
@@ -45,6 +46,7 @@ except ImportError:
     pass
 
 # Import salt libs
+import salt.payload
 import salt.utils.args
 import salt.utils.atomicfile
 import salt.utils.data
@@ -74,6 +76,29 @@ __func_alias__ = {
 
 AttrChanges = namedtuple('AttrChanges', 'added,removed')
 
+# Files smaller than this are always hashed, which costs less than looking up
+# their hash in the hash cache
+HASH_CACHE_MIN_SIZE = 1048576
+
+# Seconds between two prunings of the hash cache, and after which a hash
+# cache entry in use has its mtime refreshed
+HASH_CACHE_PRUNE_INTERVAL = 3600
+
+# Size of the ranges copied at once from a file being edited by file.replace
+# and file.blockreplace
+EDIT_CHUNK_SIZE = 1048576
+
+# Largest diff returned by file.replace and file.blockreplace, in characters
+EDIT_DIFF_MAX_SIZE = 1048576
+
+# Files larger than this are diffed by file.get_diff from the lines around the
+# places where they differ, without being read into memory
+DIFF_STREAM_MIN_SIZE = 1048576
+
+# Number of lines searched past a difference between two files for the place
+# where they match again, before giving up on diffing them
+DIFF_SYNC_LINES = 1000
+
 
 def __virtual__():
     '''
@@ -727,6 +752,133 @@ def get_sum(path, form='sha256'):
     return salt.utils.hashutils.get_hash(path, form, 4096)
 
 
+def _hash_stamp(path_stat):
+    '''
+    Return the stat fields of a file which change whenever its contents do
+    '''
+    return [path_stat.st_dev,
+            path_stat.st_ino,
+            path_stat.st_size,
+            getattr(path_stat, 'st_mtime_ns', int(path_stat.st_mtime * 1e9)),
+            getattr(path_stat, 'st_ctime_ns', int(path_stat.st_ctime * 1e9))]
+
+
+def _hash_cache_path(path):
+    '''
+    Return the location of the hash cache file of a path
+    '''
+    return os.path.join(
+        __opts__['cachedir'],
+        'file_hashes',
+        '{0}.p'.format(hashlib.sha1(salt.utils.stringutils.to_bytes(path)).hexdigest()))
+
+
+def _prune_hash_cache(cache_dir, opts):
+    '''
+    Remove the hash cache entries not used for file_hash_cache_keep hours, and
+    those of files which no longer exist. The cache is pruned at most once
+    every HASH_CACHE_PRUNE_INTERVAL seconds.
+    '''
+    marker = os.path.join(cache_dir, '.pruned')
+    now = time.time()
+    try:
+        if now - os.stat(marker).st_mtime < HASH_CACHE_PRUNE_INTERVAL:
+            return
+    except OSError:
+        pass
+    try:
+        with salt.utils.files.fopen(marker, 'w'):
+            pass
+        names = os.listdir(cache_dir)
+    except (IOError, OSError):
+        return
+    keep = opts.get('file_hash_cache_keep', 168) * 3600
+    serial = salt.payload.Serial(opts)
+    for name in names:
+        if not name.endswith('.p'):
+            continue
+        cache_path = os.path.join(cache_dir, name)
+        try:
+            if now - os.stat(cache_path).st_mtime <= keep:
+                with salt.utils.files.fopen(cache_path, 'rb') as fp_:
+                    cached_path = serial.load(fp_).get('path')
+                if cached_path and os.path.exists(cached_path):
+                    continue
+            os.remove(cache_path)
+        except (IOError, OSError):
+            pass
+        except Exception as exc:  # pylint: disable=broad-except
+            log.debug('Removing unreadable hash cache %s: %s', cache_path, exc)
+            try:
+                os.remove(cache_path)
+            except OSError:
+                pass
+
+
+def _cached_hash(path, form, chunk_size):
+    '''
+    Return the hash of a file, from the hash cache in the minion cachedir when
+    the file was hashed before and its stat did not change since. Only files
+    of at least HASH_CACHE_MIN_SIZE bytes are cached.
+    '''
+    opts = globals().get('__opts__') or {}
+    if not opts.get('cachedir') or not opts.get('file_hash_cache', True):
+        return salt.utils.hashutils.get_hash(path, form, chunk_size)
+    try:
+        path_stat = os.stat(path)
+    except OSError:
+        path_stat = None
+    if path_stat is None or not stat.S_ISREG(path_stat.st_mode) \
+            or path_stat.st_size < HASH_CACHE_MIN_SIZE:
+        return salt.utils.hashutils.get_hash(path, form, chunk_size)
+
+    stamp = _hash_stamp(path_stat)
+    cache_path = _hash_cache_path(path)
+    serial = salt.payload.Serial(opts)
+    hashes = {}
+    cache_mtime = None
+    try:
+        with salt.utils.files.fopen(cache_path, 'rb') as fp_:
+            cache_mtime = os.fstat(fp_.fileno()).st_mtime
+            cached = serial.load(fp_)
+        if cached.get('path') == path and cached.get('stamp') == stamp:
+            hashes = cached['hashes']
+    except (IOError, OSError):
+        pass
+    except Exception as exc:  # pylint: disable=broad-except
+        log.debug('Unable to read the hash cache %s: %s', cache_path, exc)
+    if form in hashes:
+        if time.time() - cache_mtime > HASH_CACHE_PRUNE_INTERVAL:
+            # Entries are pruned once their mtime is too old, keep this one
+            try:
+                os.utime(cache_path, None)
+            except OSError:
+                pass
+        return hashes[form]
+
+    hsum = salt.utils.hashutils.get_hash(path, form, chunk_size)
+    try:
+        after = os.stat(path)
+    except OSError:
+        return hsum
+    if _hash_stamp(after) != stamp \
+            or time.time() - max(after.st_mtime, after.st_ctime) <= 1:
+        # The file changed while it was hashed, or recently enough that a
+        # further change may not move its timestamps
+        return hsum
+    hashes[form] = hsum
+    try:
+        if not os.path.isdir(os.path.dirname(cache_path)):
+            os.makedirs(os.path.dirname(cache_path))
+        with salt.utils.atomicfile.atomic_open(cache_path, 'wb') as fp_:
+            serial.dump({'path': path, 'stamp': stamp, 'hashes': hashes}, fp_)
+    except (IOError, OSError) as exc:
+        log.warning('Unable to write the hash cache %s: %s', cache_path, exc)
+    else:
+        _prune_hash_cache(os.path.dirname(cache_path), opts)
+    return hsum
+
+
 def get_hash(path, form='sha256', chunk_size=65536):
     '''
     Get the hash sum of a file
@@ -737,6 +889,11 @@ def get_hash(path, form='sha256', chunk_size=65536):
             ``get_sum`` cannot really be trusted since it is vulnerable to
             collisions: ``get_sum(..., 'xyz') == 'Hash xyz not supported'``
 
+    .. versionchanged:: Neon
+        The hashes of large files are kept in the minion cachedir, they are
+        only computed again once the stat of the file changes. See
+        :conf_minion:`file_hash_cache`.
+
     path
         path to the file or directory
 
@@ -752,7 +909,7 @@ def get_hash(path, form='sha256', chunk_size=65536):
 
         salt '*' file.get_hash /etc/shadow
     '''
-    return salt.utils.hashutils.get_hash(os.path.expanduser(path), form, chunk_size)
+    return _cached_hash(os.path.expanduser(path), form, chunk_size)
 
 
 def get_source_sum(file_name='',
@@ -1728,6 +1885,442 @@ def _mkstemp_copy(path,
     return temp_file
 
 
+def _ascii_compatible(encoding):
+    '''
+    Return True if text in ``encoding`` can be searched for line endings and
+    ASCII markers byte by byte
+    '''
+    try:
+        return '\n'.encode(encoding) == b'\n'
+    except LookupError:
+        return True
+
+
+@contextlib.contextmanager
+def _map_file(path, transcode=None):
+    '''
+    Yield a read-only mapping of the contents of ``path``, so that they can be
+    searched without being read into memory. Files which cannot be mapped,
+    such as empty files and those in /proc, are read instead.
+
+    transcode
+        Decode the file from this encoding and yield it encoded as UTF-8, for
+        encodings which are not ASCII compatible such as UTF-16. Such files
+        are held in memory.
+    '''
+    with salt.utils.files.fopen(path, 'rb') as fp_:
+        if transcode:
+            yield fp_.read().decode(transcode).encode('utf-8')
+            return
+        try:
+            data = mmap.mmap(fp_.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, mmap.error):
+            # mmap throws a ValueError if the file is empty, and the size of
+            # files in /proc is 0 even though they contain data
+            yield fp_.read()
+            return
+        try:
+            yield data
+        finally:
+            data.close()
+
+
+def _line_start(data, pos):
+    '''
+    Return the offset of the start of the line containing ``pos``
+    '''
+    return data.rfind(b'\n', 0, pos) + 1
+
+
+def _line_end(data, pos):
+    '''
+    Return the offset following the end of the line containing ``pos``
+    '''
+    end = data.find(b'\n', pos)
+    return len(data) if end == -1 else end + 1
+
+
+def _changed_edits(data, edits):
+    '''
+    Filter out the edits which would leave ``data`` unchanged
+    '''
+    for start, end, text in edits:
+        if data[start:end] != text:
+            yield start, end, text
+
+
+def _write_range(data, start, end, fh_):
+    '''
+    Copy a range of ``data`` to ``fh_`` in chunks of EDIT_CHUNK_SIZE
+    '''
+    while start < end:
+        stop = min(start + EDIT_CHUNK_SIZE, end)
+        fh_.write(data[start:stop])
+        start = stop
+
+
+def _write_edits(data, edits, fh_):
+    '''
+    Write ``data`` to ``fh_`` with the edits applied. ``edits`` is an iterable
+    of ``(start, end, replacement)`` tuples, ordered and not overlapping.
+    '''
+    pos = 0
+    for start, end, text in edits:
+        _write_range(data, pos, start, fh_)
+        fh_.write(text)
+        pos = end
+    _write_range(data, pos, len(data), fh_)
+
+
+def _stream_edits(path, edits, source=None, preserve_inode=False,
+                  transcode=None):
+    '''
+    Write the contents of ``source``, which defaults to ``path``, with the
+    edits returned by ``edits`` applied to ``path``. ``edits`` is called with
+    a mapping of ``source`` (see :py:func:`_map_file`) and returns the
+    ``(start, end, replacement)`` tuples to apply to it, ordered and not
+    overlapping. The unchanged ranges are copied from the mapping, so the file
+    is never held in memory.
+
+    The new contents are written over the original file when
+    ``preserve_inode`` is True, which must then be read from a copy, otherwise
+    they are written to a temp file which is renamed over ``path`` once
+    complete.
+    '''
+    temp_file = None
+    if source is None and (preserve_inode or salt.utils.platform.is_windows()):
+        # A file which is overwritten, or mapped on Windows, cannot be read
+        # while it is being written
+        source = temp_file = _mkstemp_copy(path=path, preserve_inode=True)
+    try:
+        with _map_file(source or path, transcode=transcode) as data:
+            if preserve_inode:
+                fh_ = salt.utils.files.fopen(path, 'wb')
+            else:
+                fh_ = salt.utils.atomicfile.atomic_open(path, 'wb')
+            with fh_:
+                if transcode:
+                    buf = io.BytesIO()
+                    _write_edits(data, edits(data), buf)
+                    fh_.write(buf.getvalue().decode('utf-8').encode(transcode))
+                else:
+                    _write_edits(data, edits(data), fh_)
+    except (OSError, IOError) as exc:
+        raise CommandExecutionError(
+            "Unable to write file '{0}'. Exception: {1}".format(path, exc)
+        )
+    finally:
+        if temp_file:
+            os.remove(temp_file)
+
+
+def _count_lines(data, start, end):
+    '''
+    Return the number of line endings of ``data`` between ``start`` and
+    ``end``, counted one chunk at a time
+    '''
+    count = 0
+    while start < end:
+        stop = min(start + EDIT_CHUNK_SIZE, end)
+        count += data[start:stop].count(b'\n')
+        start = stop
+    return count
+
+
+def _edit_hunks(data, edits, context=3):
+    '''
+    Group the edits into the line ranges of ``data`` they change, widened by
+    ``context`` lines and merged when they touch, as the hunks of a unified
+    diff. Yield ``(start, end, edits)`` tuples.
+    '''
+    size = len(data)
+    hunk = None
+    for edit in edits:
+        start, end = edit[0], edit[1]
+        hunk_start = _line_start(data, start)
+        hunk_end = _line_end(data, max(start, end - 1)) if start < size else size
+        for _ in range(context):
+            if hunk_start:
+                hunk_start = _line_start(data, hunk_start - 1)
+            if hunk_end < size:
+                hunk_end = _line_end(data, hunk_end)
+        if hunk is not None and hunk_start <= hunk[1]:
+            hunk[1] = max(hunk[1], hunk_end)
+            hunk[2].append(edit)
+        else:
+            if hunk is not None:
+                yield hunk
+            hunk = [hunk_start, hunk_end, [edit]]
+    if hunk is not None:
+        yield hunk
+
+
+def _edits_diff(data, edits):
+    '''
+    Return a unified diff of the changes the edits make to ``data``, built
+    from the lines around each edit rather than from the whole file. The diff
+    is cut short once it grows past EDIT_DIFF_MAX_SIZE characters.
+    '''
+    def _shift(match, old_shift, new_shift):
+        return '@@ -{0}{1} +{2}{3} @@'.format(
+            int(match.group(1)) + old_shift, match.group(2) or '',
+            int(match.group(3)) + new_shift, match.group(4) or '')
+
+    ret = []
+    size = 0
+    lineno = 1
+    counted = 0
+    offset = 0
+    for hunk_start, hunk_end, hunk_edits in _edit_hunks(data, _changed_edits(data, edits)):
+        lineno += _count_lines(data, counted, hunk_start)
+        counted = hunk_start
+        buf = io.BytesIO()
+        pos = hunk_start
+        for start, end, text in hunk_edits:
+            buf.write(data[pos:start])
+            buf.write(text)
+            pos = end
+        buf.write(data[pos:hunk_end])
+        old = data[hunk_start:hunk_end].splitlines(True)
+        new = buf.getvalue().splitlines(True)
+        diff = __utils__['stringutils.get_diff'](old, new)
+        if not diff:
+            continue
+        # Drop the file headers and number the lines of the hunks from the
+        # start of the file
+        hunk = re.sub(
+            r'^@@ -(\d+)(,\d+)? \+(\d+)(,\d+)? @@$',
+            lambda match: _shift(match, lineno - 1, lineno - 1 + offset),
+            diff.split('\n', 2)[2],
+            flags=re.MULTILINE)
+        offset += len(new) - len(old)
+        if size + len(hunk) > EDIT_DIFF_MAX_SIZE:
+            ret.append('[diff truncated after {0} characters]\n'.format(size))
+            break
+        ret.append(hunk)
+        size += len(hunk)
+    if not ret:
+        return ''
+    return '--- \n+++ \n' + ''.join(ret)
+
+
+def _files_equal(path1, path2):
+    '''
+    Return True if both files have the same contents, comparing them one
+    chunk at a time
+    '''
+    with salt.utils.files.fopen(path1, 'rb') as fp1_, \
+            salt.utils.files.fopen(path2, 'rb') as fp2_:
+        size1 = os.fstat(fp1_.fileno()).st_size
+        size2 = os.fstat(fp2_.fileno()).st_size
+        # Files in /proc have a size of 0
+        if size1 and size2 and size1 != size2:
+            return False
+        while True:
+            chunk = fp1_.read(EDIT_CHUNK_SIZE)
+            if chunk != fp2_.read(EDIT_CHUNK_SIZE):
+                return False
+            if not chunk:
+                return True
+
+
+def _common_length(data1, pos1, data2, pos2):
+    '''
+    Return the length of the run of bytes ``data1`` and ``data2`` have in
+    common from ``pos1`` and ``pos2``
+    '''
+    length = 0
+    limit = min(len(data1) - pos1, len(data2) - pos2)
+    chunk = EDIT_CHUNK_SIZE
+    while length < limit:
+        size = min(chunk, limit - length)
+        if data1[pos1 + length:pos1 + length + size] \
+                == data2[pos2 + length:pos2 + length + size]:
+            length += size
+        elif size == 1:
+            break
+        else:
+            # Narrow down on the first differing byte
+            chunk = size // 2
+    return length
+
+
+def _read_lines(data, pos, count):
+    '''
+    Return a list of up to ``count`` lines of ``data`` from ``pos``, and
+    whether they reach the end of ``data``
+    '''
+    lines = []
+    size = len(data)
+    while pos < size and len(lines) < count:
+        end = _line_end(data, pos)
+        lines.append(data[pos:end])
+        pos = end
+    return lines, pos >= size
+
+
+def _sync_point(lines1, eof1, lines2, eof2, sync=3):
+    '''
+    Return the indexes of the first place where ``lines1`` and ``lines2``
+    match again for ``sync`` lines, or up to their end if both reach the end
+    of their file, as a ``(index1, index2)`` tuple minimizing the number of
+    lines changed. Return None if there is no such place.
+    '''
+    positions = {}
+    for index, line in enumerate(lines2):
+        positions.setdefault(line, []).append(index)
+    best = (len(lines1), len(lines2)) if eof1 and eof2 else None
+    for index1, line in enumerate(lines1):
+        if best is not None and index1 >= sum(best):
+            break
+        for index2 in positions.get(line, ()):
+            if best is not None and index1 + index2 >= sum(best):
+                break
+            tail = lines1[index1:index1 + sync]
+            if tail == lines2[index2:index2 + sync] \
+                    and (len(tail) == sync
+                         or (eof1 and eof2
+                             and len(lines1) - index1 == len(lines2) - index2)):
+                best = (index1, index2)
+                break
+    return best
+
+
+def _diff_ranges(data1, data2):
+    '''
+    Yield the line ranges where ``data1`` and ``data2`` differ as
+    ``(start1, end1, start2, end2)`` tuples of offsets. The common runs in
+    between are skipped chunk by chunk, and each difference is matched again
+    within DIFF_SYNC_LINES lines. Raise a ValueError when it cannot be.
+    '''
+    pos1 = pos2 = 0
+    while True:
+        length = _common_length(data1, pos1, data2, pos2)
+        if pos1 + length == len(data1) and pos2 + length == len(data2):
+            return
+        start1 = _line_start(data1, pos1 + length)
+        start2 = pos2 + start1 - pos1
+        lines1, eof1 = _read_lines(data1, start1, DIFF_SYNC_LINES)
+        lines2, eof2 = _read_lines(data2, start2, DIFF_SYNC_LINES)
+        sync = _sync_point(lines1, eof1, lines2, eof2)
+        if sync is None:
+            raise ValueError(
+                'No match found within {0} lines'.format(DIFF_SYNC_LINES))
+        pos1 = start1 + sum(len(x) for x in lines1[:sync[0]])
+        pos2 = start2 + sum(len(x) for x in lines2[:sync[1]])
+        yield start1, pos1, start2, pos2
+
+
+def _diff_hunks(data1, data2, context=3):
+    '''
+    Group the ranges where ``data1`` and ``data2`` differ into the hunks of a
+    unified diff, widened by ``context`` lines and merged when they touch.
+    Yield ``(start1, end1, start2, end2)`` tuples.
+    '''
+    size = len(data1)
+    hunk = None
+    for start1, end1, start2, end2 in _diff_ranges(data1, data2):
+        hunk_start = start1
+        hunk_end = end1
+        for _ in range(context):
+            if hunk_start:
+                hunk_start = _line_start(data1, hunk_start - 1)
+            if hunk_end < size:
+                hunk_end = _line_end(data1, hunk_end)
+        # The context lines are common to both files
+        if hunk is not None and hunk_start <= hunk[1]:
+            hunk[1] = hunk_end
+            hunk[3] = end2 + hunk_end - end1
+        else:
+            if hunk is not None:
+                yield hunk
+            hunk = [hunk_start, hunk_end,
+                    start2 - (start1 - hunk_start), end2 + hunk_end - end1]
+    if hunk is not None:
+        yield hunk
+
+
+def _stream_diff(data1, data2, max_size):
+    '''
+    Return a unified diff of ``data1`` and ``data2`` built from the lines
+    around the places where they differ, without the file headers. Return
+    None if it grows past ``max_size`` characters or if the files cannot be
+    matched again after one of their differences.
+    '''
+    def _shift(match, old_shift, new_shift):
+        return '@@ -{0}{1} +{2}{3} @@'.format(
+            int(match.group(1)) + old_shift, match.group(2) or '',
+            int(match.group(3)) + new_shift, match.group(4) or '')
+
+    ret = []
+    size = 0
+    lineno1 = lineno2 = 1
+    counted1 = counted2 = 0
+    try:
+        for start1, end1, start2, end2 in _diff_hunks(data1, data2):
+            lineno1 += _count_lines(data1, counted1, start1)
+            lineno2 += _count_lines(data2, counted2, start2)
+            counted1, counted2 = start1, start2
+            diff = __utils__['stringutils.get_diff'](
+                data1[start1:end1].splitlines(True),
+                data2[start2:end2].splitlines(True))
+            # Drop the file headers and number the lines of the hunks from
+            # the start of the files
+            hunk = re.sub(
+                r'^@@ -(\d+)(,\d+)? \+(\d+)(,\d+)? @@$',
+                lambda match: _shift(match, lineno1 - 1, lineno2 - 1),
+                diff.split('\n', 2)[2],
+                flags=re.MULTILINE)
+            size += len(hunk)
+            if size > max_size:
+                return None
+            ret.append(hunk)
+    except ValueError as exc:
+        log.debug('Unable to diff files: %s', exc)
+        return None
+    return ''.join(ret)
+
+
+def _diff_files(path1, path2, show_filenames=True):
+    '''
+    Return a unified diff of two text files. Files larger than
+    DIFF_STREAM_MIN_SIZE are diffed from the lines around the places where
+    they differ. A diff larger than the ``file_diff_max_size`` minion config
+    option is replaced with a summary of the checksums of the files.
+    '''
+    max_size = __opts__.get('file_diff_max_size', 1048576)
+    headers = [path1, path2] if show_filenames else []
+    try:
+        if max(os.path.getsize(path1),
+               os.path.getsize(path2)) <= DIFF_STREAM_MIN_SIZE:
+            args = []
+            for filename in (path1, path2):
+                with salt.utils.files.fopen(filename, 'rb') as fp_:
+                    args.append(fp_.readlines())
+            ret = __utils__['stringutils.get_diff'](*(args + headers))
+            if len(ret) > max_size:
+                ret = None
+        else:
+            with _map_file(path1) as data1, _map_file(path2) as data2:
+                ret = _stream_diff(data1, data2, max_size)
+            if ret is not None:
+                ret = '--- {0}\n+++ {1}\n'.format(*headers or ('', '')) + ret
+    except (IOError, OSError) as exc:
+        raise CommandExecutionError(
+            'Failed to read {0}: {1}'.format(
+                salt.utils.stringutils.to_unicode(exc.filename),
+                exc.strerror
+            )
+        )
+    if ret is None:
+        hash_type = __opts__.get('hash_type', 'sha256')
+        ret = ('Diff too large to show, {0} checksum changed from {1} to '
+               '{2}'.format(hash_type,
+                            get_hash(path1, hash_type),
+                            get_hash(path2, hash_type)))
+    return ret
+
+
 def _starts_till(src, probe, strip_comments=True):
     '''
     Returns True if src and probe at least matches at the beginning till some point.
@@ -1979,7 +2572,8 @@ def line(path, content=None, match=None, mode=None, location=None,
 
     with salt.utils.files.fopen(path, mode='r') as fp_:
         body = salt.utils.data.decode_list(fp_.readlines())
-    body_before = hashlib.sha256(salt.utils.stringutils.to_bytes(''.join(body))).hexdigest()
+    # The lines are only referenced, not copied, to detect the changes
+    body_before = list(body)
     # Add empty line at the end if last line ends with eol.
     # Allows simpler code
     if body and _get_eol(body[-1]):
@@ -2081,7 +2675,7 @@ def line(path, content=None, match=None, mode=None, location=None,
         if '' == body[-1]:
             body.pop()
 
-    changed = body_before != hashlib.sha256(salt.utils.stringutils.to_bytes(''.join(body))).hexdigest()
+    changed = body_before != body
 
     if backup and changed and __opts__['test'] is False:
         try:
@@ -2094,9 +2688,7 @@ def line(path, content=None, match=None, mode=None, location=None,
 
     if changed:
         if show_changes:
-            with salt.utils.files.fopen(path, 'r') as fp_:
-                path_content = salt.utils.data.decode_list(fp_.read().splitlines(True))
-            changes_diff = __utils__['stringutils.get_diff'](path_content, body)
+            changes_diff = __utils__['stringutils.get_diff'](body_before, body)
         if __opts__['test'] is False:
             fh_ = None
             try:
@@ -2143,6 +2735,12 @@ def replace(path,
 
     This is a pure Python implementation that wraps Python's :py:func:`~re.sub`.
 
+    .. versionchanged:: Neon
+        The file is searched through a read-only memory map, and is only
+        rewritten when the replacements change its contents. The new contents
+        are streamed from the map to the file, so files much larger than the
+        available memory can be edited.
+
     path
         Filesystem path to the file to be edited. If a symlink is specified, it
         will be resolved to its target.
@@ -2173,6 +2771,10 @@ def replace(path,
         ``file`` may be specified which will read the entire file into memory
         before processing.
 
+        .. versionchanged:: Neon
+            The file is mapped into memory and searched in place, so this is
+            ignored.
+
     append_if_not_found: False
         .. versionadded:: 2014.7.0
 
@@ -2209,11 +2811,10 @@ def replace(path,
         If ``True``, return a diff of changes made. Otherwise, return ``True``
         if changes were made, and ``False`` if not.
 
-        .. note::
-            Using this option will store two copies of the file in memory (the
-            original version and the edited version) in order to generate the
-            diff. This may not normally be a concern, but could impact
-            performance if used with large files.
+        .. versionchanged:: Neon
+            The diff is built from the lines around each replacement rather
+            than from copies of the whole file, and is cut short once it grows
+            past 1MiB.
 
     ignore_if_missing: False
         .. versionadded:: 2015.8.0
@@ -2227,10 +2828,13 @@ def replace(path,
         Preserve the inode of the file, so that any hard links continue to
         share the inode with the original filename. This works by *copying* the
         file, reading from the copy, and writing to the file at the original
-        inode. If ``False``, the file will be *moved* rather than copied, and a
-        new file will be written to a new inode, but using the original
-        filename. Hard links will then share an inode with the backup, instead
-        (if using ``backup`` to create a backup copy).
+        inode. If ``False``, a new file will be written to a new inode and
+        renamed over the original filename once complete. Hard links will then
+        keep sharing the inode of the original contents.
+
+        .. versionchanged:: Neon
+            With ``False`` the new file is renamed over the original one
+            instead of being written after moving the original file away.
 
     backslash_literal: False
         .. versionadded:: 2016.11.7
@@ -2289,14 +2893,7 @@ def replace(path,
 
     flags_num = _get_flags(flags)
     cpattern = re.compile(salt.utils.stringutils.to_bytes(pattern), flags_num)
-    filesize = os.path.getsize(path)
-    if bufsize == 'file':
-        bufsize = filesize
 
-    # Search the file; track if any changes have been made for the return val
-    has_changes = False
-    orig_file = []  # used for show_changes and change detection
-    new_file = []  # used for show_changes and change detection
     if not salt.utils.platform.is_windows():
         pre_user = get_user(path)
         pre_group = get_group(path)
@@ -2305,196 +2902,120 @@ def replace(path,
     # Avoid TypeErrors by forcing repl to be bytearray related to mmap
     # Replacement text may contains integer: 123 for example
     repl = salt.utils.stringutils.to_bytes(six.text_type(repl))
+    template = repl.replace(b'\\', b'\\\\') if backslash_literal else repl
     if not_found_content:
         not_found_content = salt.utils.stringutils.to_bytes(not_found_content)
-
-    found = False
-    temp_file = None
-    content = salt.utils.stringutils.to_unicode(not_found_content) \
+    content = not_found_content \
         if not_found_content and (prepend_if_not_found or append_if_not_found) \
-        else salt.utils.stringutils.to_unicode(repl)
+        else repl
+    linesep = salt.utils.stringutils.to_bytes(os.linesep)
+
+    def _replace_edits(data):
+        '''
+        Return the replacements of the matches of the pattern
+        '''
+        matches = cpattern.finditer(data)
+        if count > 0:
+            matches = itertools.islice(matches, count)
+        return ((match.start(), match.end(), match.expand(template))
+                for match in matches)
 
+    def _not_found_edits(data):
+        '''
+        Return the insertion of the content at the start or the end of the file
+        '''
+        if prepend_if_not_found:
+            return [(0, 0, content + linesep)]
+        size = len(data)
+        # Make sure we have a newline at the end of the file
+        if size and data[size - len(linesep):size] != linesep:
+            return [(size, size, linesep + content + linesep)]
+        return [(size, size, content + linesep)]
+
+    # Search the file first; the file is only rewritten, and its timestamps
+    # changed, if the replacements change its contents
+    edits = _replace_edits
+    has_changes = False
+    differences = ''
     try:
-        # First check the whole file, determine whether to make the replacement
-        # Searching first avoids modifying the time stamp if there are no changes
-        r_data = None
-        # Use a read-only handle to open the file
-        with salt.utils.files.fopen(path,
-                              mode='rb',
-                              buffering=bufsize) as r_file:
-            try:
-                # mmap throws a ValueError if the file is empty.
-                r_data = mmap.mmap(r_file.fileno(),
-                                   0,
-                                   access=mmap.ACCESS_READ)
-            except (ValueError, mmap.error):
-                # size of file in /proc is 0, but contains data
-                r_data = salt.utils.stringutils.to_bytes("".join(r_file))
+        with _map_file(path) as data:
             if search_only:
                 # Just search; bail as early as a match is found
-                if re.search(cpattern, r_data):
-                    return True  # `with` block handles file closure
-                else:
-                    return False
-            else:
-                result, nrepl = re.subn(cpattern,
-                                        repl.replace('\\', '\\\\') if backslash_literal else repl,
-                                        r_data,
-                                        count)
-
-                # found anything? (even if no change)
-                if nrepl > 0:
-                    found = True
-                    # Identity check the potential change
-                    has_changes = True if pattern != repl else has_changes
-
-                if prepend_if_not_found or append_if_not_found:
-                    # Search for content, to avoid pre/appending the
-                    # content if it was pre/appended in a previous run.
-                    if re.search(salt.utils.stringutils.to_bytes('^{0}($|(?=\r\n))'.format(re.escape(content))),
-                                 r_data,
-                                 flags=flags_num):
-                        # Content was found, so set found.
-                        found = True
-
-                orig_file = r_data.read(filesize).splitlines(True) \
-                    if isinstance(r_data, mmap.mmap) \
-                    else r_data.splitlines(True)
-                new_file = result.splitlines(True)
-
+                return bool(cpattern.search(data))
+            if append_if_not_found or prepend_if_not_found:
+                # Search for content, to avoid pre/appending the content if
+                # it was pre/appended in a previous run.
+                found = cpattern.search(data) or re.search(
+                    salt.utils.stringutils.to_bytes(
+                        '^{0}($|(?=\r\n))'.format(
+                            re.escape(salt.utils.stringutils.to_unicode(content)))),
+                    data,
+                    flags=flags_num)
+                if not found:
+                    edits = _not_found_edits
+            for _ in _changed_edits(data, edits(data)):
+                has_changes = True
+                break
+            if has_changes and show_changes:
+                differences = _edits_diff(data, edits(data))
     except (OSError, IOError) as exc:
         raise CommandExecutionError(
             "Unable to open file '{0}'. "
             "Exception: {1}".format(path, exc)
             )
-    finally:
-        if r_data and isinstance(r_data, mmap.mmap):
-            r_data.close()
 
     if has_changes and not dry_run:
-        # Write the replacement text in this block.
-        try:
+        temp_file = None
+        if backup or preserve_inode:
             # Create a copy to read from and to use as a backup later
-            temp_file = _mkstemp_copy(path=path,
-                                      preserve_inode=preserve_inode)
-        except (OSError, IOError) as exc:
-            raise CommandExecutionError("Exception: {0}".format(exc))
-
-        r_data = None
-        try:
-            # Open the file in write mode
-            with salt.utils.files.fopen(path,
-                        mode='w',
-                        buffering=bufsize) as w_file:
-                try:
-                    # Open the temp file in read mode
-                    with salt.utils.files.fopen(temp_file,
-                                          mode='r',
-                                          buffering=bufsize) as r_file:
-                        r_data = mmap.mmap(r_file.fileno(),
-                                           0,
-                                           access=mmap.ACCESS_READ)
-                        result, nrepl = re.subn(cpattern,
-                                                repl.replace('\\', '\\\\') if backslash_literal else repl,
-                                                r_data,
-                                                count)
-                        try:
-                            w_file.write(salt.utils.stringutils.to_str(result))
-                        except (OSError, IOError) as exc:
-                            raise CommandExecutionError(
-                                "Unable to write file '{0}'. Contents may "
-                                "be truncated. Temporary file contains copy "
-                                "at '{1}'. "
-                                "Exception: {2}".format(path, temp_file, exc)
-                                )
-                except (OSError, IOError) as exc:
-                    raise CommandExecutionError("Exception: {0}".format(exc))
-                finally:
-                    if r_data and isinstance(r_data, mmap.mmap):
-                        r_data.close()
-        except (OSError, IOError) as exc:
-            raise CommandExecutionError("Exception: {0}".format(exc))
+            temp_file = _mkstemp_copy(path=path, preserve_inode=True)
+        _stream_edits(path, edits, source=temp_file,
+                      preserve_inode=preserve_inode)
 
-    if not found and (append_if_not_found or prepend_if_not_found):
-        if not_found_content is None:
-            not_found_content = repl
-        if prepend_if_not_found:
-            new_file.insert(0, not_found_content + salt.utils.stringutils.to_bytes(os.linesep))
-        else:
-            # append_if_not_found
-            # Make sure we have a newline at the end of the file
-            if 0 != len(new_file):
-                if not new_file[-1].endswith(salt.utils.stringutils.to_bytes(os.linesep)):
-                    new_file[-1] += salt.utils.stringutils.to_bytes(os.linesep)
-            new_file.append(not_found_content + salt.utils.stringutils.to_bytes(os.linesep))
-        has_changes = True
-        if not dry_run:
+        if backup:
+            # keep the backup only if it was requested
+            # and only if there were any changes
+            backup_name = '{0}{1}'.format(path, backup)
             try:
-                # Create a copy to read from and for later use as a backup
-                temp_file = _mkstemp_copy(path=path,
-                                          preserve_inode=preserve_inode)
+                shutil.move(temp_file, backup_name)
             except (OSError, IOError) as exc:
-                raise CommandExecutionError("Exception: {0}".format(exc))
-            # write new content in the file while avoiding partial reads
-            try:
-                fh_ = salt.utils.atomicfile.atomic_open(path, 'wb')
-                for line in new_file:
-                    fh_.write(salt.utils.stringutils.to_bytes(line))
-            finally:
-                fh_.close()
-
-    if backup and has_changes and not dry_run:
-        # keep the backup only if it was requested
-        # and only if there were any changes
-        backup_name = '{0}{1}'.format(path, backup)
-        try:
-            shutil.move(temp_file, backup_name)
-        except (OSError, IOError) as exc:
-            raise CommandExecutionError(
-                "Unable to move the temp file '{0}' to the "
-                "backup file '{1}'. "
-                "Exception: {2}".format(path, temp_file, exc)
-                )
-        if symlink:
-            symlink_backup = '{0}{1}'.format(given_path, backup)
-            target_backup = '{0}{1}'.format(target_path, backup)
-            # Always clobber any existing symlink backup
-            # to match the behaviour of the 'backup' option
+                raise CommandExecutionError(
+                    "Unable to move the temp file '{0}' to the "
+                    "backup file '{1}'. "
+                    "Exception: {2}".format(path, temp_file, exc)
+                    )
+            if symlink:
+                symlink_backup = '{0}{1}'.format(given_path, backup)
+                target_backup = '{0}{1}'.format(target_path, backup)
+                # Always clobber any existing symlink backup
+                # to match the behaviour of the 'backup' option
+                try:
+                    os.symlink(target_backup, symlink_backup)
+                except OSError:
+                    os.remove(symlink_backup)
+                    os.symlink(target_backup, symlink_backup)
+                except Exception as exc:  # pylint: disable=broad-except
+                    raise CommandExecutionError(
+                        "Unable create backup symlink '{0}'. "
+                        "Target was '{1}'. "
+                        "Exception: {2}".format(symlink_backup, target_backup,
+                                                exc)
+                        )
+        elif temp_file:
             try:
-                os.symlink(target_backup, symlink_backup)
-            except OSError:
-                os.remove(symlink_backup)
-                os.symlink(target_backup, symlink_backup)
-            except Exception:  # pylint: disable=broad-except
+                os.remove(temp_file)
+            except (OSError, IOError) as exc:
                 raise CommandExecutionError(
-                    "Unable create backup symlink '{0}'. "
-                    "Target was '{1}'. "
-                    "Exception: {2}".format(symlink_backup, target_backup,
-                                            exc)
+                    "Unable to delete temp file '{0}'. "
+                    "Exception: {1}".format(temp_file, exc)
                     )
-    elif temp_file:
-        try:
-            os.remove(temp_file)
-        except (OSError, IOError) as exc:
-            raise CommandExecutionError(
-                "Unable to delete temp file '{0}'. "
-                "Exception: {1}".format(temp_file, exc)
-                )
 
     if not dry_run and not salt.utils.platform.is_windows():
         check_perms(path, None, pre_user, pre_group, pre_mode)
 
-    differences = __utils__['stringutils.get_diff'](orig_file, new_file)
-
     if show_changes:
         return differences
 
-    # We may have found a regex line match but don't need to change the line
-    # (for situations where the pattern also matches the repl). Revert the
-    # has_changes flag to False if the final result is unchanged.
-    if not differences:
-        has_changes = False
-
     return has_changes
 
 
@@ -2516,11 +3037,11 @@ def blockreplace(path,
     A block of content delimited by comments can help you manage several lines
     entries without worrying about old entries removal.
 
-    .. note::
-
-        This function will store two copies of the file in-memory (the original
-        version and the edited version) in order to detect changes and only
-        edit the targeted file if necessary.
+    .. versionchanged:: Neon
+        The file is searched for the markers through a read-only memory map
+        and the new contents are streamed to it, instead of storing two
+        copies of the file in memory. Files in encodings which are not ASCII
+        compatible, such as UTF-16, are still edited in memory.
 
     path
         Filesystem path to the file to be edited
@@ -2622,13 +3143,6 @@ def blockreplace(path,
 
     line_count = len(split_content)
 
-    has_changes = False
-    orig_file = []
-    new_file = []
-    in_block = False
-    block_found = False
-    linesep = None
-
     def _add_content(linesep, lines=None, include_marker_start=True,
                      end_line=None):
         if lines is None:
@@ -2658,147 +3172,156 @@ def blockreplace(path,
 
         return lines
 
-    # We do not use in-place editing to avoid file attrs modifications when
-    # no changes are required and to avoid any file access on a partially
-    # written file.
-    try:
-        fi_file = io.open(path, mode='r', encoding=file_encoding, newline='')
-        for line in fi_file:
-            write_line_to_new_file = True
-
-            if linesep is None:
-                # Auto-detect line separator
-                if line.endswith('\r\n'):
-                    linesep = '\r\n'
-                elif line.endswith('\n'):
-                    linesep = '\n'
-                else:
-                    # No newline(s) in file, fall back to system's linesep
-                    linesep = os.linesep
-
-            if marker_start in line:
-                # We've entered the content block
-                in_block = True
-            else:
-                if in_block:
-                    # We're not going to write the lines from the old file to
-                    # the new file until we have exited the block.
-                    write_line_to_new_file = False
-
-                    marker_end_pos = line.find(marker_end)
-                    if marker_end_pos != -1:
-                        # End of block detected
-                        in_block = False
-                        # We've found and exited the block
-                        block_found = True
-
-                        _add_content(linesep, lines=new_file,
-                                     include_marker_start=False,
-                                     end_line=line[marker_end_pos:])
-
-            # Save the line from the original file
-            orig_file.append(line)
-            if write_line_to_new_file:
-                new_file.append(line)
-
-    except (IOError, OSError) as exc:
-        raise CommandExecutionError(
-            'Failed to read from {0}: {1}'.format(path, exc)
-        )
-    finally:
-        if linesep is None:
-            # If the file was empty, we will not have set linesep yet. Assume
-            # the system's line separator. This is needed for when we
-            # prepend/append later on.
+    # Files in encodings which are not ASCII compatible are searched in
+    # memory, encoded as UTF-8
+    transcode = None
+    encoding = file_encoding
+    if file_encoding and not _ascii_compatible(file_encoding):
+        transcode = file_encoding
+        encoding = 'utf-8'
+    start_bytes = salt.utils.stringutils.to_bytes(marker_start, encoding=encoding)
+    end_bytes = salt.utils.stringutils.to_bytes(marker_end, encoding=encoding)
+
+    def _block_edits(data):
+        '''
+        Return the replacements of the contents of the marked blocks, or the
+        insertion of a new block if none is found
+        '''
+        size = len(data)
+        # Auto-detect line separator from the first line, falling back to
+        # the system's one if the file has no newline
+        newline = data.find(b'\n')
+        if newline == -1:
             linesep = os.linesep
-        try:
-            fi_file.close()
-        except Exception:  # pylint: disable=broad-except
-            pass
+        elif newline and data[newline - 1:newline] == b'\r':
+            linesep = '\r\n'
+        else:
+            linesep = '\n'
 
-    if in_block:
-        # unterminated block => bad, always fail
-        raise CommandExecutionError(
-            'Unterminated marked block. End of file reached before marker_end.'
-        )
+        block_found = False
+        pos = 0
+        while True:
+            idx = data.find(start_bytes, pos)
+            if idx == -1:
+                break
+            # We've entered the content block. The lines up to the end
+            # marker are dropped, except those containing the start marker.
+            drop_start = pos = _line_end(data, idx)
+            while True:
+                end_idx = data.find(end_bytes, pos) if pos < size else -1
+                if end_idx == -1:
+                    # unterminated block => bad, always fail
+                    raise CommandExecutionError(
+                        'Unterminated marked block. End of file reached '
+                        'before marker_end.'
+                    )
+                end_line_start = _line_start(data, end_idx)
+                idx = data.find(start_bytes, pos)
+                if idx != -1 and _line_start(data, idx) <= end_line_start:
+                    line_start = _line_start(data, idx)
+                    if line_start > drop_start:
+                        yield drop_start, line_start, b''
+                    drop_start = pos = _line_end(data, idx)
+                    continue
+                # End of block detected
+                pos = _line_end(data, end_idx)
+                end_line = salt.utils.stringutils.to_unicode(
+                    data[end_idx:pos], encoding=encoding)
+                yield drop_start, pos, salt.utils.stringutils.to_bytes(
+                    ''.join(_add_content(linesep, lines=[],
+                                         include_marker_start=False,
+                                         end_line=end_line)),
+                    encoding=encoding)
+                block_found = True
+                break
 
-    if not block_found:
+        if block_found:
+            return
         if prepend_if_not_found:
             # add the markers and content at the beginning of file
-            prepended_content = _add_content(linesep)
-            prepended_content.extend(new_file)
-            new_file = prepended_content
-            block_found = True
+            yield 0, 0, salt.utils.stringutils.to_bytes(
+                ''.join(_add_content(linesep)), encoding=encoding)
         elif append_if_not_found:
+            block = ''.join(_add_content(linesep))
             # Make sure we have a newline at the end of the file
-            if 0 != len(new_file):
-                if not new_file[-1].endswith(linesep):
-                    new_file[-1] += linesep
+            sep = salt.utils.stringutils.to_bytes(linesep)
+            if size and data[size - len(sep):size] != sep:
+                block = linesep + block
             # add the markers and content at the end of file
-            _add_content(linesep, lines=new_file)
-            block_found = True
+            yield size, size, salt.utils.stringutils.to_bytes(
+                block, encoding=encoding)
         else:
             raise CommandExecutionError(
                 'Cannot edit marked block. Markers were not found in file.'
             )
 
-    if block_found:
-        diff = __utils__['stringutils.get_diff'](orig_file, new_file)
-        has_changes = diff is not ''
-        if has_changes and not dry_run:
-            # changes detected
-            # backup file attrs
-            perms = {}
-            perms['user'] = get_user(path)
-            perms['group'] = get_group(path)
-            perms['mode'] = salt.utils.files.normalize_mode(get_mode(path))
-
-            # backup old content
-            if backup is not False:
-                backup_path = '{0}{1}'.format(path, backup)
-                shutil.copy2(path, backup_path)
-                # copy2 does not preserve ownership
-                if salt.utils.platform.is_windows():
-                    # This function resides in win_file.py and will be available
-                    # on Windows. The local function will be overridden
-                    # pylint: disable=E1120,E1123
-                    check_perms(path=backup_path,
-                                ret=None,
-                                owner=perms['user'])
-                    # pylint: enable=E1120,E1123
-                else:
-                    check_perms(name=backup_path,
-                                ret=None,
-                                user=perms['user'],
-                                group=perms['group'],
-                                mode=perms['mode'])
-
-            # write new content in the file while avoiding partial reads
-            try:
-                fh_ = salt.utils.atomicfile.atomic_open(path, 'wb')
-                for line in new_file:
-                    fh_.write(salt.utils.stringutils.to_bytes(line, encoding=file_encoding))
-            finally:
-                fh_.close()
+    # Search the file first, to only rewrite it when the block changes. This
+    # avoids file attrs modifications when no changes are required.
+    has_changes = False
+    diff = ''
+    try:
+        with _map_file(path, transcode=transcode) as data:
+            # The edits are all consumed, to detect unterminated blocks
+            for _ in _changed_edits(data, list(_block_edits(data))):
+                has_changes = True
+            if has_changes and show_changes:
+                diff = _edits_diff(data, _block_edits(data))
+    except (IOError, OSError) as exc:
+        raise CommandExecutionError(
+            'Failed to read from {0}: {1}'.format(path, exc)
+        )
 
-            # this may have overwritten file attrs
+    if has_changes and not dry_run:
+        # changes detected
+        # backup file attrs
+        perms = {}
+        perms['user'] = get_user(path)
+        perms['group'] = get_group(path)
+        perms['mode'] = salt.utils.files.normalize_mode(get_mode(path))
+
+        # backup old content
+        backup_path = None
+        if backup is not False:
+            backup_path = '{0}{1}'.format(path, backup)
+            shutil.copy2(path, backup_path)
+            # copy2 does not preserve ownership
             if salt.utils.platform.is_windows():
                 # This function resides in win_file.py and will be available
                 # on Windows. The local function will be overridden
                 # pylint: disable=E1120,E1123
-                check_perms(path=path,
+                check_perms(path=backup_path,
                             ret=None,
                             owner=perms['user'])
                 # pylint: enable=E1120,E1123
             else:
-                check_perms(path,
+                check_perms(name=backup_path,
                             ret=None,
                             user=perms['user'],
                             group=perms['group'],
                             mode=perms['mode'])
 
-        if show_changes:
-            return diff
+        # write new content in the file while avoiding partial reads
+        _stream_edits(path, _block_edits, source=backup_path,
+                      transcode=transcode)
+
+        # this may have overwritten file attrs
+        if salt.utils.platform.is_windows():
+            # This function resides in win_file.py and will be available
+            # on Windows. The local function will be overridden
+            # pylint: disable=E1120,E1123
+            check_perms(path=path,
+                        ret=None,
+                        owner=perms['user'])
+            # pylint: enable=E1120,E1123
+        else:
+            check_perms(path,
+                        ret=None,
+                        user=perms['user'],
+                        group=perms['group'],
+                        mode=perms['mode'])
+
+    if show_changes:
+        return diff
 
     return has_changes
 
@@ -5019,6 +5542,12 @@ def get_diff(file1,
     '''
     Return unified diff of two files
 
+    .. versionchanged:: Neon
+        The files are compared without being read into memory. Files larger
+        than 1MiB are diffed from the lines around the places where they
+        differ, and a diff larger than :conf_minion:`file_diff_max_size` is
+        replaced with the checksums of both files.
+
     file1
         The first file to feed into the diff utility
 
@@ -5103,34 +5632,25 @@ def get_diff(file1,
             info=errors
         )
 
-    args = []
-    for filename in paths:
-        try:
-            with salt.utils.files.fopen(filename, 'rb') as fp_:
-                args.append(fp_.readlines())
-        except (IOError, OSError) as exc:
-            raise CommandExecutionError(
-                'Failed to read {0}: {1}'.format(
-                    salt.utils.stringutils.to_unicode(filename),
-                    exc.strerror
-                )
+    try:
+        if _files_equal(*paths):
+            return ''
+    except (IOError, OSError) as exc:
+        raise CommandExecutionError(
+            'Failed to read {0}: {1}'.format(
+                salt.utils.stringutils.to_unicode(exc.filename),
+                exc.strerror
             )
+        )
 
-    if args[0] != args[1]:
-        if template and __salt__['config.option']('obfuscate_templates'):
-            ret = '<Obfuscated Template>'
-        elif not show_changes:
-            ret = '<show_changes=False>'
-        else:
-            bdiff = _binary_replace(*paths)  # pylint: disable=no-value-for-parameter
-            if bdiff:
-                ret = bdiff
-            else:
-                if show_filenames:
-                    args.extend(paths)
-                ret = __utils__['stringutils.get_diff'](*args)
-        return ret
-    return ''
+    if template and __salt__['config.option']('obfuscate_templates'):
+        return '<Obfuscated Template>'
+    elif not show_changes:
+        return '<show_changes=False>'
+    bdiff = _binary_replace(*paths)  # pylint: disable=no-value-for-parameter
+    if bdiff:
+        return bdiff
+    return _diff_files(paths[0], paths[1], show_filenames=show_filenames)
 
 
 def manage_file(name,
@@ -500,6 +500,19 @@ def latest_version(*names, **kwargs):
     if refresh:
         refresh_db(**kwargs)
 
+    # yum/dnf also refresh their metadata once it expires, so the cached
+    # versions are only used when no refresh was asked for
+    metadata_ttl, metadata_stamp = _metadata_cache()
+    cache_name = salt.utils.pkg.cache_name('latest', names, options)
+    ret = None
+    if not refresh:
+        ret = salt.utils.pkg.read_cache(
+            __opts__, cache_name, metadata_stamp, metadata_ttl)
+    if ret is not None:
+        if len(names) == 1:
+            return ret[names[0]]
+        return ret
+
     cur_pkgs = list_pkgs(versions_as_list=True)
 
     # Get available versions for specified package(s)
@@ -580,6 +593,8 @@ def latest_version(*names, **kwargs):
         else:
             ret[name] = ''
 
+    salt.utils.pkg.write_cache(__opts__, cache_name, metadata_stamp, ret)
+
     # Return a string if only one package name passed
     if len(names) == 1:
         return ret[names[0]]
@@ -688,39 +703,47 @@ def list_pkgs(versions_as_list=False, **kwargs):
     contextkey = 'pkg.list_pkgs'
 
     if contextkey not in __context__:
-        ret = {}
-        cmd = ['rpm', '-qa', '--queryformat',
-               salt.utils.pkg.rpm.QUERYFORMAT.replace('%{REPOID}', '(none)') + '\n']
-        output = __salt__['cmd.run'](cmd,
-                                     python_shell=False,
-                                     output_loglevel='trace')
-        for line in output.splitlines():
-            pkginfo = salt.utils.pkg.rpm.parse_pkginfo(
-                line,
-                osarch=__grains__['osarch']
-            )
-            if pkginfo is not None:
-                # see rpm version string rules available at https://goo.gl/UGKPNd
-                pkgver = pkginfo.version
-                epoch = None
-                release = None
-                if ':' in pkgver:
-                    epoch, pkgver = pkgver.split(":", 1)
-                if '-' in pkgver:
-                    pkgver, release = pkgver.split("-", 1)
-                all_attr = {
-                    'epoch': epoch,
-                    'version': pkgver,
-                    'release': release,
-                    'arch': pkginfo.arch,
-                    'install_date': pkginfo.install_date,
-                    'install_date_time_t': pkginfo.install_date_time_t
-                }
-                __salt__['pkg_resource.add_pkg'](ret, pkginfo.name, all_attr)
-
-        for pkgname in ret:
-            ret[pkgname] = sorted(ret[pkgname], key=lambda d: d['version'])
-
+        # The inventory is kept in the cachedir across jobs until the rpm
+        # database changes
+        stamp = None
+        if __opts__.get('pkg_inventory_cache', True):
+            stamp = salt.utils.pkg.db_stamp(salt.utils.pkg.rpm.RPMDB_PATHS)
+        ret = salt.utils.pkg.read_cache(__opts__, 'list_pkgs', stamp)
+        if ret is None:
+            ret = {}
+            cmd = ['rpm', '-qa', '--queryformat',
+                   salt.utils.pkg.rpm.QUERYFORMAT.replace('%{REPOID}', '(none)') + '\n']
+            output = __salt__['cmd.run'](cmd,
+                                         python_shell=False,
+                                         output_loglevel='trace')
+            for line in output.splitlines():
+                pkginfo = salt.utils.pkg.rpm.parse_pkginfo(
+                    line,
+                    osarch=__grains__['osarch']
+                )
+                if pkginfo is not None:
+                    # see rpm version string rules available at https://goo.gl/UGKPNd
+                    pkgver = pkginfo.version
+                    epoch = None
+                    release = None
+                    if ':' in pkgver:
+                        epoch, pkgver = pkgver.split(":", 1)
+                    if '-' in pkgver:
+                        pkgver, release = pkgver.split("-", 1)
+                    all_attr = {
+                        'epoch': epoch,
+                        'version': pkgver,
+                        'release': release,
+                        'arch': pkginfo.arch,
+                        'install_date': pkginfo.install_date,
+                        'install_date_time_t': pkginfo.install_date_time_t
+                    }
+                    __salt__['pkg_resource.add_pkg'](ret, pkginfo.name, all_attr)
+
+            for pkgname in ret:
+                ret[pkgname] = sorted(ret[pkgname], key=lambda d: d['version'])
+
+            salt.utils.pkg.write_cache(__opts__, 'list_pkgs', stamp, ret)
         __context__[contextkey] = ret
 
     return __salt__['pkg_resource.format_pkg_list'](
@@ -994,9 +1017,18 @@ def list_upgrades(refresh=True, **kwargs):
     '''
     options = _get_options(**kwargs)
 
-    if salt.utils.data.is_true(refresh):
+    refresh = salt.utils.data.is_true(refresh)
+    if refresh:
         refresh_db(check_update=False, **kwargs)
 
+    metadata_ttl, metadata_stamp = _metadata_cache()
+    cache_name = salt.utils.pkg.cache_name('upgrades', options)
+    if not refresh:
+        ret = salt.utils.pkg.read_cache(
+            __opts__, cache_name, metadata_stamp, metadata_ttl)
+        if ret is not None:
+            return ret
+
     cmd = ['--quiet']
     cmd.extend(options)
     cmd.extend(['list', 'upgrades' if _yum() == 'dnf' else 'updates'])
@@ -1004,7 +1036,9 @@ def list_upgrades(refresh=True, **kwargs):
     if out['retcode'] != 0 and 'Error:' in out:
         return {}
 
-    return dict([(x.name, x.version) for x in _yum_pkginfo(out['stdout'])])
+    ret = dict([(x.name, x.version) for x in _yum_pkginfo(out['stdout'])])
+    salt.utils.pkg.write_cache(__opts__, cache_name, metadata_stamp, ret)
+    return ret
 
 
 # Preserve expected CLI usage (yum list updates)
@@ -1076,6 +1110,20 @@ def info_installed(*names, **kwargs):
     return ret
 
 
+def _metadata_cache():
+    '''
+    Return the ttl of the package metadata cache and the stamp of the package
+    database and repository configuration the cached metadata was derived
+    from, the stamp being None when the cache is disabled
+    '''
+    ttl = __opts__.get('pkg_metadata_cache_ttl', 300)
+    if ttl <= 0:
+        return ttl, None
+    return ttl, salt.utils.pkg.db_stamp(
+        salt.utils.pkg.rpm.RPMDB_PATHS +
+        ('/etc/yum.repos.d', os.path.join('/var/cache', _yum())))
+
+
 def refresh_db(**kwargs):
     '''
     Check the yum repos for updated packages
@@ -1714,6 +1762,7 @@ def install(name=None,
                 errors.append(out['stdout'])
 
     __context__.pop('pkg.list_pkgs', None)
+    salt.utils.pkg.clear_cache(__opts__)
     new = list_pkgs(versions_as_list=False, attr=diff_attr) if not downloadonly else list_downloaded()
 
     ret = salt.utils.data.compare_dicts(old, new)
@@ -1934,6 +1983,7 @@ def upgrade(name=None,
     cmd.extend(targets)
     result = _call_yum(cmd)
     __context__.pop('pkg.list_pkgs', None)
+    salt.utils.pkg.clear_cache(__opts__)
     new = list_pkgs()
     ret = salt.utils.data.compare_dicts(old, new)
 
@@ -2044,6 +2094,7 @@ def remove(name=None, pkgs=None, **kwargs):  # pylint: disable=W0613
         errors = []
 
     __context__.pop('pkg.list_pkgs', None)
+    salt.utils.pkg.clear_cache(__opts__)
     new = list_pkgs()
     ret = salt.utils.data.compare_dicts(old, new)
 
@@ -291,6 +291,12 @@ class EventListener(object):
         # tag -> list of futures
         self.tag_map = defaultdict(list)
 
+        # Index over the tag_map keys, so an event is only checked against
+        # the tags it can match. Prefix tags are looked up by their length,
+        # any other matcher is still called for every event.
+        self.prefix_lengths = defaultdict(int)
+        self.custom_matchers = set()
+
         # request_obj -> list of (tag, future)
         self.request_map = defaultdict(list)
 
@@ -350,6 +356,8 @@ class EventListener(object):
                 tornado.ioloop.IOLoop.current().add_callback(callback, future)
             future.add_done_callback(handle_future)
         # add this tag and future to the callbacks
+        if (tag, matcher) not in self.tag_map:
+            self._index_tag(tag, matcher)
         self.tag_map[(tag, matcher)].append(future)
         self.request_map[request].append((tag, matcher, future))
 
@@ -370,6 +378,48 @@ class EventListener(object):
             self.tag_map[(tag, matcher)].remove(future)
         if len(self.tag_map[(tag, matcher)]) == 0:
             del self.tag_map[(tag, matcher)]
+            self._unindex_tag(tag, matcher)
+
+    def _index_tag(self, tag, matcher):
+        '''
+        Add a new tag_map key to the tag index
+        '''
+        if matcher is self.prefix_matcher and tag is not None:
+            self.prefix_lengths[len(tag)] += 1
+        elif matcher is not self.exact_matcher:
+            self.custom_matchers.add((tag, matcher))
+
+    def _unindex_tag(self, tag, matcher):
+        '''
+        Remove a tag_map key from the tag index
+        '''
+        if matcher is self.prefix_matcher and tag is not None:
+            self.prefix_lengths[len(tag)] -= 1
+            if self.prefix_lengths[len(tag)] <= 0:
+                del self.prefix_lengths[len(tag)]
+        else:
+            self.custom_matchers.discard((tag, matcher))
+
+    def _matching_tags(self, mtag):
+        '''
+        Return the tag_map keys whose futures are waiting for the event tag
+        ``mtag``
+        '''
+        if not isinstance(mtag, six.string_types):
+            # Let the matchers complain about it
+            return list(self.tag_map)
+        ret = []
+        key = (mtag, self.exact_matcher)
+        if key in self.tag_map:
+            ret.append(key)
+        for length in self.prefix_lengths:
+            if length > len(mtag):
+                continue
+            key = (mtag[:length], self.prefix_matcher)
+            if key in self.tag_map:
+                ret.append(key)
+        ret.extend(self.custom_matchers)
+        return ret
 
     def _handle_event_socket_recv(self, raw):
         '''
@@ -378,7 +428,10 @@ class EventListener(object):
         mtag, data = self.event.unpack(raw, self.event.serial)
 
         # see if we have any futures that need this info:
-        for (tag, matcher), futures in six.iteritems(self.tag_map):
+        for tag, matcher in self._matching_tags(mtag):
+            futures = self.tag_map.get((tag, matcher))
+            if not futures:
+                continue
             try:
                 is_matched = matcher(mtag, tag)
             except Exception:  # pylint: disable=broad-except
@@ -388,7 +441,7 @@ class EventListener(object):
             if not is_matched:
                 continue
 
-            for future in futures:
+            for future in list(futures):
                 if future.done():
                     continue
                 future.set_result({'data': data, 'tag': mtag})
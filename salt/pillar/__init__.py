@@ -12,8 +12,10 @@ import collections
 import logging
 import tornado.gen
 import sys
+import time
 import traceback
 import inspect
+from multiprocessing.pool import ThreadPool
 
 # Import salt libs
 import salt.loader
@@ -401,6 +403,8 @@ class Pillar(object):
             self.merge_strategy = opts['pillar_source_merging_strategy']
 
         self.ext_pillars = salt.loader.pillars(ext_pillar_opts, self.functions)
+        # Time spent in each of the ext_pillars of the last compilation
+        self.ext_pillar_timing = []
         self.ignored_pillars = {}
         self.pillar_override = pillar_override or {}
         if not isinstance(self.pillar_override, dict):
@@ -921,12 +925,63 @@ class Pillar(object):
                                             val)
         return ext
 
+    def _ext_pillar_independent(self, key):
+        '''
+        Return True if the ext_pillar does not use the pillar data compiled
+        before it, either because it is listed in the ext_pillar_independent
+        option or because its module sets ``__ext_pillar_independent__``
+        '''
+        if key in self.opts.get('ext_pillar_independent', []):
+            return True
+        return getattr(inspect.getmodule(self.ext_pillars[key]),
+                       '__ext_pillar_independent__',
+                       False)
+
+    def _fetch_independent_ext_pillars(self, pillar, elapsed):
+        '''
+        Start fetching the independent ext_pillars in a pool of
+        ext_pillar_concurrency threads. Return the pool and a dict mapping the
+        position and name of each of these ext_pillars to its pending result.
+        The time spent in each of them is recorded in ``elapsed``.
+        '''
+        def _fetch(index, key, val):
+            start = time.time()
+            try:
+                return self._external_pillar_data(base, val, key)
+            finally:
+                elapsed[(index, key)] = time.time() - start
+
+        fetching = []
+        for index, run in enumerate(self.opts['ext_pillar']):
+            if not isinstance(run, dict) \
+                    or next(six.iterkeys(run)) in self.opts.get('exclude_ext_pillar', []):
+                continue
+            for key, val in six.iteritems(run):
+                # The ext_pillar modules are loaded here rather than from the
+                # threads
+                if key in self.ext_pillars and self._ext_pillar_independent(key):
+                    fetching.append((index, key, val))
+        if len(fetching) < 2:
+            return None, {}
+
+        # Ext_pillars fetched concurrently must not see the merges made to
+        # the pillar data by the others
+        base = copy.deepcopy(pillar)
+        pool = ThreadPool(min(self.opts['ext_pillar_concurrency'], len(fetching)))
+        results = dict(
+            ((index, key), pool.apply_async(_fetch, (index, key, val)))
+            for index, key, val in fetching
+        )
+        pool.close()
+        return pool, results
+
     def ext_pillar(self, pillar, errors=None):
         '''
         Render the external pillar data
         '''
         if errors is None:
             errors = []
+        self.ext_pillar_timing = []
         try:
             # Make sure that on-demand git_pillar is fetched before we try to
             # compile the pillar data. git_pillar will fetch a remote when
@@ -952,7 +1007,6 @@ class Pillar(object):
             errors.append('The "ext_pillar" option is malformed')
             log.critical(errors[-1])
             return pillar, errors
-        ext = None
         # Bring in CLI pillar data
         if self.pillar_override:
             pillar = merge(
@@ -962,7 +1016,28 @@ class Pillar(object):
                 self.opts.get('renderer', 'yaml'),
                 self.opts.get('pillar_merge_lists', False))
 
-        for run in self.opts['ext_pillar']:
+        # The ext_pillars which do not use the pillar data compiled before
+        # them can be fetched concurrently, they are still merged in order
+        elapsed = {}
+        if self.opts.get('ext_pillar_concurrency', 0) > 1:
+            pool, fetched = self._fetch_independent_ext_pillars(pillar, elapsed)
+        else:
+            pool, fetched = None, {}
+
+        try:
+            return self._merge_ext_pillars(pillar, errors, fetched, elapsed)
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+
+    def _merge_ext_pillars(self, pillar, errors, fetched, elapsed):
+        '''
+        Run the ext_pillars, or wait for those already being fetched, and
+        merge their data in the configured order
+        '''
+        ext = None
+        for index, run in enumerate(self.opts['ext_pillar']):
             if not isinstance(run, dict):
                 errors.append('The "ext_pillar" option is malformed')
                 log.critical(errors[-1])
@@ -976,10 +1051,14 @@ class Pillar(object):
                         key
                     )
                     continue
+                start = time.time()
                 try:
-                    ext = self._external_pillar_data(pillar,
-                                                     val,
-                                                     key)
+                    if (index, key) in fetched:
+                        ext = fetched[(index, key)].get()
+                    else:
+                        ext = self._external_pillar_data(pillar,
+                                                         val,
+                                                         key)
                 except Exception as exc:  # pylint: disable=broad-except
                     errors.append(
                         'Failed to load ext_pillar {0}: {1}'.format(
@@ -991,6 +1070,17 @@ class Pillar(object):
                         'Exception caught loading ext_pillar \'%s\':\n%s',
                         key, ''.join(traceback.format_tb(sys.exc_info()[2]))
                     )
+                finally:
+                    self.ext_pillar_timing.append({
+                        'ext_pillar': key,
+                        'time': elapsed.get((index, key), time.time() - start),
+                        'concurrent': (index, key) in fetched,
+                    })
+                    log.debug('ext_pillar %s took %.3fs%s',
+                              key,
+                              self.ext_pillar_timing[-1]['time'],
+                              ' (fetched concurrently)'
+                              if (index, key) in fetched else '')
             if ext:
                 pillar = merge(
                     pillar,
@@ -1043,6 +1133,8 @@ class Pillar(object):
             for error in errors:
                 log.critical('Pillar render error: %s', error)
             pillar['_errors'] = errors
+        if self.opts.get('ext_pillar_timing', False) and self.ext_pillar_timing:
+            pillar['_ext_pillar_timing'] = self.ext_pillar_timing
 
         if self.pillar_override:
             pillar = merge(
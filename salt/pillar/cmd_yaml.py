@@ -16,6 +16,8 @@ import salt.utils.yaml
 # Set up logging
 log = logging.getLogger(__name__)
 
+__ext_pillar_independent__ = True
+
 
 def ext_pillar(minion_id,  # pylint: disable=W0613
                pillar,  # pylint: disable=W0613
@@ -15,6 +15,8 @@ from salt.serializers.yamlex import deserialize
 # Set up logging
 log = logging.getLogger(__name__)
 
+__ext_pillar_independent__ = True
+
 
 def ext_pillar(minion_id,  # pylint: disable=W0613
                pillar,  # pylint: disable=W0613
@@ -159,6 +159,8 @@ __virtualname__ = 'consul'
 # Set up logging
 log = logging.getLogger(__name__)
 
+__ext_pillar_independent__ = True
+
 
 def __virtual__():
     '''
@@ -75,6 +75,8 @@ __virtualname__ = 'etcd'
 # Set up logging
 log = logging.getLogger(__name__)
 
+__ext_pillar_independent__ = True
+
 
 def __virtual__():
     '''
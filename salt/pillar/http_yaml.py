@@ -53,6 +53,8 @@ from salt.ext.six.moves.urllib.parse import quote as _quote  # pylint: disable=n
 
 log = logging.getLogger(__name__)
 
+__ext_pillar_independent__ = True
+
 
 def __virtual__():
     return True
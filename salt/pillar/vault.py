@@ -127,6 +127,8 @@ import logging
 
 log = logging.getLogger(__name__)
 
+__ext_pillar_independent__ = True
+
 __func_alias__ = {
     'set_': 'set'
 }
@@ -172,6 +172,11 @@ def _get_options(ret=None):
 
 
 def _ensure_index(index):
+    # Indices are only ever created, so remember the ones known to exist
+    # instead of asking the cluster again on every return
+    known_indices = __context__.setdefault('elasticsearch_return.indices', set())
+    if index in known_indices:
+        return
     index_exists = __salt__['elasticsearch.index_exists'](index)
     if not index_exists:
         options = _get_options()
@@ -185,6 +190,7 @@ def _ensure_index(index):
         __salt__['elasticsearch.index_create']('{0}-v1'.format(index),
                                                index_definition)
         __salt__['elasticsearch.alias_create']('{0}-v1'.format(index), index)
+    known_indices.add(index)
 
 
 def _convert_keys(data):
@@ -346,18 +352,24 @@ def event_return(events):
         index = '{0}-{1}'.format(index,
             datetime.date.today().strftime('%Y.%m.%d'))
 
+    if not events:
+        return
+
     _ensure_index(index)
 
+    # Index the whole batch with a single bulk request
+    lines = []
     for event in events:
-        data = {
+        lines.append(salt.utils.json.dumps(
+            {'index': {'_id': uuid.uuid4().hex}}))
+        lines.append(salt.utils.json.dumps({
             'tag': event.get('tag', ''),
             'data': event.get('data', '')
-        }
+        }))
 
-    ret = __salt__['elasticsearch.document_create'](index=index,
-                                                    doc_type=doc_type,
-                                                    id=uuid.uuid4(),
-                                                    body=salt.utils.json.dumps(data))
+    ret = __salt__['elasticsearch.document_bulk'](body='\n'.join(lines) + '\n',
+                                                  index=index,
+                                                  doc_type=doc_type)
 
 
 def prep_jid(nocache=False, passed_jid=None):  # pylint: disable=unused-argument
@@ -144,7 +144,9 @@ from __future__ import absolute_import, print_function, unicode_literals
 
 # Import python libs
 from contextlib import contextmanager
+import os
 import sys
+import time
 import logging
 
 # Import salt libs
@@ -179,6 +181,12 @@ log = logging.getLogger(__name__)
 # Define the module's virtual name
 __virtualname__ = 'mysql'
 
+# Seconds a pooled connection may sit idle before it is pinged on reuse
+MYSQL_PING_INTERVAL = 30
+
+# Rows removed per statement when purging old jobs
+PURGE_CHUNK_SIZE = 10000
+
 
 def __virtual__():
     '''
@@ -227,49 +235,91 @@ def _get_options(ret=None):
     return _options
 
 
-@contextmanager
-def _get_serv(ret=None, commit=False):
+def _connection_key(options):
     '''
-    Return a mysql cursor
+    Return a hashable key identifying the server and credentials in options
     '''
-    _options = _get_options(ret)
+    return tuple(sorted((k, six.text_type(v)) for k, v in six.iteritems(options)))
+
+
+def _connect(options):
+    '''
+    Open a new connection to the MySQL server
+    '''
+    log.debug('Generating new MySQL connection')
+    try:
+        # An empty ssl_options dictionary passed to MySQLdb.connect will
+        # effectively connect w/o SSL.
+        ssl_options = {}
+        if options.get('ssl_ca'):
+            ssl_options['ca'] = options.get('ssl_ca')
+        if options.get('ssl_cert'):
+            ssl_options['cert'] = options.get('ssl_cert')
+        if options.get('ssl_key'):
+            ssl_options['key'] = options.get('ssl_key')
+        return MySQLdb.connect(host=options.get('host'),
+                               user=options.get('user'),
+                               passwd=options.get('pass'),
+                               db=options.get('db'),
+                               port=options.get('port'),
+                               ssl=ssl_options)
+    except OperationalError as exc:
+        raise salt.exceptions.SaltMasterError('MySQL returner could not connect to database: {exc}'.format(exc=exc))
+
+
+def _get_pool():
+    '''
+    Return the connections of this process, keyed on their connection options
+    '''
+    try:
+        return __context__.setdefault('mysql_returner_conn', {})
+    except (AttributeError, NameError, TypeError):
+        return {}
+
 
-    connect = True
-    if __context__ and 'mysql_returner_conn' in __context__:
+def _get_conn(options):
+    '''
+    Return a connection for options, reusing the one this process already
+    opened. A connection which sat idle for longer than MYSQL_PING_INTERVAL
+    seconds is pinged first, and replaced when the server went away.
+    '''
+    pool = _get_pool()
+    key = _connection_key(options)
+    entry = pool.get(key)
+    if entry is not None and entry['pid'] == os.getpid():
+        if time.time() - entry['used'] < MYSQL_PING_INTERVAL:
+            return entry['conn']
         try:
-            log.debug('Trying to reuse MySQL connection pool')
-            conn = __context__['mysql_returner_conn']
-            conn.ping()
-            connect = False
+            log.debug('Trying to reuse MySQL connection')
+            entry['conn'].ping()
+            entry['used'] = time.time()
+            return entry['conn']
         except OperationalError as exc:
             log.debug('OperationalError on ping: %s', exc)
+    conn = _connect(options)
+    pool[key] = {'conn': conn, 'pid': os.getpid(), 'used': time.time()}
+    return conn
 
-    if connect:
-        log.debug('Generating new MySQL connection pool')
+
+def _drop_conn(options):
+    '''
+    Forget the pooled connection for options, so that the next use reconnects
+    '''
+    entry = _get_pool().pop(_connection_key(options), None)
+    if entry is not None:
         try:
-            # An empty ssl_options dictionary passed to MySQLdb.connect will
-            # effectively connect w/o SSL.
-            ssl_options = {}
-            if _options.get('ssl_ca'):
-                ssl_options['ca'] = _options.get('ssl_ca')
-            if _options.get('ssl_cert'):
-                ssl_options['cert'] = _options.get('ssl_cert')
-            if _options.get('ssl_key'):
-                ssl_options['key'] = _options.get('ssl_key')
-            conn = MySQLdb.connect(host=_options.get('host'),
-                                   user=_options.get('user'),
-                                   passwd=_options.get('pass'),
-                                   db=_options.get('db'),
-                                   port=_options.get('port'),
-                                   ssl=ssl_options)
+            entry['conn'].close()
+        except Exception:  # pylint: disable=broad-except
+            pass
 
-            try:
-                __context__['mysql_returner_conn'] = conn
-            except TypeError:
-                pass
-        except OperationalError as exc:
-            raise salt.exceptions.SaltMasterError('MySQL returner could not connect to database: {exc}'.format(exc=exc))
 
+@contextmanager
+def _get_serv(ret=None, commit=False):
+    '''
+    Return a mysql cursor
+    '''
+    _options = _get_options(ret)
+    conn = _get_conn(_options)
     cursor = conn.cursor()
 
     try:
@@ -277,13 +327,18 @@ def _get_serv(ret=None, commit=False):
     except MySQLdb.DatabaseError as err:
         error = err.args
         sys.stderr.write(six.text_type(error))
-        cursor.execute("ROLLBACK")
+        if isinstance(err, OperationalError):
+            # The connection is most likely gone, don't hand it out again
+            _drop_conn(_options)
+        else:
+            cursor.execute("ROLLBACK")
         six.reraise(*sys.exc_info())
     else:
         if commit:
             cursor.execute("COMMIT")
         else:
             cursor.execute("ROLLBACK")
+        _get_pool().get(_connection_key(_options), {})['used'] = time.time()
 
 
 def returner(ret):
@@ -311,6 +366,31 @@ def returner(ret):
         log.critical('Could not store return with MySQL returner. MySQL server unavailable.')
 
 
+def returner_multi(rets):
+    '''
+    Return the data of several minions to a mysql server in one statement
+
+    .. versionadded:: Neon
+    '''
+    rows = [(ret['fun'], ret['jid'],
+             salt.utils.json.dumps(ret['return']),
+             ret['id'],
+             ret.get('success', False),
+             salt.utils.json.dumps(ret))
+            for ret in rets]
+    if not rows:
+        return
+    try:
+        with _get_serv(rets[0], commit=True) as cur:
+            sql = '''INSERT INTO `salt_returns`
+                     (`fun`, `jid`, `return`, `id`, `success`, `full_ret`)
+                     VALUES (%s, %s, %s, %s, %s, %s)'''
+            cur.executemany(sql, rows)
+    except salt.exceptions.SaltMasterError as exc:
+        log.critical(exc)
+        log.critical('Could not store returns with MySQL returner. MySQL server unavailable.')
+
+
 def event_return(events):
     '''
     Return event to mysql server
@@ -318,13 +398,17 @@ def event_return(events):
     Requires that configuration be enabled via 'event_return'
     option in master config.
     '''
+    rows = [(event.get('tag', ''),
+             salt.utils.json.dumps(event.get('data', '')),
+             __opts__['id'])
+            for event in events]
+    if not rows:
+        return
     with _get_serv(events, commit=True) as cur:
-        for event in events:
-            tag = event.get('tag', '')
-            data = event.get('data', '')
-            sql = '''INSERT INTO `salt_events` (`tag`, `data`, `master_id`)
-                     VALUES (%s, %s, %s)'''
-            cur.execute(sql, (tag, salt.utils.json.dumps(data), __opts__['id']))
+        sql = '''INSERT INTO `salt_events` (`tag`, `data`, `master_id`)
+                 VALUES (%s, %s, %s)'''
+        # executemany folds the rows into a single multi-row INSERT
+        cur.executemany(sql, rows)
 
 
 def save_load(jid, load, minions=None):
@@ -475,6 +559,20 @@ def prep_jid(nocache=False, passed_jid=None):  # pylint: disable=unused-argument
     return passed_jid if passed_jid is not None else salt.utils.jid.gen_jid(__opts__)
 
 
+def _delete_in_chunks(cur, sql, timestamp):
+    '''
+    Run a delete statement, which takes the timestamp and a row limit, until
+    it runs out of rows. Every chunk is committed on its own so the purge does
+    not hold locks on, or build undo logs for, the whole table at once.
+    '''
+    while True:
+        cur.execute(sql, (timestamp, PURGE_CHUNK_SIZE))
+        deleted = cur.rowcount
+        cur.execute('COMMIT')
+        if deleted < PURGE_CHUNK_SIZE:
+            break
+
+
 def _purge_jobs(timestamp):
     '''
     Purge records from the returner tables.
@@ -483,27 +581,24 @@ def _purge_jobs(timestamp):
     '''
     with _get_serv() as cur:
         try:
-            sql = 'delete from `jids` where jid in (select distinct jid from salt_returns where alter_time < %s)'
-            cur.execute(sql, (timestamp,))
-            cur.execute('COMMIT')
+            sql = 'delete from `jids` where jid in (select distinct jid from salt_returns where alter_time < %s) limit %s'
+            _delete_in_chunks(cur, sql, timestamp)
         except MySQLdb.Error as e:
             log.error('mysql returner archiver was unable to delete contents of table \'jids\'')
             log.error(six.text_type(e))
             raise salt.exceptions.SaltRunnerError(six.text_type(e))
 
         try:
-            sql = 'delete from `salt_returns` where alter_time < %s'
-            cur.execute(sql, (timestamp,))
-            cur.execute('COMMIT')
+            sql = 'delete from `salt_returns` where alter_time < %s limit %s'
+            _delete_in_chunks(cur, sql, timestamp)
         except MySQLdb.Error as e:
             log.error('mysql returner archiver was unable to delete contents of table \'salt_returns\'')
             log.error(six.text_type(e))
             raise salt.exceptions.SaltRunnerError(six.text_type(e))
 
         try:
-            sql = 'delete from `salt_events` where alter_time < %s'
-            cur.execute(sql, (timestamp,))
-            cur.execute('COMMIT')
+            sql = 'delete from `salt_events` where alter_time < %s limit %s'
+            _delete_in_chunks(cur, sql, timestamp)
         except MySQLdb.Error as e:
             log.error('mysql returner archiver was unable to delete contents of table \'salt_events\'')
             log.error(six.text_type(e))
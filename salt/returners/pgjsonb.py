@@ -166,6 +166,7 @@ from __future__ import absolute_import, print_function, unicode_literals
 
 # Import python libs
 from contextlib import contextmanager
+import os
 import sys
 import time
 import logging
@@ -191,6 +192,12 @@ __virtualname__ = 'pgjsonb'
 
 PG_SAVE_LOAD_SQL = '''INSERT INTO jids (jid, load) VALUES (%(jid)s, %(load)s)'''
 
+# Seconds a pooled connection may sit idle before it is checked on reuse
+PG_CHECK_INTERVAL = 30
+
+# Rows removed per statement when purging old jobs
+PURGE_CHUNK_SIZE = 10000
+
 
 def __virtual__():
     if not HAS_PG:
@@ -235,25 +242,31 @@ def _get_options(ret=None):
     return _options
 
 
-@contextmanager
-def _get_serv(ret=None, commit=False):
+def _connection_key(options):
     '''
-    Return a Pg cursor
+    Return a hashable key identifying the server and credentials in options
     '''
-    _options = _get_options(ret)
+    return tuple(sorted((k, six.text_type(v)) for k, v in six.iteritems(options)))
+
+
+def _connect(options):
+    '''
+    Open a new connection to the Pg server
+    '''
+    log.debug('Generating new pgjsonb connection')
     try:
         # An empty ssl_options dictionary passed to MySQLdb.connect will
         # effectively connect w/o SSL.
         ssl_options = {
-            k: v for k, v in six.iteritems(_options)
+            k: v for k, v in six.iteritems(options)
             if k in ['sslmode', 'sslcert', 'sslkey', 'sslrootcert', 'sslcrl']
         }
         conn = psycopg2.connect(
-            host=_options.get('host'),
-            port=_options.get('port'),
-            dbname=_options.get('db'),
-            user=_options.get('user'),
-            password=_options.get('pass'),
+            host=options.get('host'),
+            port=options.get('port'),
+            dbname=options.get('db'),
+            user=options.get('user'),
+            password=options.get('pass'),
             **ssl_options
         )
     except psycopg2.OperationalError as exc:
@@ -266,7 +279,65 @@ def _get_serv(ret=None, commit=False):
                               VALUES (%(jid)s, %(load)s)
                               ON CONFLICT (jid) DO UPDATE
                               SET load=%(load)s'''
+    return conn
+
 
+def _get_pool():
+    '''
+    Return the connections of this process, keyed on their connection options
+    '''
+    try:
+        return __context__.setdefault('pgjsonb_returner_conn', {})
+    except (AttributeError, NameError, TypeError):
+        return {}
+
+
+def _get_conn(options):
+    '''
+    Return a connection for options, reusing the one this process already
+    opened. A connection which sat idle for longer than PG_CHECK_INTERVAL
+    seconds is checked first, and replaced when the server went away.
+    '''
+    pool = _get_pool()
+    key = _connection_key(options)
+    entry = pool.get(key)
+    if entry is not None and entry['pid'] == os.getpid() \
+            and not entry['conn'].closed:
+        if time.time() - entry['used'] < PG_CHECK_INTERVAL:
+            return entry['conn']
+        try:
+            cursor = entry['conn'].cursor()
+            cursor.execute('SELECT 1')
+            cursor.execute('ROLLBACK')
+            cursor.close()
+            entry['used'] = time.time()
+            return entry['conn']
+        except (psycopg2.OperationalError, psycopg2.InterfaceError) as exc:
+            log.debug('pgjsonb connection check failed: %s', exc)
+    conn = _connect(options)
+    pool[key] = {'conn': conn, 'pid': os.getpid(), 'used': time.time()}
+    return conn
+
+
+def _drop_conn(options):
+    '''
+    Forget the pooled connection for options, so that the next use reconnects
+    '''
+    entry = _get_pool().pop(_connection_key(options), None)
+    if entry is not None:
+        try:
+            entry['conn'].close()
+        except Exception:  # pylint: disable=broad-except
+            pass
+
+
+@contextmanager
+def _get_serv(ret=None, commit=False):
+    '''
+    Return a Pg cursor
+    '''
+    _options = _get_options(ret)
+    conn = _get_conn(_options)
     cursor = conn.cursor()
 
     try:
@@ -274,15 +345,21 @@ def _get_serv(ret=None, commit=False):
     except psycopg2.DatabaseError as err:
         error = err.args
         sys.stderr.write(six.text_type(error))
-        cursor.execute("ROLLBACK")
+        if isinstance(err, psycopg2.OperationalError) or conn.closed:
+            # The connection is most likely gone, don't hand it out again
+            _drop_conn(_options)
+        else:
+            cursor.execute("ROLLBACK")
         six.reraise(*sys.exc_info())
     else:
         if commit:
             cursor.execute("COMMIT")
         else:
             cursor.execute("ROLLBACK")
+        _get_pool().get(_connection_key(_options), {})['used'] = time.time()
     finally:
-        conn.close()
+        if not conn.closed:
+            cursor.close()
 
 
 def returner(ret):
@@ -305,6 +382,34 @@ def returner(ret):
         log.critical('Could not store return with pgjsonb returner. PostgreSQL server unavailable.')
 
 
+def returner_multi(rets):
+    '''
+    Return the data of several minions to a Pg server in one statement
+
+    .. versionadded:: Neon
+    '''
+    now = time.time()
+    rows = [(ret['fun'], ret['jid'],
+             psycopg2.extras.Json(ret['return']),
+             ret['id'],
+             ret.get('success', False),
+             psycopg2.extras.Json(ret),
+             now)
+            for ret in rets]
+    if not rows:
+        return
+    try:
+        with _get_serv(rets[0], commit=True) as cur:
+            sql = '''INSERT INTO salt_returns
+                    (fun, jid, return, id, success, full_ret, alter_time)
+                    VALUES %s'''
+            psycopg2.extras.execute_values(
+                cur, sql, rows,
+                template='(%s, %s, %s, %s, %s, %s, to_timestamp(%s))')
+    except salt.exceptions.SaltMasterError:
+        log.critical('Could not store returns with pgjsonb returner. PostgreSQL server unavailable.')
+
+
 def event_return(events):
     '''
     Return event to Pg server
@@ -312,14 +417,22 @@ def event_return(events):
     Requires that configuration be enabled via 'event_return'
     option in master config.
     '''
+    now = time.time()
+    rows = [(event.get('tag', ''),
+             psycopg2.extras.Json(event.get('data', '')),
+             __opts__['id'],
+             now)
+            for event in events]
+    if not rows:
+        return
     with _get_serv(events, commit=True) as cur:
-        for event in events:
-            tag = event.get('tag', '')
-            data = event.get('data', '')
-            sql = '''INSERT INTO salt_events (tag, data, master_id, alter_time)
-                     VALUES (%s, %s, %s, to_timestamp(%s))'''
-            cur.execute(sql, (tag, psycopg2.extras.Json(data),
-                              __opts__['id'], time.time()))
+        # Send the whole batch as multi-row INSERTs rather than a round trip
+        # per event
+        sql = '''INSERT INTO salt_events (tag, data, master_id, alter_time)
+                 VALUES %s'''
+        psycopg2.extras.execute_values(
+            cur, sql, rows,
+            template='(%s, %s, %s, to_timestamp(%s))')
 
 
 def save_load(jid, load, minions=None):
@@ -440,6 +553,20 @@ def prep_jid(nocache=False, passed_jid=None):  # pylint: disable=unused-argument
     return passed_jid if passed_jid is not None else salt.utils.jid.gen_jid(__opts__)
 
 
+def _delete_in_chunks(cursor, sql, timestamp):
+    '''
+    Run a delete statement, which takes the timestamp and a row limit, until
+    it runs out of rows. Every chunk is committed on its own so the purge does
+    not hold locks on the whole table in one long transaction.
+    '''
+    while True:
+        cursor.execute(sql, (timestamp, PURGE_CHUNK_SIZE))
+        deleted = cursor.rowcount
+        cursor.execute('COMMIT')
+        if deleted < PURGE_CHUNK_SIZE:
+            break
+
+
 def _purge_jobs(timestamp):
     '''
     Purge records from the returner tables.
@@ -448,9 +575,8 @@ def _purge_jobs(timestamp):
     '''
     with _get_serv() as cursor:
         try:
-            sql = 'delete from jids where jid in (select distinct jid from salt_returns where alter_time < %s)'
-            cursor.execute(sql, (timestamp,))
-            cursor.execute('COMMIT')
+            sql = 'delete from jids where ctid = any(array(select ctid from jids where jid in (select distinct jid from salt_returns where alter_time < %s) limit %s))'
+            _delete_in_chunks(cursor, sql, timestamp)
         except psycopg2.DatabaseError as err:
             error = err.args
             sys.stderr.write(six.text_type(error))
@@ -458,9 +584,8 @@ def _purge_jobs(timestamp):
             raise err
 
         try:
-            sql = 'delete from salt_returns where alter_time < %s'
-            cursor.execute(sql, (timestamp,))
-            cursor.execute('COMMIT')
+            sql = 'delete from salt_returns where ctid = any(array(select ctid from salt_returns where alter_time < %s limit %s))'
+            _delete_in_chunks(cursor, sql, timestamp)
         except psycopg2.DatabaseError as err:
             error = err.args
             sys.stderr.write(six.text_type(error))
@@ -468,9 +593,8 @@ def _purge_jobs(timestamp):
             raise err
 
         try:
-            sql = 'delete from salt_events where alter_time < %s'
-            cursor.execute(sql, (timestamp,))
-            cursor.execute('COMMIT')
+            sql = 'delete from salt_events where ctid = any(array(select ctid from salt_events where alter_time < %s limit %s))'
+            _delete_in_chunks(cursor, sql, timestamp)
         except psycopg2.DatabaseError as err:
             error = err.args
             sys.stderr.write(six.text_type(error))
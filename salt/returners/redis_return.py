@@ -254,16 +254,28 @@ def get_fun(fun):
     '''
     serv = _get_serv(ret=None)
     ret = {}
-    for minion in serv.smembers('minions'):
-        ind_str = '{0}:{1}'.format(minion, fun)
-        try:
-            jid = serv.get(ind_str)
-        except Exception:  # pylint: disable=broad-except
-            continue
-        if not jid:
+    minions = list(serv.smembers('minions'))
+    if not minions:
+        return ret
+
+    # Look up the last jid of every minion, then their returns, with one
+    # pipelined round trip each instead of two per minion
+    pipeline = serv.pipeline(transaction=False)
+    for minion in minions:
+        pipeline.get('{0}:{1}'.format(minion, fun))
+    jids = pipeline.execute(raise_on_error=False)
+
+    pipeline = serv.pipeline(transaction=False)
+    last = []
+    for minion, jid in zip(minions, jids):
+        if not jid or isinstance(jid, Exception):
             continue
-        data = serv.get('{0}:{1}'.format(minion, jid))
-        if data:
+        pipeline.hget('ret:{0}'.format(jid), minion)
+        last.append(minion)
+    if not last:
+        return ret
+    for minion, data in zip(last, pipeline.execute(raise_on_error=False)):
+        if data and not isinstance(data, Exception):
             ret[minion] = salt.utils.json.loads(data)
     return ret
 
@@ -274,7 +286,10 @@ def get_jids():
     '''
     serv = _get_serv(ret=None)
     ret = {}
-    for s in serv.mget(serv.keys('load:*')):
+    load_keys = list(serv.scan_iter('load:*'))
+    if not load_keys:
+        return ret
+    for s in serv.mget(load_keys):
         if s is None:
             continue
         load = salt.utils.json.loads(s)
@@ -301,8 +316,8 @@ def clean_old_jobs():
     do manually cleaning here.
     '''
     serv = _get_serv(ret=None)
-    ret_jids = serv.keys('ret:*')
-    living_jids = set(serv.keys('load:*'))
+    ret_jids = serv.scan_iter('ret:*')
+    living_jids = set(serv.scan_iter('load:*'))
     to_remove = []
     for ret_key in ret_jids:
         load_key = ret_key.replace('ret:', 'load:', 1)
@@ -104,3 +104,30 @@ def delete(event, saltenv='base', test=None):
 
     res = sevent.get_event(wait=30, tag='salt/reactors/manage/delete-complete')
     return res['result']
+
+
+def stats(saltenv='base', test=None):
+    '''
+    .. versionadded:: Neon
+
+    Return the counters of the reactor render threads: the events queued for
+    rendering, the events dropped because the queue was full, the events
+    handled, the current backlog and the largest backlog seen
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt-run reactor.stats
+    '''
+    sevent = salt.utils.event.get_event(
+            'master',
+            __opts__['sock_dir'],
+            __opts__['transport'],
+            opts=__opts__,
+            listen=True)
+
+    __jid_event__.fire_event({}, 'salt/reactors/manage/stats')
+
+    results = sevent.get_event(wait=30, tag='salt/reactors/manage/stats-results')
+    return results['stats']
@@ -128,6 +128,17 @@ STATE_RUNTIME_KEYWORDS = frozenset([
 
 STATE_INTERNAL_KEYWORDS = STATE_REQUISITE_KEYWORDS.union(STATE_REQUISITE_IN_KEYWORDS).union(STATE_RUNTIME_KEYWORDS)
 
+# Arguments which make the execution of a state depend on more than the states
+# it requires. The work of such states is never aggregated into another state.
+STATE_AGGREGATE_UNSAFE_KEYWORDS = STATE_REQUISITE_KEYWORDS.union([
+    'check_cmd',
+    'onlyif',
+    'unless',
+    'retry',
+    'parallel',
+    '__prereq__',
+    ]).difference(['require'])
+
 
 def _odict_hashable(self):
     return id(self)
@@ -752,6 +763,10 @@ class State(object):
         self.active = set()
         self.mod_init = set()
         self.pre = {}
+        # The chunks aggregated into each state, keyed on its tag, and the
+        # changes made for them by its execution, keyed on their tag
+        self.agg_merged = {}
+        self.agg_changes = {}
         self.__run_num = 0
         self.jid = jid
         self.instance_id = six.text_type(id(self))
@@ -834,13 +849,112 @@ class State(object):
         if low['state'] in agg_opt and not low.get('__agg__'):
             agg_fun = '{0}.mod_aggregate'.format(low['state'])
             if agg_fun in self.states:
+                if any(low.get(key) for key in STATE_AGGREGATE_UNSAFE_KEYWORDS):
+                    return low
+                agg_chunks = self._aggregate_chunks(low, running, chunks)
                 try:
-                    low = self.states[agg_fun](low, chunks, running)
+                    low = self.states[agg_fun](low, agg_chunks, running)
                     low['__agg__'] = True
                 except TypeError:
                     log.error('Failed to execute aggregate for state %s', low['state'])
+                tag = _gen_tag(low)
+                merged = [chunk for chunk in agg_chunks
+                          if chunk.get('__agg_into__') == tag]
+                if merged:
+                    self.agg_merged[tag] = merged
         return low
 
+    def _requisite_tags(self, req, chunks):
+        '''
+        Return the tags of the chunks matched by a requisite
+        '''
+        if isinstance(req, six.string_types):
+            req = {'id': req}
+        req = trim_req(req)
+        req_key = next(iter(req))
+        req_val = req[req_key]
+        tags = set()
+        if req_val is None:
+            return tags
+        for chunk in chunks:
+            if req_key == 'sls':
+                if fnmatch.fnmatch(chunk['__sls__'], req_val):
+                    tags.add(_gen_tag(chunk))
+                continue
+            if (fnmatch.fnmatch(chunk['name'], req_val) or
+                    fnmatch.fnmatch(chunk['__id__'], req_val)):
+                if req_key == 'id' or chunk['state'] == req_key:
+                    tags.add(_gen_tag(chunk))
+        return tags
+
+    def _aggregate_chunks(self, low, running, chunks):
+        '''
+        Return the chunks whose work can be aggregated into the execution of
+        the low chunk: those which have not run yet, have no requisites other
+        than require and whose required states will have succeeded by the time
+        the low chunk runs, being either done already or required by the low
+        chunk as well. The low chunk itself is kept so the aggregation system
+        can use it as the base of the aggregate.
+
+        Chunks only ordered after other states, by their definition order or
+        ``order``, must not run before them either: no chunk following a state
+        of another type which has not run and is not required by the low
+        chunk is aggregated.
+        '''
+        low_reqs = set()
+        for req in low.get('require', []):
+            low_reqs.update(self._requisite_tags(req, chunks))
+        ret = []
+        for chunk in chunks:
+            if chunk is low:
+                ret.append(chunk)
+                continue
+            if chunk['state'] != low['state']:
+                tag = _gen_tag(chunk)
+                if tag not in running and tag not in low_reqs:
+                    break
+                continue
+            if chunk.get('__agg__'):
+                continue
+            if chunk.get('aggregate') is False or _gen_tag(chunk) in running:
+                continue
+            if any(chunk.get(key) for key in STATE_AGGREGATE_UNSAFE_KEYWORDS):
+                continue
+            compatible = True
+            for req in chunk.get('require', []):
+                tags = self._requisite_tags(req, chunks)
+                if not tags:
+                    # Leave the reporting of the missing requisite to the
+                    # chunk itself
+                    compatible = False
+                for tag in tags:
+                    if tag in low_reqs:
+                        continue
+                    if tag in running and running[tag].get('result') is True:
+                        continue
+                    compatible = False
+                if not compatible:
+                    break
+            if compatible:
+                ret.append(chunk)
+        return ret
+
+    def _split_aggregate_changes(self, low, ret):
+        '''
+        Hand the changes the execution of an aggregate made for the chunks
+        merged into it over to those chunks, which report them when they run
+        '''
+        merged = self.agg_merged.pop(_gen_tag(low), None)
+        if not merged or not isinstance(ret.get('changes'), dict):
+            return
+        for chunk in merged:
+            changes = {}
+            for name in chunk.get('__agg_names__', ()):
+                if name in ret['changes']:
+                    changes[name] = ret['changes'].pop(name)
+            if changes:
+                self.agg_changes[_gen_tag(chunk)] = (low['__id__'], changes)
+
     def _run_check(self, low_data):
         '''
         Check that unless doesn't return 0, and that onlyif returns a 0.
@@ -2022,6 +2136,20 @@ class State(object):
             low['__prereq__'] = False
             return ret
 
+        if low.get('__agg__'):
+            self._split_aggregate_changes(low, ret)
+            if _gen_tag(low) in self.agg_changes and isinstance(ret.get('changes'), dict):
+                agg_id, agg_changes = self.agg_changes.pop(_gen_tag(low))
+                ret['changes'].update(agg_changes)
+                comment = 'Changes made by the aggregated execution of state \'{0}\': {1}'.format(
+                    agg_id, ', '.join(sorted(agg_changes)))
+                if isinstance(ret.get('comment'), list):
+                    ret['comment'].insert(0, comment)
+                elif ret.get('comment'):
+                    ret['comment'] = '{0}\n{1}'.format(comment, ret['comment'])
+                else:
+                    ret['comment'] = comment
+
         ret['__sls__'] = low.get('__sls__')
         ret['__run_num__'] = self.__run_num
         self.__run_num += 1
@@ -23,7 +23,10 @@ from salt.ext.six.moves import shlex_quote as _cmd_quote
 from salt.ext.six.moves.urllib.parse import urlparse as _urlparse  # pylint: disable=no-name-in-module
 
 # Import Salt libs
+import salt.payload
 import salt.utils.args
+import salt.utils.atomicfile
+import salt.utils.data
 import salt.utils.files
 import salt.utils.hashutils
 import salt.utils.path
@@ -156,6 +159,142 @@ def _compare_checksum(cached, source_sum):
     return source_sum == cached_sum
 
 
+def _archive_sum(path):
+    '''
+    Return the checksum of a cached archive, or None if it cannot be computed
+    '''
+    try:
+        return {'hsum': __salt__['file.get_hash'](path, form=__opts__['hash_type']),
+                'hash_type': __opts__['hash_type']}
+    except (CommandExecutionError, IOError, OSError) as exc:
+        log.debug('Unable to compute the checksum of %s: %s', path, exc)
+        return None
+
+
+def _manifest_path(archive_sum):
+    return os.path.join(
+        __opts__['cachedir'],
+        'archive_manifest',
+        '{0}-{1}.p'.format(archive_sum['hash_type'], archive_sum['hsum'])
+    )
+
+
+def _read_manifest(archive_sum, params):
+    '''
+    Return the contents of the archive with the given checksum, as recorded by
+    an earlier run which listed it with the same parameters, or None
+    '''
+    if not archive_sum:
+        return None
+    manifest_file = _manifest_path(archive_sum)
+    try:
+        with salt.utils.files.fopen(manifest_file, 'rb') as fp_:
+            data = salt.payload.Serial(__opts__).load(fp_)
+    except (IOError, OSError):
+        return None
+    except Exception as exc:  # pylint: disable=broad-except
+        log.debug('Unable to read archive manifest %s: %s', manifest_file, exc)
+        return None
+    if not isinstance(data, dict) or data.get('params') != params:
+        return None
+    return data.get('contents')
+
+
+def _write_manifest(archive_sum, params, contents):
+    '''
+    Record the contents of the archive with the given checksum, so that later
+    runs do not need to list the archive again
+    '''
+    if not archive_sum or contents is None:
+        return
+    manifest_file = _manifest_path(archive_sum)
+    manifest_dir = os.path.dirname(manifest_file)
+    try:
+        if not os.path.isdir(manifest_dir):
+            os.makedirs(manifest_dir)
+        with salt.utils.atomicfile.atomic_open(manifest_file, mode='wb') as fp_:
+            salt.payload.Serial(__opts__).dump(
+                {'params': params, 'contents': contents}, fp_)
+    except (IOError, OSError) as exc:
+        log.warning('Failed to write archive manifest %s: %s',
+                    manifest_file, exc.__str__())
+
+
+def _content_types(contents):
+    '''
+    Pair the lists of paths in the archive contents with the function telling
+    whether an os.lstat() mode is of the expected type
+    '''
+    return ((contents['dirs'], stat.S_ISDIR),
+            (contents['files'], lambda x: not stat.S_ISLNK(x)
+                                and not stat.S_ISDIR(x)),
+            (contents['links'], stat.S_ISLNK))
+
+
+def _contents_present(name, contents):
+    '''
+    Return True if every path in the archive contents exists within ``name``
+    with the correct type
+    '''
+    for path_list, func in _content_types(contents):
+        for path in path_list:
+            full_path = salt.utils.path.join(name, path)
+            try:
+                if not func(os.lstat(full_path.rstrip(os.sep)).st_mode):
+                    return False
+            except OSError:
+                return False
+    return True
+
+
+def _stream_members(tar, contents, enforce_toplevel):
+    '''
+    Yield the members of a tar archive opened in stream mode, so that each of
+    them is extracted as soon as it is read, and record them in ``contents``
+    the same way :py:func:`archive.list <salt.modules.archive.list_>` does.
+
+    When ``enforce_toplevel`` is set, stop before the first member which would
+    leave the archive without a single top-level directory and record its path
+    as ``contents['rejected']``.
+    '''
+    for key in ('dirs', 'files', 'links', 'top_level_dirs', 'top_level_files',
+                'top_level_links', 'names'):
+        contents[key] = []
+    for member in tar:
+        path = salt.utils.data.decode(member.name)
+        if member.issym():
+            kind = 'links'
+        elif member.isdir():
+            kind = 'dirs'
+            path += '/'
+        else:
+            kind = 'files'
+        if path.count('/') == (1 if kind == 'dirs' else 0):
+            contents['top_level_' + kind].append(path)
+            if enforce_toplevel \
+                    and (len(contents['top_level_dirs']) > 1
+                         or len(contents['top_level_files']) > 0):
+                contents['rejected'] = path
+                return
+        contents[kind].append(path)
+        contents['names'].append(member.name)
+        yield member
+
+
+def _toplevel_comment(archive_format, name):
+    return ('Archive does not have a single top-level directory. '
+            'To allow this archive to be extracted, set '
+            '\'enforce_toplevel\' to False. To avoid a '
+            '\'{0}-bomb\' it may also be advisable to set a '
+            'top-level directory by adding it to the \'name\' '
+            'value (for example, setting \'name\' to {1} '
+            'instead of {2}).'.format(
+                archive_format,
+                os.path.join(name, 'some_dir'),
+                name,
+            ))
+
+
 def _is_bsdtar():
     return 'bsdtar' in __salt__['cmd.run'](['tar', '--version'],
                                            python_shell=False)
@@ -203,6 +342,15 @@ def extracted(name,
         Additionally, the **ZIP Archive Handling** section below applies
         specifically to the 2016.11.0 release (and newer).
 
+    .. versionchanged:: Neon
+        The contents of an archive are recorded in the minion cachedir, keyed
+        on the checksum of the archive, the first time it is listed. Later runs
+        check for the presence of these contents instead of listing the archive
+        again, and a remote archive with a ``source_hash`` is not cached at all
+        when all of its contents are present. A tar archive extracted into a
+        new destination directory without ``options``, ``list_options`` or
+        ``strip_components`` is listed as it is extracted, in a single pass.
+
     Ensure that an archive is extracted to a specific directory.
 
     .. important::
@@ -997,8 +1145,29 @@ def extracted(name,
             log.debug('There is no cached source %s available on minion',
                       source_match)
 
+    # The contents of the archive are known without listing it if they were
+    # recorded by an earlier run. A remote archive is verified against its
+    # source_hash when it is cached, so this hash can be used to look them up
+    # before caching it.
+    manifest_params = {'archive_format': archive_format,
+                       'list_options': list_options,
+                       'strip_components': strip_components}
+    if source_sum and not source_is_local and not skip_verify:
+        archive_sum = source_sum
+    else:
+        archive_sum = None
+    contents = _read_manifest(archive_sum, manifest_params)
+    up_to_date = contents is not None \
+        and not overwrite \
+        and not source_hash_update \
+        and _contents_present(name, contents)
+
     if source_is_local:
         cached = source_match
+    elif up_to_date:
+        log.debug('All files in %s are already present, not caching it',
+                  salt.utils.url.redact_http_basic_auth(source_match))
+        cached = None
     else:
         if __opts__['test']:
             ret['result'] = None
@@ -1048,13 +1217,15 @@ def extracted(name,
             )
             return result
 
-    existing_cached_source_sum = _read_cached_checksum(cached)
+    existing_cached_source_sum = _read_cached_checksum(cached) \
+        if cached is not None \
+        else None
 
     if source_hash and source_hash_update and not skip_verify:
         # Create local hash sum file if we're going to track sum update
         _update_checksum(cached)
 
-    if archive_format == 'zip' and not password:
+    if archive_format == 'zip' and not password and not up_to_date:
         log.debug('Checking %s to see if it is password-protected',
                   source_match)
         # Either use_cmd_unzip was explicitly set to True, or was
@@ -1078,65 +1249,72 @@ def extracted(name,
                 )
                 return ret
 
-    try:
-        contents = __salt__['archive.list'](cached,
-                                            archive_format=archive_format,
-                                            options=list_options,
-                                            strip_components=strip_components,
-                                            clean=False,
-                                            verbose=True)
-    except CommandExecutionError as exc:
-        contents = None
-        errors = []
-        if not if_missing:
-            errors.append('\'if_missing\' must be set')
-        if not enforce_ownership_on and (user or group):
-            errors.append(
-                'Ownership cannot be managed without setting '
-                '\'enforce_ownership_on\'.'
-            )
-        msg = exc.strerror
-        if errors:
-            msg += '\n\n'
-            if archive_format == 'tar':
-                msg += (
-                    'If the source archive is a tar archive compressed using '
-                    'a compression type not natively supported by the tar '
-                    'command, then setting the \'list_options\' argument may '
-                    'allow the contents to be listed. Otherwise, if Salt is '
-                    'unable to determine the files/directories in the '
-                    'archive, the following workaround(s) would need to be '
-                    'used for this state to proceed'
+    if contents is None and archive_sum is None:
+        archive_sum = _archive_sum(cached)
+        contents = _read_manifest(archive_sum, manifest_params)
+
+    # A tar archive extracted into a new destination is listed while it is
+    # extracted, listing it beforehand is only needed to check which of its
+    # contents are present.
+    stream_extract = contents is None \
+        and archive_format == 'tar' \
+        and options is None \
+        and list_options is None \
+        and not strip_components \
+        and not __opts__['test'] \
+        and not os.path.lexists(name)
+
+    if contents is None and not stream_extract:
+        try:
+            contents = __salt__['archive.list'](cached,
+                                                archive_format=archive_format,
+                                                options=list_options,
+                                                strip_components=strip_components,
+                                                clean=False,
+                                                verbose=True)
+        except CommandExecutionError as exc:
+            contents = None
+            errors = []
+            if not if_missing:
+                errors.append('\'if_missing\' must be set')
+            if not enforce_ownership_on and (user or group):
+                errors.append(
+                    'Ownership cannot be managed without setting '
+                    '\'enforce_ownership_on\'.'
                 )
-            else:
+            msg = exc.strerror
+            if errors:
+                msg += '\n\n'
+                if archive_format == 'tar':
+                    msg += (
+                        'If the source archive is a tar archive compressed using '
+                        'a compression type not natively supported by the tar '
+                        'command, then setting the \'list_options\' argument may '
+                        'allow the contents to be listed. Otherwise, if Salt is '
+                        'unable to determine the files/directories in the '
+                        'archive, the following workaround(s) would need to be '
+                        'used for this state to proceed'
+                    )
+                else:
+                    msg += (
+                        'The following workarounds must be used for this state to '
+                        'proceed'
+                    )
                 msg += (
-                    'The following workarounds must be used for this state to '
-                    'proceed'
+                    ' (assuming the source file is a valid {0} archive):\n'
+                    .format(archive_format)
                 )
-            msg += (
-                ' (assuming the source file is a valid {0} archive):\n'
-                .format(archive_format)
-            )
 
-            for error in errors:
-                msg += '\n- {0}'.format(error)
-        ret['comment'] = msg
-        return ret
+                for error in errors:
+                    msg += '\n- {0}'.format(error)
+            ret['comment'] = msg
+            return ret
+        _write_manifest(archive_sum, manifest_params, contents)
 
     if enforce_toplevel and contents is not None \
             and (len(contents['top_level_dirs']) > 1
                  or len(contents['top_level_files']) > 0):
-        ret['comment'] = ('Archive does not have a single top-level directory. '
-                          'To allow this archive to be extracted, set '
-                          '\'enforce_toplevel\' to False. To avoid a '
-                          '\'{0}-bomb\' it may also be advisable to set a '
-                          'top-level directory by adding it to the \'name\' '
-                          'value (for example, setting \'name\' to {1} '
-                          'instead of {2}).'.format(
-                              archive_format,
-                              os.path.join(name, 'some_dir'),
-                              name,
-                          ))
+        ret['comment'] = _toplevel_comment(archive_format, name)
         return ret
 
     if clean and clean_parent:
@@ -1157,8 +1335,12 @@ def extracted(name,
     except TypeError:
         if_missing_path_exists = False
 
-    if not if_missing_path_exists:
-        if contents is None:
+    if not if_missing_path_exists and not up_to_date:
+        if stream_extract:
+            # Nothing can be present in a destination which does not exist
+            extraction_needed = True
+            contents_missing = True
+        elif contents is None:
             try:
                 os.lstat(if_missing)
                 extraction_needed = False
@@ -1173,11 +1355,7 @@ def extracted(name,
                     return ret
         else:
             incorrect_type = []
-            for path_list, func in \
-                    ((contents['dirs'], stat.S_ISDIR),
-                     (contents['files'], lambda x: not stat.S_ISLNK(x)
-                                         and not stat.S_ISDIR(x)),
-                     (contents['links'], stat.S_ISLNK)):
+            for path_list, func in _content_types(contents):
                 for path in path_list:
                     full_path = salt.utils.path.join(name, path)
                     try:
@@ -1376,11 +1554,32 @@ def extracted(name,
             else:
                 if options is None:
                     try:
-                        with closing(tarfile.open(cached, 'r')) as tar:
-                            tar.extractall(salt.utils.stringutils.to_str(name))
-                            files = tar.getnames()
-                            if trim_output:
-                                files = files[:trim_output]
+                        if stream_extract:
+                            streamed = {}
+                            with closing(tarfile.open(cached, 'r|*')) as tar:
+                                tar.extractall(
+                                    salt.utils.stringutils.to_str(name),
+                                    members=_stream_members(tar,
+                                                            streamed,
+                                                            enforce_toplevel))
+                            if 'rejected' in streamed:
+                                # The destination did not exist before, remove
+                                # what was extracted ahead of the rejected path
+                                salt.utils.files.rm_rf(name)
+                                ret['comment'] = _toplevel_comment(
+                                    archive_format, name)
+                                return ret
+                            files = streamed.pop('names')
+                            for path_list in six.itervalues(streamed):
+                                path_list.sort()
+                            contents = streamed
+                            _write_manifest(archive_sum, manifest_params, contents)
+                        else:
+                            with closing(tarfile.open(cached, 'r')) as tar:
+                                tar.extractall(salt.utils.stringutils.to_str(name))
+                                files = tar.getnames()
+                        if trim_output:
+                            files = files[:trim_output]
                     except tarfile.ReadError:
                         if salt.utils.path.which('xz'):
                             if __salt__['cmd.retcode'](
@@ -1492,6 +1691,23 @@ def extracted(name,
             ret['comment'] = exc.strerror
             return ret
 
+        if contents is None:
+            # The archive was extracted by the tar command after it could not
+            # be streamed, list it now to know which paths it contained
+            try:
+                contents = __salt__['archive.list'](cached,
+                                                    archive_format=archive_format,
+                                                    options=list_options,
+                                                    strip_components=strip_components,
+                                                    clean=False,
+                                                    verbose=True)
+            except CommandExecutionError as exc:
+                log.warning('Unable to list the contents of %s: %s',
+                            salt.utils.url.redact_http_basic_auth(source_match),
+                            exc.strerror)
+            else:
+                _write_manifest(archive_sum, manifest_params, contents)
+
     # Recursively set user and group ownership of files
     enforce_missing = []
     enforce_failed = []
@@ -1510,6 +1726,8 @@ def extracted(name,
                 enforce_dirs = contents['top_level_dirs']
                 enforce_files = contents['top_level_files']
                 enforce_links = contents['top_level_links']
+            else:
+                enforce_dirs = enforce_files = enforce_links = []
 
         recurse = []
         if user:
@@ -282,12 +282,14 @@ For example:
 from __future__ import absolute_import, print_function, unicode_literals
 import copy
 import difflib
+import errno
 import itertools
 import logging
 import os
 import posixpath
 import re
 import shutil
+import stat
 import sys
 import time
 import traceback
@@ -711,8 +713,8 @@ def _check_directory(name,
     Check what changes need to be made on a directory
     '''
     changes = {}
-    if recurse or clean:
-        assert max_depth is None or not clean
+    if clean:
+        assert max_depth is None
         # walk path only once and store the result
         walk_l = list(_depth_limited_walk(name, max_depth))
         # root: (dirs, files) structure, compatible for python2.6
@@ -725,38 +727,24 @@ def _check_directory(name,
             recurse_set = _get_recurse_set(recurse)
         except (TypeError, ValueError) as exc:
             return False, '{0}'.format(exc), changes
+        rchanges, _ = _recurse_meta(
+            name,
+            user=user if 'user' in recurse_set else None,
+            group=group if 'group' in recurse_set else None,
+            dir_mode=dir_mode if 'mode' in recurse_set else None,
+            file_mode=file_mode if 'mode' in recurse_set else None,
+            check_files='ignore_files' not in recurse_set,
+            check_dirs='ignore_dirs' not in recurse_set,
+            max_depth=max_depth,
+            follow_symlinks=follow_symlinks,
+            test=True)
+        changes.update(rchanges)
         if 'user' not in recurse_set:
             user = None
         if 'group' not in recurse_set:
             group = None
         if 'mode' not in recurse_set:
             dir_mode = None
-            file_mode = None
-
-        check_files = 'ignore_files' not in recurse_set
-        check_dirs = 'ignore_dirs' not in recurse_set
-        for root, dirs, files in walk_l:
-            if check_files:
-                for fname in files:
-                    fchange = {}
-                    path = os.path.join(root, fname)
-                    stats = __salt__['file.stats'](
-                        path, None, follow_symlinks
-                    )
-                    if user is not None and user != stats.get('user'):
-                        fchange['user'] = user
-                    if group is not None and group != stats.get('group'):
-                        fchange['group'] = group
-                    if file_mode is not None and salt.utils.files.normalize_mode(file_mode) != salt.utils.files.normalize_mode(stats.get('mode')):
-                        fchange['mode'] = file_mode
-                    if fchange:
-                        changes[path] = fchange
-            if check_dirs:
-                for name_ in dirs:
-                    path = os.path.join(root, name_)
-                    fchange = _check_dir_meta(path, user, group, dir_mode, follow_symlinks)
-                    if fchange:
-                        changes[path] = fchange
     # Recurse skips root (we always do dirs, not root), so always check root:
     fchange = _check_dir_meta(name, user, group, dir_mode, follow_symlinks)
     if fchange:
@@ -3280,6 +3268,92 @@ def _depth_limited_walk(top, max_depth=None):
         yield (six.text_type(root), list(dirs), list(files))
 
 
+def _recurse_meta(name,
+                  user=None,
+                  group=None,
+                  dir_mode=None,
+                  file_mode=None,
+                  check_files=True,
+                  check_dirs=True,
+                  max_depth=None,
+                  follow_symlinks=False,
+                  test=False):
+    '''
+    Enforce the ownership and mode of everything below a directory. The user
+    and group are resolved once, every entry is compared with the single stat
+    made on it during the walk and only the needed chown and chmod calls are
+    made, unless testing.
+
+    Returns the changes summarized per directory, keyed on the path of the
+    directory joined with ``*``, and the list of the errors met.
+    '''
+    changes = {}
+    errors = []
+    uid = gid = None
+    if user is not None:
+        uid = __salt__['file.user_to_uid'](user)
+        if isinstance(uid, six.string_types):
+            return changes, ['User {0} does not exist'.format(user)]
+    if group is not None:
+        gid = __salt__['file.group_to_gid'](group)
+        if isinstance(gid, six.string_types):
+            return changes, ['Group {0} does not exist'.format(group)]
+    modes = {}
+    if file_mode is not None:
+        file_mode = salt.utils.files.normalize_mode(file_mode)
+        modes[False] = int(file_mode, 8)
+    if dir_mode is not None:
+        dir_mode = salt.utils.files.normalize_mode(dir_mode)
+        modes[True] = int(dir_mode, 8)
+
+    for root, dirs, files in salt.utils.path.scandir_walk(name, max_depth):
+        summary = {}
+        entries = []
+        if check_dirs:
+            entries.extend((entry, True) for entry in dirs)
+        if check_files:
+            entries.extend((entry, False) for entry in files)
+        for entry, is_dir in entries:
+            try:
+                link = not follow_symlinks and entry.is_symlink()
+                pstat = entry.stat(follow_symlinks=follow_symlinks)
+            except OSError:
+                # Removed since the directory was listed
+                continue
+            chown_uid = uid if uid is not None and pstat.st_uid != uid else -1
+            chown_gid = gid if gid is not None and pstat.st_gid != gid else -1
+            mode = modes.get(is_dir)
+            # The mode of a symlink itself cannot be changed
+            if mode is None or link or stat.S_IMODE(pstat.st_mode) == mode:
+                mode = None
+            if chown_uid == -1 and chown_gid == -1 and mode is None:
+                continue
+            if not test:
+                try:
+                    if chown_uid != -1 or chown_gid != -1:
+                        if link:
+                            os.lchown(entry.path, chown_uid, chown_gid)
+                        else:
+                            os.chown(entry.path, chown_uid, chown_gid)
+                    if mode is not None:
+                        os.chmod(entry.path, mode)
+                except OSError as exc:
+                    if exc.errno != errno.ENOENT:
+                        errors.append('{0}: {1}'.format(entry.path, exc.strerror))
+                    continue
+            if chown_uid != -1:
+                summary['user'] = user
+            if chown_gid != -1:
+                summary['group'] = group
+            if mode is not None:
+                summary['dir_mode' if is_dir else 'file_mode'] = \
+                    dir_mode if is_dir else file_mode
+            summary['entries'] = summary.get('entries', 0) + 1
+        if summary:
+            changes[os.path.join(root, '*')] = summary
+    return changes, errors
+
+
 def directory(name,
               user=None,
               group=None,
@@ -3355,6 +3429,11 @@ def directory(name,
 
         .. versionadded:: 2015.5.0
 
+        .. versionchanged:: Neon
+            The changes made below the directory are reported per directory,
+            under the path of the directory joined with ``*``, with the
+            attributes changed and the number of entries they were changed on.
+
     max_depth
         Limit the recursion depth. The default is no limit=None.
         'max_depth' and 'clean' are mutually exclusive.
@@ -3677,7 +3756,7 @@ def directory(name,
                 name, ret, user, group, dir_mode, None, follow_symlinks)
 
     errors = []
-    if recurse or clean:
+    if clean or (recurse and salt.utils.platform.is_windows()):
         # walk path only once and store the result
         walk_l = list(_depth_limited_walk(name, max_depth))
         # root: (dirs, files) structure, compatible for python2.6
@@ -3686,6 +3765,8 @@ def directory(name,
             walk_d[i[0]] = (i[1], i[2])
 
     recurse_set = None
+    # Set when the user or group to enforce recursively does not exist
+    owner_missing = False
     if recurse:
         try:
             recurse_set = _get_recurse_set(recurse)
@@ -3701,6 +3782,7 @@ def directory(name,
                 # check for user is not fatal, so we need to be sure user
                 # exists.
                 if isinstance(uid, six.string_types):
+                    owner_missing = True
                     ret['result'] = False
                     ret['comment'] = 'Failed to enforce ownership for ' \
                                      'user {0} (user does not ' \
@@ -3717,6 +3799,7 @@ def directory(name,
                 gid = __salt__['file.group_to_gid'](group)
                 # As above with user, we need to make sure group exists.
                 if isinstance(gid, six.string_types):
+                    owner_missing = True
                     ret['result'] = False
                     ret['comment'] = 'Failed to enforce group ownership ' \
                                      'for group {0}'.format(group)
@@ -3735,12 +3818,19 @@ def directory(name,
         check_files = 'ignore_files' not in recurse_set
         check_dirs = 'ignore_dirs' not in recurse_set
 
-        for root, dirs, files in walk_l:
-            if check_files:
-                for fn_ in files:
-                    full = os.path.join(root, fn_)
-                    try:
-                        if salt.utils.platform.is_windows():
+        if not salt.utils.platform.is_windows():
+            if not owner_missing:
+                rchanges, rerrors = _recurse_meta(
+                    name, user, group, dir_mode, file_mode, check_files,
+                    check_dirs, max_depth, follow_symlinks)
+                ret['changes'].update(rchanges)
+                errors.extend(rerrors)
+        else:
+            for root, dirs, files in walk_l:
+                if check_files:
+                    for fn_ in files:
+                        full = os.path.join(root, fn_)
+                        try:
                             ret = __salt__['file.check_perms'](
                                 path=full,
                                 ret=ret,
@@ -3749,18 +3839,14 @@ def directory(name,
                                 deny_perms=win_deny_perms,
                                 inheritance=win_inheritance,
                                 reset=win_perms_reset)
-                        else:
-                            ret, _ = __salt__['file.check_perms'](
-                                full, ret, user, group, file_mode, None, follow_symlinks)
-                    except CommandExecutionError as exc:
-                        if not exc.strerror.startswith('Path not found'):
-                            errors.append(exc.strerror)
-
-            if check_dirs:
-                for dir_ in dirs:
-                    full = os.path.join(root, dir_)
-                    try:
-                        if salt.utils.platform.is_windows():
+                        except CommandExecutionError as exc:
+                            if not exc.strerror.startswith('Path not found'):
+                                errors.append(exc.strerror)
+
+                if check_dirs:
+                    for dir_ in dirs:
+                        full = os.path.join(root, dir_)
+                        try:
                             ret = __salt__['file.check_perms'](
                                 path=full,
                                 ret=ret,
@@ -3769,12 +3855,9 @@ def directory(name,
                                 deny_perms=win_deny_perms,
                                 inheritance=win_inheritance,
                                 reset=win_perms_reset)
-                        else:
-                            ret, _ = __salt__['file.check_perms'](
-                                full, ret, user, group, dir_mode, None, follow_symlinks)
-                    except CommandExecutionError as exc:
-                        if not exc.strerror.startswith('Path not found'):
-                            errors.append(exc.strerror)
+                        except CommandExecutionError as exc:
+                            if not exc.strerror.startswith('Path not found'):
+                                errors.append(exc.strerror)
 
     if clean:
         keep = _gen_keep_files(name, require, walk_d)
@@ -140,6 +140,29 @@ if salt.utils.platform.is_windows():
 
 log = logging.getLogger(__name__)
 
+# Arguments of a pkg low chunk which only concern the chunk itself and not the
+# package manager transaction it runs, see mod_aggregate
+_AGG_CHUNK_ARGS = frozenset([
+    'name',
+    'names',
+    'pkgs',
+    'sources',
+    'version',
+    'state',
+    'fun',
+    'order',
+    'aggregate',
+    'failhard',
+    'fire_event',
+    'require',
+    'require_in',
+    'watch_in',
+    'onchanges_in',
+    'onfail_in',
+    'prereq_in',
+    'listen_in',
+])
+
 
 def __virtual__():
     '''
@@ -3265,10 +3288,36 @@ def mod_init(low):
     return False
 
 
+def _agg_args(low):
+    '''
+    Return the arguments of a pkg low chunk which affect the package manager
+    transaction as a whole, low chunks can only be aggregated when these match
+    '''
+    return dict((key, val) for key, val in six.iteritems(low)
+                if not key.startswith('__') and key not in _AGG_CHUNK_ARGS)
+
+
+def _agg_names(low):
+    '''
+    Return the names of the packages targeted by a pkg low chunk
+    '''
+    if 'sources' in low:
+        return [next(iter(x)) for x in low['sources'] if isinstance(x, dict)]
+    if 'pkgs' in low:
+        return [next(iter(x)) if isinstance(x, dict) else x
+                for x in low['pkgs']]
+    return [low['name']] if 'name' in low else []
+
+
 def mod_aggregate(low, chunks, running):
     '''
     The mod_aggregate function which looks up all packages in the available
     low chunks and merges them into a single pkgs ref in the present low data
+
+    Only the low chunks targeting the same function with the same arguments
+    are merged. Every merged chunk is marked with the tag of the present low
+    data and the names of its packages, so the changes made by the single
+    transaction can be reported by the chunks they belong to.
     '''
     pkgs = []
     pkg_type = None
@@ -3280,6 +3329,8 @@ def mod_aggregate(low, chunks, running):
     ]
     if low.get('fun') not in agg_enabled:
         return low
+    low_tag = __utils__['state.gen_tag'](low)
+    low_args = _agg_args(low)
     for chunk in chunks:
         tag = __utils__['state.gen_tag'](chunk)
         if tag in running:
@@ -3291,9 +3342,10 @@ def mod_aggregate(low, chunks, running):
             # Check for the same function
             if chunk.get('fun') != low.get('fun'):
                 continue
-            # Check for the same repo
-            if chunk.get('fromrepo') != low.get('fromrepo'):
+            # Check for the same repo and transaction options
+            if tag != low_tag and _agg_args(chunk) != low_args:
                 continue
+            names = _agg_names(chunk)
             # Check first if 'sources' was passed so we don't aggregate pkgs
             # and sources together.
             if 'sources' in chunk:
@@ -3311,12 +3363,20 @@ def mod_aggregate(low, chunks, running):
                         pkgs.extend(chunk['pkgs'])
                         chunk['__agg__'] = True
                     elif 'name' in chunk:
-                        version = chunk.pop('version', None)
+                        # Merged chunks keep their version, they run on their
+                        # own with it when the aggregate does not run
+                        if tag == low_tag:
+                            version = chunk.pop('version', None)
+                        else:
+                            version = chunk.get('version')
                         if version is not None:
                             pkgs.append({chunk['name']: version})
                         else:
                             pkgs.append(chunk['name'])
                         chunk['__agg__'] = True
+            if chunk.get('__agg__') and tag != low_tag:
+                chunk['__agg_into__'] = low_tag
+                chunk['__agg_names__'] = names
     if pkg_type is not None and pkgs:
         if pkg_type in low:
             low[pkg_type].extend(pkgs)
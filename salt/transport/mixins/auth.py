@@ -6,9 +6,11 @@ import multiprocessing
 import ctypes
 import logging
 import os
+import time
 import hashlib
 import shutil
 import binascii
+from collections import OrderedDict
 
 # Import Salt Libs
 import salt.crypt
@@ -38,6 +40,9 @@ except ImportError:
 
 log = logging.getLogger(__name__)
 
+# Maximum number of parsed minion public keys kept in memory by each worker
+PUB_KEY_CACHE_SIZE = 10000
+
 
 # TODO: rename
 class AESPubClientMixin(object):
@@ -107,6 +112,74 @@ class AESReqServerMixin(object):
 
         self.master_key = salt.crypt.MasterKeys(self.opts)
 
+        # Parsed minion public keys, keyed on the path of their file
+        self._pub_key_cache = OrderedDict()
+        # Signature of the master public key when signed with the master's
+        # own signing keypair, and signature of the current AES key
+        self._pub_sig_cache = {}
+        self._aes_sig_cache = {}
+
+    def _get_pub_key(self, pubfn):
+        '''
+        Return the parsed public key stored in pubfn. Parsed keys are kept in
+        a bounded LRU cache keyed on the path of the file, along with its
+        inode, size and mtime. A minion signing in again has its key neither
+        read nor parsed again, unless the file changed since.
+        '''
+        try:
+            pstat = os.stat(pubfn)
+            stamp = (pstat.st_ino, pstat.st_size, pstat.st_mtime)
+        except OSError:
+            stamp = None
+        entry = self._pub_key_cache.pop(pubfn, None)
+        # A file changed within the mtime granularity of some filesystems
+        # may be changed again without moving its mtime, so it is read again
+        if entry is None or stamp is None or entry[0] != stamp \
+                or time.time() - stamp[2] <= 1:
+            with salt.utils.files.fopen(pubfn, 'r') as fp_:
+                pem = fp_.read()
+            entry = (stamp, salt.crypt.load_rsa_pub_key(pem))
+            if len(self._pub_key_cache) >= PUB_KEY_CACHE_SIZE:
+                self._pub_key_cache.popitem(last=False)
+        if stamp is not None:
+            self._pub_key_cache[pubfn] = entry
+        return entry[1]
+
+    def _sign_aes(self, aes):
+        '''
+        Sign the digest of the AES key with the master key. The AES key only
+        changes on rotation (or per minion when auth_mode is 2 and a token is
+        sent), so the signature of the last key signed is kept to avoid a
+        private key operation on each sign-in. It is only reused as long as
+        the master key it was made with is in use.
+        '''
+        key = self.master_key.key
+        cached = self._aes_sig_cache.get(aes)
+        if cached is not None and cached[0] is key:
+            return cached[1]
+        digest = salt.utils.stringutils.to_bytes(hashlib.sha256(aes).hexdigest())
+        sig = salt.crypt.private_encrypt(key, digest)
+        self._aes_sig_cache = {aes: (key, sig)}
+        return sig
+
+    def _sign_pub_key(self, pub_key):
+        '''
+        Sign the master public key with the master's own signing keypair and
+        return the base64 encoded signature. The signature only changes along
+        with the public key or the signing key, so the last one is kept until
+        either of them changed.
+        '''
+        sign_path = self.master_key.get_sign_paths()[1]
+        sig_key = (pub_key, os.path.getmtime(sign_path))
+        if sig_key not in self._pub_sig_cache:
+            # get the key_pass for the signing key
+            key_pass = salt.utils.sdb.sdb_get(self.opts['signing_key_pass'], self.opts)
+
+            log.debug("Signing master public key before sending")
+            pub_sign = salt.crypt.sign_message(sign_path, pub_key, key_pass)
+            self._pub_sig_cache = {sig_key: binascii.b2a_base64(pub_sign)}
+        return self._pub_sig_cache[sig_key]
+
     def _encrypt_private(self, ret, dictkey, target):
         '''
         The server equivalent of ReqChannel.crypted_transfer_decode_dictentry
@@ -120,7 +193,7 @@ class AESReqServerMixin(object):
             self.opts,
             key)
         try:
-            pub = salt.crypt.get_rsa_pub_key(pubfn)
+            pub = self._get_pub_key(pubfn)
         except (ValueError, IndexError, TypeError):
             return self.crypticle.dumps({})
         except IOError:
@@ -433,7 +506,7 @@ class AESReqServerMixin(object):
         # The key payload may sometimes be corrupt when using auto-accept
         # and an empty request comes in
         try:
-            pub = salt.crypt.get_rsa_pub_key(pubfn)
+            pub = self._get_pub_key(pubfn)
         except (ValueError, IndexError, TypeError) as err:
             log.error('Corrupt public key "%s": %s', pubfn, err)
             return {'enc': 'clear',
@@ -456,14 +529,7 @@ class AESReqServerMixin(object):
             else:
                 # the master has its own signing-keypair, compute the master.pub's
                 # signature and append that to the auth-reply
-
-                # get the key_pass for the signing key
-                key_pass = salt.utils.sdb.sdb_get(self.opts['signing_key_pass'], self.opts)
-
-                log.debug("Signing master public key before sending")
-                pub_sign = salt.crypt.sign_message(self.master_key.get_sign_paths()[1],
-                                                   ret['pub_key'], key_pass)
-                ret.update({'pub_sig': binascii.b2a_base64(pub_sign)})
+                ret.update({'pub_sig': self._sign_pub_key(ret['pub_key'])})
 
         if not HAS_M2:
             mcipher = PKCS1_OAEP.new(self.master_key.key)
@@ -509,8 +575,7 @@ class AESReqServerMixin(object):
             else:
                 ret['aes'] = cipher.encrypt(aes)
         # Be aggressive about the signature
-        digest = salt.utils.stringutils.to_bytes(hashlib.sha256(aes).hexdigest())
-        ret['sig'] = salt.crypt.private_encrypt(self.master_key.key, digest)
+        ret['sig'] = self._sign_aes(aes)
         eload = {'result': True,
                  'act': 'accept',
                  'id': load['id'],
@@ -25,6 +25,7 @@ import salt.utils.event
 import salt.utils.files
 import salt.utils.msgpack
 import salt.utils.platform
+import salt.utils.presence
 import salt.utils.process
 import salt.utils.verify
 import salt.payload
@@ -1282,6 +1283,8 @@ class PubServer(tornado.tcpserver.TCPServer, object):
         self.clients = set()
         self.aes_funcs = salt.master.AESFuncs(self.opts)
         self.present = {}
+        self.presence_tracking = self.opts.get('presence_tracking', True)
+        self._presence_write = None
         self.presence_events = False
         if self.opts.get('presence_events', False):
             tcp_only = True
@@ -1305,12 +1308,37 @@ class PubServer(tornado.tcpserver.TCPServer, object):
         if self._closing:
             return
         self._closing = True
+        if self.presence_tracking:
+            if self._presence_write is not None:
+                self.io_loop.remove_timeout(self._presence_write)
+                self._presence_write = None
+            salt.utils.presence.clear_presence(self.opts, 'tcp')
 
     # pylint: disable=W1701
     def __del__(self):
         self.close()
     # pylint: enable=W1701
 
+    def write_presence(self):
+        '''
+        Write the ids and addresses of the connected minions to the presence
+        file read by CkMinions.connected_ids
+        '''
+        self._presence_write = None
+        minions = dict((id_, next(iter(clients)).address[0])
+                       for id_, clients in six.iteritems(self.present)
+                       if clients)
+        salt.utils.presence.write_presence(self.opts, 'tcp', minions=minions)
+
+    def _presence_changed(self):
+        '''
+        Schedule a write of the presence file, changes made until it runs are
+        written together
+        '''
+        if self.presence_tracking and self._presence_write is None:
+            self._presence_write = self.io_loop.call_later(
+                salt.utils.presence.WRITE_INTERVAL, self.write_presence)
+
     def _add_client_present(self, client):
         id_ = client.id_
         if id_ in self.present:
@@ -1318,6 +1346,7 @@ class PubServer(tornado.tcpserver.TCPServer, object):
             clients.add(client)
         else:
             self.present[id_] = {client}
+            self._presence_changed()
             if self.presence_events:
                 data = {'new': [id_],
                         'lost': []}
@@ -1349,6 +1378,7 @@ class PubServer(tornado.tcpserver.TCPServer, object):
         clients.remove(client)
         if len(clients) == 0:
             del self.present[id_]
+            self._presence_changed()
             if self.presence_events:
                 data = {'new': [],
                         'lost': [id_]}
@@ -1491,6 +1521,8 @@ class TCPPubServerChannel(salt.transport.server.PubServerChannel):
         sock.listen(self.backlog)
         # pub_server will take ownership of the socket
         pub_server.add_socket(sock)
+        if pub_server.presence_tracking:
+            pub_server.write_presence()
 
         # Set up Salt IPC server
         if self.opts.get('ipc_mode', '') == 'tcp':
@@ -1514,6 +1546,8 @@ class TCPPubServerChannel(salt.transport.server.PubServerChannel):
             self.io_loop.start()
         except (KeyboardInterrupt, SystemExit):
             salt.log.setup.shutdown_multiprocessing_logging()
+        finally:
+            pub_server.close()
 
     def pre_fork(self, process_manager, kwargs=None):
         '''
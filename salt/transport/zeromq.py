@@ -24,6 +24,7 @@ import salt.log.setup
 import salt.utils.event
 import salt.utils.files
 import salt.utils.minions
+import salt.utils.presence
 import salt.utils.process
 import salt.utils.stringutils
 import salt.utils.verify
@@ -907,11 +908,26 @@ class ZeroMQPubServerChannel(salt.transport.server.PubServerChannel):
         with salt.utils.files.set_umask(0o177):
             pull_sock.bind(pull_uri)
 
+        # Follow the minions connecting to the publisher
+        tracker, monitor_sock = self._start_presence_tracking(pub_sock)
+        if tracker is not None:
+            poller = zmq.Poller()
+            poller.register(pull_sock, zmq.POLLIN)
+            poller.register(monitor_sock, zmq.POLLIN)
+            tracker.flush(force=True)
+
         try:
             while True:
                 # Catch and handle EINTR from when this process is sent
                 # SIGUSR1 gracefully so we don't choke and die horribly
                 try:
+                    if tracker is not None:
+                        socks = dict(poller.poll(salt.utils.presence.WRITE_INTERVAL * 1000))
+                        if monitor_sock in socks:
+                            self._handle_presence_events(monitor_sock, tracker)
+                        tracker.flush()
+                        if pull_sock not in socks:
+                            continue
                     log.debug('Publish daemon getting data from puller %s', pull_uri)
                     package = pull_sock.recv()
                     log.debug('Publish daemon received payload. size=%d', len(package))
@@ -957,6 +973,10 @@ class ZeroMQPubServerChannel(salt.transport.server.PubServerChannel):
 
         except KeyboardInterrupt:
             log.trace('Publish daemon caught Keyboard interupt, tearing down')
+        if tracker is not None:
+            salt.utils.presence.clear_presence(self.opts, 'zeromq')
+            pub_sock.disable_monitor()
+            monitor_sock.close()
         # Cleanly close the sockets if we're shutting down
         if pub_sock.closed is False:
             pub_sock.close()
@@ -965,6 +985,44 @@ class ZeroMQPubServerChannel(salt.transport.server.PubServerChannel):
         if context.closed is False:
             context.term()
 
+    def _start_presence_tracking(self, pub_sock):
+        '''
+        Monitor the connections made to the publisher socket, when presence
+        tracking is enabled. Return the presence tracker and the monitor
+        socket, or a tuple of None if the connections are not tracked.
+        '''
+        if not self.opts.get('presence_tracking', True):
+            return None, None
+        if not HAS_ZMQ_MONITOR:
+            log.warning('The zmq socket monitor is not available, the '
+                        'minion presence will not be tracked')
+            return None, None
+        try:
+            monitor_sock = pub_sock.get_monitor_socket(
+                zmq.EVENT_ACCEPTED | zmq.EVENT_DISCONNECTED)
+        except (AttributeError, zmq.ZMQError) as exc:
+            log.warning('Unable to monitor the publisher socket, the minion '
+                        'presence will not be tracked: %s', exc)
+            return None, None
+        return salt.utils.presence.PresenceTracker(self.opts, 'zeromq'), monitor_sock
+
+    @staticmethod
+    def _handle_presence_events(monitor_sock, tracker):
+        '''
+        Apply all of the pending connect and disconnect events of the
+        publisher socket to the presence tracker
+        '''
+        while True:
+            try:
+                msg = monitor_sock.recv_multipart(zmq.NOBLOCK)
+            except zmq.Again:
+                return
+            evt = zmq.utils.monitor.parse_monitor_message(msg)
+            if evt['event'] == zmq.EVENT_ACCEPTED:
+                tracker.connected(evt['value'])
+            elif evt['event'] == zmq.EVENT_DISCONNECTED:
+                tracker.disconnected(evt['value'])
+
     def pre_fork(self, process_manager, kwargs=None):
         '''
         Do anything necessary pre-fork. Since this is on the master side this will
@@ -59,6 +59,8 @@ import fnmatch
 import hashlib
 import logging
 import datetime
+import threading
+from collections import deque
 
 try:
     from collections.abc import MutableMapping
@@ -252,6 +254,8 @@ class SaltEvent(object):
         self.puburi, self.pulluri = self.__load_uri(sock_dir, node)
         self.pending_tags = []
         self.pending_events = []
+        # The pending events wait_for_subscribed already reported, by id
+        self._subscribed_seen = {}
         self.__load_cache_regex()
         if listen and not self.cpub:
             # Only connect to the publisher at initialization time if
@@ -384,6 +388,7 @@ class SaltEvent(object):
         self.subscriber.close()
         self.subscriber = None
         self.pending_events = []
+        self._subscribed_seen = {}
         self.cpub = False
 
     def connect_pull(self, timeout=1):
@@ -650,6 +655,37 @@ class SaltEvent(object):
         else:
             return ret['data']
 
+    def wait_for_subscribed(self, wait=5):
+        '''
+        Block for up to ``wait`` seconds until an event matching one of the
+        subscribed tags is available, without consuming it. The event is
+        cached for a later get_event call.
+
+        Only events which were cached since the previous call count, a cached
+        event nobody consumed, like the bare jid event of a find_job ping,
+        does not make every later call return at once.
+
+        Returns True if such an event is available.
+        '''
+        assert self._run_io_loop_sync
+
+        def _subscribed(mtag, tag):  # pylint: disable=unused-argument
+            return any(pmatch_func(mtag, ptag) for ptag, pmatch_func in self.pending_tags)
+
+        seen = self._subscribed_seen
+        # Keep the events themselves, so that their ids are not reused
+        self._subscribed_seen = dict((id(evt), evt) for evt in self.pending_events)
+        if any(id(evt) not in seen and _subscribed(evt['tag'], None)
+               for evt in self.pending_events):
+            return True
+        with salt.utils.asynchronous.current_ioloop(self.io_loop):
+            ret = self._get_event(wait, None, _subscribed, no_block=wait <= 0)
+        if ret is None:
+            return False
+        self.pending_events.append(ret)
+        self._subscribed_seen[id(ret)] = ret
+        return True
+
     def get_event_noblock(self):
         '''
         Get the raw event without blocking or any other niceties
@@ -1175,6 +1211,141 @@ class EventPublisher(salt.utils.process.SignalHandlingProcess):
     # pylint: enable=W1701
 
 
+# A batch of events an event returner failed to store is retried this many
+# times, backing off exponentially up to EVENT_RETURN_MAX_BACKOFF seconds
+EVENT_RETURN_RETRIES = 5
+EVENT_RETURN_MAX_BACKOFF = 60
+# Seconds the writers get to store the queued events when EventReturn exits
+EVENT_RETURN_FLUSH_TIMEOUT = 30
+
+
+class EventReturnWriter(threading.Thread):
+    '''
+    A thread which hands the events queued for one event returner to it in
+    batches, so a slow returner holds up neither the event bus nor the other
+    returners.
+
+    Events are queued in a bounded buffer; once it is full the oldest events
+    are dropped. A batch the returner fails to store is retried with an
+    exponential backoff before it is dropped.
+    '''
+    def __init__(self, name, returner, batch_size=0, max_seconds=0, buffer_size=0):
+        super(EventReturnWriter, self).__init__(name='EventReturnWriter({0})'.format(name))
+        self.daemon = True
+        self.returner_name = name
+        self.returner = returner
+        self.batch_size = max(batch_size, 1)
+        self.max_seconds = max_seconds
+        # (time queued at, event) pairs
+        self.queue = deque(maxlen=buffer_size if buffer_size > 0 else None)
+        # time the oldest event in the queue was queued at
+        self.oldest = None
+        self.cond = threading.Condition()
+        self.stopping = threading.Event()
+        # metrics
+        self.stored = 0
+        self.dropped = 0
+        self.flush_time = 0.0
+
+    def put(self, event):
+        '''
+        Queue an event for the returner, without blocking
+        '''
+        now = time.time()
+        with self.cond:
+            if len(self.queue) == self.queue.maxlen:
+                self.dropped += 1
+                if self.dropped % 1000 == 1:
+                    log.warning(
+                        'Event returner %s is falling behind, %s events '
+                        'dropped so far', self.returner_name, self.dropped
+                    )
+                self.queue.append((now, event))
+                # The oldest event was dropped, age the queue on the next one
+                self.oldest = self.queue[0][0]
+            else:
+                if not self.queue:
+                    self.oldest = now
+                    # Let the writer time out on this event's age
+                    self.cond.notify()
+                self.queue.append((now, event))
+            if len(self.queue) >= self.batch_size:
+                self.cond.notify()
+
+    def stop(self):
+        '''
+        Store what is still queued and stop the thread
+        '''
+        with self.cond:
+            self.stopping.set()
+            self.cond.notify()
+
+    def _next_batch(self):
+        '''
+        Wait until a batch is due and return at most batch_size of the oldest
+        events, or return None once the writer is stopped and the queue is
+        empty
+        '''
+        with self.cond:
+            while True:
+                timeout = None
+                due = len(self.queue) >= self.batch_size
+                if self.queue and not due:
+                    if self.stopping.is_set():
+                        due = True
+                    elif self.max_seconds > 0:
+                        timeout = self.oldest + self.max_seconds - time.time()
+                        due = timeout <= 0
+                if due:
+                    batch = [self.queue.popleft()[1]
+                             for _ in range(min(self.batch_size, len(self.queue)))]
+                    self.oldest = self.queue[0][0] if self.queue else None
+                    return batch
+                if self.stopping.is_set():
+                    return None
+                self.cond.wait(timeout)
+
+    def _store(self, batch):
+        '''
+        Hand a batch of events to the returner, retrying with a backoff
+        '''
+        backoff = 1
+        for attempt in range(EVENT_RETURN_RETRIES + 1):
+            start = time.time()
+            try:
+                self.returner(batch)
+            except Exception as exc:  # pylint: disable=broad-except
+                log.error('Could not store events - returner \'%s\' raised '
+                          'exception: %s', self.returner_name, exc)
+                # don't waste processing power unnecessarily on converting a
+                # potentially huge dataset to a string
+                if log.level <= logging.DEBUG:
+                    log.debug('Event data that caused an exception: %s', batch)
+                if attempt == EVENT_RETURN_RETRIES or self.stopping.is_set():
+                    break
+                self.stopping.wait(backoff)
+                backoff = min(backoff * 2, EVENT_RETURN_MAX_BACKOFF)
+                continue
+            self.flush_time = time.time() - start
+            self.stored += len(batch)
+            log.profile(
+                'Event returner %s stored %s events in %.3fs, queue depth %s, '
+                '%s stored and %s dropped in total', self.returner_name,
+                len(batch), self.flush_time, len(self.queue), self.stored,
+                self.dropped
+            )
+            return
+        self.dropped += len(batch)
+        log.error('Dropped %s events for returner %s', len(batch), self.returner_name)
+
+    def run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            self._store(batch)
+
+
 class EventReturn(salt.utils.process.SignalHandlingProcess):
     '''
     A dedicated process which listens to the master event bus and queues
@@ -1195,10 +1366,11 @@ class EventReturn(salt.utils.process.SignalHandlingProcess):
         self.opts = opts
         self.event_return_queue = self.opts['event_return_queue']
         self.event_return_queue_max_seconds = self.opts.get('event_return_queue_max_seconds', 0)
+        self.event_return_buffer_size = self.opts.get('event_return_buffer_size', 0)
         local_minion_opts = self.opts.copy()
         local_minion_opts['file_client'] = 'local'
         self.minion = salt.minion.MasterMinion(local_minion_opts)
-        self.event_queue = []
+        self.writers = []
         self.stop = False
 
     # __setstate__ and __getstate__ are only used on Windows.
@@ -1219,44 +1391,52 @@ class EventReturn(salt.utils.process.SignalHandlingProcess):
         }
 
     def _handle_signals(self, signum, sigframe):
-        # Flush and terminate
-        if self.event_queue:
-            self.flush_events()
+        # Only tell the writers to stop here, the events they still hold are
+        # flushed when run() exits
         self.stop = True
+        for writer in self.writers:
+            writer.stop()
         super(EventReturn, self)._handle_signals(signum, sigframe)
 
-    def flush_events(self):
-        if isinstance(self.opts['event_return'], list):
-            # Multiple event returners
-            for r in self.opts['event_return']:
-                log.debug('Calling event returner %s, one of many.', r)
-                event_return = '{0}.event_return'.format(r)
-                self._flush_event_single(event_return)
-        else:
-            # Only a single event returner
-            log.debug('Calling event returner %s, only one '
-                      'configured.', self.opts['event_return'])
-            event_return = '{0}.event_return'.format(
-                self.opts['event_return']
+    def start_writers(self):
+        '''
+        Start a writer thread for each configured event returner
+        '''
+        returners = self.opts['event_return']
+        if not isinstance(returners, list):
+            returners = [returners]
+        for returner in returners:
+            event_return = '{0}.event_return'.format(returner)
+            if event_return not in self.minion.returners:
+                log.error('Could not store return for event(s) - returner '
+                          '\'%s\' not found.', event_return)
+                continue
+            writer = EventReturnWriter(
+                event_return,
+                self.minion.returners[event_return],
+                batch_size=self.event_return_queue,
+                max_seconds=self.event_return_queue_max_seconds,
+                buffer_size=self.event_return_buffer_size)
+            writer.start()
+            self.writers.append(writer)
+
+    def flush_events(self, timeout=EVENT_RETURN_FLUSH_TIMEOUT):
+        '''
+        Store all queued events and stop the writer threads, waiting up to
+        ``timeout`` seconds for them
+        '''
+        for writer in self.writers:
+            writer.stop()
+        deadline = time.time() + timeout
+        for writer in self.writers:
+            writer.join(max(deadline - time.time(), 0))
+            if writer.is_alive():
+                log.warning(
+                    'Event returner %s did not store its queued events within '
+                    '%s seconds, %s events are lost', writer.returner_name,
+                    timeout, len(writer.queue)
                 )
-            self._flush_event_single(event_return)
-        del self.event_queue[:]
-
-    def _flush_event_single(self, event_return):
-        if event_return in self.minion.returners:
-            try:
-                self.minion.returners[event_return](self.event_queue)
-            except Exception as exc:  # pylint: disable=broad-except
-                log.error('Could not store events - returner \'%s\' raised '
-                          'exception: %s', event_return, exc)
-                # don't waste processing power unnecessarily on converting a
-                # potentially huge dataset to a string
-                if log.level <= logging.DEBUG:
-                    log.debug('Event data that caused an exception: %s',
-                        self.event_queue)
-        else:
-            log.error('Could not store return for event(s) - returner '
-                      '\'%s\' not found.', event_return)
+        del self.writers[:]
 
     def run(self):
         '''
@@ -1265,55 +1445,26 @@ class EventReturn(salt.utils.process.SignalHandlingProcess):
         salt.utils.process.appendproctitle(self.__class__.__name__)
         self.event = get_event('master', opts=self.opts, listen=True)
         events = self.event.iter_events(full=True)
+        self.start_writers()
         self.event.fire_event({}, 'salt/event_listen/start')
         try:
             # events below is a generator, we will iterate until we get the salt/event/exit tag
-            oldestevent = None
             for event in events:
 
                 if event['tag'] == 'salt/event/exit':
                     # We're done eventing
                     self.stop = True
                 if self._filter(event):
-                    # This event passed the filter, add it to the queue
-                    self.event_queue.append(event)
-                too_long_in_queue = False
-
-                # if max_seconds is >0, then we want to make sure we flush the queue
-                # every event_return_queue_max_seconds seconds,  If it's 0, don't
-                # apply any of this logic
-                if self.event_return_queue_max_seconds > 0:
-                    rightnow = datetime.datetime.now()
-                    if not oldestevent:
-                        oldestevent = rightnow
-                    age_in_seconds = (rightnow - oldestevent).seconds
-                    if age_in_seconds > 0:
-                        log.debug('Oldest event in queue is %s seconds old.', age_in_seconds)
-                    if age_in_seconds >= self.event_return_queue_max_seconds:
-                        too_long_in_queue = True
-                        oldestevent = None
-                    else:
-                        too_long_in_queue = False
-
-                    if too_long_in_queue:
-                        log.debug('Oldest event has been in queue too long, will flush queue')
-
-                # If we are over the max queue size or the oldest item in the queue has been there too long
-                # then flush the queue
-                if len(self.event_queue) >= self.event_return_queue or too_long_in_queue:
-                    log.debug('Flushing %s events.', len(self.event_queue))
-                    self.flush_events()
-                    oldestevent = None
+                    # This event passed the filter, queue it for the returners
+                    for writer in self.writers:
+                        writer.put(event)
                 if self.stop:
                     # We saw the salt/event/exit tag, we can stop eventing
                     break
-        finally:  # flush all we have at this moment
-            # No matter what, make sure we flush the queue even when we are exiting
-            # and there will be no more events.
-            if self.event_queue:
-                log.debug('Flushing %s events.', len(self.event_queue))
-
-                self.flush_events()
+        finally:
+            # No matter what, make sure we flush the queues even when we are
+            # exiting and there will be no more events.
+            self.flush_events()
 
     def _filter(self, event):
         '''
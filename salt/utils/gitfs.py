@@ -5,6 +5,7 @@ Classes which provide the shared base for GitFS, git_pillar, and winrepo
 
 # Import python libs
 from __future__ import absolute_import, print_function, unicode_literals
+import binascii
 import contextlib
 import copy
 import errno
@@ -13,6 +14,7 @@ import glob
 import hashlib
 import logging
 import os
+import posixpath
 import shlex
 import shutil
 import stat
@@ -425,6 +427,7 @@ class GitProvider(object):
         else:
             self.hash = hash_type(self.id).hexdigest()
         self.cachedir_basename = getattr(self, 'name', self.hash)
+        self._tree_index = {}
         self.cachedir = salt.utils.path.join(cache_root, self.cachedir_basename)
         self.linkdir = salt.utils.path.join(cache_root,
                                             'links',
@@ -937,9 +940,27 @@ class GitProvider(object):
 
     def dir_list(self, tgt_env):
         '''
-        This function must be overridden in a sub-class
+        Get a list of directories for the target environment
         '''
-        raise NotImplementedError()
+        ret = set()
+        index = self.get_tree_index(tgt_env)
+        if index is None:
+            return ret
+        root = self.root(tgt_env)
+        if root:
+            if not stat.S_ISDIR(index.get(root, (None, 0, None))[1]):
+                return ret
+            prefix = root + '/'
+        else:
+            prefix = ''
+        add_mountpoint = lambda path: salt.utils.path.join(
+            self.mountpoint(tgt_env), path, use_posixpath=True)
+        for repo_path, (_, mode, _) in six.iteritems(index):
+            if stat.S_ISDIR(mode) and repo_path.startswith(prefix):
+                ret.add(add_mountpoint(repo_path[len(prefix):]))
+        if self.mountpoint(tgt_env):
+            ret.add(self.mountpoint(tgt_env))
+        return ret
 
     def env_is_exposed(self, tgt_env):
         '''
@@ -967,11 +988,62 @@ class GitProvider(object):
 
     def file_list(self, tgt_env):
         '''
-        This function must be overridden in a sub-class
+        Get file list for the target environment
         '''
-        raise NotImplementedError()
+        files = set()
+        symlinks = {}
+        index = self.get_tree_index(tgt_env)
+        if index is None:
+            # Not found, return empty objects
+            return files, symlinks
+        root = self.root(tgt_env)
+        if root:
+            if not stat.S_ISDIR(index.get(root, (None, 0, None))[1]):
+                return files, symlinks
+            prefix = root + '/'
+        else:
+            prefix = ''
+        add_mountpoint = lambda path: salt.utils.path.join(
+            self.mountpoint(tgt_env), path, use_posixpath=True)
+        for repo_path, (_, mode, link_tgt) in six.iteritems(index):
+            if stat.S_ISDIR(mode) or not repo_path.startswith(prefix):
+                continue
+            file_path = add_mountpoint(repo_path[len(prefix):])
+            files.add(file_path)
+            if link_tgt is not None:
+                symlinks[file_path] = link_tgt
+        return files, symlinks
 
     def find_file(self, path, tgt_env):
+        '''
+        Find the specified file in the specified environment
+        '''
+        index = self.get_tree_index(tgt_env)
+        if index is None:
+            # Branch/tag/SHA not found in repo
+            return None, None, None
+        depth = 0
+        while True:
+            depth += 1
+            if depth > SYMLINK_RECURSE_DEPTH:
+                return None, None, None
+            try:
+                blob_sha, mode, link_tgt = index[path]
+            except KeyError:
+                # File not found
+                return None, None, None
+            if link_tgt is not None:
+                # Path is a symlink. Follow the symlink and set path to the
+                # location indicated in the blob data.
+                path = posixpath.normpath(salt.utils.path.join(
+                    os.path.dirname(path), link_tgt, use_posixpath=True))
+                continue
+            if stat.S_ISDIR(mode):
+                # Path is a directory, not a file.
+                return None, None, None
+            return self.get_blob(blob_sha, mode, path), blob_sha, mode
+
+    def get_blob(self, blob_sha, mode, path):
         '''
         This function must be overridden in a sub-class
         '''
@@ -1023,6 +1095,51 @@ class GitProvider(object):
         # No matches found
         return None
 
+    def get_tree_index(self, tgt_env):
+        '''
+        Return a dict mapping each path in the tree for the specified
+        environment to a tuple of (SHA, mode, symlink target). The symlink
+        target is None for anything which is not a symlink.
+
+        The index is cached per environment and keyed on the SHA of the tree
+        it was built from, so the tree is only walked again once the ref has
+        moved to a different tree. This allows find_file, file_list and
+        dir_list to avoid repeatedly traversing the tree and loading each blob
+        just to determine its type.
+        '''
+        tree = self.get_tree(tgt_env)
+        if not tree:
+            return None
+        tree_sha = self.get_tree_sha(tree)
+        try:
+            cached_sha, index = self._tree_index[tgt_env]
+            if cached_sha == tree_sha:
+                return index
+        except KeyError:
+            pass
+        start = time.time()
+        index = {}
+        self.walk_tree(tree, index)
+        self._tree_index[tgt_env] = (tree_sha, index)
+        log.profile(
+            '%s tree index build remote=%s saltenv=%s entries=%d '
+            'duration=%s seconds',
+            self.role, self.id, tgt_env, len(index), time.time() - start
+        )
+        return index
+
+    def get_tree_sha(self, tree):
+        '''
+        This function must be overridden in a sub-class
+        '''
+        raise NotImplementedError()
+
+    def walk_tree(self, tree, index):
+        '''
+        This function must be overridden in a sub-class
+        '''
+        raise NotImplementedError()
+
     def get_url(self):
         '''
         Examine self.id and assign self.url (and self.branch, for git_pillar)
@@ -1197,31 +1314,6 @@ class GitPython(GitProvider):
 
         return new
 
-    def dir_list(self, tgt_env):
-        '''
-        Get list of directories for the target environment using GitPython
-        '''
-        ret = set()
-        tree = self.get_tree(tgt_env)
-        if not tree:
-            return ret
-        if self.root(tgt_env):
-            try:
-                tree = tree / self.root(tgt_env)
-            except KeyError:
-                return ret
-            relpath = lambda path: os.path.relpath(path, self.root(tgt_env))
-        else:
-            relpath = lambda path: path
-        add_mountpoint = lambda path: salt.utils.path.join(
-            self.mountpoint(tgt_env), path, use_posixpath=True)
-        for blob in tree.traverse():
-            if isinstance(blob, git.Tree):
-                ret.add(add_mountpoint(relpath(blob.path)))
-        if self.mountpoint(tgt_env):
-            ret.add(self.mountpoint(tgt_env))
-        return ret
-
     def envs(self):
         '''
         Check the refs and return a list of the ones which can be used as salt
@@ -1268,82 +1360,11 @@ class GitPython(GitProvider):
         cleaned = self.clean_stale_refs()
         return True if (new_objs or cleaned) else None
 
-    def file_list(self, tgt_env):
+    def get_blob(self, blob_sha, mode, path):
         '''
-        Get file list for the target environment using GitPython
+        Return a git.Blob object for the specified SHA
         '''
-        files = set()
-        symlinks = {}
-        tree = self.get_tree(tgt_env)
-        if not tree:
-            # Not found, return empty objects
-            return files, symlinks
-        if self.root(tgt_env):
-            try:
-                tree = tree / self.root(tgt_env)
-            except KeyError:
-                return files, symlinks
-            relpath = lambda path: os.path.relpath(path, self.root(tgt_env))
-        else:
-            relpath = lambda path: path
-        add_mountpoint = lambda path: salt.utils.path.join(
-            self.mountpoint(tgt_env), path, use_posixpath=True)
-        for file_blob in tree.traverse():
-            if not isinstance(file_blob, git.Blob):
-                continue
-            file_path = add_mountpoint(relpath(file_blob.path))
-            files.add(file_path)
-            if stat.S_ISLNK(file_blob.mode):
-                stream = six.BytesIO()
-                file_blob.stream_data(stream)
-                stream.seek(0)
-                link_tgt = salt.utils.stringutils.to_str(stream.read())
-                stream.close()
-                symlinks[file_path] = link_tgt
-        return files, symlinks
-
-    def find_file(self, path, tgt_env):
-        '''
-        Find the specified file in the specified environment
-        '''
-        tree = self.get_tree(tgt_env)
-        if not tree:
-            # Branch/tag/SHA not found in repo
-            return None, None, None
-        blob = None
-        depth = 0
-        while True:
-            depth += 1
-            if depth > SYMLINK_RECURSE_DEPTH:
-                blob = None
-                break
-            try:
-                file_blob = tree / path
-                if stat.S_ISLNK(file_blob.mode):
-                    # Path is a symlink. The blob data corresponding to
-                    # this path's object ID will be the target of the
-                    # symlink. Follow the symlink and set path to the
-                    # location indicated in the blob data.
-                    stream = six.BytesIO()
-                    file_blob.stream_data(stream)
-                    stream.seek(0)
-                    link_tgt = salt.utils.stringutils.to_str(stream.read())
-                    stream.close()
-                    path = salt.utils.path.join(
-                        os.path.dirname(path), link_tgt, use_posixpath=True)
-                else:
-                    blob = file_blob
-                    if isinstance(blob, git.Tree):
-                        # Path is a directory, not a file.
-                        blob = None
-                    break
-            except KeyError:
-                # File not found or repo_path points to a directory
-                blob = None
-                break
-        if isinstance(blob, git.Blob):
-            return blob, blob.hexsha, blob.mode
-        return None, None, None
+        return git.Blob(self.repo, binascii.unhexlify(blob_sha), mode, path)
 
     def get_tree_from_branch(self, ref):
         '''
@@ -1377,6 +1398,30 @@ class GitPython(GitProvider):
         except (gitdb.exc.ODBError, AttributeError):
             return None
 
+    def get_tree_sha(self, tree):
+        '''
+        Return the SHA of a git.Tree object
+        '''
+        return tree.hexsha
+
+    def walk_tree(self, tree, index):
+        '''
+        Traverse through a git.Tree object, adding each blob and tree to the
+        index. Submodules are skipped.
+        '''
+        for item in tree.traverse():
+            if isinstance(item, git.Tree):
+                index[item.path] = (item.hexsha, item.mode, None)
+            elif isinstance(item, git.Blob):
+                link_tgt = None
+                if stat.S_ISLNK(item.mode):
+                    stream = six.BytesIO()
+                    item.stream_data(stream)
+                    stream.seek(0)
+                    link_tgt = salt.utils.stringutils.to_str(stream.read())
+                    stream.close()
+                index[item.path] = (item.hexsha, item.mode, link_tgt)
+
     def write_file(self, blob, dest):
         '''
         Using the blob object, write the file to the destination path
@@ -1646,57 +1691,6 @@ class Pygit2(GitProvider):
 
         return new
 
-    def dir_list(self, tgt_env):
-        '''
-        Get a list of directories for the target environment using pygit2
-        '''
-        def _traverse(tree, blobs, prefix):
-            '''
-            Traverse through a pygit2 Tree object recursively, accumulating all
-            the empty directories within it in the "blobs" list
-            '''
-            for entry in iter(tree):
-                if entry.oid not in self.repo:
-                    # Entry is a submodule, skip it
-                    continue
-                blob = self.repo[entry.oid]
-                if not isinstance(blob, pygit2.Tree):
-                    continue
-                blobs.append(
-                    salt.utils.path.join(prefix, entry.name, use_posixpath=True)
-                )
-                if blob:
-                    _traverse(
-                        blob, blobs, salt.utils.path.join(
-                            prefix, entry.name, use_posixpath=True)
-                    )
-
-        ret = set()
-        tree = self.get_tree(tgt_env)
-        if not tree:
-            return ret
-        if self.root(tgt_env):
-            try:
-                oid = tree[self.root(tgt_env)].oid
-                tree = self.repo[oid]
-            except KeyError:
-                return ret
-            if not isinstance(tree, pygit2.Tree):
-                return ret
-            relpath = lambda path: os.path.relpath(path, self.root(tgt_env))
-        else:
-            relpath = lambda path: path
-        blobs = []
-        if tree:
-            _traverse(tree, blobs, self.root(tgt_env))
-        add_mountpoint = lambda path: salt.utils.path.join(
-            self.mountpoint(tgt_env), path, use_posixpath=True)
-        for blob in blobs:
-            ret.add(add_mountpoint(relpath(blob)))
-        if self.mountpoint(tgt_env):
-            ret.add(self.mountpoint(tgt_env))
-        return ret
-
     def envs(self):
         '''
         Check the refs and return a list of the ones which can be used as salt
@@ -1770,102 +1764,11 @@ class Pygit2(GitProvider):
             if (received_objects or refs_pre != refs_post or cleaned) \
             else None
 
-    def file_list(self, tgt_env):
+    def get_blob(self, blob_sha, mode, path):
         '''
-        Get file list for the target environment using pygit2
+        Return a pygit2.Blob object for the specified SHA
         '''
-        def _traverse(tree, blobs, prefix):
-            '''
-            Traverse through a pygit2 Tree object recursively, accumulating all
-            the file paths and symlink info in the "blobs" dict
-            '''
-            for entry in iter(tree):
-                if entry.oid not in self.repo:
-                    # Entry is a submodule, skip it
-                    continue
-                obj = self.repo[entry.oid]
-                if isinstance(obj, pygit2.Blob):
-                    repo_path = salt.utils.path.join(
-                        prefix, entry.name, use_posixpath=True)
-                    blobs.setdefault('files', []).append(repo_path)
-                    if stat.S_ISLNK(tree[entry.name].filemode):
-                        link_tgt = self.repo[tree[entry.name].oid].data
-                        blobs.setdefault('symlinks', {})[repo_path] = link_tgt
-                elif isinstance(obj, pygit2.Tree):
-                    _traverse(
-                        obj, blobs, salt.utils.path.join(
-                            prefix, entry.name, use_posixpath=True)
-                    )
-
-        files = set()
-        symlinks = {}
-        tree = self.get_tree(tgt_env)
-        if not tree:
-            # Not found, return empty objects
-            return files, symlinks
-        if self.root(tgt_env):
-            try:
-                # This might need to be changed to account for a root that
-                # spans more than one directory
-                oid = tree[self.root(tgt_env)].oid
-                tree = self.repo[oid]
-            except KeyError:
-                return files, symlinks
-            if not isinstance(tree, pygit2.Tree):
-                return files, symlinks
-            relpath = lambda path: os.path.relpath(path, self.root(tgt_env))
-        else:
-            relpath = lambda path: path
-        blobs = {}
-        if tree:
-            _traverse(tree, blobs, self.root(tgt_env))
-        add_mountpoint = lambda path: salt.utils.path.join(
-            self.mountpoint(tgt_env), path, use_posixpath=True)
-        for repo_path in blobs.get('files', []):
-            files.add(add_mountpoint(relpath(repo_path)))
-        for repo_path, link_tgt in six.iteritems(blobs.get('symlinks', {})):
-            symlinks[add_mountpoint(relpath(repo_path))] = link_tgt
-        return files, symlinks
-
-    def find_file(self, path, tgt_env):
-        '''
-        Find the specified file in the specified environment
-        '''
-        tree = self.get_tree(tgt_env)
-        if not tree:
-            # Branch/tag/SHA not found in repo
-            return None, None, None
-        blob = None
-        mode = None
-        depth = 0
-        while True:
-            depth += 1
-            if depth > SYMLINK_RECURSE_DEPTH:
-                blob = None
-                break
-            try:
-                entry = tree[path]
-                mode = entry.filemode
-                if stat.S_ISLNK(mode):
-                    # Path is a symlink. The blob data corresponding to this
-                    # path's object ID will be the target of the symlink. Follow
-                    # the symlink and set path to the location indicated
-                    # in the blob data.
-                    link_tgt = self.repo[entry.oid].data
-                    path = salt.utils.path.join(
-                        os.path.dirname(path), link_tgt, use_posixpath=True)
-                else:
-                    blob = self.repo[entry.oid]
-                    if isinstance(blob, pygit2.Tree):
-                        # Path is a directory, not a file.
-                        blob = None
-                    break
-            except KeyError:
-                blob = None
-                break
-        if isinstance(blob, pygit2.Blob):
-            return blob, blob.hex, mode
-        return None, None, None
+        return self.repo[blob_sha]
 
     def get_tree_from_branch(self, ref):
         '''
@@ -1897,6 +1800,12 @@ class Pygit2(GitProvider):
         except (KeyError, TypeError, ValueError, AttributeError):
             return None
 
+    def get_tree_sha(self, tree):
+        '''
+        Return the SHA of a pygit2.Tree object
+        '''
+        return tree.hex
+
     def setup_callbacks(self):
         '''
         Assign attributes for pygit2 callbacks
@@ -2043,6 +1952,29 @@ class Pygit2(GitProvider):
             )
             failhard(self.role)
 
+    def walk_tree(self, tree, index):
+        '''
+        Traverse through a pygit2.Tree object, adding each blob and tree to the
+        index. The type of each entry is determined from its file mode, so
+        blobs (other than symlinks) are never loaded. Submodules are skipped.
+        '''
+        def _traverse(tree, prefix):
+            for entry in iter(tree):
+                repo_path = salt.utils.path.join(
+                    prefix, entry.name, use_posixpath=True)
+                mode = entry.filemode
+                if stat.S_ISDIR(mode):
+                    index[repo_path] = (entry.hex, mode, None)
+                    _traverse(self.repo[entry.oid], repo_path)
+                elif stat.S_ISLNK(mode):
+                    link_tgt = salt.utils.stringutils.to_str(
+                        self.repo[entry.oid].data)
+                    index[repo_path] = (entry.hex, mode, link_tgt)
+                elif stat.S_ISREG(mode):
+                    index[repo_path] = (entry.hex, mode, None)
+
+        _traverse(tree, '')
+
     def write_file(self, blob, dest):
         '''
         Using the blob object, write the file to the destination path
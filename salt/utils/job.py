@@ -116,6 +116,102 @@ def store_job(opts, load, event=None, mminion=None):
         mminion.returners[updateetfstr](load['jid'], endtime)
 
 
+def store_jobs(opts, loads, event=None, mminion=None):
+    '''
+    Store the job information of a batch of returns using the configured
+    master_job_cache
+
+    This does the same as store_job for every load, but each jid is only
+    prepared and saved once, and all of the returns are passed to the job
+    cache in a single call if it provides a ``returner_multi`` function.
+    '''
+    # Generate EndTime
+    endtime = salt.utils.jid.jid_to_time(salt.utils.jid.gen_jid(opts))
+    if mminion is None:
+        mminion = salt.minion.MasterMinion(opts, states=False, rend=False)
+
+    job_cache = opts['master_job_cache']
+    valid = []
+    for load in loads:
+        # If the return data is invalid, just ignore it
+        if any(key not in load for key in ('return', 'jid', 'id')):
+            continue
+        if not salt.utils.verify.valid_id(opts, load['id']):
+            continue
+        if load['jid'] == 'req':
+            # Standalone jobs each need a jid of their own
+            store_job(opts, load, event=event, mminion=mminion)
+            continue
+        valid.append(load)
+
+    jidstore_fstr = '{0}.prep_jid'.format(job_cache)
+    prepared = set()
+    for load in valid:
+        if load['jid'] not in prepared and salt.utils.jid.is_jid(load['jid']):
+            # Store the jid
+            try:
+                mminion.returners[jidstore_fstr](False, passed_jid=load['jid'])
+            except KeyError:
+                emsg = "Returner '{0}' does not support function prep_jid".format(job_cache)
+                log.error(emsg)
+                raise KeyError(emsg)
+            prepared.add(load['jid'])
+        if event:
+            log.info('Got return from %s for job %s', load['id'], load['jid'])
+            event.fire_event(load,
+                             salt.utils.event.tagify([load['jid'], 'ret', load['id']], 'job'))
+            event.fire_ret_load(load)
+
+    # if you have a job_cache, or an ext_job_cache, don't write to
+    # the regular master cache
+    if not opts['job_cache'] or opts.get('ext_job_cache'):
+        return
+
+    # do not cache job results if explicitly requested
+    valid = [load for load in valid if load.get('jid') != 'nocache']
+    if not valid:
+        return
+
+    savefstr = '{0}.save_load'.format(job_cache)
+    fstr = '{0}.returner'.format(job_cache)
+    multi_fstr = '{0}.returner_multi'.format(job_cache)
+    updateetfstr = '{0}.update_endtime'.format(job_cache)
+    for load in valid:
+        if 'fun' not in load and isinstance(load.get('return'), dict):
+            ret_ = load['return']
+            if 'fun' in ret_:
+                load.update({'fun': ret_['fun']})
+            if 'user' in ret_:
+                load.update({'user': ret_['user']})
+
+    # Try to reach returner methods
+    try:
+        savefstr_func = mminion.returners[savefstr]
+        fstr_func = mminion.returners[fstr]
+    except KeyError as error:
+        emsg = "Returner '{0}' does not support function {1}".format(job_cache, error)
+        log.error(emsg)
+        raise KeyError(emsg)
+
+    jids = []
+    for load in valid:
+        if load['jid'] not in jids:
+            jids.append(load['jid'])
+            if job_cache != 'local_cache':
+                savefstr_func(load['jid'], load)
+
+    if multi_fstr in mminion.returners:
+        mminion.returners[multi_fstr](valid)
+    else:
+        for load in valid:
+            fstr_func(load)
+
+    if (opts.get('job_cache_store_endtime')
+            and updateetfstr in mminion.returners):
+        for jid in jids:
+            mminion.returners[updateetfstr](jid, endtime)
+
+
 def store_minions(opts, jid, minions, mminion=None, syndic_id=None):
     '''
     Store additional minions matched on lower-level masters using the configured
@@ -6,11 +6,14 @@ This module contains routines used for the salt mine
 # Import python libs
 from __future__ import absolute_import, unicode_literals
 import logging
+import time
+from collections import OrderedDict
 
 # Import salt libs
 import salt.utils.data
 
 # Import 3rd-party libs
+from salt.ext import six
 
 log = logging.getLogger(__name__)
 
@@ -18,6 +21,9 @@ MINE_ITEM_ACL_ID = '__saltmine_acl__'
 MINE_ITEM_ACL_VERSION = 1
 MINE_ITEM_ACL_DATA = '__data__'
 
+# Number of mine.get responses kept by a MineIndex
+MINE_RESULT_CACHE_SIZE = 256
+
 
 def minion_side_acl_denied(
         minion_acl_cache,
@@ -115,3 +121,92 @@ def parse_function_definition(function_definition):
     })
 
     return (function_name, function_args, function_kwargs, minion_acl)
+
+
+class MineIndex(object):
+    '''
+    Index of the mine data of the minions, kept per mine function as a
+    ``{minion: entry}`` map, along with the responses to the mine.get
+    requests served from it.
+
+    The mine data of the minions missing from the index is read from the
+    minion data cache in bulk. With a ``ttl`` of 0 nothing is kept between
+    requests. Otherwise the mine data of a minion is read again once it has
+    been kept for ``ttl`` seconds, and the responses are kept as long, unless
+    the mine of a minion is updated through this index first.
+    '''
+    def __init__(self, ttl=0):
+        self.ttl = ttl
+        self.functions = {}
+        self.loaded = {}
+        self.results = OrderedDict()
+
+    def _expired(self, stamp, now):
+        return self.ttl <= 0 or now - stamp >= self.ttl
+
+    def update(self, minion, mine_data):
+        '''
+        Replace the mine data indexed for a minion, None when its mine was
+        flushed
+        '''
+        if self.ttl <= 0:
+            return
+        for entries in six.itervalues(self.functions):
+            entries.pop(minion, None)
+        if isinstance(mine_data, dict):
+            for function, entry in six.iteritems(mine_data):
+                self.functions.setdefault(function, {})[minion] = entry
+        self.loaded[minion] = time.time()
+        self.results.clear()
+
+    def get(self, cache, minions, functions):
+        '''
+        Return the mine entries of the given functions for the given minions
+        as a dict of ``{function: {minion: entry}}``
+        '''
+        now = time.time()
+        missing = [minion for minion in minions
+                   if self._expired(self.loaded.get(minion, 0), now)]
+        fetched = {}
+        if missing:
+            banks = dict(('minions/{0}'.format(minion), minion)
+                         for minion in missing)
+            for bank, mine_data in six.iteritems(cache.fetch_many(banks, 'mine')):
+                fetched[banks[bank]] = mine_data
+                if self.ttl > 0:
+                    self.update(banks[bank], mine_data)
+        if self.ttl > 0:
+            return dict((function, self.functions.get(function, {}))
+                        for function in functions)
+        ret = dict((function, {}) for function in functions)
+        for minion, mine_data in six.iteritems(fetched):
+            if not isinstance(mine_data, dict):
+                continue
+            for function in functions:
+                if function in mine_data:
+                    ret[function][minion] = mine_data[function]
+        return ret
+
+    def get_result(self, key):
+        '''
+        Return the response kept for the given request key, or None
+        '''
+        if self.ttl <= 0 or key not in self.results:
+            return None
+        stamp, result = self.results[key]
+        if self._expired(stamp, time.time()):
+            del self.results[key]
+            return None
+        return result
+
+    def set_result(self, key, result):
+        '''
+        Keep the response to a request, evicting the least recently stored
+        ones past MINE_RESULT_CACHE_SIZE
+        '''
+        if self.ttl <= 0:
+            return
+        self.results.pop(key, None)
+        self.results[key] = (time.time(), result)
+        while len(self.results) > MINE_RESULT_CACHE_SIZE:
+            self.results.popitem(last=False)
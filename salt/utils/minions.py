@@ -6,10 +6,13 @@ expected to return
 
 # Import python libs
 from __future__ import absolute_import, unicode_literals
+import copy
 import os
 import fnmatch
 import re
+import time
 import logging
+from collections import OrderedDict
 
 # Import salt libs
 import salt.payload
@@ -17,6 +20,7 @@ import salt.roster
 import salt.utils.data
 import salt.utils.files
 import salt.utils.network
+import salt.utils.presence
 import salt.utils.stringutils
 import salt.utils.versions
 from salt.defaults import DEFAULT_TARGET_DELIM
@@ -46,6 +50,201 @@ TARGET_REX = re.compile(
         (?P<pattern>.+)$'''                # The pattern passed to the target engine
     )
 
+# Key directory listings, keyed on the directory path. Each entry holds the
+# directory stat it was read under and the sorted key names found in it.
+_KEY_DIR_CACHE = {}
+
+
+def list_key_dir(path):
+    '''
+    Return the sorted names of the keys stored in a key directory.
+
+    The listing is cached per directory and only read again when the
+    directory's inode or mtime changes, which happens whenever a key is added
+    to, moved out of or removed from it, by this process or any other.
+    Raises OSError if the directory does not exist.
+    '''
+    dir_stat = os.stat(path)
+    stamp = (dir_stat.st_ino, dir_stat.st_mtime)
+    cached = _KEY_DIR_CACHE.get(path)
+    if cached is not None and cached[0] == stamp:
+        return list(cached[1])
+    now = time.time()
+    keys = []
+    for fn_ in salt.utils.data.sorted_ignorecase(os.listdir(path)):
+        if not fn_.startswith('.') \
+                and os.path.isfile(os.path.join(path, fn_)):
+            keys.append(salt.utils.stringutils.to_unicode(fn_))
+    if now - dir_stat.st_mtime > 1:
+        _KEY_DIR_CACHE[path] = (stamp, keys)
+    else:
+        # The directory changed within the mtime granularity of some
+        # filesystems, a further change may not move the mtime.
+        _KEY_DIR_CACHE.pop(path, None)
+    return list(keys)
+
+
+# Compiled compound target expressions, keyed on the expression. Each entry
+# holds the nodegroups it was expanded against and its token list.
+_COMPOUND_CACHE = OrderedDict()
+COMPOUND_CACHE_SIZE = 1000
+
+# Number of compound target words each CkMinions keeps the key matches of
+KEY_MATCH_CACHE_SIZE = 1000
+
+# Binding strength of the set operators compound expressions compile to. These
+# match the python operator precedence the expressions used to be eval'd with.
+_SET_OPER_PRECEDENCE = {'|': 1, '&': 2, '-': 3}
+
+# Target engines whose matches only depend on the accepted minion keys
+_KEY_ENGINES = (None, 'L', 'E')
+
+
+def _compile_compound(expr, nodegroups):
+    '''
+    Expand the nodegroups in a compound target and turn it into a list of
+    tokens. Set operators and parentheses are kept as strings, ``('ALL',)``
+    stands for all accepted minions, and each target word becomes a tuple of
+    ``(engine, pattern, delimiter, ignore_missing)``, with an engine of
+    ``None`` for a glob. Returns None if the expression is invalid.
+    '''
+    tokens = []
+    unmatched = []
+    opers = ['and', 'or', 'not', '(', ')']
+
+    if isinstance(expr, six.string_types):
+        words = expr.split()
+    else:
+        # we make a shallow copy in order to not affect the passed in arg
+        words = expr[:]
+
+    while words:
+        word = words.pop(0)
+        target_info = parse_target(word)
+
+        # Easy check first
+        if word in opers:
+            if tokens:
+                if tokens[-1] == '(' and word in ('and', 'or'):
+                    log.error('Invalid beginning operator after "(": %s', word)
+                    return None
+                if word == 'not':
+                    if not tokens[-1] in ('&', '|', '('):
+                        tokens.append('&')
+                    tokens.extend(['(', ('ALL',), '-'])
+                    unmatched.append('-')
+                elif word == 'and':
+                    tokens.append('&')
+                elif word == 'or':
+                    tokens.append('|')
+                elif word == '(':
+                    tokens.append(word)
+                    unmatched.append(word)
+                elif word == ')':
+                    if not unmatched or unmatched[-1] != '(':
+                        log.error('Invalid compound expr (unexpected '
+                                  'right parenthesis): %s',
+                                  expr)
+                        return None
+                    tokens.append(word)
+                    unmatched.pop()
+                    if unmatched and unmatched[-1] == '-':
+                        tokens.append(')')
+                        unmatched.pop()
+                else:  # Won't get here, unless oper is added
+                    log.error('Unhandled oper in compound expr: %s',
+                              expr)
+                    return None
+            else:
+                # seq start with oper, fail
+                if word == 'not':
+                    tokens.extend(['(', ('ALL',), '-'])
+                    unmatched.append('-')
+                elif word == '(':
+                    tokens.append(word)
+                    unmatched.append(word)
+                else:
+                    log.error(
+                        'Expression may begin with'
+                        ' binary operator: %s', word
+                    )
+                    return None
+
+        elif target_info and target_info['engine']:
+            if 'N' == target_info['engine']:
+                # if we encounter a node group, just evaluate it in-place
+                decomposed = nodegroup_comp(target_info['pattern'], nodegroups)
+                if decomposed:
+                    words = decomposed + words
+                continue
+
+            # ignore missing minions for lists if we exclude them with
+            # a 'not'
+            tokens.append((target_info['engine'],
+                           target_info['pattern'],
+                           target_info['delimiter'],
+                           bool(tokens) and tokens[-1] == '-'))
+            if unmatched and unmatched[-1] == '-':
+                tokens.append(')')
+                unmatched.pop()
+
+        else:
+            # The match is not explicitly defined, evaluate as a glob
+            tokens.append((None, word, None, False))
+            if unmatched and unmatched[-1] == '-':
+                tokens.append(')')
+                unmatched.pop()
+
+    # Add a closing ')' for each item left in unmatched
+    tokens.extend([')' for item in unmatched])
+    return tokens
+
+
+def _eval_compound(tokens, resolve):
+    '''
+    Evaluate a compiled compound target with set algebra. ``resolve`` is
+    called with each target word and returns the set of minions it matches.
+    Raises ValueError if the tokens do not form a valid expression.
+    '''
+    pos = [0]
+
+    def _peek():
+        return tokens[pos[0]] if pos[0] < len(tokens) else None
+
+    def _atom():
+        token = _peek()
+        pos[0] += 1
+        if token == '(':
+            ret = _expr(1)
+            if _peek() != ')':
+                raise ValueError('unbalanced parenthesis')
+            pos[0] += 1
+            return ret
+        if isinstance(token, tuple):
+            return resolve(token)
+        raise ValueError('unexpected token {0}'.format(token))
+
+    def _expr(min_precedence):
+        ret = _atom()
+        while True:
+            oper = _peek()
+            if not isinstance(oper, six.string_types) \
+                    or _SET_OPER_PRECEDENCE.get(oper, 0) < min_precedence:
+                return ret
+            pos[0] += 1
+            other = _expr(_SET_OPER_PRECEDENCE[oper] + 1)
+            if oper == '|':
+                ret = ret | other
+            elif oper == '&':
+                ret = ret & other
+            else:
+                ret = ret - other
+
+    ret = _expr(1)
+    if pos[0] != len(tokens):
+        raise ValueError('unexpected token {0}'.format(_peek()))
+    return ret
+
 
 def _nodegroup_regex(nodegroup, words, opers):
     opers_set = set(opers)
@@ -208,6 +407,13 @@ class CkMinions(object):
             self.acc = 'minions'
         else:
             self.acc = 'accepted'
+        # Compound target words matched against the accepted keys, and the
+        # accepted keys they were matched against
+        self._key_match_cache = OrderedDict()
+        self._key_match_minions = None
+        # The ip grains of the cached minions, with the minions and connected
+        # addresses they were last read for
+        self._minion_ips = None
 
     def _check_nodegroup_minions(self, expr, greedy):  # pylint: disable=unused-argument
         '''
@@ -263,9 +469,7 @@ class CkMinions(object):
                     with salt.utils.files.fopen(pki_cache_fn, mode='rb') as fn_:
                         return self.serial.load(fn_)
             else:
-                for fn_ in salt.utils.data.sorted_ignorecase(os.listdir(os.path.join(self.opts['pki_dir'], self.acc))):
-                    if not fn_.startswith('.') and os.path.isfile(os.path.join(self.opts['pki_dir'], self.acc, fn_)):
-                        minions.append(fn_)
+                minions = list_key_dir(os.path.join(self.opts['pki_dir'], self.acc))
             return minions
         except OSError as exc:
             log.error(
@@ -293,10 +497,7 @@ class CkMinions(object):
             return self.cache.list('minions')
 
         if greedy:
-            minions = []
-            for fn_ in salt.utils.data.sorted_ignorecase(os.listdir(os.path.join(self.opts['pki_dir'], self.acc))):
-                if not fn_.startswith('.') and os.path.isfile(os.path.join(self.opts['pki_dir'], self.acc, fn_)):
-                    minions.append(fn_)
+            minions = list_key_dir(os.path.join(self.opts['pki_dir'], self.acc))
         elif cache_enabled:
             minions = list_cached_minions()
         else:
@@ -312,10 +513,11 @@ class CkMinions(object):
                 return {'minions': minions,
                         'missing': []}
             minions = set(minions)
+            if greedy:
+                cminions = [id_ for id_ in cminions if id_ in minions]
+            cdata = self._fetch_minion_data(cminions)
             for id_ in cminions:
-                if greedy and id_ not in minions:
-                    continue
-                mdata = self.cache.fetch('minions/{0}'.format(id_), 'data')
+                mdata = cdata[id_]
                 if mdata is None:
                     if not greedy:
                         minions.remove(id_)
@@ -331,6 +533,14 @@ class CkMinions(object):
         return {'minions': minions,
                 'missing': []}
 
+    def _fetch_minion_data(self, minions):
+        '''
+        Return a dict of the cached data of the given minions, read in bulk
+        '''
+        banks = dict(('minions/{0}'.format(id_), id_) for id_ in minions)
+        return dict((banks[bank], data) for bank, data in
+                    six.iteritems(self.cache.fetch_many(banks, 'data')))
+
     def _check_grain_minions(self, expr, delimiter, greedy):
         '''
         Return the minions found by looking via grains
@@ -411,8 +621,9 @@ class CkMinions(object):
             proto = 'ipv{0}'.format(tgt.version)
 
             minions = set(minions)
+            cdata = self._fetch_minion_data(cminions)
             for id_ in cminions:
-                mdata = self.cache.fetch('minions/{0}'.format(id_), 'data')
+                mdata = cdata[id_]
                 if mdata is None:
                     if not greedy:
                         minions.remove(id_)
@@ -485,7 +696,8 @@ class CkMinions(object):
         if not isinstance(expr, six.string_types) and not isinstance(expr, (list, tuple)):
             log.error('Compound target that is neither string, list nor tuple')
             return {'minions': [], 'missing': []}
-        minions = set(self._pki_minions())
+        pki_minions = self._pki_minions()
+        minions = set(pki_minions)
         log.debug('minions: %s', minions)
 
         nodegroups = self.opts.get('nodegroups', {})
@@ -504,127 +716,72 @@ class CkMinions(object):
                 ref['I'] = self._check_pillar_exact_minions
                 ref['J'] = self._check_pillar_exact_minions
 
-            results = []
-            unmatched = []
-            opers = ['and', 'or', 'not', '(', ')']
-            missing = []
+            cache_key = expr if isinstance(expr, six.string_types) else tuple(expr)
+            cached = _COMPOUND_CACHE.pop(cache_key, None)
+            if cached is None or cached[0] != nodegroups:
+                tokens = _compile_compound(expr, nodegroups)
+                if tokens is None:
+                    return {'minions': [], 'missing': []}
+                cached = (copy.deepcopy(nodegroups), tokens)
+            tokens = cached[1]
+            _COMPOUND_CACHE[cache_key] = cached
+            while len(_COMPOUND_CACHE) > COMPOUND_CACHE_SIZE:
+                _COMPOUND_CACHE.popitem(last=False)
+
+            if pki_minions != self._key_match_minions:
+                self._key_match_cache = OrderedDict()
+                self._key_match_minions = pki_minions
 
-            if isinstance(expr, six.string_types):
-                words = expr.split()
-            else:
-                # we make a shallow copy in order to not affect the passed in arg
-                words = expr[:]
-
-            while words:
-                word = words.pop(0)
-                target_info = parse_target(word)
-
-                # Easy check first
-                if word in opers:
-                    if results:
-                        if results[-1] == '(' and word in ('and', 'or'):
-                            log.error('Invalid beginning operator after "(": %s', word)
-                            return {'minions': [], 'missing': []}
-                        if word == 'not':
-                            if not results[-1] in ('&', '|', '('):
-                                results.append('&')
-                            results.append('(')
-                            results.append(six.text_type(set(minions)))
-                            results.append('-')
-                            unmatched.append('-')
-                        elif word == 'and':
-                            results.append('&')
-                        elif word == 'or':
-                            results.append('|')
-                        elif word == '(':
-                            results.append(word)
-                            unmatched.append(word)
-                        elif word == ')':
-                            if not unmatched or unmatched[-1] != '(':
-                                log.error('Invalid compound expr (unexpected '
-                                          'right parenthesis): %s',
-                                          expr)
-                                return {'minions': [], 'missing': []}
-                            results.append(word)
-                            unmatched.pop()
-                            if unmatched and unmatched[-1] == '-':
-                                results.append(')')
-                                unmatched.pop()
-                        else:  # Won't get here, unless oper is added
-                            log.error('Unhandled oper in compound expr: %s',
-                                      expr)
-                            return {'minions': [], 'missing': []}
-                    else:
-                        # seq start with oper, fail
-                        if word == 'not':
-                            results.append('(')
-                            results.append(six.text_type(set(minions)))
-                            results.append('-')
-                            unmatched.append('-')
-                        elif word == '(':
-                            results.append(word)
-                            unmatched.append(word)
-                        else:
-                            log.error(
-                                'Expression may begin with'
-                                ' binary operator: %s', word
-                            )
-                            return {'minions': [], 'missing': []}
-
-                elif target_info and target_info['engine']:
-                    if 'N' == target_info['engine']:
-                        # if we encounter a node group, just evaluate it in-place
-                        decomposed = nodegroup_comp(target_info['pattern'], nodegroups)
-                        if decomposed:
-                            words = decomposed + words
-                        continue
-
-                    engine = ref.get(target_info['engine'])
+            missing = []
+            resolved = {}
+
+            def _resolve(token):
+                if token in resolved:
+                    return resolved[token]
+                if token == ('ALL',):
+                    resolved[token] = minions
+                    return minions
+                engine_name, pattern, delimiter, ignore_missing = token
+                if engine_name in _KEY_ENGINES \
+                        and token in self._key_match_cache:
+                    matched, _missing = self._key_match_cache.pop(token)
+                    self._key_match_cache[token] = (matched, _missing)
+                    missing.extend(_missing)
+                    resolved[token] = matched
+                    return matched
+                if engine_name is None:
+                    _results = self._check_glob_minions(pattern, True)
+                else:
+                    engine = ref.get(engine_name)
                     if not engine:
                         # If an unknown engine is called at any time, fail out
-                        log.error(
-                            'Unrecognized target engine "%s" for'
-                            ' target expression "%s"',
-                            target_info['engine'],
-                            word,
-                        )
-                        return {'minions': [], 'missing': []}
-
-                    engine_args = [target_info['pattern']]
-                    if target_info['engine'] in ('G', 'P', 'I', 'J'):
-                        engine_args.append(target_info['delimiter'] or ':')
+                        raise ValueError(
+                            'Unrecognized target engine "{0}" for target '
+                            'expression "{1}@{2}"'.format(
+                                engine_name, engine_name, pattern))
+                    engine_args = [pattern]
+                    if engine_name in ('G', 'P', 'I', 'J'):
+                        engine_args.append(delimiter or ':')
                     engine_args.append(greedy)
-
-                    # ignore missing minions for lists if we exclude them with
-                    # a 'not'
-                    if 'L' == target_info['engine']:
-                        engine_args.append(results and results[-1] == '-')
+                    if 'L' == engine_name:
+                        engine_args.append(ignore_missing)
                     _results = engine(*engine_args)
-                    results.append(six.text_type(set(_results['minions'])))
-                    missing.extend(_results['missing'])
-                    if unmatched and unmatched[-1] == '-':
-                        results.append(')')
-                        unmatched.pop()
-
-                else:
-                    # The match is not explicitly defined, evaluate as a glob
-                    _results = self._check_glob_minions(word, True)
-                    results.append(six.text_type(set(_results['minions'])))
-                    if unmatched and unmatched[-1] == '-':
-                        results.append(')')
-                        unmatched.pop()
-
-            # Add a closing ')' for each item left in unmatched
-            results.extend([')' for item in unmatched])
-
-            results = ' '.join(results)
-            log.debug('Evaluating final compound matching expr: %s',
-                      results)
+                matched = frozenset(_results['minions'])
+                missing.extend(_results['missing'])
+                if engine_name in _KEY_ENGINES:
+                    self._key_match_cache[token] = (matched, _results['missing'])
+                    while len(self._key_match_cache) > KEY_MATCH_CACHE_SIZE:
+                        self._key_match_cache.popitem(last=False)
+                resolved[token] = matched
+                return matched
+
+            log.debug('Evaluating compiled compound matching expr: %s',
+                      tokens)
             try:
-                minions = list(eval(results))  # pylint: disable=W0123
+                minions = list(_eval_compound(tokens, _resolve))
                 return {'minions': minions, 'missing': missing}
-            except Exception:  # pylint: disable=broad-except
-                log.error('Invalid compound target: %s', expr)
+            except Exception as exc:  # pylint: disable=broad-except
+                log.error('Invalid compound target: %s (%s)', expr, exc)
                 return {'minions': [], 'missing': []}
 
         return {'minions': list(minions),
@@ -648,11 +805,27 @@ class CkMinions(object):
                 'minions.'
             )
         minions = set()
+        # The publishers keep track of the connected minions, only scan the
+        # connections when they do not
+        presence = salt.utils.presence.read_presence(self.opts)
+        if presence is None:
+            addrs = None
+        else:
+            addrs, present = presence
+            for id_, addr in six.iteritems(present):
+                if subset and id_ not in subset:
+                    continue
+                minions.add((id_, addr) if show_ip else id_)
+            if not addrs:
+                # The connections of the minions are all known by id
+                return minions
+            addrs = set(addrs)
         if self.opts.get('minion_data_cache', False):
             search = self.cache.list('minions')
             if search is None:
                 return minions
-            addrs = salt.utils.network.local_port_tcp(int(self.opts['publish_port']))
+            if addrs is None:
+                addrs = salt.utils.network.local_port_tcp(int(self.opts['publish_port']))
             if '127.0.0.1' in addrs:
                 # Add in the address of a possible locally-connected minion.
                 addrs.discard('127.0.0.1')
@@ -663,26 +836,19 @@ class CkMinions(object):
                 addrs.update(set(salt.utils.network.ip_addrs6(include_loopback=False)))
             if subset:
                 search = subset
+            minion_ips = self._connected_minion_ips(search, addrs)
             for id_ in search:
-                try:
-                    mdata = self.cache.fetch('minions/{0}'.format(id_), 'data')
-                except SaltCacheError:
-                    # If a SaltCacheError is explicitly raised during the fetch operation,
-                    # permission was denied to open the cached data.p file. Continue on as
-                    # in the releases <= 2016.3. (An explicit error raise was added in PR
-                    # #35388. See issue #36867 for more information.
-                    continue
-                if mdata is None:
+                if id_ not in minion_ips:
                     continue
-                grains = mdata.get('grains', {})
-                for ipv4 in grains.get('ipv4', []):
+                ipv4s, ipv6s = minion_ips[id_]
+                for ipv4 in ipv4s:
                     if ipv4 in addrs:
                         if show_ip:
                             minions.add((id_, ipv4))
                         else:
                             minions.add(id_)
                         break
-                for ipv6 in grains.get('ipv6', []):
+                for ipv6 in ipv6s:
                     if ipv6 in addrs:
                         if show_ip:
                             minions.add((id_, ipv6))
@@ -691,14 +857,50 @@ class CkMinions(object):
                         break
         return minions
 
+    def _connected_minion_ips(self, minions, addrs):
+        '''
+        Return a dict mapping the given minion ids to their ipv4 and ipv6
+        grains, for matching them against the connected addresses
+
+        The grains are read in bulk from the minion data cache and kept
+        between calls. They are read again when asked for minions they were
+        not read for, or when a connection comes from an address that was not
+        connected the last time they were read, which covers minions changing
+        address.
+        '''
+        minions = set(minions)
+        if self._minion_ips is not None:
+            read_minions, read_addrs, minion_ips = self._minion_ips
+            if minions.issubset(read_minions) and addrs.issubset(read_addrs):
+                return minion_ips
+
+        try:
+            cdata = self._fetch_minion_data(minions)
+        except SaltCacheError:
+            # If a SaltCacheError is explicitly raised during the fetch operation,
+            # permission was denied to open the cached data.p file. Continue on as
+            # in the releases <= 2016.3. (An explicit error raise was added in PR
+            # #35388. See issue #36867 for more information.
+            cdata = {}
+            for id_ in minions:
+                try:
+                    cdata[id_] = self.cache.fetch('minions/{0}'.format(id_), 'data')
+                except SaltCacheError:
+                    continue
+        minion_ips = {}
+        for id_, mdata in six.iteritems(cdata):
+            if mdata is None:
+                continue
+            grains = mdata.get('grains', {})
+            minion_ips[id_] = (grains.get('ipv4', []), grains.get('ipv6', []))
+        self._minion_ips = (minions, set(addrs), minion_ips)
+        return minion_ips
+
     def _all_minions(self, expr=None):
         '''
         Return a list of all minions that have auth'd
         '''
-        mlist = []
-        for fn_ in salt.utils.data.sorted_ignorecase(os.listdir(os.path.join(self.opts['pki_dir'], self.acc))):
-            if not fn_.startswith('.') and os.path.isfile(os.path.join(self.opts['pki_dir'], self.acc, fn_)):
-                mlist.append(fn_)
+        mlist = list_key_dir(os.path.join(self.opts['pki_dir'], self.acc))
         return {'minions': mlist, 'missing': []}
 
     def check_minions(self,
@@ -2021,6 +2021,15 @@ class SaltCMDOptionParser(six.with_metaclass(OptionParserMeta,
             help=('Wait the specified time in seconds after each job is done '
                   'before freeing the slot in the batch for the next one.')
         )
+        self.add_option(
+            '--batch-presence',
+            default=False,
+            dest='batch_presence',
+            action='store_true',
+            help=('Choose the minions to run a batch job on from the minions '
+                  'connected to the master, instead of pinging the target '
+                  'first.')
+        )
         self.add_option(
             '--batch-safe-limit',
             default=0,
@@ -3087,6 +3096,16 @@ class SaltSSHOptionParser(six.with_metaclass(OptionParserMeta,
             help='Use the only authentication identity files configured in the '
                  'ssh_config files. See IdentitiesOnly flag in man ssh_config.'
         )
+        auth_group.add_option(
+            '--control-persist',
+            dest='ssh_control_persist',
+            default=0,
+            type=int,
+            help='Share a single persistent connection per target between '
+                 'all of the ssh and scp calls made by salt-ssh, keeping it '
+                 'open for the given number of seconds after the last use. '
+                 'Default: %default (disabled).'
+        )
         auth_group.add_option(
             '--sudo',
             dest='ssh_sudo',
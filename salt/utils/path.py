@@ -454,3 +454,82 @@ def os_walk(top, *args, **kwargs):
         top_query = salt.utils.stringutils.to_str(top)
     for item in os.walk(top_query, *args, **kwargs):
         yield salt.utils.data.decode(item, preserve_tuples=True)
+
+
+class _DirEntry(object):
+    '''
+    Minimal stand-in for os.DirEntry on Python versions without os.scandir
+    '''
+    def __init__(self, root, name):
+        self.name = name
+        self.path = os.path.join(root, name)
+        self._stat = None
+        self._lstat = None
+
+    def is_symlink(self):
+        return os.path.islink(self.path)
+
+    def is_dir(self, follow_symlinks=True):
+        if follow_symlinks:
+            return os.path.isdir(self.path)
+        return not self.is_symlink() and os.path.isdir(self.path)
+
+    def stat(self, follow_symlinks=True):
+        if follow_symlinks:
+            if self._stat is None:
+                self._stat = os.stat(self.path)
+            return self._stat
+        if self._lstat is None:
+            self._lstat = os.lstat(self.path)
+        return self._lstat
+
+
+def _scandir(path):
+    '''
+    Return the entries of a directory as os.DirEntry objects
+    '''
+    if hasattr(os, 'scandir'):
+        return list(os.scandir(path))
+    return [_DirEntry(path, name) for name in os.listdir(path)]
+
+
+def scandir_walk(top, max_depth=None):
+    '''
+    Walk the directory tree under top like os.walk, top down and without
+    following the symlinks to directories, yielding for each directory a tuple
+    of its path and of the lists of the os.DirEntry objects of its
+    subdirectories and files. The entries carry what the listing of the
+    directory returned and cache the stat made on them, so the tree is not
+    queried again per entry. The walk stops descending max_depth levels below
+    top, and like an os.walk pruned there, yields no subdirectories for the
+    directories at that depth.
+    '''
+    top = salt.utils.stringutils.to_unicode(top)
+    stack = [(top, 0)]
+    while stack:
+        root, depth = stack.pop()
+        try:
+            entries = _scandir(root)
+        except OSError:
+            continue
+        dirs = []
+        files = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                dirs.append(entry)
+            else:
+                files.append(entry)
+        if max_depth is not None and depth >= max_depth:
+            dirs = []
+        yield root, dirs, files
+        for entry in reversed(dirs):
+            try:
+                if entry.is_symlink():
+                    continue
+            except OSError:
+                continue
+            stack.append((entry.path, depth + 1))
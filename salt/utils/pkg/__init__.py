@@ -5,13 +5,18 @@ Common functions for managing package refreshes during states
 # Import python libs
 from __future__ import absolute_import, print_function, unicode_literals
 import errno
+import hashlib
 import logging
 import os
 import re
+import time
 
 # Import Salt libs
+import salt.payload
+import salt.utils.atomicfile
 import salt.utils.data
 import salt.utils.files
+import salt.utils.stringutils
 import salt.utils.versions
 
 log = logging.getLogger(__name__)
@@ -67,6 +72,105 @@ def check_refresh(opts, refresh=None):
     )
 
 
+def db_stamp(paths):
+    '''
+    Return the inode, mtime and size of each of the given paths which exists,
+    which change along with the package database or repository metadata they
+    belong to. Returns None if none of the paths exist.
+    '''
+    stamp = []
+    for path in paths:
+        try:
+            path_stat = os.stat(path)
+        except OSError:
+            continue
+        stamp.append([path, path_stat.st_ino, path_stat.st_mtime, path_stat.st_size])
+    return stamp or None
+
+
+def cache_name(*args):
+    '''
+    Return a name to cache data under which identifies the given arguments
+    '''
+    return hashlib.sha1(
+        salt.utils.stringutils.to_bytes(repr(args))).hexdigest()
+
+
+def _cache_path(opts, name):
+    '''
+    Return the location of the package cache file with the given name
+    '''
+    return os.path.join(opts['cachedir'], 'pkg_cache', '{0}.p'.format(name))
+
+
+def read_cache(opts, name, stamp, ttl=0):
+    '''
+    Return the data cached under the given name, provided that it was cached
+    while the package database was at the given stamp and, when a ttl is
+    given, less than ttl seconds ago. Returns None otherwise.
+    '''
+    if stamp is None or not opts.get('cachedir'):
+        return None
+    path = _cache_path(opts, name)
+    try:
+        with salt.utils.files.fopen(path, 'rb') as fp_:
+            cached = salt.payload.Serial(opts).load(fp_)
+    except (IOError, OSError):
+        return None
+    except Exception as exc:  # pylint: disable=broad-except
+        log.debug('Unable to read the package cache %s: %s', path, exc)
+        return None
+    if not isinstance(cached, dict) or cached.get('stamp') != stamp:
+        return None
+    if ttl and time.time() - cached.get('time', 0) >= ttl:
+        return None
+    return cached.get('data')
+
+
+def write_cache(opts, name, stamp, data):
+    '''
+    Cache data under the given name along with the stamp of the package
+    database it was read from
+    '''
+    if stamp is None or not opts.get('cachedir'):
+        return
+    now = time.time()
+    if any(now - mtime <= 1 for _, _, mtime, _ in stamp):
+        # The database changed within the mtime granularity of some
+        # filesystems, a further change may not move the mtime.
+        return
+    path = _cache_path(opts, name)
+    try:
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with salt.utils.atomicfile.atomic_open(path, 'wb') as fp_:
+            salt.payload.Serial(opts).dump(
+                {'stamp': stamp, 'time': now, 'data': data}, fp_)
+    except (IOError, OSError) as exc:
+        log.warning('Encountered error writing the package cache: %s', exc.__str__())
+
+
+def clear_cache(opts):
+    '''
+    Remove all of the package cache files, after packages were installed or
+    removed
+    '''
+    if not opts.get('cachedir'):
+        return
+    cache_dir = os.path.join(opts['cachedir'], 'pkg_cache')
+    try:
+        names = os.listdir(cache_dir)
+    except OSError:
+        return
+    for name in names:
+        try:
+            os.remove(os.path.join(cache_dir, name))
+        except OSError as exc:
+            if exc.errno != errno.ENOENT:
+                log.warning('Encountered error removing the package cache: %s',
+                            exc.__str__())
+
+
 def split_comparison(version):
     match = re.match(r'^(<=>|!=|>=|<=|>>|<<|<>|>|<|=)?\s?([^<>=]+)$', version)
     if match:
@@ -10,6 +10,21 @@ from __future__ import absolute_import, print_function, unicode_literals
 from salt.ext import six
 from salt.ext.six.moves import range  # pylint: disable=redefined-builtin
 
+# The dpkg database, rewritten whenever a package is installed, removed or
+# held
+DPKG_DB_PATHS = ('/var/lib/dpkg/status',)
+
+# What the candidate versions of the packages depend on: the installed
+# packages, the package lists updated by apt-get update and the apt
+# configuration
+APT_METADATA_PATHS = DPKG_DB_PATHS + (
+    '/var/lib/apt/lists',
+    '/etc/apt/sources.list',
+    '/etc/apt/sources.list.d',
+    '/etc/apt/preferences',
+    '/etc/apt/preferences.d',
+)
+
 
 def combine_comments(comments):
     '''
@@ -36,6 +36,14 @@ ARCHES_SH = ('sh3', 'sh4', 'sh4a')
 ARCHES = ARCHES_64 + ARCHES_32 + ARCHES_PPC + ARCHES_S390 + \
     ARCHES_ALPHA + ARCHES_ARM + ARCHES_SH
 
+# The rpm database, in its Berkeley DB or SQLite format
+RPMDB_PATHS = (
+    '/var/lib/rpm/Packages',
+    '/var/lib/rpm/rpmdb.sqlite',
+    '/usr/lib/sysimage/rpm/Packages',
+    '/usr/lib/sysimage/rpm/rpmdb.sqlite',
+)
+
 # EPOCHNUM can't be used until RHEL5 is EOL as it is not present
 QUERYFORMAT = '%{NAME}_|-%{EPOCH}_|-%{VERSION}_|-%{RELEASE}_|-%{ARCH}_|-%{REPOID}_|-%{INSTALLTIME}'
 
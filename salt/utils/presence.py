@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+'''
+Track the minions connected to the master's publishers.
+
+The publisher of every transport follows its subscribers as they connect and
+disconnect and writes what it knows to a presence file in the master cachedir:
+the ZeroMQ publisher only sees the remote addresses of its connections, the
+TCP publisher knows the id each of its subscribers authenticated with. These
+files are read by ``CkMinions.connected_ids`` instead of scanning the TCP
+connection table of the host on every call.
+'''
+
+# Import Python libs
+from __future__ import absolute_import, print_function, unicode_literals
+import errno
+import logging
+import os
+import socket
+import time
+
+# Import Salt libs
+import salt.payload
+import salt.transport
+import salt.utils.atomicfile
+import salt.utils.files
+import salt.utils.process
+from salt.ext import six
+
+log = logging.getLogger(__name__)
+
+# Presence files last read by this process, keyed on their path. Each entry
+# holds the stat stamp the file was read at and its contents.
+_PRESENCE_CACHE = {}
+
+# Shortest interval between two writes of a presence file, in seconds. Changes
+# made in between are written together.
+WRITE_INTERVAL = 1
+
+
+def presence_path(opts, transport):
+    '''
+    Return the path of the presence file of the given transport
+    '''
+    return os.path.join(opts['cachedir'], 'presence', '{0}.p'.format(transport))
+
+
+def write_presence(opts, transport, addrs=None, minions=None):
+    '''
+    Write the presence file of a transport. ``addrs`` is an iterable of the
+    remote addresses connected to the publisher, ``minions`` a dict mapping
+    the id of every connected minion to its address.
+    '''
+    path = presence_path(opts, transport)
+    data = {'pid': os.getpid(),
+            'addrs': sorted(addrs or ()),
+            'minions': dict(minions or {})}
+    serial = salt.payload.Serial(opts)
+    try:
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with salt.utils.atomicfile.atomic_open(path, mode='wb') as fp_:
+            serial.dump(data, fp_)
+    except (IOError, OSError) as exc:
+        log.error('Unable to write the presence file %s: %s', path, exc)
+
+
+def clear_presence(opts, transport):
+    '''
+    Remove the presence file of a transport, done when its publisher stops
+    '''
+    path = presence_path(opts, transport)
+    _PRESENCE_CACHE.pop(path, None)
+    try:
+        os.remove(path)
+    except OSError as exc:
+        if exc.errno != errno.ENOENT:
+            log.error('Unable to remove the presence file %s: %s', path, exc)
+
+
+def _read_presence_file(opts, path):
+    '''
+    Return the contents of a presence file, or None if it is missing or the
+    publisher which wrote it is not running anymore
+    '''
+    try:
+        file_stat = os.stat(path)
+    except OSError:
+        _PRESENCE_CACHE.pop(path, None)
+        return None
+    stamp = (file_stat.st_ino, file_stat.st_mtime, file_stat.st_size)
+    cached = _PRESENCE_CACHE.get(path)
+    if cached is not None and cached[0] == stamp:
+        data = cached[1]
+    else:
+        serial = salt.payload.Serial(opts)
+        try:
+            with salt.utils.files.fopen(path, 'rb') as fp_:
+                data = serial.load(fp_)
+        except Exception as exc:  # pylint: disable=broad-except
+            log.debug('Unable to read the presence file %s: %s', path, exc)
+            return None
+        if not isinstance(data, dict) or 'pid' not in data:
+            return None
+        _PRESENCE_CACHE[path] = (stamp, data)
+    if not salt.utils.process.os_is_running(data['pid']):
+        log.debug('The publisher which wrote %s is not running', path)
+        return None
+    return data
+
+
+def read_presence(opts):
+    '''
+    Return the presence known to the publishers of all of the configured
+    transports as a tuple of the set of connected remote addresses and a dict
+    mapping the ids of the connected minions to their address. Return None if
+    the presence of a transport is not tracked, so the caller can fall back to
+    scanning the connections.
+    '''
+    if not opts.get('presence_tracking', True):
+        return None
+    addrs = set()
+    minions = {}
+    for transport, _ in salt.transport.iter_transport_opts(opts):
+        data = _read_presence_file(opts, presence_path(opts, transport))
+        if data is None:
+            return None
+        addrs.update(data.get('addrs', ()))
+        minions.update(data.get('minions', {}))
+    return addrs, minions
+
+
+def _normalize_addr(addr):
+    '''
+    Return an IPv4 address mapped into IPv6 as a plain IPv4 address
+    '''
+    if addr.startswith('::ffff:') and '.' in addr:
+        return addr[7:]
+    return addr
+
+
+class PresenceTracker(object):
+    '''
+    Follow the connections made to a publisher from the connect and disconnect
+    events of its ZeroMQ socket monitor, keeping the remote addresses of the
+    open connections keyed on their file descriptor.
+    '''
+    def __init__(self, opts, transport):
+        self.opts = opts
+        self.transport = transport
+        self.connections = {}
+        self.dirty = True
+        self.last_write = 0
+
+    def connected(self, fd_):
+        '''
+        Record the connection accepted on the given file descriptor
+        '''
+        # The publisher binds an IPv6 socket when ipv6 is enabled, so its
+        # connections are of the same family
+        family = socket.AF_INET6 if self.opts.get('ipv6') is True else socket.AF_INET
+        try:
+            sock = socket.fromfd(fd_, family, socket.SOCK_STREAM)
+        except (OSError, socket.error) as exc:
+            log.debug('Unable to inspect the connection on fd %s: %s', fd_, exc)
+            return
+        try:
+            addr = sock.getpeername()[0]
+        except (OSError, socket.error) as exc:
+            log.debug('Unable to get the peer of the connection on fd %s: %s',
+                      fd_, exc)
+            return
+        finally:
+            # Only the duplicated descriptor is closed
+            sock.close()
+        self.connections[fd_] = _normalize_addr(addr)
+        self.dirty = True
+
+    def disconnected(self, fd_):
+        '''
+        Forget the connection on the given file descriptor
+        '''
+        if self.connections.pop(fd_, None) is not None:
+            self.dirty = True
+
+    def addrs(self):
+        '''
+        Return the set of the connected remote addresses
+        '''
+        return set(six.itervalues(self.connections))
+
+    def flush(self, force=False):
+        '''
+        Write the presence file if the connections changed since it was last
+        written, at most once per WRITE_INTERVAL unless forced
+        '''
+        now = time.time()
+        if not self.dirty or (not force and now - self.last_write < WRITE_INTERVAL):
+            return
+        write_presence(self.opts, self.transport, addrs=self.addrs())
+        self.dirty = False
+        self.last_write = now
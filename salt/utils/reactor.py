@@ -9,6 +9,9 @@ from __future__ import absolute_import, print_function, unicode_literals
 import fnmatch
 import glob
 import logging
+import os
+import re
+import threading
 
 # Import salt libs
 import salt.client
@@ -39,6 +42,66 @@ REACTOR_INTERNAL_KEYWORDS = frozenset([
 ])
 
 
+_GLOB_CHARS = frozenset('*?[')
+
+
+class ReactMap(object):
+    '''
+    A reactor map compiled for matching event tags.
+
+    Tags without glob characters are looked up in a dict, tags which only end
+    in ``*`` are looked up by prefix, and the remaining globs are tried one by
+    one only when the union of all of them matches. The reactors are returned
+    in the order of the map, like matching every entry in turn would.
+    '''
+    def __init__(self, react_map):
+        self.reactions = []
+        self.exact = {}
+        self.prefixes = {}
+        self.prefix_lengths = set()
+        self.globs = []
+        self.glob_union = None
+        for ropt in react_map or []:
+            if not isinstance(ropt, dict):
+                continue
+            if len(ropt) != 1:
+                continue
+            key = next(six.iterkeys(ropt))
+            val = ropt[key]
+            if isinstance(val, six.string_types):
+                val = [val]
+            elif not isinstance(val, list):
+                continue
+            idx = len(self.reactions)
+            self.reactions.append(val)
+            key = os.path.normcase(six.text_type(key))
+            if not _GLOB_CHARS.intersection(key):
+                self.exact.setdefault(key, []).append(idx)
+            elif key.endswith('*') and not _GLOB_CHARS.intersection(key[:-1]):
+                self.prefixes.setdefault(key[:-1], []).append(idx)
+                self.prefix_lengths.add(len(key) - 1)
+            else:
+                self.globs.append((idx, re.compile(fnmatch.translate(key))))
+        if self.globs:
+            self.glob_union = re.compile('|'.join(
+                '(?:{0})'.format(regex.pattern) for _, regex in self.globs))
+
+    def match(self, tag):
+        '''
+        Return the list of reactors for the tag
+        '''
+        tag = os.path.normcase(tag)
+        hits = list(self.exact.get(tag, ()))
+        for length in self.prefix_lengths:
+            hits.extend(self.prefixes.get(tag[:length], ()))
+        if self.glob_union is not None and self.glob_union.match(tag):
+            hits.extend(idx for idx, regex in self.globs if regex.match(tag))
+        reactors = []
+        for idx in sorted(hits):
+            reactors.extend(self.reactions[idx])
+        return reactors
+
+
 class Reactor(salt.utils.process.SignalHandlingProcess, salt.state.Compiler):
     '''
     Read in the reactor configuration variable and compare it to events
@@ -54,8 +117,16 @@ class Reactor(salt.utils.process.SignalHandlingProcess, salt.state.Compiler):
         super(Reactor, self).__init__(**kwargs)
         local_minion_opts = opts.copy()
         local_minion_opts['file_client'] = 'local'
+        # Reactor SLS files are rendered again on every matching event, let
+        # jinja reuse their compiled code
+        local_minion_opts['__jinja_code_cache'] = True
         self.minion = salt.minion.MasterMinion(local_minion_opts)
         salt.state.Compiler.__init__(self, opts, self.minion.rend)
+        self._react_map = None
+        self._react_map_source = None
+        self.render_pool = None
+        self.stats = {'queued': 0, 'dropped': 0, 'done': 0, 'max_backlog': 0}
+        self._stats_lock = threading.Lock()
 
     # We need __setstate__ and __getstate__ to avoid pickling errors since
     # 'self.rend' (from salt.state.Compiler) contains a function reference
@@ -105,36 +176,46 @@ class Reactor(salt.utils.process.SignalHandlingProcess, salt.state.Compiler):
                 log.exception('Failed to render "%s": ', fn_)
         return react
 
-    def list_reactors(self, tag):
+    def _get_react_map(self):
         '''
-        Take in the tag from an event and return a list of the reactors to
-        process
+        Return the compiled reactor map, compiling it again only when the
+        reactor configuration, or the file it is read from, changed
         '''
-        log.debug('Gathering reactors for tag %s', tag)
-        reactors = []
+        if isinstance(self.opts['reactor'], six.string_types):
+            try:
+                stat = os.stat(self.opts['reactor'])
+                source = (self.opts['reactor'], stat.st_mtime, stat.st_size)
+            except OSError:
+                source = None
+        else:
+            source = id(self.opts['reactor'])
+        if source is not None and source == self._react_map_source:
+            return self._react_map
+
+        react_map = []
         if isinstance(self.opts['reactor'], six.string_types):
             try:
                 with salt.utils.files.fopen(self.opts['reactor']) as fp_:
                     react_map = salt.utils.yaml.safe_load(fp_)
             except (OSError, IOError):
                 log.error('Failed to read reactor map: "%s"', self.opts['reactor'])
+                source = None
             except Exception:  # pylint: disable=broad-except
                 log.error('Failed to parse YAML in reactor map: "%s"', self.opts['reactor'])
+                source = None
         else:
             react_map = self.opts['reactor']
-        for ropt in react_map:
-            if not isinstance(ropt, dict):
-                continue
-            if len(ropt) != 1:
-                continue
-            key = next(six.iterkeys(ropt))
-            val = ropt[key]
-            if fnmatch.fnmatch(tag, key):
-                if isinstance(val, six.string_types):
-                    reactors.append(val)
-                elif isinstance(val, list):
-                    reactors.extend(val)
-        return reactors
+        self._react_map = ReactMap(react_map)
+        self._react_map_source = source
+        return self._react_map
+
+    def list_reactors(self, tag):
+        '''
+        Take in the tag from an event and return a list of the reactors to
+        process
+        '''
+        log.debug('Gathering reactors for tag %s', tag)
+        return self._get_react_map().match(tag)
 
     def list_all(self):
         '''
@@ -168,6 +249,7 @@ class Reactor(salt.utils.process.SignalHandlingProcess, salt.state.Compiler):
                 return {'status': False, 'comment': 'Reactor already exists.'}
 
         self.minion.opts['reactor'].append({tag: reaction})
+        self._react_map_source = None
         return {'status': True, 'comment': 'Reactor added.'}
 
     def delete_reactor(self, tag):
@@ -179,6 +261,7 @@ class Reactor(salt.utils.process.SignalHandlingProcess, salt.state.Compiler):
             _tag = next(six.iterkeys(reactor))
             if _tag == tag:
                 self.minion.opts['reactor'].remove(reactor)
+                self._react_map_source = None
                 return {'status': True, 'comment': 'Reactor deleted.'}
 
         return {'status': False, 'comment': 'Reactor does not exists.'}
@@ -226,6 +309,59 @@ class Reactor(salt.utils.process.SignalHandlingProcess, salt.state.Compiler):
         for chunk in chunks:
             self.wrap.run(chunk)
 
+    def react(self, tag, data, reactors):
+        '''
+        Render the reactions to an event and execute them
+        '''
+        try:
+            chunks = self.reactions(tag, data, reactors)
+            if chunks:
+                try:
+                    self.call_reactions(chunks)
+                except SystemExit:
+                    log.warning('Exit ignored by reactor')
+        finally:
+            with self._stats_lock:
+                self.stats['done'] += 1
+
+    def dispatch(self, tag, data, reactors):
+        '''
+        Hand the reactions to an event over to the render pool, or react
+        right away when no render threads are configured
+        '''
+        if self.render_pool is None:
+            self.react(tag, data, reactors)
+            return
+        if self.render_pool.fire_async(self.react, args=(tag, data, reactors)):
+            with self._stats_lock:
+                self.stats['queued'] += 1
+                self.stats['max_backlog'] = max(self.stats['max_backlog'],
+                                                 self.backlog())
+        else:
+            with self._stats_lock:
+                self.stats['dropped'] += 1
+            log.error(
+                'Reactor render queue is full (%s events), dropping the '
+                'reactions to %s', self.opts['reactor_worker_hwm'], tag
+            )
+
+    def backlog(self):
+        '''
+        Return the number of events waiting for their reactions to be rendered
+        '''
+        if self.render_pool is None:
+            return 0
+        return self.render_pool._job_queue.qsize()
+
+    def get_stats(self):
+        '''
+        Return the counters of the render pool
+        '''
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats['backlog'] = self.backlog()
+        return stats
+
     def run(self):
         '''
         Enter into the server loop
@@ -240,6 +376,12 @@ class Reactor(salt.utils.process.SignalHandlingProcess, salt.state.Compiler):
                 opts=self.opts,
                 listen=True) as event:
             self.wrap = ReactWrap(self.opts)
+            render_threads = self.opts.get('reactor_render_threads', 1)
+            if render_threads > 0:
+                self.render_pool = salt.utils.process.ThreadPool(
+                    render_threads,
+                    queue_size=self.opts['reactor_worker_hwm']
+                )
 
             for data in event.iter_events(full=True):
                 # skip all events fired by ourselves
@@ -260,16 +402,14 @@ class Reactor(salt.utils.process.SignalHandlingProcess, salt.state.Compiler):
                 elif data['tag'].endswith('salt/reactors/manage/list'):
                     event.fire_event({'reactors': self.list_all()},
                                           'salt/reactors/manage/list-results')
+                elif data['tag'].endswith('salt/reactors/manage/stats'):
+                    event.fire_event({'stats': self.get_stats()},
+                                          'salt/reactors/manage/stats-results')
                 else:
                     reactors = self.list_reactors(data['tag'])
                     if not reactors:
                         continue
-                    chunks = self.reactions(data['tag'], data['data'], reactors)
-                    if chunks:
-                        try:
-                            self.call_reactions(chunks)
-                        except SystemExit:
-                            log.warning('Exit ignored by reactor')
+                    self.dispatch(data['tag'], data['data'], reactors)
 
 
 class ReactWrap(object):
@@ -10,6 +10,7 @@ import codecs
 import os
 import logging
 import tempfile
+import threading
 import traceback
 import sys
 
@@ -53,6 +54,14 @@ TEMPLATE_DIRNAME = os.path.join(saltpath[0], 'templates')
 SLS_ENCODING = 'utf-8'  # this one has no BOM.
 SLS_ENCODER = codecs.getencoder(SLS_ENCODING)
 
+# Compiled jinja templates, keyed on the hash of their source and on the
+# environment options they were compiled with. Only renders whose opts carry
+# the internal ``__jinja_code_cache`` flag, which the reactor sets for the
+# reactor SLS files it renders on every matching event, use this cache.
+JINJA_CODE_CACHE_SIZE = 256
+_JINJA_CODE_CACHE = OrderedDict()
+_JINJA_CODE_CACHE_LOCK = threading.Lock()
+
 
 class AliasedLoader(object):
     '''
@@ -285,6 +294,29 @@ def _get_jinja_error(trace, context=None):
     return line, out
 
 
+def _jinja_from_string(jinja_env, tmplstr, env_args):
+    '''
+    Return a template for tmplstr bound to jinja_env, compiling it only when
+    the same source was not already compiled with the same options
+    '''
+    key = (salt.utils.hashutils.sha256_digest(tmplstr),
+           repr(sorted((k, v) for k, v in six.iteritems(env_args)
+                       if k != 'loader')),
+           jinja_env.undefined)
+    with _JINJA_CODE_CACHE_LOCK:
+        code = _JINJA_CODE_CACHE.pop(key, None)
+        if code is not None:
+            _JINJA_CODE_CACHE[key] = code
+    if code is None:
+        code = jinja_env.compile(tmplstr)
+        with _JINJA_CODE_CACHE_LOCK:
+            _JINJA_CODE_CACHE[key] = code
+            while len(_JINJA_CODE_CACHE) > JINJA_CODE_CACHE_SIZE:
+                _JINJA_CODE_CACHE.popitem(last=False)
+    return jinja_env.template_class.from_code(
+        jinja_env, code, jinja_env.make_globals(None), None)
+
+
 def render_jinja_tmpl(tmplstr, context, tmplpath=None):
     opts = context['opts']
     saltenv = context['saltenv']
@@ -387,7 +419,10 @@ def render_jinja_tmpl(tmplstr, context, tmplpath=None):
             decoded_context[key] = salt.utils.data.decode(value)
 
     try:
-        template = jinja_env.from_string(tmplstr)
+        if opts.get('__jinja_code_cache', False):
+            template = _jinja_from_string(jinja_env, tmplstr, env_args)
+        else:
+            template = jinja_env.from_string(tmplstr)
         template.globals.update(decoded_context)
         output = template.render(**decoded_context)
     except jinja2.exceptions.UndefinedError as exc:
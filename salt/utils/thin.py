@@ -336,6 +336,59 @@ def _get_thintar_prefix(tarname):
     return tmp_tarname
 
 
+def _get_thin_manifest(members, previous=None):
+    '''
+    Return a dict mapping the name of each member of the thin archive to the
+    sha256 digest, size and mtime of the file it is packed from. Return None
+    if a file cannot be read.
+
+    members
+        An iterable of (path, arcname) tuples.
+
+    previous
+        The manifest of the existing archive. The digest of a file whose size
+        and mtime did not change since then is taken from it instead of
+        reading the file again.
+    '''
+    previous = previous or {}
+    manifest = {}
+    try:
+        for path, arcname in members:
+            stat = os.stat(path)
+            entry = previous.get(arcname)
+            if isinstance(entry, list) and len(entry) == 3 \
+                    and entry[1:] == [stat.st_size, stat.st_mtime]:
+                digest = entry[0]
+            else:
+                digest = salt.utils.hashutils.get_hash(path, 'sha256')
+            manifest[arcname] = [digest, stat.st_size, stat.st_mtime]
+    except (IOError, OSError) as exc:
+        log.debug('Unable to build the thin manifest: %s', exc)
+        return None
+    return manifest
+
+
+def _thin_manifest_digests(manifest):
+    '''
+    Return the sha256 digest of each member of a thin manifest
+    '''
+    return dict((arcname, entry[0])
+                for arcname, entry in _six.iteritems(manifest or {}))
+
+
+def _read_thin_manifest(path):
+    '''
+    Load a thin manifest written by gen_thin. Return None if it does not exist
+    or cannot be parsed.
+    '''
+    try:
+        with salt.utils.files.fopen(path, 'r') as fp_:
+            manifest = salt.utils.json.load(fp_)
+    except (IOError, OSError, TypeError, ValueError):
+        return None
+    return manifest if isinstance(manifest, dict) else None
+
+
 def gen_thin(cachedir, extra_mods='', overwrite=False, so_mods='',
              python2_bin='python2', python3_bin='python3', absonly=True,
              compress='gzip', extended_cfg=None):
@@ -344,6 +397,13 @@ def gen_thin(cachedir, extra_mods='', overwrite=False, so_mods='',
     Optional additional mods to include (e.g. mako) can be supplied as a comma
     delimited string.  Permits forcing an overwrite of the output file as well.
 
+    A manifest of the sha256 digest of every archive member is kept next to
+    the tarball, as ``thin.tgz.manifest`` or ``thin.zip.manifest``. When the
+    tarball is regenerated, the files to pack are compared with the manifest
+    first, only hashing the files whose size or mtime changed. If they did not change, the existing
+    tarball is kept without packing it again, so that its checksum does not
+    change and targets which already hold it are not redeployed.
+
     CLI Example:
 
     .. code-block:: bash
@@ -368,6 +428,7 @@ def gen_thin(cachedir, extra_mods='', overwrite=False, so_mods='',
     salt_call = os.path.join(thindir, 'salt-call')
     pymap_cfg = os.path.join(thindir, 'supported-versions')
     code_checksum = os.path.join(thindir, 'code-checksum')
+    thin_manifest = thintar + '.manifest'
     digest_collector = salt.utils.hashutils.DigestCollector()
 
     with salt.utils.files.fopen(salt_call, 'wb') as fp_:
@@ -384,19 +445,7 @@ def gen_thin(cachedir, extra_mods='', overwrite=False, so_mods='',
             else:
                 overwrite = True
 
-        if overwrite:
-            try:
-                log.debug('Removing %s archive file', thintar)
-                os.remove(thintar)
-            except OSError as exc:
-                log.error('Error while removing %s file: %s', thintar, exc)
-                if os.path.exists(thintar):
-                    raise salt.exceptions.SaltSystemExit(
-                        'Unable to remove {} file. See logs for details.'.format(
-                            thintar
-                        )
-                    )
-        else:
+        if not overwrite:
             return thintar
     if _six.PY3:
         # Let's check for the minimum python 2 version requirement, 2.6
@@ -468,19 +517,17 @@ def gen_thin(cachedir, extra_mods='', overwrite=False, so_mods='',
     with salt.utils.files.fopen(pymap_cfg, 'wb') as fp_:
         fp_.write(_get_supported_py_config(tops=tops_py_version_mapping, extended_cfg=extended_cfg))
 
-    tmp_thintar = _get_thintar_prefix(thintar)
-    if compress == 'gzip':
-        tfp = tarfile.open(tmp_thintar, 'w:gz', dereference=True)
-    elif compress == 'zip':
-        tfp = zipfile.ZipFile(tmp_thintar, 'w', compression=zlib and zipfile.ZIP_DEFLATED or zipfile.ZIP_STORED)
-        tfp.add = tfp.write
     try:  # cwd may not exist if it was removed but salt was run from it
         start_dir = os.getcwd()
     except OSError:
         start_dir = None
-    tempdir = None
+    # Eggs are extracted to temporary directories, which have to stay around
+    # until the archive is packed
+    tempdirs = []
+    # Source path and archive name of each file to pack, in packing order
+    members = []
 
-    # Pack default data
+    # Collect default data
     log.debug('Packing default libraries based on current Salt version')
     for py_ver, tops in _six.iteritems(tops_py_version_mapping):
         for top in tops:
@@ -490,13 +537,16 @@ def gen_thin(cachedir, extra_mods='', overwrite=False, so_mods='',
             top_dirname = os.path.dirname(top)
             if os.path.isdir(top_dirname):
                 os.chdir(top_dirname)
+                src_dir = top_dirname
             else:
                 # This is likely a compressed python .egg
                 tempdir = tempfile.mkdtemp()
+                tempdirs.append(tempdir)
                 egg = zipfile.ZipFile(top_dirname)
                 egg.extractall(tempdir)
                 top = os.path.join(tempdir, base)
                 os.chdir(tempdir)
+                src_dir = tempdir
 
             site_pkg_dir = _is_shareable(base) and 'pyall' or 'py{}'.format(py_ver)
 
@@ -504,28 +554,17 @@ def gen_thin(cachedir, extra_mods='', overwrite=False, so_mods='',
             if not os.path.isdir(top):
                 # top is a single file module
                 if os.path.exists(os.path.join(top_dirname, base)):
-                    tfp.add(base, arcname=os.path.join(site_pkg_dir, base))
+                    members.append((os.path.join(src_dir, base),
+                                    os.path.join(site_pkg_dir, base)))
                 continue
             for root, dirs, files in salt.utils.path.os_walk(base, followlinks=True):
                 for name in files:
                     if not name.endswith(('.pyc', '.pyo')):
                         digest_collector.add(os.path.join(root, name))
-                        arcname = os.path.join(site_pkg_dir, root, name)
-                        if hasattr(tfp, 'getinfo'):
-                            try:
-                                # This is a little slow but there's no clear way to detect duplicates
-                                tfp.getinfo(os.path.join(site_pkg_dir, root, name))
-                                arcname = None
-                            except KeyError:
-                                log.debug('ZIP: Unable to add "%s" with "getinfo"', arcname)
-                        if arcname:
-                            tfp.add(os.path.join(root, name), arcname=arcname)
-
-            if tempdir is not None:
-                shutil.rmtree(tempdir)
-                tempdir = None
+                        members.append((os.path.join(src_dir, root, name),
+                                        os.path.join(site_pkg_dir, root, name)))
 
-    # Pack alternative data
+    # Collect alternative data
     if extended_cfg:
         log.debug('Packing libraries based on alternative Salt versions')
     for ns, cfg in _six.iteritems(get_ext_tops(extended_cfg)):
@@ -539,21 +578,15 @@ def gen_thin(cachedir, extra_mods='', overwrite=False, so_mods='',
             if not os.path.isdir(top):
                 # top is a single file module
                 if os.path.exists(os.path.join(top_dirname, base)):
-                    tfp.add(base, arcname=os.path.join(ns, site_pkg_dir, base))
+                    members.append((os.path.join(top_dirname, base),
+                                    os.path.join(ns, site_pkg_dir, base)))
                 continue
             for root, dirs, files in salt.utils.path.os_walk(base, followlinks=True):
                 for name in files:
                     if not name.endswith(('.pyc', '.pyo')):
                         digest_collector.add(os.path.join(root, name))
-                        arcname = os.path.join(ns, site_pkg_dir, root, name)
-                        if hasattr(tfp, 'getinfo'):
-                            try:
-                                tfp.getinfo(os.path.join(site_pkg_dir, root, name))
-                                arcname = None
-                            except KeyError:
-                                log.debug('ZIP: Unable to add "%s" with "getinfo"', arcname)
-                        if arcname:
-                            tfp.add(os.path.join(root, name), arcname=arcname)
+                        members.append((os.path.join(top_dirname, root, name),
+                                        os.path.join(ns, site_pkg_dir, root, name)))
 
     os.chdir(thindir)
     with salt.utils.files.fopen(thinver, 'w+') as fp_:
@@ -564,14 +597,71 @@ def gen_thin(cachedir, extra_mods='', overwrite=False, so_mods='',
         fp_.write(digest_collector.digest())
     os.chdir(os.path.dirname(thinver))
 
-    for fname in ['version', '.thin-gen-py-version', 'salt-call', 'supported-versions', 'code-checksum']:
+    control_files = ['version', '.thin-gen-py-version', 'salt-call', 'supported-versions', 'code-checksum']
+    previous = None
+    if os.path.isfile(thintar):
+        previous = _read_thin_manifest(thin_manifest)
+    manifest = _get_thin_manifest(
+        members + [(os.path.join(thindir, fname), fname) for fname in control_files],
+        previous)
+    if manifest is not None and previous is not None:
+        if _thin_manifest_digests(manifest) == _thin_manifest_digests(previous):
+            log.debug('Content of %s is unchanged, keeping the existing archive',
+                      thintar)
+            for tempdir in tempdirs:
+                shutil.rmtree(tempdir)
+            if start_dir:
+                os.chdir(start_dir)
+            # Keep the sizes and mtimes of the files current
+            with salt.utils.files.fopen(thin_manifest, 'w') as fp_:
+                salt.utils.json.dump(manifest, fp_)
+            return thintar
+
+    if os.path.isfile(thintar):
+        try:
+            log.debug('Removing %s archive file', thintar)
+            os.remove(thintar)
+        except OSError as exc:
+            log.error('Error while removing %s file: %s', thintar, exc)
+            if os.path.exists(thintar):
+                raise salt.exceptions.SaltSystemExit(
+                    'Unable to remove {} file. See logs for details.'.format(
+                        thintar
+                    )
+                )
+
+    tmp_thintar = _get_thintar_prefix(thintar)
+    if compress == 'gzip':
+        tfp = tarfile.open(tmp_thintar, 'w:gz', dereference=True)
+    elif compress == 'zip':
+        tfp = zipfile.ZipFile(tmp_thintar, 'w', compression=zlib and zipfile.ZIP_DEFLATED or zipfile.ZIP_STORED)
+        tfp.add = tfp.write
+
+    for path, arcname in members:
+        if hasattr(tfp, 'getinfo'):
+            try:
+                # This is a little slow but there's no clear way to detect duplicates
+                tfp.getinfo(arcname)
+                continue
+            except KeyError:
+                log.debug('ZIP: Unable to add "%s" with "getinfo"', arcname)
+        tfp.add(path, arcname=arcname)
+
+    for fname in control_files:
         tfp.add(fname)
 
+    for tempdir in tempdirs:
+        shutil.rmtree(tempdir)
     if start_dir:
         os.chdir(start_dir)
     tfp.close()
 
     shutil.move(tmp_thintar, thintar)
+    if manifest is not None:
+        with salt.utils.files.fopen(thin_manifest, 'w') as fp_:
+            salt.utils.json.dump(manifest, fp_)
+    elif os.path.isfile(thin_manifest):
+        os.remove(thin_manifest)
 
     return thintar
 
@@ -4,13 +4,116 @@ For running command line executables with a timeout
 '''
 from __future__ import absolute_import, print_function, unicode_literals
 
+import os
 import shlex
 import subprocess
+import tempfile
 import threading
 import salt.exceptions
 import salt.utils.data
+import salt.utils.stringutils
 from salt.ext import six
 
+# Size of the reads from the pipes of a process whose output is spooled
+READ_SIZE = 65536
+
+
+class OutputSpool(object):
+    '''
+    Collect the output of a process in bounded memory. The first and the last
+    ``limit`` bytes of the output are kept, whatever comes in between is only
+    written to a spool file created in ``spool_dir`` once the output outgrows
+    the memory buffers. A ``limit`` of None keeps the whole output in memory.
+
+    The ``callback``, if any, is passed every chunk of the output as it is
+    received.
+    '''
+    def __init__(self, limit=None, spool_dir=None, prefix='', suffix='',
+                 callback=None):
+        self.limit = limit
+        self.spool_dir = spool_dir
+        self.prefix = prefix
+        self.suffix = suffix
+        self.callback = callback
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.size = 0
+        self.path = None
+        self._fp = None
+
+    @property
+    def truncated(self):
+        '''
+        Whether part of the output was dropped from memory
+        '''
+        return self.size > len(self.head) + len(self.tail)
+
+    def _spool(self):
+        '''
+        Open the spool file, which is only readable by its owner, and write
+        the output received so far to it
+        '''
+        try:
+            if not os.path.isdir(self.spool_dir):
+                os.makedirs(self.spool_dir)
+            fd_, self.path = tempfile.mkstemp(dir=self.spool_dir,
+                                              prefix=self.prefix,
+                                              suffix=self.suffix)
+        except (IOError, OSError):
+            # Keep the head and tail only
+            self.spool_dir = None
+            return
+        self._fp = os.fdopen(fd_, 'wb')
+        self._fp.write(self.head)
+        self._fp.write(self.tail)
+
+    def write(self, data):
+        '''
+        Add a chunk of output
+        '''
+        if self.callback is not None:
+            self.callback(data)
+        if self.limit is None:
+            self.head += data
+            self.size += len(data)
+            return
+        if self._fp is None and self.spool_dir is not None \
+                and self.size + len(data) > 2 * self.limit:
+            # Nothing was dropped yet, the memory buffers hold all of the
+            # output received so far
+            self._spool()
+        self.size += len(data)
+        if self._fp is not None:
+            self._fp.write(data)
+        room = self.limit - len(self.head)
+        if room > 0:
+            self.head += data[:room]
+            data = data[room:]
+        if data:
+            self.tail += data
+            if len(self.tail) > self.limit:
+                del self.tail[:len(self.tail) - self.limit]
+
+    def close(self):
+        '''
+        Close the spool file
+        '''
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
+
+    def getvalue(self):
+        '''
+        Return the output kept in memory, with a marker standing for the
+        dropped part of it
+        '''
+        if not self.truncated:
+            return bytes(self.head + self.tail)
+        marker = '\n... {0} bytes truncated{1} ...\n'.format(
+            self.size - len(self.head) - len(self.tail),
+            ', full output in {0}'.format(self.path) if self.path else '')
+        return bytes(self.head + salt.utils.stringutils.to_bytes(marker) + self.tail)
+
 
 class TimedProc(object):
     '''
@@ -23,6 +126,8 @@ class TimedProc(object):
         self.with_communicate = kwargs.pop('with_communicate', self.wait)
         self.timeout = kwargs.pop('timeout', None)
         self.stdin_raw_newlines = kwargs.pop('stdin_raw_newlines', False)
+        self.stdout_spool = kwargs.pop('stdout_spool', None)
+        self.stderr_spool = kwargs.pop('stderr_spool', None)
 
         # If you're not willing to wait for the process
         # you can't define any stdin, stdout or stderr
@@ -86,7 +191,10 @@ class TimedProc(object):
         '''
         def receive():
             if self.with_communicate:
-                self.stdout, self.stderr = self.process.communicate(input=self.stdin)
+                if self.stdout_spool is not None or self.stderr_spool is not None:
+                    self.stdout, self.stderr = self._stream()
+                else:
+                    self.stdout, self.stderr = self.process.communicate(input=self.stdin)
             elif self.wait:
                 self.process.wait()
 
@@ -111,3 +219,52 @@ class TimedProc(object):
                     )
                 )
         return self.process.returncode
+
+    def _stream(self):
+        '''
+        Read the output of the process into its spools as it is produced,
+        rather than buffering all of it like communicate does
+        '''
+        def pump(pipe, spool):
+            try:
+                while True:
+                    data = os.read(pipe.fileno(), READ_SIZE)
+                    if not data:
+                        break
+                    spool.write(data)
+            finally:
+                pipe.close()
+                spool.close()
+
+        spools = []
+        readers = []
+        for pipe, spool in ((self.process.stdout, self.stdout_spool),
+                            (self.process.stderr, self.stderr_spool)):
+            if pipe is None:
+                spools.append(None)
+                continue
+            if spool is None:
+                spool = OutputSpool()
+            spools.append(spool)
+            reader = threading.Thread(target=pump, args=(pipe, spool))
+            reader.daemon = True
+            reader.start()
+            readers.append(reader)
+        if self.process.stdin is not None:
+            try:
+                if self.stdin:
+                    self.process.stdin.write(
+                        salt.utils.stringutils.to_bytes(self.stdin))
+            except (IOError, OSError):
+                # The process exited without reading all of its input
+                pass
+            finally:
+                try:
+                    self.process.stdin.close()
+                except (IOError, OSError):
+                    pass
+        for reader in readers:
+            reader.join()
+        self.process.wait()
+        return tuple(spool.getvalue() if spool is not None else None
+                     for spool in spools)
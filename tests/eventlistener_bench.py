@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''
+Benchmark the salt-api (rest_tornado) EventListener against a local master
+event bus.
+
+An event publisher is started on a temporary sock_dir, the EventListener is
+given a number of waiting requests, the way long-polling API clients wait on
+job returns, and a separate process fires job return events at the bus. The
+event rate the listener keeps up with and the time spent dispatching each
+event are reported.
+'''
+# pylint: disable=resource-leakage
+# Import Python libs
+from __future__ import absolute_import, print_function
+import multiprocessing
+import optparse
+import shutil
+import tempfile
+import time
+
+# Import salt libs
+import salt.utils.event
+from salt.netapi.rest_tornado import saltnado
+
+# Import 3rd-party libs
+import tornado.ioloop
+from salt.ext.six.moves import range  # pylint: disable=import-error,redefined-builtin
+
+
+class Request(object):
+    '''
+    Stand-in for the tornado request a waiter belongs to
+    '''
+    _finished = False
+
+
+def parse():
+    '''
+    Parse the script command line inputs
+    '''
+    parser = optparse.OptionParser()
+    parser.add_option(
+        '-w',
+        '--waiters',
+        dest='waiters',
+        default=2000,
+        type='int',
+        help='The number of requests waiting on a job return (Default: 2000)'
+    )
+    parser.add_option(
+        '-e',
+        '--events',
+        dest='events',
+        default=20000,
+        type='int',
+        help='The number of events to fire at the bus (Default: 20000)'
+    )
+    parser.add_option(
+        '-t',
+        '--timeout',
+        dest='timeout',
+        default=120,
+        type='int',
+        help='Give up after this many seconds (Default: 120)'
+    )
+    options, _ = parser.parse_args()
+    return options
+
+
+def fire_events(sock_dir, count, waiters):
+    '''
+    Fire job return events, one in every ten of them for a waiting job
+    '''
+    event = salt.utils.event.MasterEvent(sock_dir, listen=False)
+    for num in range(count):
+        if num % 10 == 0:
+            jid = num // 10 % waiters
+        else:
+            jid = waiters + num
+        event.fire_event({'return': True},
+                         'salt/job/{0}/ret/minion{1}'.format(jid, num))
+    event.fire_event({}, 'bench/done')
+    # Let the bus flush before tearing down the socket
+    time.sleep(2)
+
+
+def run(options):
+    '''
+    Run the benchmark and print the results
+    '''
+    sock_dir = tempfile.mkdtemp()
+    publisher = salt.utils.event.EventPublisher({'sock_dir': sock_dir})
+    publisher.start()
+    try:
+        time.sleep(2)
+        io_loop = tornado.ioloop.IOLoop.current()
+        listener = saltnado.EventListener(
+            {}, {'sock_dir': sock_dir, 'transport': 'zeromq'})
+
+        dispatch_times = []
+        handle = listener._handle_event_socket_recv
+
+        def timed_handle(raw):
+            start = time.time()
+            handle(raw)
+            dispatch_times.append(time.time() - start)
+        listener.event.set_event_handler(timed_handle)
+
+        for num in range(options.waiters):
+            listener.get_event(Request(), tag='salt/job/{0}/ret/'.format(num))
+        done = listener.get_event(Request(), tag='bench/done',
+                                  matcher=saltnado.EventListener.exact_matcher)
+        done.add_done_callback(lambda future: io_loop.stop())
+        io_loop.call_later(options.timeout, io_loop.stop)
+
+        sender = multiprocessing.Process(
+            target=fire_events,
+            args=(sock_dir, options.events, options.waiters))
+        start = time.time()
+        sender.start()
+        io_loop.start()
+        elapsed = time.time() - start
+        sender.join()
+    finally:
+        publisher.terminate()
+        publisher.join()
+        shutil.rmtree(sock_dir, ignore_errors=True)
+
+    received = len(dispatch_times)
+    if not received:
+        print('No events were received')
+        return
+    dispatch_times.sort()
+    print('Waiters:            {0}'.format(options.waiters))
+    print('Events received:    {0} of {1}'.format(received, options.events + 1))
+    print('Event rate:         {0:.0f}/s'.format(received / elapsed))
+    print('Dispatch mean:      {0:.1f}us'.format(
+        sum(dispatch_times) / received * 1e6))
+    print('Dispatch p99:       {0:.1f}us'.format(
+        dispatch_times[int(received * 0.99)] * 1e6))
+    print('Dispatch max:       {0:.1f}us'.format(dispatch_times[-1] * 1e6))
+
+
+if __name__ == '__main__':
+    run(parse())
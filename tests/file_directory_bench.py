@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''
+Benchmark the recursive ownership and mode enforcement of file.directory.
+
+A tree of files is generated in a temporary directory. The time taken to check
+it file by file with file.stats, the way file.directory used to, is compared
+with the time taken by the stat based engine to check it and to fix the modes
+of a tenth of its files.
+'''
+# Import Python libs
+from __future__ import absolute_import, print_function
+import optparse
+import os
+import shutil
+import tempfile
+import time
+
+# Import salt libs
+import salt.modules.file as filemod
+import salt.states.file as filestate
+import salt.utils.files
+import salt.utils.path
+from salt.ext.six.moves import range  # pylint: disable=import-error,redefined-builtin
+
+
+def parse():
+    '''
+    Parse the script command line inputs
+    '''
+    parser = optparse.OptionParser()
+    parser.add_option(
+        '-f',
+        '--files',
+        dest='files',
+        default=100000,
+        type='int',
+        help='The number of files in the tree (Default: 100000)'
+    )
+    parser.add_option(
+        '-w',
+        '--width',
+        dest='width',
+        default=100,
+        type='int',
+        help='The number of files per directory (Default: 100)'
+    )
+    options, _ = parser.parse_args()
+    return options
+
+
+def make_tree(top, files, width):
+    '''
+    Generate a tree of files, width files per directory and width directories
+    per level
+    '''
+    paths = []
+    for num in range(files):
+        dirs = []
+        num_ = num // width
+        while num_:
+            dirs.append('d{0}'.format(num_ % width))
+            num_ //= width
+        path = os.path.join(top, *dirs)
+        if not os.path.isdir(path):
+            os.makedirs(path, 0o755)
+        path = os.path.join(path, 'f{0}'.format(num))
+        with salt.utils.files.fopen(path, 'w'):
+            pass
+        os.chmod(path, 0o644)
+        paths.append(path)
+    return paths
+
+
+def check_file_stats(top, user, group):
+    '''
+    Check the tree the way file.directory used to, file.stats per entry
+    '''
+    changes = 0
+    for root, dirs, files in salt.utils.path.os_walk(top):
+        for name in dirs + files:
+            stats = filemod.stats(os.path.join(root, name), None, False)
+            if stats['user'] != user or stats['group'] != group \
+                    or stats['mode'] not in ('0644', '0755'):
+                changes += 1
+    return changes
+
+
+def timed(func, *args, **kwargs):
+    start = time.time()
+    ret = func(*args, **kwargs)
+    return time.time() - start, ret
+
+
+def run(options):
+    '''
+    Run the benchmark and print the results
+    '''
+    filestate.__salt__ = {'file.user_to_uid': filemod.user_to_uid,
+                          'file.group_to_gid': filemod.group_to_gid}
+    top = tempfile.mkdtemp()
+    try:
+        paths = make_tree(top, options.files, options.width)
+        user = filemod.get_user(top)
+        group = filemod.get_group(top)
+        kwargs = {'user': user, 'group': group,
+                  'dir_mode': '755', 'file_mode': '644'}
+
+        elapsed, _ = timed(check_file_stats, top, user, group)
+        print('Files:                        {0}'.format(options.files))
+        print('Check with file.stats:        {0:.2f}s'.format(elapsed))
+        elapsed, ret = timed(filestate._recurse_meta, top, test=True, **kwargs)
+        print('Check with the stat engine:   {0:.2f}s ({1} directories '
+              'changed)'.format(elapsed, len(ret[0])))
+        for path in paths[::10]:
+            os.chmod(path, 0o600)
+        elapsed, ret = timed(filestate._recurse_meta, top, **kwargs)
+        print('Fix a tenth of the modes:     {0:.2f}s ({1} entries '
+              'changed)'.format(
+                  elapsed, sum(x['entries'] for x in ret[0].values())))
+    finally:
+        shutil.rmtree(top, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    run(parse())
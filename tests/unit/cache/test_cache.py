@@ -9,7 +9,7 @@ from __future__ import absolute_import, print_function, unicode_literals
 # Import Salt Testing libs
 # import integration
 from tests.support.unit import TestCase
-from tests.support.mock import patch
+from tests.support.mock import MagicMock, patch
 
 # Import Salt libs
 import salt.payload
@@ -51,6 +51,35 @@ class MemCacheTest(TestCase):
                      'memcache_debug': False}
         self.cache = salt.cache.factory(self.opts)
 
+    @patch('salt.loader.cache')
+    def test_fetch_many(self, loader_mock):
+        fetch_many = MagicMock(side_effect=lambda banks, key: dict(
+            (bank, 'data of ' + bank) for bank in banks))
+        loader_mock.return_value = {
+            'fake_driver.fetch': MagicMock(return_value='data of bank1'),
+            'fake_driver.fetch_many': fetch_many}
+        with patch('time.time', return_value=0):
+            self.cache.fetch('bank1', 'key')
+            ret = self.cache.fetch_many(['bank1', 'bank2'], 'key')
+        fetch_many.assert_called_with(['bank2'], 'key')
+        self.assertEqual(ret, {'bank1': 'data of bank1',
+                               'bank2': 'data of bank2'})
+
+        # Both banks are now served from memory
+        fetch_many.reset_mock()
+        with patch('time.time', return_value=1):
+            ret = self.cache.fetch_many(['bank1', 'bank2'], 'key')
+        fetch_many.assert_not_called()
+        self.assertEqual(ret['bank2'], 'data of bank2')
+
+    @patch('salt.loader.cache')
+    def test_fetch_many_fallback(self, loader_mock):
+        fetch = MagicMock(side_effect=lambda bank, key: bank)
+        loader_mock.return_value = {'fake_driver.fetch': fetch}
+        ret = salt.cache.Cache(self.opts).fetch_many(['bank1', 'bank2'], 'key')
+        self.assertEqual(ret, {'bank1': 'bank1', 'bank2': 'bank2'})
+        self.assertEqual(fetch.call_count, 2)
+
     @patch('salt.cache.Cache.fetch', return_value='fake_data')
     @patch('salt.loader.cache', return_value={})
     def test_fetch(self, loader_mock, cache_fetch_mock):
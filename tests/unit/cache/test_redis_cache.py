@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+'''
+unit tests for the redis cache
+'''
+
+# Import Python libs
+from __future__ import absolute_import, print_function, unicode_literals
+
+# Import Salt Testing libs
+from tests.support.mixins import LoaderModuleMockMixin
+from tests.support.unit import TestCase
+from tests.support.mock import MagicMock, patch
+
+# Import Salt libs
+import salt.payload
+import salt.cache.redis_cache as redis_cache
+
+
+class FakePipeline(object):
+    '''
+    Pipeline recording the keys read, answering from a dict
+    '''
+    def __init__(self, server):
+        self.server = server
+        self.keys = []
+
+    def get(self, key):
+        self.keys.append(key)
+
+    def execute(self):
+        self.server.round_trips += 1
+        return [self.server.data.get(key) for key in self.keys]
+
+
+class FakeRedis(object):
+    '''
+    Redis server holding its keys in a dict
+    '''
+    def __init__(self, data):
+        self.data = data
+        self.round_trips = 0
+
+    def pipeline(self, transaction=True):  # pylint: disable=unused-argument
+        return FakePipeline(self)
+
+
+class RedisCacheTestCase(TestCase, LoaderModuleMockMixin):
+    '''
+    Test the bulk reads of the redis cache
+    '''
+    def setup_loader_modules(self):
+        return {redis_cache: {'__opts__': {},
+                              '__context__': {'serial': salt.payload.Serial('msgpack')}}}
+
+    def test_fetch_many(self):
+        serial = salt.payload.Serial('msgpack')
+        data = dict(('$KEY_minions/minion{0}/data'.format(num),
+                     serial.dumps({'grains': {'num': num}}))
+                    for num in range(5))
+        server = FakeRedis(data)
+        banks = ['minions/minion{0}'.format(num) for num in range(6)]
+        with patch.object(redis_cache, '_get_redis_server',
+                          MagicMock(return_value=server)), \
+                patch.object(redis_cache, '_FETCH_MANY_CHUNK', 4):
+            ret = redis_cache.fetch_many(banks, 'data')
+        self.assertEqual(server.round_trips, 2)
+        self.assertEqual(ret['minions/minion3'], {'grains': {'num': 3}})
+        self.assertEqual(ret['minions/minion5'], {})
+        self.assertEqual(sorted(ret), sorted(banks))
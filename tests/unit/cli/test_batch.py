@@ -72,3 +72,66 @@ class BatchTestCase(TestCase):
         '''
         ret = Batch.get_bnum(self.batch)
         self.assertEqual(ret, None)
+
+    # run tests
+
+    def test_run_sliding_window(self):
+        '''
+        Tests that a new minion is started as soon as one returns, and that the
+        run blocks on the event bus instead of polling while it waits
+        '''
+        def returns(tgt):
+            # baz is slow, every other minion returns straight away
+            for minion in tgt:
+                if minion != 'baz':
+                    yield {minion: {'ret': True}}
+            if 'baz' in tgt:
+                for _ in range(3):
+                    yield None
+                yield {'baz': {'ret': True}}
+
+        started = []
+
+        def cmd_iter_no_block(tgt, *args, **kwargs):
+            started.append(list(tgt))
+            return returns(tgt)
+
+        self.batch.local.cmd_iter_no_block = cmd_iter_no_block
+        self.batch.opts = {'batch': '2', 'fun': 'test.ping', 'arg': [],
+                           'timeout': 5, 'gather_job_timeout': 5}
+        self.batch.minions = ['foo', 'bar', 'baz']
+        self.batch.ping_gen = iter(())
+        self.batch.options = None
+
+        with patch('time.sleep', MagicMock()) as sleep:
+            ret = list(self.batch.run())
+            sleep.assert_not_called()
+
+        # foo takes the slot bar frees up while baz is still running
+        self.assertEqual(ret, [{'bar': True}, {'foo': True}, {'baz': True}])
+        self.assertEqual(started, [['baz', 'bar'], ['foo']])
+        self.assertTrue(self.batch.local.event.wait_for_subscribed.called)
+
+    def test_gather_present_minions(self):
+        '''
+        Tests that batch_presence picks the connected minions without a ping
+        '''
+        opts = {'batch': '2',
+                'batch_presence': True,
+                'conf_file': {},
+                'tgt': '*',
+                'transport': '',
+                'timeout': 5,
+                'gather_job_timeout': 5}
+        ckminions = MagicMock()
+        ckminions.check_minions.return_value = {'minions': ['foo', 'bar', 'baz'],
+                                                'missing': []}
+        ckminions.connected_ids.return_value = set(['foo', 'baz'])
+        mock_client = MagicMock()
+        with patch('salt.client.get_local_client', MagicMock(return_value=mock_client)), \
+                patch('salt.utils.minions.CkMinions', MagicMock(return_value=ckminions)):
+            batch = Batch(opts, quiet=True)
+        self.assertEqual(batch.minions, ['foo', 'baz'])
+        self.assertEqual(batch.down_minions, set(['bar']))
+        mock_client.cmd_iter.assert_not_called()
+        ckminions.connected_ids.assert_called_once_with(subset=['foo', 'bar', 'baz'])
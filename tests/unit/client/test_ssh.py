@@ -148,3 +148,32 @@ class SSHSingleTests(TestCase):
                          'PasswordAuthentication=yes -o ConnectTimeout=65 -o Port=22 '
                          '-o IdentityFile=/etc/salt/pki/master/ssh/salt-ssh.rsa '
                          '-o User=root  date +%s')
+
+    def test_control_persist_opts(self):
+        '''
+        Test that ssh_control_persist multiplexes ssh and scp calls over a
+        shared ControlPath socket
+        '''
+        opts = {
+            'cachedir': self.tmp_cachedir,
+            '_ssh_version': (7, 4),
+            'ssh_control_persist': 60,
+        }
+        shell = ssh.shell.Shell(opts, 'login1', user='root', timeout=65)
+        control_path = os.path.join(
+            ssh.shell.control_dir(opts), '%C')
+        expected = ('-o ControlMaster=auto -o ControlPath={0} '
+                    '-o ControlPersist=60 '.format(control_path))
+        self.assertEqual(shell._control_opts(), expected)
+        self.assertEqual(shell._cmd_str('date +%s'),
+                         'ssh login1 {0} date +%s'.format(expected))
+        self.assertIn(expected, shell._cmd_str('a b', ssh='scp'))
+
+        opts['_ssh_version'] = (5, 3)
+        self.assertIn(
+            os.path.join(ssh.shell.control_dir(opts), '%r@%h:%p'),
+            shell._control_opts())
+
+        opts['ssh_control_persist'] = 0
+        self.assertEqual(shell._control_opts(), '')
+        self.assertEqual(shell._cmd_str('date +%s'), 'ssh login1 date +%s')
@@ -10,6 +10,7 @@ import stat
 # Import Salt libs
 import salt.config
 import salt.daemons.masterapi as masterapi
+import salt.utils.mine
 import salt.utils.platform
 
 # Import Salt Testing Libs
@@ -559,6 +560,9 @@ class FakeCache(object):
     def fetch(self, bank, key):
         return self.data[bank, key]
 
+    def fetch_many(self, banks, key):
+        return dict((bank, self.data.get((bank, key), {})) for bank in banks)
+
 
 class RemoteFuncsTestCase(TestCase):
     '''
@@ -733,3 +737,37 @@ class RemoteFuncsTestCase(TestCase):
             ret,
             {}
         )
+
+    def test_mine_get_cached(self):
+        '''
+        Asserts that with ``mine_get_cache_ttl`` set, identical requests are
+        served from the mine index and mine updates are reflected in it.
+        '''
+        self.funcs.mine_index = salt.utils.mine.MineIndex(60)
+        self.funcs.cache.store('minions/webserver', 'mine',
+                               dict(ip_addr='2001:db8::1:3'))
+        load = {'id': 'requester_minion',
+                'tgt': 'G@roles:web',
+                'fun': 'ip_addr',
+                'tgt_type': 'compound'}
+        check_minions = MagicMock(return_value={'minions': ['webserver'],
+                                                'missing': []})
+        with patch('salt.utils.minions.CkMinions._check_compound_minions',
+                   check_minions), \
+                patch.object(self.funcs.cache, 'fetch_many',
+                             wraps=self.funcs.cache.fetch_many) as fetch_many:
+            self.assertEqual(self.funcs._mine_get(dict(load)),
+                             dict(webserver='2001:db8::1:3'))
+            self.assertEqual(self.funcs._mine_get(dict(load)),
+                             dict(webserver='2001:db8::1:3'))
+            self.assertEqual(check_minions.call_count, 1)
+            self.assertEqual(fetch_many.call_count, 1)
+
+            with patch.dict(self.funcs.opts, {'minion_data_cache': True}):
+                self.funcs._mine({'id': 'webserver',
+                                  'data': dict(ip_addr='2001:db8::1:4')})
+            self.assertEqual(self.funcs._mine_get(dict(load)),
+                             dict(webserver='2001:db8::1:4'))
+            self.assertEqual(check_minions.call_count, 2)
+            # The minion's mine was indexed when it was updated
+            self.assertEqual(fetch_many.call_count, 1)
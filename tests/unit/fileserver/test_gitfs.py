@@ -260,6 +260,48 @@ class GitFSTestFuncs(object):
         self.assertIn('grail', ret)
         self.assertIn(UNICODE_DIRNAME, ret)
 
+    def test_find_file(self):
+        gitfs.update()
+        fnd = gitfs.find_file('testfile')
+        self.assertEqual(fnd['rel'], 'testfile')
+        with salt.utils.files.fopen(fnd['path'], 'rb') as fp_:
+            contents = fp_.read()
+        with salt.utils.files.fopen(
+                os.path.join(self.tmp_repo_dir, 'testfile'), 'rb') as fp_:
+            self.assertEqual(contents, fp_.read())
+        # Directories and nonexistent paths are not found
+        self.assertEqual(gitfs.find_file('grail')['path'], '')
+        self.assertEqual(gitfs.find_file('nonexistent')['path'], '')
+
+    def test_find_file_symlink(self):
+        gitfs.update()
+        fnd = gitfs.find_file('dest_sym')
+        self.assertEqual(fnd['rel'], 'dest_sym')
+        with salt.utils.files.fopen(fnd['path'], 'rb') as fp_:
+            contents = fp_.read()
+        with salt.utils.files.fopen(
+                os.path.join(self.tmp_repo_dir, 'source_sym'), 'rb') as fp_:
+            self.assertEqual(contents, fp_.read())
+
+    def test_symlink_list(self):
+        gitfs.update()
+        ret = gitfs.symlink_list(LOAD)
+        self.assertEqual(ret.get('dest_sym'), 'source_sym')
+
+    def test_tree_index_reused(self):
+        '''
+        The tree index should only be built once for an unchanged ref, no
+        matter how many lookups are made against it.
+        '''
+        gitfs.update()
+        repo = gitfs._gitfs().remotes[0]
+        repo._tree_index.clear()
+        with patch.object(repo, 'walk_tree', wraps=repo.walk_tree) as walk:
+            self.assertIsNotNone(repo.find_file('testfile', 'base')[0])
+            self.assertIn('testfile', repo.file_list('base')[0])
+            self.assertIn('grail', repo.dir_list('base'))
+            self.assertEqual(walk.call_count, 1)
+
     def test_envs(self):
         gitfs.update()
         ret = gitfs.envs(ignore_cache=True)
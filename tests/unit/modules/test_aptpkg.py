@@ -9,6 +9,8 @@
 # Import Python Libs
 from __future__ import absolute_import, print_function, unicode_literals
 import copy
+import shutil
+import tempfile
 import textwrap
 
 # Import Salt Testing Libs
@@ -20,6 +22,7 @@ from tests.support.mock import Mock, MagicMock, patch
 from salt.ext import six
 from salt.exceptions import CommandExecutionError, SaltInvocationError
 import salt.modules.aptpkg as aptpkg
+import salt.modules.pkg_resource as pkg_resource
 
 try:
     import pytest
@@ -573,6 +576,34 @@ class AptPkgTestCase(TestCase, LoaderModuleMockMixin):
             self.assertEqual(len(list_downloaded), 1)
             self.assertDictEqual(list_downloaded, DOWNLOADED_RET)
 
+    def test_list_pkgs_cached(self):
+        '''
+        Test that the package inventory is kept across jobs until the dpkg
+        database changes
+        '''
+        cachedir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cachedir)
+        stamp = [['/var/lib/dpkg/status', 1, 1234567890.0, 4096]]
+        dpkg_query = MagicMock(return_value='install ok installed wget 1.15-1ubuntu1.14.04.2 amd64')
+        with patch.dict(aptpkg.__opts__, {'cachedir': cachedir}), \
+                patch.dict(aptpkg.__grains__, {'cpuarch': 'x86_64', 'osarch': 'amd64'}), \
+                patch.dict(aptpkg.__salt__, {'cmd.run_stdout': dpkg_query,
+                                             'pkg_resource.add_pkg': pkg_resource.add_pkg,
+                                             'pkg_resource.sort_pkglist': MagicMock(),
+                                             'pkg_resource.stringify': MagicMock()}), \
+                patch('salt.utils.pkg.db_stamp', MagicMock(return_value=stamp)):
+            self.assertEqual(aptpkg.list_pkgs(versions_as_list=True),
+                             {'wget': ['1.15-1ubuntu1.14.04.2']})
+            aptpkg.__context__.clear()
+            self.assertEqual(aptpkg.list_pkgs(versions_as_list=True),
+                             {'wget': ['1.15-1ubuntu1.14.04.2']})
+            self.assertEqual(dpkg_query.call_count, 1)
+
+            aptpkg.__context__.clear()
+            stamp[0][2] += 1
+            aptpkg.list_pkgs(versions_as_list=True)
+            self.assertEqual(dpkg_query.call_count, 2)
+
 
 @skipIf(pytest is None, 'PyTest is missing')
 class AptUtilsTestCase(TestCase, LoaderModuleMockMixin):
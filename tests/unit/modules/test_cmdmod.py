@@ -6,6 +6,7 @@
 # Import python libs
 from __future__ import absolute_import, print_function, unicode_literals
 import os
+import shutil
 import sys
 import tempfile
 
@@ -555,3 +556,43 @@ class CMDMODTestCase(TestCase, LoaderModuleMockMixin):
                 cmdmod.run_chroot('/mnt', 'cmd', binds=['/var'])
                 self.assertEqual(mock_mount.call_count, 4)
                 self.assertEqual(mock_umount.call_count, 4)
+
+    @skipIf(salt.utils.platform.is_windows(), 'Do not run on Windows')
+    def test_run_all_output_limit(self):
+        '''
+        Test that the output of a command run with an output limit is
+        truncated, spooled and fired on the event bus
+        '''
+        cachedir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cachedir)
+        fire = MagicMock()
+        with patch.dict(cmdmod.__opts__, {'cachedir': cachedir,
+                                          'id': 'minion',
+                                          'cmd_output_limit': 10,
+                                          'cmd_output_events': True}), \
+                patch.dict(cmdmod.__salt__, {'event.fire': fire,
+                                             'config.get': MagicMock(return_value=None)}):
+            ret = cmdmod.run_all('seq 1000', python_shell=False,
+                                 __pub_jid='20191001000000000000')
+            # Commands run by other modules return their whole output
+            self.assertEqual(cmdmod.run('seq 1000').splitlines(),
+                             [str(num) for num in range(1, 1001)])
+
+        expected = '\n'.join(str(num) for num in range(1, 1001)) + '\n'
+        self.assertEqual(ret['retcode'], 0)
+        self.assertTrue(ret['stdout'].startswith(expected[:10]))
+        self.assertTrue(ret['stdout'].endswith(expected[-10:].rstrip()))
+        self.assertIn(
+            '{0} bytes truncated, full output in {1}'.format(
+                len(expected) - 20, ret['stdout_spool']),
+            ret['stdout'])
+        self.assertTrue(ret['stdout_spool'].startswith(
+            os.path.join(cachedir, 'cmd_output', '20191001000000000000_')))
+        with salt.utils.files.fopen(ret['stdout_spool']) as fp_:
+            self.assertEqual(fp_.read(), expected)
+        self.assertNotIn('stderr_spool', ret)
+        self.assertTrue(fire.called)
+        self.assertEqual(fire.call_args[0][1],
+                         'salt/job/20191001000000000000/prog/minion/cmd')
+        self.assertEqual(fire.call_args[0][0]['size'], len(expected))
+        self.assertTrue(expected.endswith(fire.call_args[0][0]['output']))
@@ -30,21 +30,17 @@ class ElasticsearchTestCase(TestCase):
     '''
     Test cases for salt.modules.elasticsearch
     '''
-    @staticmethod
-    def es_return_true(hosts=None, profile=None):
-        return True
-
     @staticmethod
     def es_raise_command_execution_error(hosts=None, profile=None):
         raise CommandExecutionError("custom message")
 
-    # 'ping' function tests: 2
+    # 'ping' function tests: 3
 
     def test_ping(self):
         '''
         Test if ping succeeds
         '''
-        with patch.object(elasticsearch, '_get_instance', self.es_return_true):
+        with patch.object(elasticsearch, '_get_instance', MagicMock()):
             self.assertTrue(elasticsearch.ping())
 
     def test_ping_failure(self):
@@ -54,6 +50,24 @@ class ElasticsearchTestCase(TestCase):
         with patch.object(elasticsearch, '_get_instance', self.es_raise_command_execution_error):
             self.assertFalse(elasticsearch.ping())
 
+    def test_ping_cached_instance_failure(self):
+        '''
+        Test if ping fails once the cluster behind a cached client goes away
+        '''
+        fake_es = MagicMock()
+        profile = {'host': 'es.example.com:9200'}
+        with patch.object(elasticsearch.elasticsearch, 'Elasticsearch',
+                          MagicMock(return_value=fake_es)) as es_class, \
+                patch.object(elasticsearch, '__context__', {}, create=True):
+            self.assertTrue(elasticsearch.ping(profile=profile))
+            fake_es.info.side_effect = TransportError('N/A', 'connection refused')
+            self.assertFalse(elasticsearch.ping(profile=profile))
+            self.assertRaises(CommandExecutionError,
+                              elasticsearch.ping,
+                              allow_failure=True,
+                              profile=profile)
+            self.assertEqual(es_class.call_count, 1)
+
     # 'info' function tests: 2
 
     def test_info(self):
@@ -25,6 +25,7 @@ import salt.config
 import salt.loader
 import salt.utils.data
 import salt.utils.files
+import salt.utils.hashutils
 import salt.utils.platform
 import salt.utils.stringutils
 import salt.modules.file as filemod
@@ -255,6 +256,56 @@ class FileReplaceTestCase(TestCase, LoaderModuleMockMixin):
         self.assertIsInstance(ret, bool)
         self.assertEqual(ret, False)
 
+    def test_replace_unchanged(self):
+        '''
+        Check that the file is not rewritten when the replacements leave it
+        unchanged
+        '''
+        bak_file = '{0}.bak'.format(self.tfile.name)
+        with patch('salt.modules.file._stream_edits') as stream_edits:
+            ret = filemod.replace(self.tfile.name, r'Etiam (nibh)', r'Etiam \1')
+        self.assertEqual(ret, '')
+        stream_edits.assert_not_called()
+        self.assertFalse(os.path.exists(bak_file))
+
+    def test_replace_no_preserve_inode(self):
+        bak_file = '{0}.bak'.format(self.tfile.name)
+        self.addCleanup(os.remove, bak_file)
+        inode = os.stat(self.tfile.name).st_ino
+        ret = filemod.replace(self.tfile.name, r'Etiam', 'Salticus',
+                              preserve_inode=False, show_changes=False)
+        self.assertTrue(ret)
+        self.assertNotEqual(os.stat(self.tfile.name).st_ino, inode)
+        with salt.utils.files.fopen(self.tfile.name, 'r') as fp_:
+            self.assertEqual(
+                salt.utils.stringutils.to_unicode(fp_.read()),
+                self.MULTILINE_STRING.replace('Etiam', 'Salticus'))
+        with salt.utils.files.fopen(bak_file, 'r') as fp_:
+            self.assertEqual(salt.utils.stringutils.to_unicode(fp_.read()),
+                             self.MULTILINE_STRING)
+
+    def test_replace_diff(self):
+        '''
+        Check that the diff built around the replacements matches the diff of
+        the whole files
+        '''
+        expected = salt.utils.stringutils.get_diff(
+            self.MULTILINE_STRING.splitlines(True),
+            self.MULTILINE_STRING.replace('Lorem', 'Salticus').splitlines(True))
+        ret = filemod.replace(self.tfile.name, r'Lorem', 'Salticus',
+                              backup=False, dry_run=True)
+        self.assertEqual(ret, expected)
+
+        # The second hunk does not fit
+        first_hunk = expected[:expected.rindex('@@ -')]
+        with patch('salt.modules.file.EDIT_DIFF_MAX_SIZE', len(expected) - 20):
+            ret = filemod.replace(self.tfile.name, r'Lorem', 'Salticus',
+                                  backup=False, dry_run=True)
+        self.assertEqual(
+            ret,
+            '{0}[diff truncated after {1} characters]\n'.format(
+                first_hunk, len(first_hunk) - 10))
+
 
 class FileCommentLineTestCase(TestCase, LoaderModuleMockMixin):
     def setup_loader_modules(self):
@@ -703,6 +754,24 @@ class FileBlockReplaceTestCase(TestCase, LoaderModuleMockMixin):
 
             self.assertIsInstance(ret, bool)
 
+    def test_replace_utf16(self):
+        content = os.linesep.join(['foo', '#-- START', 'old', '#-- END', ''])
+        with salt.utils.files.fopen(self.tfile.name, 'wb') as fp_:
+            fp_.write(content.encode('utf-16'))
+        with patch.dict(filemod.__utils__,
+                        {'files.get_encoding': MagicMock(return_value='utf-16')}), \
+                patch.object(filemod, 'check_perms', MagicMock()):
+            ret = filemod.blockreplace(self.tfile.name,
+                                       marker_start='#-- START',
+                                       marker_end='#-- END',
+                                       content='new',
+                                       append_newline=True,
+                                       backup=False)
+        self.assertIn('+new', ret)
+        with salt.utils.files.fopen(self.tfile.name, 'rb') as fp_:
+            self.assertEqual(fp_.read().decode('utf-16'),
+                             content.replace('old', 'new'))
+
     def test_unfinished_block_exception(self):
         self.assertRaises(
             CommandExecutionError,
@@ -865,6 +934,70 @@ class FileModuleTestCase(TestCase, LoaderModuleMockMixin):
                                                  'base')
         self.assertTrue(result, None)
 
+    def test_get_hash_cached(self):
+        '''
+        Test that the hash of a file is cached until its stat changes
+        '''
+        cachedir = tempfile.mkdtemp(dir=RUNTIME_VARS.TMP)
+        self.addCleanup(shutil.rmtree, cachedir)
+        path = os.path.join(cachedir, 'image')
+        with salt.utils.files.fopen(path, 'wb') as fp_:
+            fp_.write(b'contents')
+        expected = salt.utils.hashutils.get_hash(path, 'sha256')
+        later = MagicMock(return_value=os.stat(path).st_ctime + 10)
+        with patch.dict(filemod.__opts__, {'cachedir': cachedir}), \
+                patch('salt.modules.file.HASH_CACHE_MIN_SIZE', 0), \
+                patch('time.time', later):
+            self.assertEqual(filemod.get_hash(path), expected)
+            with patch('salt.utils.hashutils.get_hash',
+                       MagicMock(side_effect=AssertionError)):
+                self.assertEqual(filemod.get_hash(path), expected)
+                self.assertTrue(filemod.check_hash(path, expected))
+            with salt.utils.files.fopen(path, 'ab') as fp_:
+                fp_.write(b' changed')
+            self.assertEqual(filemod.get_hash(path),
+                             salt.utils.hashutils.get_hash(path, 'sha256'))
+            with patch.dict(filemod.__opts__, {'file_hash_cache': False}), \
+                    patch('salt.utils.hashutils.get_hash',
+                          MagicMock(return_value='uncached')):
+                self.assertEqual(filemod.get_hash(path), 'uncached')
+
+    def test_get_hash_cache_pruned(self):
+        '''
+        Test that the hash cache entries of removed files and of files not
+        hashed for file_hash_cache_keep hours are removed
+        '''
+        cachedir = tempfile.mkdtemp(dir=RUNTIME_VARS.TMP)
+        self.addCleanup(shutil.rmtree, cachedir)
+        hash_dir = os.path.join(cachedir, 'file_hashes')
+        paths = {}
+        for name in ('removed', 'old', 'used', 'new'):
+            paths[name] = os.path.join(cachedir, name)
+            with salt.utils.files.fopen(paths[name], 'wb') as fp_:
+                fp_.write(salt.utils.stringutils.to_bytes(name))
+        now = os.stat(paths['new']).st_ctime + 10
+        with patch.dict(filemod.__opts__, {'cachedir': cachedir}), \
+                patch('salt.modules.file.HASH_CACHE_MIN_SIZE', 0), \
+                patch('time.time', MagicMock(return_value=now)):
+            for name in ('removed', 'old', 'used'):
+                filemod.get_hash(paths[name])
+            entries = dict((name, filemod._hash_cache_path(path))
+                           for name, path in paths.items())
+            os.remove(paths['removed'])
+            os.utime(entries['old'], (now - 169 * 3600, now - 169 * 3600))
+            os.utime(entries['used'], (now - 169 * 3600, now - 169 * 3600))
+            # A cache hit keeps the entry
+            filemod.get_hash(paths['used'])
+            # Until the prune interval passed, nothing is removed
+            filemod.get_hash(paths['new'])
+            self.assertTrue(os.path.exists(entries['removed']))
+            os.utime(os.path.join(hash_dir, '.pruned'), (0, 0))
+            os.remove(entries['new'])
+            filemod.get_hash(paths['new'])
+        self.assertEqual(
+            sorted(name for name in entries if os.path.exists(entries[name])),
+            ['new', 'used'])
+
     @skipIf(salt.utils.platform.is_windows(), 'SED is not available on Windows')
     def test_sed_limit_escaped(self):
         with tempfile.NamedTemporaryFile(mode='w+') as tfile:
@@ -1099,48 +1232,33 @@ class FileModuleTestCase(TestCase, LoaderModuleMockMixin):
             baz
             яйца
             ''')
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
         diff_result = textwrap.dedent('''\
-            --- text1
-            +++ text2
+            --- {0}
+            +++ {1}
             @@ -1,4 +1,4 @@
              foo
              bar
              baz
             -спам
             +яйца
-            ''')
+            ''').format(os.path.join(tmp_dir, 'text1'),
+                        os.path.join(tmp_dir, 'text2'))
 
         # The below two variables are 8 bytes of data pulled from /dev/urandom
         binary1 = b'\xd4\xb2\xa6W\xc6\x8e\xf5\x0f'
         binary2 = b',\x13\x04\xa5\xb0\x12\xdf%'
 
-        # pylint: disable=no-self-argument
-        class MockFopen(object):
-            '''
-            Provides a fake filehandle object that has just enough to run
-            readlines() as file.get_diff does. Any significant changes to
-            file.get_diff may require this class to be modified.
-            '''
-            def __init__(mockself, path, *args, **kwargs):  # pylint: disable=unused-argument
-                mockself.path = path
-
-            def readlines(mockself):  # pylint: disable=unused-argument
-                return {
-                    'text1': text1.encode('utf8'),
-                    'text2': text2.encode('utf8'),
-                    'binary1': binary1,
-                    'binary2': binary2,
-                }[mockself.path].splitlines(True)
-
-            def __enter__(mockself):
-                return mockself
+        for name, data in (('text1', text1.encode('utf8')),
+                           ('text2', text2.encode('utf8')),
+                           ('binary1', binary1),
+                           ('binary2', binary2)):
+            with salt.utils.files.fopen(os.path.join(tmp_dir, name), 'wb') as fp_:
+                fp_.write(data)
 
-            def __exit__(mockself, *args):  # pylint: disable=unused-argument
-                pass
-        # pylint: enable=no-self-argument
-
-        fopen = MagicMock(side_effect=lambda x, *args, **kwargs: MockFopen(x))
-        cache_file = MagicMock(side_effect=lambda x, *args, **kwargs: x.split('/')[-1])
+        cache_file = MagicMock(
+            side_effect=lambda x, *args, **kwargs: os.path.join(tmp_dir, x.split('/')[-1]))
 
         # Mocks for __utils__['files.is_text']
         mock_text_text = MagicMock(side_effect=[True, True])
@@ -1148,8 +1266,7 @@ class FileModuleTestCase(TestCase, LoaderModuleMockMixin):
         mock_text_bin = MagicMock(side_effect=[True, False])
         mock_bin_text = MagicMock(side_effect=[False, True])
 
-        with patch.dict(filemod.__salt__, {'cp.cache_file': cache_file}), \
-                patch.object(salt.utils.files, 'fopen', fopen):
+        with patch.dict(filemod.__salt__, {'cp.cache_file': cache_file}):
 
             # Test diffing two text files
             with patch.dict(filemod.__utils__, {'files.is_text': mock_text_text}):
@@ -1196,6 +1313,61 @@ class FileModuleTestCase(TestCase, LoaderModuleMockMixin):
                 ret = filemod.get_diff('binary1', 'text1')
                 self.assertEqual(ret, 'Replace binary file with text file')
 
+    def _write_diff_files(self, lines1, lines2):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        paths = []
+        for name, lines in (('file1', lines1), ('file2', lines2)):
+            path = os.path.join(tmp_dir, name)
+            with salt.utils.files.fopen(path, 'w') as fp_:
+                fp_.writelines(lines)
+            paths.append(path)
+        return paths
+
+    def test_get_diff_streamed(self):
+        '''
+        Large files are diffed from the lines around their differences
+        '''
+        lines1 = ['line {0}\n'.format(num) for num in range(200)]
+        lines2 = list(lines1)
+        lines2[10] = 'changed\n'
+        lines2[150:152] = []
+        lines2.append('added')
+        file1, file2 = self._write_diff_files(lines1, lines2)
+        cache_file = MagicMock(side_effect=lambda path, *args, **kwargs: path)
+
+        with patch.dict(filemod.__salt__, {'cp.cache_file': cache_file}), \
+                patch.dict(filemod.__utils__, {'files.is_text': MagicMock(return_value=True)}), \
+                patch.object(filemod, 'DIFF_STREAM_MIN_SIZE', 0):
+            ret = filemod.get_diff(file1, file2)
+        self.assertEqual(
+            ret,
+            salt.utils.stringutils.get_diff(lines1, lines2, file1, file2))
+
+    def test_get_diff_too_large(self):
+        lines1 = ['line {0}\n'.format(num) for num in range(200)]
+        file1, file2 = self._write_diff_files(lines1, lines1[100:])
+        cache_file = MagicMock(side_effect=lambda path, *args, **kwargs: path)
+
+        with patch.dict(filemod.__salt__, {'cp.cache_file': cache_file}), \
+                patch.dict(filemod.__utils__, {'files.is_text': MagicMock(return_value=True)}), \
+                patch.dict(filemod.__opts__, {'file_diff_max_size': 100,
+                                              'hash_type': 'sha256'}):
+            ret = filemod.get_diff(file1, file2)
+        self.assertEqual(
+            ret,
+            'Diff too large to show, sha256 checksum changed from {0} to {1}'.format(
+                salt.utils.hashutils.get_hash(file1, 'sha256'),
+                salt.utils.hashutils.get_hash(file2, 'sha256')))
+
+        # The two files do not match again within DIFF_SYNC_LINES lines
+        with patch.dict(filemod.__salt__, {'cp.cache_file': cache_file}), \
+                patch.dict(filemod.__utils__, {'files.is_text': MagicMock(return_value=True)}), \
+                patch.object(filemod, 'DIFF_STREAM_MIN_SIZE', 0), \
+                patch.object(filemod, 'DIFF_SYNC_LINES', 50):
+            ret = filemod.get_diff(file1, file2)
+        self.assertTrue(ret.startswith('Diff too large to show'))
+
     def test_stats(self):
         with patch('os.path.expanduser', MagicMock(side_effect=lambda path: path)), \
                 patch('os.path.exists', MagicMock(return_value=True)), \
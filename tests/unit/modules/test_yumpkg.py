@@ -3,6 +3,9 @@
 # Import Python Libs
 from __future__ import absolute_import, unicode_literals, print_function
 import os
+import shutil
+import tempfile
+import time
 
 # Import Salt Testing Libs
 from tests.support.mixins import LoaderModuleMockMixin
@@ -126,6 +129,43 @@ class YumTestCase(TestCase, LoaderModuleMockMixin):
                 self.assertTrue(pkgs.get(pkg_name))
                 self.assertEqual(pkgs[pkg_name], [pkg_version])
 
+    def test_list_pkgs_cached(self):
+        '''
+        Test that the package inventory is kept across jobs until the rpm
+        database changes
+        '''
+        def _add_data(data, key, value):
+            data.setdefault(key, []).append(value)
+
+        cachedir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cachedir)
+        stamp = [['/var/lib/rpm/Packages', 1, 1234567890.0, 4096]]
+        rpm_qa = MagicMock(return_value='alsa-lib_|-(none)_|-1.1.1_|-1.el7_|-x86_64_|-(none)_|-1487838475')
+        with patch.dict(yumpkg.__opts__, {'cachedir': cachedir}), \
+                patch.dict(yumpkg.__salt__, {'cmd.run': rpm_qa,
+                                             'pkg_resource.add_pkg': _add_data,
+                                             'pkg_resource.format_pkg_list': pkg_resource.format_pkg_list,
+                                             'pkg_resource.stringify': MagicMock()}), \
+                patch.dict(pkg_resource.__salt__, {'pkg.parse_arch': yumpkg.parse_arch}), \
+                patch('salt.utils.pkg.db_stamp', MagicMock(return_value=stamp)):
+            self.assertEqual(yumpkg.list_pkgs(versions_as_list=True),
+                             {'alsa-lib': ['1.1.1-1.el7']})
+            yumpkg.__context__.pop('pkg.list_pkgs')
+            self.assertEqual(yumpkg.list_pkgs(versions_as_list=True),
+                             {'alsa-lib': ['1.1.1-1.el7']})
+            self.assertEqual(rpm_qa.call_count, 1)
+
+            yumpkg.__context__.pop('pkg.list_pkgs')
+            stamp[0][2] += 1
+            yumpkg.list_pkgs(versions_as_list=True)
+            self.assertEqual(rpm_qa.call_count, 2)
+
+            # Disabling the inventory cache runs rpm every time
+            yumpkg.__context__.pop('pkg.list_pkgs')
+            with patch.dict(yumpkg.__opts__, {'pkg_inventory_cache': False}):
+                yumpkg.list_pkgs(versions_as_list=True)
+            self.assertEqual(rpm_qa.call_count, 3)
+
     def test_list_pkgs_with_attr(self):
         '''
         Test packages listing with the attr parameter
@@ -521,6 +561,79 @@ class YumTestCase(TestCase, LoaderModuleMockMixin):
                         else:
                             self.fail("repo '{0}' not checked".format(repo))
 
+    def test_list_upgrades_cached(self):
+        '''
+        Test that the available upgrades are cached until the metadata cache
+        ttl runs out or the rpm database changes, unless refreshing
+        '''
+        cachedir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cachedir)
+        stamp = [['/var/lib/rpm/Packages', 1, 1234567890.0, 4096]]
+        cmd = MagicMock(return_value={
+            'retcode': 0,
+            'stdout': 'Updated Packages\nalsa-lib.x86_64 1.1.6-2.el7 base\n'})
+        with patch.dict(yumpkg.__opts__, {'cachedir': cachedir}), \
+                patch.dict(yumpkg.__salt__, {'cmd.run_all': cmd,
+                                             'config.get': MagicMock(return_value=False)}), \
+                patch.object(yumpkg, 'refresh_db', MagicMock()), \
+                patch('salt.utils.pkg.db_stamp', MagicMock(return_value=stamp)):
+            self.assertEqual(yumpkg.list_upgrades(refresh=False),
+                             {'alsa-lib': '1.1.6-2.el7'})
+            self.assertEqual(yumpkg.list_upgrades(refresh=False),
+                             {'alsa-lib': '1.1.6-2.el7'})
+            self.assertEqual(cmd.call_count, 1)
+
+            # Other options are cached on their own
+            yumpkg.list_upgrades(refresh=False, fromrepo='good')
+            self.assertEqual(cmd.call_count, 2)
+
+            # Refreshing always asks yum
+            yumpkg.list_upgrades(refresh=True)
+            self.assertEqual(cmd.call_count, 3)
+
+            stamp[0][2] += 1
+            yumpkg.list_upgrades(refresh=False)
+            self.assertEqual(cmd.call_count, 4)
+
+            with patch('time.time', MagicMock(return_value=time.time() + 301)):
+                yumpkg.list_upgrades(refresh=False)
+            self.assertEqual(cmd.call_count, 5)
+
+            with patch.dict(yumpkg.__opts__, {'pkg_metadata_cache_ttl': 0}):
+                yumpkg.list_upgrades(refresh=False)
+                yumpkg.list_upgrades(refresh=False)
+            self.assertEqual(cmd.call_count, 7)
+
+    def test_latest_version_cached(self):
+        '''
+        Test that the latest versions are cached, unless refreshing
+        '''
+        cachedir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cachedir)
+        stamp = [['/var/lib/rpm/Packages', 1, 1234567890.0, 4096]]
+        cmd = MagicMock(return_value={
+            'retcode': 0,
+            'stdout': 'Available Packages\nfoo.x86_64 1.2-3.el7 base\n'})
+        with patch.dict(yumpkg.__opts__, {'cachedir': cachedir}), \
+                patch.dict(yumpkg.__salt__, {'cmd.run_all': cmd,
+                                             'config.get': MagicMock(return_value=False)}), \
+                patch.object(yumpkg, 'list_pkgs', MagicMock(return_value={})), \
+                patch.object(yumpkg, 'refresh_db', MagicMock()), \
+                patch('salt.utils.pkg.db_stamp', MagicMock(return_value=stamp)):
+            self.assertEqual(yumpkg.latest_version('foo', refresh=False),
+                             '1.2-3.el7')
+            self.assertEqual(yumpkg.latest_version('foo', refresh=False),
+                             '1.2-3.el7')
+            self.assertEqual(cmd.call_count, 1)
+
+            # A different set of names is cached on its own
+            self.assertEqual(yumpkg.latest_version('foo', 'bar', refresh=False),
+                             {'foo': '1.2-3.el7', 'bar': ''})
+            self.assertEqual(cmd.call_count, 2)
+
+            yumpkg.latest_version('foo', refresh=True)
+            self.assertEqual(cmd.call_count, 3)
+
     def test_list_upgrades_dnf(self):
         '''
         The subcommand should be "upgrades" with dnf
@@ -18,6 +18,7 @@ from tests.support.events import eventpublisher_process
 import salt.auth
 import salt.utils.event
 import salt.utils.json
+import salt.utils.stringutils
 import salt.utils.yaml
 from salt.ext.six.moves import map, range  # pylint: disable=import-error
 try:
@@ -958,3 +959,43 @@ class TestEventListener(AsyncTestCase):
 
             self.assertEqual(0, len(event_listener.tag_map))
             self.assertEqual(0, len(event_listener.request_map))
+
+    def test_tag_index(self):
+        '''
+        Make sure an event is handed to every future waiting for its tag and
+        to no other, and that the tag index is emptied with the tag_map
+        '''
+        with eventpublisher_process(self.sock_dir):
+            event_listener = saltnado.EventListener({},  # we don't use mod_opts, don't save?
+                                                    {'sock_dir': self.sock_dir,
+                                                     'transport': 'zeromq'})
+            exact_matcher = saltnado.EventListener.exact_matcher
+
+            self._finished = False  # fit to event_listener's behavior
+            all_events = event_listener.get_event(self)
+            job = event_listener.get_event(self, tag='salt/job/1')
+            job_again = event_listener.get_event(self, tag='salt/job/1')
+            other_job = event_listener.get_event(self, tag='salt/job/2')
+            ret = event_listener.get_event(self, tag='salt/job/1/ret/m1',
+                                           matcher=exact_matcher)
+            partial = event_listener.get_event(self, tag='salt/job/1/ret',
+                                               matcher=exact_matcher)
+            custom = event_listener.get_event(self, tag='m1',
+                                              matcher=lambda mtag, tag: mtag.endswith(tag))
+
+            raw = b''.join([
+                b'salt/job/1/ret/m1',
+                salt.utils.stringutils.to_bytes(salt.utils.event.TAGEND),
+                event_listener.event.serial.dumps({'foo': 'bar'})])
+            event_listener._handle_event_socket_recv(raw)
+
+            for future in (all_events, job, job_again, ret, custom):
+                self.assertEqual(future.result()['tag'], 'salt/job/1/ret/m1')
+                self.assertEqual(future.result()['data']['foo'], 'bar')
+            for future in (other_job, partial):
+                self.assertFalse(future.done())
+
+            event_listener.clean_by_request(self)
+            self.assertEqual(0, len(event_listener.tag_map))
+            self.assertEqual(0, len(event_listener.prefix_lengths))
+            self.assertEqual(0, len(event_listener.custom_matchers))
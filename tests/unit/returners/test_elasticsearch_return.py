@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+'''
+Unit tests for the elasticsearch returner
+'''
+
+# Import Python libs
+from __future__ import absolute_import, print_function, unicode_literals
+
+# Import Salt Testing libs
+from tests.support.mixins import LoaderModuleMockMixin
+from tests.support.unit import TestCase
+from tests.support.mock import MagicMock, patch
+
+# Import Salt libs
+import salt.utils.json
+import salt.returners.elasticsearch_return as elasticsearch_return
+
+
+class ElasticsearchReturnTestCase(TestCase, LoaderModuleMockMixin):
+    '''
+    Test the elasticsearch returner
+    '''
+    def setup_loader_modules(self):
+        self.salt = {'elasticsearch.index_exists': MagicMock(return_value=True),
+                     'elasticsearch.index_create': MagicMock(),
+                     'elasticsearch.alias_create': MagicMock(),
+                     'elasticsearch.document_bulk': MagicMock(),
+                     'elasticsearch.document_create': MagicMock()}
+        return {elasticsearch_return: {'__salt__': self.salt,
+                                       '__opts__': {'id': 'master'},
+                                       '__context__': {}}}
+
+    def test_event_return_bulk(self):
+        events = [{'tag': 'salt/a', 'data': {'a': 1}},
+                  {'tag': 'salt/b', 'data': {'b': 2}},
+                  {'tag': 'salt/c', 'data': {'c': 3}}]
+        elasticsearch_return.event_return(events)
+        bulk = self.salt['elasticsearch.document_bulk']
+        self.assertEqual(bulk.call_count, 1)
+        kwargs = bulk.call_args[1]
+        self.assertEqual(kwargs['index'], 'salt-master-event-cache')
+        lines = kwargs['body'].splitlines()
+        self.assertEqual(len(lines), 6)
+        self.assertTrue(kwargs['body'].endswith('\n'))
+        self.assertIn('_id', salt.utils.json.loads(lines[0])['index'])
+        self.assertEqual([salt.utils.json.loads(line)['tag']
+                          for line in lines[1::2]],
+                         ['salt/a', 'salt/b', 'salt/c'])
+
+    def test_event_return_empty(self):
+        elasticsearch_return.event_return([])
+        self.salt['elasticsearch.document_bulk'].assert_not_called()
+
+    def test_ensure_index_cached(self):
+        ret = {'fun': 'test.ping', 'jid': '20190101000000000000',
+               'id': 'minion', 'retcode': 0, 'return': True}
+        elasticsearch_return.returner(dict(ret))
+        elasticsearch_return.returner(dict(ret))
+        self.assertEqual(self.salt['elasticsearch.index_exists'].call_count, 1)
+        self.assertEqual(
+            self.salt['elasticsearch.document_create'].call_count, 2)
+
+    def test_ensure_index_created(self):
+        with patch.dict(self.salt,
+                        {'elasticsearch.index_exists': MagicMock(return_value=False)}):
+            elasticsearch_return._ensure_index('salt-test_ping')
+            elasticsearch_return._ensure_index('salt-test_ping')
+        self.salt['elasticsearch.index_create'].assert_called_once()
+        self.salt['elasticsearch.alias_create'].assert_called_once_with(
+            'salt-test_ping-v1', 'salt-test_ping')
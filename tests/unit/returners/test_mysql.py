@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+'''
+tests.unit.returners.test_mysql
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Unit tests for the MySQL returner (mysql).
+'''
+
+# Import Python libs
+from __future__ import absolute_import, print_function, unicode_literals
+import logging
+
+# Import Salt Testing libs
+from tests.support.mixins import LoaderModuleMockMixin
+from tests.support.unit import TestCase
+from tests.support.mock import (
+    MagicMock,
+    patch
+)
+
+# Import Salt libs
+import salt.returners.mysql as mysql
+
+log = logging.getLogger(__name__)
+
+
+class MySQLConnectionTestCase(TestCase, LoaderModuleMockMixin):
+    '''
+    Tests for the pooled connections and bulk statements of mysql
+    '''
+    def setup_loader_modules(self):
+        return {mysql: {'__opts__': {'id': 'master'},
+                        '__context__': {}}}
+
+    def setUp(self):
+        class Error(Exception):
+            pass
+
+        class DatabaseError(Error):
+            pass
+
+        class OperationalError(DatabaseError):
+            pass
+
+        self.mysqldb = MagicMock()
+        self.mysqldb.Error = Error
+        self.mysqldb.DatabaseError = DatabaseError
+        self.mysqldb.connect.side_effect = lambda **kwargs: MagicMock()
+        patcher = patch.object(mysql, 'MySQLdb', self.mysqldb, create=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.object(mysql, 'OperationalError', OperationalError,
+                               create=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.object(mysql, '_get_options',
+                               MagicMock(return_value={'host': 'localhost',
+                                                       'db': 'salt'}))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _pooled(self):
+        return list(mysql.__context__['mysql_returner_conn'].values())[0]
+
+    def test_connection_reused(self):
+        with mysql._get_serv() as cur:
+            cur.execute('SELECT 1')
+        with mysql._get_serv() as cur:
+            cur.execute('SELECT 1')
+        self.assertEqual(self.mysqldb.connect.call_count, 1)
+        self._pooled()['conn'].close.assert_not_called()
+        self._pooled()['conn'].ping.assert_not_called()
+
+    def test_connection_pinged_when_idle(self):
+        with mysql._get_serv():
+            pass
+        entry = self._pooled()
+        entry['used'] -= mysql.MYSQL_PING_INTERVAL + 1
+        with mysql._get_serv():
+            pass
+        entry['conn'].ping.assert_called_once_with()
+        self.assertEqual(self.mysqldb.connect.call_count, 1)
+
+    def test_reconnect_after_failed_ping(self):
+        with mysql._get_serv():
+            pass
+        entry = self._pooled()
+        entry['used'] -= mysql.MYSQL_PING_INTERVAL + 1
+        entry['conn'].ping.side_effect = mysql.OperationalError('gone away')
+        with mysql._get_serv():
+            pass
+        self.assertEqual(self.mysqldb.connect.call_count, 2)
+        self.assertIsNot(self._pooled()['conn'], entry['conn'])
+
+    def test_reconnect_after_fork(self):
+        with patch('os.getpid', MagicMock(return_value=100)):
+            with mysql._get_serv():
+                pass
+        conn = self._pooled()['conn']
+        with patch('os.getpid', MagicMock(return_value=101)):
+            with mysql._get_serv():
+                pass
+        self.assertEqual(self.mysqldb.connect.call_count, 2)
+        self.assertEqual(self._pooled()['pid'], 101)
+        # The connection of the parent is left alone
+        conn.close.assert_not_called()
+        conn.ping.assert_not_called()
+
+    def test_connection_dropped_on_error(self):
+        with self.assertRaises(mysql.OperationalError):
+            with mysql._get_serv():
+                conn = self._pooled()['conn']
+                raise mysql.OperationalError('server closed')
+        self.assertEqual(mysql.__context__['mysql_returner_conn'], {})
+        conn.close.assert_called_once_with()
+        with mysql._get_serv():
+            pass
+        self.assertEqual(self.mysqldb.connect.call_count, 2)
+
+    def test_event_return_bulk(self):
+        events = [{'tag': 'salt/a', 'data': {'a': 1}},
+                  {'tag': 'salt/b', 'data': {'b': 2}}]
+        mysql.event_return(events)
+        cursor = self._pooled()['conn'].cursor.return_value
+        self.assertEqual(cursor.executemany.call_count, 1)
+        cursor.execute.assert_called_once_with('COMMIT')
+        rows = cursor.executemany.call_args[0][1]
+        self.assertEqual([row[0] for row in rows], ['salt/a', 'salt/b'])
+        self.assertEqual([row[2] for row in rows], ['master', 'master'])
+
+    def test_event_return_empty(self):
+        mysql.event_return([])
+        self.mysqldb.connect.assert_not_called()
+
+    def test_purge_in_chunks(self):
+        with mysql._get_serv():
+            pass
+        cursor = self._pooled()['conn'].cursor.return_value
+        rowcounts = iter([mysql.PURGE_CHUNK_SIZE, 5,
+                          mysql.PURGE_CHUNK_SIZE, mysql.PURGE_CHUNK_SIZE, 0,
+                          0])
+
+        def execute(sql, params=None):
+            if params is not None:
+                cursor.rowcount = next(rowcounts)
+        cursor.execute.side_effect = execute
+        self.assertTrue(mysql._purge_jobs('stamp'))
+        deletes = [call for call in cursor.execute.call_args_list
+                   if len(call[0]) > 1]
+        self.assertEqual(len(deletes), 6)
+        for call in deletes:
+            self.assertEqual(call[0][1], ('stamp', mysql.PURGE_CHUNK_SIZE))
+        tables = [call[0][0].split('`')[1] for call in deletes]
+        self.assertEqual(tables, ['jids', 'jids',
+                                  'salt_returns', 'salt_returns', 'salt_returns',
+                                  'salt_events'])
+        # Every chunk is committed on its own
+        commits = [call for call in cursor.execute.call_args_list
+                   if call[0] == ('COMMIT',)]
+        self.assertEqual(len(commits), 6)
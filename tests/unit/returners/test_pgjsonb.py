@@ -49,3 +49,86 @@ class PGJsonbCleanOldJobsTestCase(TestCase, LoaderModuleMockMixin):
             with patch.dict(pgjsonb.__salt__, {'config.option': MagicMock()}):
                 with patch.dict(pgjsonb.__opts__, {'archive_jobs': 1}):
                     self.assertEqual(pgjsonb.clean_old_jobs(), None)
+
+
+class PGJsonbConnectionTestCase(TestCase, LoaderModuleMockMixin):
+    '''
+    Tests for the pooled connections and bulk statements of pgjsonb
+    '''
+    def setup_loader_modules(self):
+        return {pgjsonb: {'__opts__': {'id': 'master'},
+                          '__context__': {}}}
+
+    def setUp(self):
+        class DatabaseError(Exception):
+            pass
+
+        class OperationalError(DatabaseError):
+            pass
+
+        class InterfaceError(Exception):
+            pass
+
+        self.psycopg2 = MagicMock()
+        self.psycopg2.DatabaseError = DatabaseError
+        self.psycopg2.OperationalError = OperationalError
+        self.psycopg2.InterfaceError = InterfaceError
+        self.conn = self.psycopg2.connect.return_value
+        self.conn.closed = 0
+        self.conn.server_version = 90600
+        self.cursor = self.conn.cursor.return_value
+        patcher = patch.object(pgjsonb, 'psycopg2', self.psycopg2, create=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.object(pgjsonb, '_get_options',
+                               MagicMock(return_value={'host': 'localhost',
+                                                       'db': 'salt'}))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_connection_reused(self):
+        with pgjsonb._get_serv() as cur:
+            cur.execute('SELECT 1')
+        with pgjsonb._get_serv() as cur:
+            cur.execute('SELECT 1')
+        self.assertEqual(self.psycopg2.connect.call_count, 1)
+        self.conn.close.assert_not_called()
+
+    def test_connection_checked_when_idle(self):
+        with pgjsonb._get_serv():
+            pass
+        entry = list(pgjsonb.__context__['pgjsonb_returner_conn'].values())[0]
+        entry['used'] -= pgjsonb.PG_CHECK_INTERVAL + 1
+        self.cursor.execute.side_effect = [self.psycopg2.OperationalError(),
+                                           None]
+        with pgjsonb._get_serv():
+            pass
+        self.assertEqual(self.psycopg2.connect.call_count, 2)
+
+    def test_connection_dropped_on_error(self):
+        with self.assertRaises(self.psycopg2.OperationalError):
+            with pgjsonb._get_serv():
+                raise self.psycopg2.OperationalError('server closed')
+        self.assertEqual(pgjsonb.__context__['pgjsonb_returner_conn'], {})
+        self.conn.close.assert_called_once_with()
+
+    def test_event_return_bulk(self):
+        events = [{'tag': 'salt/a', 'data': {'a': 1}},
+                  {'tag': 'salt/b', 'data': {'b': 2}}]
+        pgjsonb.event_return(events)
+        self.assertEqual(self.psycopg2.extras.execute_values.call_count, 1)
+        args = self.psycopg2.extras.execute_values.call_args[0]
+        self.assertEqual([row[0] for row in args[2]], ['salt/a', 'salt/b'])
+
+    def test_purge_in_chunks(self):
+        rowcounts = iter([pgjsonb.PURGE_CHUNK_SIZE, 5, 0, 0, 0])
+
+        def execute(sql, params=None):
+            if params is not None:
+                self.cursor.rowcount = next(rowcounts)
+        self.cursor.execute.side_effect = execute
+        self.assertTrue(pgjsonb._purge_jobs('stamp'))
+        deletes = [call for call in self.cursor.execute.call_args_list
+                   if len(call[0]) > 1]
+        self.assertEqual(len(deletes), 4)
+        self.assertEqual(deletes[0][0][1], ('stamp', pgjsonb.PURGE_CHUNK_SIZE))
@@ -6,10 +6,13 @@
 # Import python libs
 from __future__ import absolute_import, print_function, unicode_literals
 import os
+import shutil
+import tarfile
+import tempfile
 
 # Import Salt Testing libs
 from tests.support.mixins import LoaderModuleMockMixin
-from tests.support.unit import TestCase
+from tests.support.unit import TestCase, skipIf
 from tests.support.mock import (
     MagicMock,
     patch
@@ -17,6 +20,7 @@ from tests.support.mock import (
 
 # Import Salt Libs
 import salt.states.archive as archive
+import salt.utils.files
 from salt.ext.six.moves import zip  # pylint: disable=import-error,redefined-builtin
 import salt.utils.platform
 
@@ -53,6 +57,8 @@ class ArchiveTestCase(TestCase, LoaderModuleMockMixin):
                 '__opts__': {'cachedir': '/tmp',
                              'test': False,
                              'hash_type': 'sha256'},
+                # The sources used in these tests do not exist
+                '__salt__': {'file.get_hash': MagicMock(side_effect=IOError)},
                 '__env__': 'test'
             }
         }
@@ -360,3 +366,102 @@ class ArchiveTestCase(TestCase, LoaderModuleMockMixin):
                                         skip_files_list_verify=True,
                                         enforce_toplevel=False)
                 self.assertDictEqual(ret, expected_ret)
+
+
+@skipIf(salt.utils.platform.is_windows(), 'Uses POSIX paths')
+class ArchiveManifestTestCase(TestCase, LoaderModuleMockMixin):
+    '''
+    Test the extraction of real tar archives and the reuse of their manifest
+    '''
+    def setup_loader_modules(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        return {
+            archive: {
+                '__grains__': {'os': 'FooOS!'},
+                '__opts__': {'cachedir': os.path.join(self.tmp_dir, 'cache'),
+                             'test': False,
+                             'hash_type': 'sha256'},
+                '__salt__': {'file.get_hash': MagicMock(return_value='abc'),
+                             'file.source_list': MagicMock(
+                                 side_effect=lambda source, *args: (source, None)),
+                             'archive.list': MagicMock(side_effect=AssertionError)},
+                '__states__': {'file.directory': self._makedirs},
+                '__env__': 'test'
+            }
+        }
+
+    @staticmethod
+    def _makedirs(name, **kwargs):
+        os.makedirs(name)
+        return {'result': True, 'changes': {}}
+
+    def _make_archive(self, *names):
+        src = os.path.join(self.tmp_dir, 'src')
+        source = os.path.join(self.tmp_dir, 'foo.tar.gz')
+        with tarfile.open(source, 'w:gz') as tar:
+            for name in names:
+                path = os.path.join(src, name)
+                if name.endswith('/'):
+                    os.makedirs(path)
+                else:
+                    with salt.utils.files.fopen(path, 'w') as fp_:
+                        fp_.write(name)
+                tar.add(path, arcname=name.rstrip('/'), recursive=False)
+        return source
+
+    def test_extracted_stream(self):
+        source = self._make_archive('foo/', 'foo/bar', 'foo/baz/', 'foo/baz/qux')
+        name = os.path.join(self.tmp_dir, 'out')
+
+        ret = archive.extracted(name, source)
+        self.assertTrue(ret['result'], ret)
+        self.assertEqual(ret['changes']['extracted_files'],
+                         ['foo', 'foo/bar', 'foo/baz', 'foo/baz/qux'])
+        self.assertTrue(os.path.isfile(os.path.join(name, 'foo', 'baz', 'qux')))
+
+        # The manifest recorded while extracting tells the contents are present
+        ret = archive.extracted(name, source)
+        self.assertTrue(ret['result'], ret)
+        self.assertEqual(ret['changes'], {})
+        self.assertEqual(ret['comment'], 'All files in archive are already present')
+
+        os.remove(os.path.join(name, 'foo', 'bar'))
+        ret = archive.extracted(name, source)
+        self.assertTrue(ret['result'], ret)
+        self.assertTrue(os.path.isfile(os.path.join(name, 'foo', 'bar')))
+        archive.__salt__['archive.list'].assert_not_called()
+
+    def test_extracted_stream_toplevel(self):
+        source = self._make_archive('foo/', 'foo/bar', 'baz')
+        name = os.path.join(self.tmp_dir, 'out')
+
+        ret = archive.extracted(name, source)
+        self.assertFalse(ret['result'])
+        self.assertTrue(ret['comment'].startswith(
+            'Archive does not have a single top-level directory'))
+        self.assertFalse(os.path.exists(name))
+
+    def test_extracted_manifest_remote(self):
+        '''
+        A remote archive whose contents are all present is not cached
+        '''
+        source = 'salt://foo.tar.gz'
+        name = os.path.join(self.tmp_dir, 'out')
+        os.makedirs(os.path.join(name, 'foo'))
+        source_sum = {'hsum': 'abc', 'hash_type': 'sha256'}
+        archive._write_manifest(
+            source_sum,
+            {'archive_format': 'tar', 'list_options': None,
+             'strip_components': None},
+            {'dirs': ['foo/'], 'files': [], 'links': [],
+             'top_level_dirs': ['foo/'], 'top_level_files': [],
+             'top_level_links': []})
+
+        with patch.dict(archive.__salt__,
+                        {'file.get_source_sum': MagicMock(return_value=source_sum)}),\
+                patch.dict(archive.__states__,
+                           {'file.not_cached': MagicMock(return_value={'result': True})}):
+            ret = archive.extracted(name, source, source_hash='abc')
+        self.assertTrue(ret['result'], ret)
+        self.assertEqual(ret['comment'], 'All files in archive are already present')
@@ -6,6 +6,7 @@ from datetime import datetime
 import os
 import pprint
 import shutil
+import tempfile
 
 try:
     from dateutil.relativedelta import relativedelta
@@ -1280,6 +1281,47 @@ class TestFileState(TestCase, LoaderModuleMockMixin):
                                                  (name, user=user, group=group),
                                                  ret)
 
+    @skipIf(salt.utils.platform.is_windows(), 'File modes do not exist on windows')
+    def test_directory_recurse_after_failure(self):
+        '''
+        Test that file.directory still enforces the recursive ownership and
+        modes when an earlier check failed, unless the owner does not exist
+        '''
+        name = os.path.join(RUNTIME_VARS.TMP, 'recurse_after_failure')
+
+        def check_perms(path, ret, *args, **kwargs):
+            ret['result'] = False
+            ret['comment'] = 'Failed to change mode to 0755'
+            return ret, {}
+
+        recurse_meta = MagicMock(return_value=({}, []))
+        with patch.dict(filestate.__salt__,
+                        {'file.check_perms': check_perms,
+                         'file.user_to_uid': MagicMock(return_value=''),
+                         'file.group_to_gid': MagicMock(return_value=0)}), \
+                patch.object(filestate, '_check_user', MagicMock(return_value='')), \
+                patch.object(filestate, '_check_directory',
+                             MagicMock(return_value=(None, '', {name: {'mode': '0755'}}))), \
+                patch.object(filestate, '_recurse_meta', recurse_meta), \
+                patch('os.path.isdir', MagicMock(return_value=True)), \
+                patch('os.path.isfile', MagicMock(return_value=False)), \
+                patch('os.path.islink', MagicMock(return_value=False)):
+            ret = filestate.directory(name, dir_mode='755', recurse=['mode'])
+            self.assertFalse(ret['result'])
+            self.assertEqual(recurse_meta.call_count, 1)
+
+            # Without a user, the mode is still enforced
+            filestate.directory(name, dir_mode='755', recurse=['user', 'mode'])
+            self.assertEqual(recurse_meta.call_count, 2)
+            self.assertIsNone(recurse_meta.call_args[0][1])
+
+            # A user which does not exist stops the recursion
+            ret = filestate.directory(name, user='nobody', dir_mode='755',
+                                      recurse=['user', 'mode'])
+            self.assertFalse(ret['result'])
+            self.assertIn('user nobody (user does not exist)', ret['comment'])
+            self.assertEqual(recurse_meta.call_count, 2)
+
     # 'recurse' function tests: 1
 
     def test_recurse(self):
@@ -2397,8 +2439,102 @@ class TestFilePrivateFunctions(TestCase, LoaderModuleMockMixin):
 
             ret = filestate._check_directory(root_tmp_dir, dir_mode=oct(expected_dir_mode),
                                              file_mode=oct(expected_dir_mode), recurse=['mode'])
-            self.assertSetEqual(changed_files, set(ret[-1].keys()))
+            # The changes are summarized per directory
+            self.assertSetEqual(
+                set(os.path.join(os.path.dirname(c), '*') for c in changed_files),
+                set(ret[-1].keys()))
 
         finally:
             # Cleanup
             shutil.rmtree(root_tmp_dir)
+
+    @skipIf(salt.utils.platform.is_windows(), 'File modes do not exist on windows')
+    def test__recurse_meta(self):
+        '''
+        Test that _recurse_meta only changes the entries which need it and
+        summarizes the changes per directory
+        '''
+        root_tmp_dir = tempfile.mkdtemp(dir=RUNTIME_VARS.TMP)
+        self.addCleanup(shutil.rmtree, root_tmp_dir)
+        sub_dir = os.path.join(root_tmp_dir, 'sub')
+        os.mkdir(sub_dir, 0o755)
+        for path in (os.path.join(root_tmp_dir, 'a'),
+                     os.path.join(sub_dir, 'b'),
+                     os.path.join(sub_dir, 'c')):
+            with salt.utils.files.fopen(path, 'w'):
+                os.chmod(path, 0o644)
+        os.chmod(os.path.join(sub_dir, 'b'), 0o600)
+        os.chmod(os.path.join(sub_dir, 'c'), 0o600)
+        os.chmod(sub_dir, 0o700)
+        uid = os.stat(root_tmp_dir).st_uid
+        user_to_uid = MagicMock(return_value=uid)
+
+        with patch.dict(filestate.__salt__, {'file.user_to_uid': user_to_uid}):
+            changes, errors = filestate._recurse_meta(
+                root_tmp_dir, user=uid, dir_mode='755', file_mode='644',
+                test=True)
+            self.assertEqual(errors, [])
+            self.assertEqual(
+                changes,
+                {os.path.join(root_tmp_dir, '*'): {'dir_mode': '0755',
+                                                   'entries': 1},
+                 os.path.join(sub_dir, '*'): {'file_mode': '0644',
+                                              'entries': 2}})
+            self.assertEqual(os.stat(sub_dir).st_mode & 0o777, 0o700)
+
+            self.assertEqual(
+                filestate._recurse_meta(root_tmp_dir, user=uid, dir_mode='755',
+                                        file_mode='644'),
+                (changes, []))
+            self.assertEqual(os.stat(sub_dir).st_mode & 0o777, 0o755)
+            self.assertEqual(
+                os.stat(os.path.join(sub_dir, 'c')).st_mode & 0o777, 0o644)
+            self.assertEqual(
+                filestate._recurse_meta(root_tmp_dir, user=uid, dir_mode='755',
+                                        file_mode='644'),
+                ({}, []))
+        # The user is resolved once per call
+        self.assertEqual(user_to_uid.call_count, 3)
+
+    @skipIf(salt.utils.platform.is_windows(), 'File modes do not exist on windows')
+    def test__recurse_meta_max_depth(self):
+        '''
+        Test that _recurse_meta leaves the directories at max_depth, and what
+        is below them, alone
+        '''
+        root_tmp_dir = tempfile.mkdtemp(dir=RUNTIME_VARS.TMP)
+        self.addCleanup(shutil.rmtree, root_tmp_dir)
+        one = os.path.join(root_tmp_dir, 'one')
+        two = os.path.join(one, 'two')
+        three = os.path.join(two, 'three')
+        os.makedirs(three)
+        for path in (root_tmp_dir, one, two, three):
+            os.chmod(path, 0o700)
+            with salt.utils.files.fopen(os.path.join(path, 'file'), 'w'):
+                pass
+            os.chmod(os.path.join(path, 'file'), 0o600)
+
+        def modes():
+            return [(os.stat(path).st_mode & 0o777,
+                     os.stat(os.path.join(path, 'file')).st_mode & 0o777)
+                    for path in (one, two, three)]
+
+        changes, errors = filestate._recurse_meta(
+            root_tmp_dir, dir_mode='755', file_mode='644', max_depth=0)
+        self.assertEqual(errors, [])
+        self.assertEqual(
+            changes,
+            {os.path.join(root_tmp_dir, '*'): {'file_mode': '0644',
+                                               'entries': 1}})
+        self.assertEqual(modes(), [(0o700, 0o600)] * 3)
+
+        changes, errors = filestate._recurse_meta(
+            root_tmp_dir, dir_mode='755', file_mode='644', max_depth=1)
+        self.assertEqual(errors, [])
+        self.assertEqual(
+            changes,
+            {os.path.join(root_tmp_dir, '*'): {'dir_mode': '0755',
+                                               'entries': 1},
+             os.path.join(one, '*'): {'file_mode': '0644', 'entries': 1}})
+        self.assertEqual(modes(),
+                         [(0o755, 0o644), (0o700, 0o600), (0o700, 0o600)])
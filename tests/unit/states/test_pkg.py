@@ -13,6 +13,7 @@ from tests.support.mock import (
 # Import Salt Libs
 from salt.ext import six
 import salt.states.pkg as pkg
+from salt.utils.state import gen_tag
 from salt.ext.six.moves import zip
 
 
@@ -233,3 +234,38 @@ class PkgTestCase(TestCase, LoaderModuleMockMixin):
         for installed_versions, operator, version, expected_result in test_parameters:
             msg = "installed_versions: {}, operator: {}, version: {}, expected_result: {}".format(installed_versions, operator, version, expected_result)
             self.assertEqual(expected_result, pkg._fulfills_version_spec(installed_versions, operator, version), msg)
+
+    def test_mod_aggregate(self):
+        '''
+        Test that pkg.mod_aggregate merges the chunks running the same
+        transaction and marks them with the chunk they are merged into
+        '''
+        def _chunk(id_, **kwargs):
+            chunk = {'state': 'pkg', 'fun': 'installed', '__id__': id_,
+                     'name': id_, '__sls__': 'pkgs', '__env__': 'base'}
+            chunk.update(kwargs)
+            return chunk
+
+        low = _chunk('vim', require=[{'pkgrepo': 'extra'}])
+        chunks = [
+            low,
+            _chunk('git', version='2.20'),
+            _chunk('tools', pkgs=['curl', {'wget': '1.20'}]),
+            _chunk('nginx', fromrepo='testing'),
+            _chunk('httpd', refresh=True),
+            _chunk('tmux', fun='removed'),
+        ]
+        with patch.dict(pkg.__utils__, {'state.gen_tag': gen_tag}):
+            low = pkg.mod_aggregate(low, chunks, {})
+        self.assertEqual(low['pkgs'],
+                         ['vim', {'git': '2.20'}, 'curl', {'wget': '1.20'}])
+        self.assertNotIn('__agg_into__', low)
+        self.assertEqual(
+            [(chunk['__id__'], chunk['__agg_into__'], chunk['__agg_names__'])
+             for chunk in chunks if '__agg_into__' in chunk],
+            [('git', 'pkg_|-vim_|-vim_|-installed', ['git']),
+             ('tools', 'pkg_|-vim_|-vim_|-installed', ['curl', 'wget'])])
+        for chunk in chunks[3:]:
+            self.assertNotIn('__agg__', chunk)
+        # The merged chunks keep their version, for when they run on their own
+        self.assertEqual(chunks[1]['version'], '2.20')
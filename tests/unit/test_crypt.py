@@ -5,6 +5,7 @@ from __future__ import absolute_import
 import os
 import tempfile
 import shutil
+from collections import OrderedDict
 
 # salt testing libs
 from tests.support.unit import TestCase, skipIf
@@ -18,6 +19,7 @@ from tests.support.mock import (
 # salt libs
 from salt.ext import six
 import salt.utils.files
+import salt.transport.mixins.auth
 from salt import crypt
 
 # third-party libs
@@ -156,6 +158,11 @@ class CryptTestCase(TestCase):
         with patch('salt.utils.files.fopen', mock_open(read_data=PUBKEY_DATA)):
             self.assertTrue(crypt.verify_signature('/keydir/keyname.pub', MSG, SIG))
 
+    def test_load_rsa_pub_key(self):
+        key = RSA.importKey(PUBKEY_DATA)
+        for data in (PUBKEY_DATA, six.b(PUBKEY_DATA)):
+            self.assertEqual(crypt.load_rsa_pub_key(data), key)
+
 
 @skipIf(not HAS_M2, 'm2crypto is not available')
 class M2CryptTestCase(TestCase):
@@ -214,6 +221,11 @@ class M2CryptTestCase(TestCase):
         with patch('salt.utils.files.fopen', mock_open(read_data=six.b(PUBKEY_DATA))):
             self.assertTrue(crypt.verify_signature('/keydir/keyname.pub', MSG, SIG))
 
+    def test_load_rsa_pub_key(self):
+        key = M2Crypto.RSA.load_pub_key_bio(M2Crypto.BIO.MemoryBuffer(six.b(PUBKEY_DATA)))
+        for data in (PUBKEY_DATA, six.b(PUBKEY_DATA)):
+            self.assertEqual(crypt.load_rsa_pub_key(data).n, key.n)
+
     def test_encrypt_decrypt_bin(self):
         priv_key = M2Crypto.RSA.load_key_string(six.b(PRIVKEY_DATA))
         pub_key = M2Crypto.RSA.load_pub_key_bio(M2Crypto.BIO.MemoryBuffer(six.b(PUBKEY_DATA)))
@@ -265,6 +277,70 @@ class TestBadCryptodomePubKey(TestCase):
         assert key.can_encrypt()
 
 
+class AESReqServerMixinKeyCacheTestCase(TestCase):
+    '''
+    Test the caching of minion public keys in the master auth path
+    '''
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.key_path = os.path.join(self.test_dir, 'minion')
+        self._write_key(self.key_path, PUBKEY_DATA, 1000000000)
+        self.mixin = salt.transport.mixins.auth.AESReqServerMixin()
+        self.mixin._pub_key_cache = OrderedDict()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    @staticmethod
+    def _write_key(path, data, mtime=None):
+        with salt.utils.files.fopen(path, 'w') as fd:
+            fd.write(data)
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+
+    def test_get_pub_key_cached(self):
+        load = MagicMock(side_effect=salt.crypt.load_rsa_pub_key)
+        fopen = MagicMock(side_effect=salt.utils.files.fopen)
+        with patch('salt.crypt.load_rsa_pub_key', load), \
+                patch('salt.utils.files.fopen', fopen):
+            first = self.mixin._get_pub_key(self.key_path)
+            self.assertIs(self.mixin._get_pub_key(self.key_path), first)
+        self.assertEqual(load.call_count, 1)
+        # The key file is not read again either
+        self.assertEqual(fopen.call_count, 1)
+
+    def test_get_pub_key_changed_on_disk(self):
+        self.mixin._get_pub_key(self.key_path)
+        self._write_key(self.key_path, TestBadCryptodomePubKey.TEST_KEY,
+                        1000000001)
+        load = MagicMock(side_effect=salt.crypt.load_rsa_pub_key)
+        with patch('salt.crypt.load_rsa_pub_key', load):
+            self.mixin._get_pub_key(self.key_path)
+        load.assert_called_once_with(TestBadCryptodomePubKey.TEST_KEY)
+
+    def test_get_pub_key_recently_changed(self):
+        self._write_key(self.key_path, PUBKEY_DATA)
+        load = MagicMock(side_effect=salt.crypt.load_rsa_pub_key)
+        with patch('salt.crypt.load_rsa_pub_key', load):
+            self.mixin._get_pub_key(self.key_path)
+            self.mixin._get_pub_key(self.key_path)
+        self.assertEqual(load.call_count, 2)
+
+    def test_get_pub_key_missing(self):
+        with self.assertRaises(IOError):
+            self.mixin._get_pub_key(os.path.join(self.test_dir, 'missing'))
+        self.assertEqual(self.mixin._pub_key_cache, OrderedDict())
+
+    def test_get_pub_key_bounded(self):
+        other_path = os.path.join(self.test_dir, 'other')
+        self._write_key(other_path, TestBadCryptodomePubKey.TEST_KEY,
+                        1000000000)
+        with patch('salt.transport.mixins.auth.PUB_KEY_CACHE_SIZE', 1):
+            self.mixin._get_pub_key(self.key_path)
+            self.mixin._get_pub_key(other_path)
+        self.assertEqual(list(self.mixin._pub_key_cache), [other_path])
+
+
 class TestM2CryptoRegression47124(TestCase):
 
     SIGNATURE = (
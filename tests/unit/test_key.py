@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+'''
+Unit tests for salt.key
+'''
+
+# Import Python libs
+from __future__ import absolute_import, print_function, unicode_literals
+import os
+import shutil
+import tempfile
+
+# Import Salt Testing libs
+from tests.support.unit import TestCase
+from tests.support.mock import patch, MagicMock
+
+# Import Salt libs
+import salt.key
+import salt.utils.files
+import salt.utils.minions
+
+
+class KeyTestCase(TestCase):
+    '''
+    Test the key listing and matching of salt.key.Key
+    '''
+    def setUp(self):
+        self.pki_dir = tempfile.mkdtemp()
+        for keydir in (salt.key.Key.ACC, salt.key.Key.PEND,
+                       salt.key.Key.REJ, salt.key.Key.DEN):
+            os.makedirs(os.path.join(self.pki_dir, keydir))
+        self.add_key(salt.key.Key.ACC, 'web1')
+        self.add_key(salt.key.Key.ACC, 'web2')
+        self.add_key(salt.key.Key.ACC, 'db1')
+        self.add_key(salt.key.Key.PEND, 'web3')
+        opts = {'__role': 'master',
+                'pki_dir': self.pki_dir,
+                'sock_dir': self.pki_dir,
+                'transport': 'zeromq'}
+        with patch('salt.utils.event.get_event', MagicMock()):
+            self.key = salt.key.Key(opts)
+        salt.utils.minions._KEY_DIR_CACHE.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.pki_dir)
+        salt.utils.minions._KEY_DIR_CACHE.clear()
+
+    def add_key(self, keydir, name):
+        path = os.path.join(self.pki_dir, keydir, name)
+        with salt.utils.files.fopen(path, 'w') as fp_:
+            fp_.write('key')
+        return path
+
+    def age_key_dirs(self):
+        '''
+        Push the key directory mtimes into the past so their listings can be
+        cached
+        '''
+        for keydir in os.listdir(self.pki_dir):
+            path = os.path.join(self.pki_dir, keydir)
+            mtime = os.stat(path).st_mtime - 10
+            os.utime(path, (mtime, mtime))
+
+    def test_list_keys(self):
+        self.add_key(salt.key.Key.ACC, '.hidden')
+        self.assertEqual(
+            self.key.list_keys(),
+            {'minions': ['db1', 'web1', 'web2'],
+             'minions_pre': ['web3'],
+             'minions_rejected': [],
+             'minions_denied': []})
+
+    def test_list_keys_cached(self):
+        self.age_key_dirs()
+        self.key.list_keys()
+        with patch('os.listdir', MagicMock(side_effect=OSError)):
+            self.assertEqual(self.key.list_keys()['minions'],
+                             ['db1', 'web1', 'web2'])
+
+    def test_list_keys_refreshed(self):
+        self.age_key_dirs()
+        self.key.list_keys()
+        self.add_key(salt.key.Key.ACC, 'db2')
+        self.assertEqual(self.key.list_keys()['minions'],
+                         ['db1', 'db2', 'web1', 'web2'])
+
+    def test_list_status(self):
+        self.assertEqual(self.key.list_status('acc'),
+                         {'minions': ['db1', 'web1', 'web2']})
+        self.assertEqual(self.key.list_status('unaccepted'),
+                         {'minions_pre': ['web3']})
+
+    def test_name_match(self):
+        self.assertEqual(self.key.name_match('web*'),
+                         {'minions': ['web1', 'web2'],
+                          'minions_pre': ['web3']})
+        self.assertEqual(self.key.name_match('db1,web[2-3]'),
+                         {'minions': ['db1', 'web2'],
+                          'minions_pre': ['web3']})
+        self.assertEqual(self.key.name_match('web1'),
+                         {'minions': ['web1']})
+        self.assertEqual(self.key.name_match('nomatch'), {})
+
+    def test_dict_match(self):
+        self.assertEqual(
+            self.key.dict_match({'minions': ['web1', 'db*'],
+                                 'minions_pre': ['web3', 'web4']}),
+            {'minions': ['db*', 'web1'], 'minions_pre': ['web3']})
@@ -3,9 +3,13 @@
 # Import Python libs
 from __future__ import absolute_import
 
+# Import Python libs
+import zlib
+
 # Import Salt libs
 import salt.config
 import salt.master
+import salt.serializers.msgpack
 
 # Import Salt Testing Libs
 from tests.support.unit import TestCase
@@ -331,3 +335,45 @@ class ClearFuncsTestCase(TestCase):
                 patch('salt.utils.master.get_values_of_matching_keys', MagicMock(return_value=['test'])), \
                 patch('salt.utils.minions.CkMinions.auth_check', MagicMock(return_value=False)):
             self.assertEqual(mock_ret, self.clear_funcs.publish(load))
+
+
+class AESFuncsTestCase(TestCase):
+    '''
+    TestCase for salt.master.AESFuncs class
+    '''
+
+    def setUp(self):
+        self.aes_funcs = salt.master.AESFuncs.__new__(salt.master.AESFuncs)
+        self.aes_funcs.opts = salt.config.master_config(None)
+        self.aes_funcs.event = MagicMock()
+        self.aes_funcs.mminion = MagicMock()
+        self.loads = [
+            {'id': 'syndic', 'jid': '20190101000000000000', 'fun': 'test.ping',
+             'arg': [], 'return': {'web1': {'return': True},
+                                   'web2': {'return': True}}},
+            {'id': 'syndic', 'jid': '20190101000000000001', 'fun': 'test.ping',
+             'arg': [], 'return': {'web1': {'return': True}}},
+        ]
+
+    def _syndic_return(self, load):
+        with patch('os.path.exists', MagicMock(return_value=True)), \
+                patch('salt.utils.job.store_jobs') as store_jobs:
+            self.aes_funcs._syndic_return(load)
+        return store_jobs
+
+    def test_syndic_return(self):
+        store_jobs = self._syndic_return({'load': self.loads})
+        rets = store_jobs.call_args[0][1]
+        self.assertEqual(store_jobs.call_count, 1)
+        self.assertEqual(sorted((ret['jid'], ret['id']) for ret in rets),
+                         [('20190101000000000000', 'web1'),
+                          ('20190101000000000000', 'web2'),
+                          ('20190101000000000001', 'web1')])
+        self.assertEqual(rets[0]['fun'], 'test.ping')
+
+    def test_syndic_return_compressed(self):
+        load = {'compression': 'zlib',
+                'load': zlib.compress(
+                    salt.serializers.msgpack.serialize(self.loads))}
+        store_jobs = self._syndic_return(load)
+        self.assertEqual(len(store_jobs.call_args[0][1]), 3)
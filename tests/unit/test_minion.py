@@ -394,6 +394,47 @@ class MinionTestCase(TestCase, AdaptedConfigurationTestCaseMixin):
             io_loop.run_sync(lambda: minion._handle_decoded_payload(job_data))
 
 
+class SyndicManagerTestCase(TestCase):
+    '''
+    Test the forwarding of returns by salt.minion.SyndicManager
+    '''
+    def setUp(self):
+        self.manager = salt.minion.SyndicManager.__new__(salt.minion.SyndicManager)
+        self.manager.opts = {'syndic_return_batch_size': 2}
+        self.manager.raw_events = []
+        self.manager.delayed = []
+        self.manager.job_rets = {
+            None: dict(('salt/job/1/ret/minion{0}'.format(num), {'num': num})
+                       for num in range(5))
+        }
+
+    def test_forward_events_batched(self):
+        sent = []
+
+        def return_pub_syndic(values, master_id=None):
+            sent.append(values)
+            return len(sent) < 3
+        with patch.object(self.manager, '_return_pub_syndic',
+                          side_effect=return_pub_syndic):
+            self.manager._forward_events()
+        self.assertEqual([len(values) for values in sent], [2, 2, 1])
+        # The last batch was not taken, it stays for the next round
+        self.assertEqual(len(self.manager.job_rets[None]), 1)
+
+        with patch.object(self.manager, '_return_pub_syndic',
+                          return_value=True):
+            self.manager._forward_events()
+        self.assertEqual(self.manager.job_rets, {})
+
+    def test_forward_events_unbatched(self):
+        self.manager.opts['syndic_return_batch_size'] = 0
+        with patch.object(self.manager, '_return_pub_syndic',
+                          return_value=True) as return_pub_syndic:
+            self.manager._forward_events()
+        self.assertEqual(len(return_pub_syndic.call_args[0][0]), 5)
+        self.assertEqual(self.manager.job_rets, {})
+
+
 class MinionAsyncTestCase(TestCase, AdaptedConfigurationTestCaseMixin, tornado.testing.AsyncTestCase):
 
     def setUp(self):
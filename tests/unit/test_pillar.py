@@ -11,6 +11,7 @@
 from __future__ import absolute_import
 import shutil
 import tempfile
+import threading
 
 # Import Salt Testing libs
 from tests.support.runtests import RUNTIME_VARS
@@ -325,6 +326,51 @@ class PillarTestCase(TestCase):
             'mocked-minion', 'fake_pillar', 'bar',
             extra_minion_data={'fake_key': 'foo'})
 
+    def test_ext_pillar_concurrency(self):
+        '''
+        Independent ext_pillars are fetched concurrently and merged in order
+        '''
+        opts = {
+            'optimization_order': [0, 1, 2],
+            'renderer': 'json',
+            'renderer_blacklist': [],
+            'renderer_whitelist': [],
+            'state_top': '',
+            'pillar_roots': {'base': []},
+            'file_roots': {'base': []},
+            'extension_modules': '',
+            'ext_pillar': [{'first': {}}, {'dependent': {}}, {'second': {}}],
+            'ext_pillar_concurrency': 2,
+            'ext_pillar_independent': ['first', 'second'],
+        }
+        second_started = threading.Event()
+
+        def first(minion_id, pillar):
+            # Only returns once the second ext_pillar is being fetched
+            return {'concurrent': second_started.wait(5), 'key': 'first'}
+
+        def dependent(minion_id, pillar):
+            return {'seen': sorted(pillar)}
+
+        def second(minion_id, pillar):
+            second_started.set()
+            return {'key': 'second'}
+
+        with patch('salt.loader.pillars',
+                   MagicMock(return_value={'first': first,
+                                           'dependent': dependent,
+                                           'second': second})):
+            pillar = salt.pillar.Pillar(opts, {}, 'mocked-minion', 'base')
+        ret, errors = pillar.ext_pillar({'top': True})
+        self.assertEqual(errors, [])
+        self.assertEqual(ret, {'top': True,
+                               'concurrent': True,
+                               'key': 'second',
+                               'seen': ['concurrent', 'key', 'top']})
+        self.assertEqual(
+            [(x['ext_pillar'], x['concurrent']) for x in pillar.ext_pillar_timing],
+            [('first', True), ('dependent', False), ('second', True)])
+
     def test_ext_pillar_first(self):
         '''
         test when using ext_pillar and ext_pillar_first
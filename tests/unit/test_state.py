@@ -21,6 +21,7 @@ from tests.support.helpers import with_tempfile
 # Import Salt libs
 import salt.exceptions
 import salt.state
+import salt.states.pkg
 from salt.utils.odict import OrderedDict
 from salt.utils.decorators import state as statedecorators
 import salt.utils.files
@@ -32,6 +33,13 @@ except ImportError as err:
     pytest = None
 
 
+class MockStates(dict):
+    '''
+    Stand-in for the loader of the state modules
+    '''
+    inject_globals = {}
+
+
 class StateCompilerTestCase(TestCase, AdaptedConfigurationTestCaseMixin):
     '''
     TestCase for the state compiler.
@@ -221,6 +229,168 @@ class StateCompilerTestCase(TestCase, AdaptedConfigurationTestCaseMixin):
             return_result = state_obj._run_check_unless(low_data, '')
             self.assertEqual(expected_result, return_result)
 
+    def _agg_chunk(self, id_, **kwargs):
+        chunk = {'state': 'pkg', 'fun': 'installed', '__id__': id_,
+                 'name': id_, '__sls__': 'pkgs', '__env__': 'base'}
+        chunk.update(kwargs)
+        return chunk
+
+    def test_aggregate_chunks(self):
+        '''
+        Test that only the chunks whose requisites allow it are aggregated
+        '''
+        with patch('salt.state.State._gather_pillar'):
+            state_obj = salt.state.State(self.get_temp_config('minion'))
+        low = self._agg_chunk('vim', require=[{'pkgrepo': 'extra'}])
+        conf = {'state': 'file', 'fun': 'managed', '__id__': 'conf',
+                'name': '/etc/conf', '__sls__': 'conf', '__env__': 'base'}
+        chunks = [
+            low,
+            {'state': 'pkgrepo', 'fun': 'managed', '__id__': 'extra',
+             'name': 'extra', '__sls__': 'repos', '__env__': 'base'},
+            self._agg_chunk('git'),
+            self._agg_chunk('curl', require=[{'pkgrepo': 'extra'}]),
+            self._agg_chunk('nginx', require=[{'file': '/etc/conf'}]),
+            self._agg_chunk('httpd', require=[{'sls': 'repos'}]),
+            self._agg_chunk('tmux', watch=[{'file': '/etc/conf'}]),
+            self._agg_chunk('zsh', unless='true'),
+            self._agg_chunk('wget', aggregate=False),
+            self._agg_chunk('less', require=[{'pkg': 'missing'}]),
+        ]
+        # The file is managed by a state which runs after all of them
+        chunks.append(conf)
+        running = {}
+        self.assertEqual(
+            [chunk['__id__'] for chunk in
+             state_obj._aggregate_chunks(low, running, chunks)],
+            ['vim', 'git', 'curl', 'httpd'])
+        # Once the file has been managed, the states requiring it are safe
+        running['file_|-conf_|-/etc/conf_|-managed'] = {'result': True}
+        running['pkgrepo_|-extra_|-extra_|-managed'] = {'result': True}
+        self.assertEqual(
+            [chunk['__id__'] for chunk in
+             state_obj._aggregate_chunks(low, running, chunks)],
+            ['vim', 'git', 'curl', 'nginx', 'httpd'])
+
+    def test_aggregate_chunks_order(self):
+        '''
+        Test that the chunks ordered after a state which has not run are not
+        aggregated into an earlier chunk
+        '''
+        with patch('salt.state.State._gather_pillar'):
+            state_obj = salt.state.State(self.get_temp_config('minion'))
+        low = self._agg_chunk('vim')
+        repo = {'state': 'pkgrepo', 'fun': 'managed', '__id__': 'extra',
+                'name': 'extra', '__sls__': 'repos', '__env__': 'base'}
+        cmd = {'state': 'cmd', 'fun': 'run', '__id__': 'setup',
+               'name': 'setup-repo', '__sls__': 'repos', '__env__': 'base'}
+        chunks = [
+            low,
+            self._agg_chunk('git'),
+            repo,
+            self._agg_chunk('nginx'),
+            cmd,
+            self._agg_chunk('httpd', order=10001),
+        ]
+        running = {}
+        self.assertEqual(
+            [chunk['__id__'] for chunk in
+             state_obj._aggregate_chunks(low, running, chunks)],
+            ['vim', 'git'])
+        running['pkgrepo_|-extra_|-extra_|-managed'] = {'result': True}
+        self.assertEqual(
+            [chunk['__id__'] for chunk in
+             state_obj._aggregate_chunks(low, running, chunks)],
+            ['vim', 'git', 'nginx'])
+        running['cmd_|-setup_|-setup-repo_|-run'] = {'result': True}
+        self.assertEqual(
+            [chunk['__id__'] for chunk in
+             state_obj._aggregate_chunks(low, running, chunks)],
+            ['vim', 'git', 'nginx', 'httpd'])
+        # A state required by the chunk runs before it
+        low['require'] = [{'pkgrepo': 'extra'}]
+        del running['pkgrepo_|-extra_|-extra_|-managed']
+        self.assertEqual(
+            [chunk['__id__'] for chunk in
+             state_obj._aggregate_chunks(low, running, chunks)],
+            ['vim', 'git', 'nginx', 'httpd'])
+
+    def test_aggregate_failed_require(self):
+        '''
+        Test that the chunks merged into an aggregate whose requisites failed
+        run on their own with their own arguments
+        '''
+        with patch('salt.state.State._gather_pillar'):
+            state_obj = salt.state.State(self.get_temp_config('minion'))
+        installed = []
+
+        def pkg_installed(name, version=None, pkgs=None, **kwargs):  # pylint: disable=unused-argument
+            installed.append((name, version, pkgs))
+            return {'name': name, 'result': True, 'changes': {},
+                    'comment': 'All specified packages are already installed'}
+
+        def fail(name, **kwargs):  # pylint: disable=unused-argument
+            return {'name': name, 'result': False, 'changes': {},
+                    'comment': 'Failure!'}
+
+        chunks = [
+            {'state': 'test', 'fun': 'fail_without_changes', '__id__': 'broken',
+             'name': 'broken', '__sls__': 'pkgs', '__env__': 'base'},
+            self._agg_chunk('vim', require=[{'test': 'broken'}]),
+            self._agg_chunk('git', version='2.20'),
+        ]
+        states = MockStates({'pkg.installed': pkg_installed,
+                             'pkg.mod_aggregate': salt.states.pkg.mod_aggregate,
+                             'test.fail_without_changes': fail})
+        with patch.object(state_obj, 'states', states), \
+                patch.object(state_obj, 'check_refresh', MagicMock()), \
+                patch.object(state_obj, '_mod_init', MagicMock()), \
+                patch.dict(salt.states.pkg.__dict__,
+                           {'__utils__': {'state.gen_tag': salt.state._gen_tag}}):
+            ret = state_obj.call_chunks(chunks)
+        self.assertFalse(ret['pkg_|-vim_|-vim_|-installed']['result'])
+        self.assertTrue(ret['pkg_|-git_|-git_|-installed']['result'])
+        self.assertEqual(installed, [('git', '2.20', None)])
+
+    def test_aggregate_changes(self):
+        '''
+        Test that the changes made by an aggregate are reported by the chunks
+        merged into it
+        '''
+        with patch('salt.state.State._gather_pillar'):
+            state_obj = salt.state.State(self.get_temp_config('minion'))
+        low = self._agg_chunk('vim', __agg__=True)
+        git = self._agg_chunk('git', __agg__=True,
+                              __agg_into__='pkg_|-vim_|-vim_|-installed',
+                              __agg_names__=['git'])
+        state_obj.agg_merged['pkg_|-vim_|-vim_|-installed'] = [git]
+        changes = {'vim': {'old': '', 'new': '8.1'},
+                   'git': {'old': '', 'new': '2.20'},
+                   'libcurl': {'old': '', 'new': '7.64'}}
+        low_ret = {'result': True, 'name': 'vim', 'changes': dict(changes),
+                   'comment': 'The following packages were installed/updated: git, vim'}
+        git_ret = {'result': True, 'name': 'git', 'changes': {},
+                   'comment': 'All specified packages are already installed'}
+        states = MockStates(
+            {'pkg.installed': MagicMock(side_effect=[low_ret, git_ret])})
+        with patch.object(state_obj, 'states', states), \
+                patch.object(state_obj, 'check_refresh', MagicMock()), \
+                patch('salt.utils.args.format_call',
+                      MagicMock(return_value={'full': 'pkg.installed',
+                                              'args': [], 'kwargs': {}})):
+            ret = state_obj.call(low)
+            self.assertEqual(ret['changes'],
+                             {'vim': changes['vim'],
+                              'libcurl': changes['libcurl']})
+            ret = state_obj.call(git)
+            self.assertEqual(ret['changes'], {'git': changes['git']})
+            self.assertEqual(
+                ret['comment'],
+                'Changes made by the aggregated execution of state \'vim\': git\n'
+                'All specified packages are already installed')
+        self.assertEqual(state_obj.agg_changes, {})
+
+
 
 class HighStateTestCase(TestCase, AdaptedConfigurationTestCaseMixin):
     def setUp(self):
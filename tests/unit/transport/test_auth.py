@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+'''
+    tests.unit.transport.test_auth
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Unit tests for the signature caches of the master-side auth crypto
+'''
+
+# Import python libs
+from __future__ import absolute_import, print_function, unicode_literals
+import binascii
+import os
+import shutil
+import tempfile
+
+# Import Salt Testing libs
+from tests.support.unit import TestCase
+from tests.support.mock import MagicMock, patch
+
+# Import Salt libs
+import salt.transport.mixins.auth
+import salt.utils.files
+
+
+class AESReqServerMixinSignatureTestCase(TestCase):
+    '''
+    Test the reuse of the AES key and master pubkey signatures
+    '''
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.test_dir)
+        self.sign_path = os.path.join(self.test_dir, 'master_sign.pub')
+        self._touch(self.sign_path, 1000000000)
+        self.mixin = salt.transport.mixins.auth.AESReqServerMixin()
+        self.mixin.opts = {'signing_key_pass': None}
+        self.mixin.master_key = MagicMock()
+        self.mixin.master_key.get_sign_paths.return_value = (
+            os.path.join(self.test_dir, 'master_sign.pem'), self.sign_path)
+        self.mixin._pub_sig_cache = {}
+        self.mixin._aes_sig_cache = {}
+
+    @staticmethod
+    def _touch(path, mtime):
+        with salt.utils.files.fopen(path, 'w'):
+            pass
+        os.utime(path, (mtime, mtime))
+
+    def test_sign_aes_cached(self):
+        encrypt = MagicMock(side_effect=lambda key, digest: b'sig:' + digest)
+        with patch('salt.crypt.private_encrypt', encrypt):
+            first = self.mixin._sign_aes(b'aes1')
+            self.assertEqual(self.mixin._sign_aes(b'aes1'), first)
+        self.assertEqual(encrypt.call_count, 1)
+
+    def test_sign_aes_new_session(self):
+        encrypt = MagicMock(side_effect=lambda key, digest: b'sig:' + digest)
+        with patch('salt.crypt.private_encrypt', encrypt):
+            first = self.mixin._sign_aes(b'aes1')
+            second = self.mixin._sign_aes(b'aes2')
+            self.assertNotEqual(first, second)
+            # Only the signature of the current AES key is kept
+            self.mixin._sign_aes(b'aes1')
+        self.assertEqual(encrypt.call_count, 3)
+
+    def test_sign_aes_new_master_key(self):
+        encrypt = MagicMock(side_effect=lambda key, digest: b'sig:' + digest)
+        with patch('salt.crypt.private_encrypt', encrypt):
+            self.mixin._sign_aes(b'aes1')
+            self.mixin.master_key.key = MagicMock()
+            self.mixin._sign_aes(b'aes1')
+        self.assertEqual(encrypt.call_count, 2)
+        self.assertIs(encrypt.call_args[0][0], self.mixin.master_key.key)
+
+    def test_sign_pub_key_cached(self):
+        sign = MagicMock(return_value=b'signature')
+        with patch('salt.crypt.sign_message', sign), \
+                patch('salt.utils.sdb.sdb_get', MagicMock(return_value=None)):
+            first = self.mixin._sign_pub_key('pub1')
+            self.assertEqual(self.mixin._sign_pub_key('pub1'), first)
+        self.assertEqual(first, binascii.b2a_base64(b'signature'))
+        sign.assert_called_once_with(self.sign_path, 'pub1', None)
+
+    def test_sign_pub_key_changed(self):
+        sign = MagicMock(return_value=b'signature')
+        with patch('salt.crypt.sign_message', sign), \
+                patch('salt.utils.sdb.sdb_get', MagicMock(return_value=None)):
+            self.mixin._sign_pub_key('pub1')
+            # A new master public key
+            self.mixin._sign_pub_key('pub2')
+            self.assertEqual(sign.call_count, 2)
+            # A new signing key
+            self._touch(self.sign_path, 1000000001)
+            self.mixin._sign_pub_key('pub2')
+            self.assertEqual(sign.call_count, 3)
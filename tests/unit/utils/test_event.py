@@ -13,12 +13,14 @@ import os
 import hashlib
 import time
 import shutil
+import threading
 import warnings
 
 # Import Salt Testing libs
 from tests.support.unit import expectedFailure, skipIf, TestCase
 from tests.support.runtests import RUNTIME_VARS
 from tests.support.events import eventpublisher_process, eventsender_process
+from tests.support.mock import MagicMock, patch
 
 # Import salt libs
 import salt.config
@@ -223,6 +225,42 @@ class TestSaltEvent(TestCase):
             self.assertGotEvent(evt2, {'data': 'foo2'})
             self.assertGotEvent(evt1, {'data': 'foo1'})
 
+    def test_event_wait_for_subscribed(self):
+        '''Test waiting for a subscribed event leaves it for get_event'''
+        with eventpublisher_process(self.sock_dir):
+            me = salt.utils.event.MasterEvent(self.sock_dir, listen=True)
+            me.subscribe('evt1')
+            self.assertFalse(me.wait_for_subscribed(wait=0.1))
+            me.fire_event({'data': 'foo2'}, 'evt2')
+            me.fire_event({'data': 'foo1'}, 'evt1')
+            self.assertTrue(me.wait_for_subscribed(wait=5))
+            # The event was already reported
+            self.assertFalse(me.wait_for_subscribed(wait=0.1))
+            evt1 = me.get_event(tag='evt1', no_block=True)
+            self.assertGotEvent(evt1, {'data': 'foo1'})
+
+    def test_event_wait_for_subscribed_stale(self):
+        '''
+        Test a cached event nobody consumes does not end every later wait
+        '''
+        me = salt.utils.event.MasterEvent(self.sock_dir, listen=False)
+        me.subscribe('20190101000000000000')
+        # The event of the publish, under the bare jid, as left by find_job
+        me.pending_events.append({'tag': '20190101000000000000',
+                                  'data': {'minions': ['minion']}})
+        with patch.object(me, '_get_event', MagicMock(return_value=None)) as get_event:
+            self.assertTrue(me.wait_for_subscribed(wait=1))
+            get_event.assert_not_called()
+            for _ in range(2):
+                self.assertFalse(me.wait_for_subscribed(wait=1))
+            self.assertEqual(get_event.call_count, 2)
+            self.assertEqual(get_event.call_args[0][0], 1)
+            # An event cached since the last call ends the wait
+            me.pending_events.append({'tag': '20190101000000000000/ret/minion',
+                                      'data': {}})
+            self.assertTrue(me.wait_for_subscribed(wait=1))
+            self.assertEqual(get_event.call_count, 2)
+
     def test_event_subscriptions_cache_regex(self):
         '''Test regex subscriptions cache a message until requested'''
         with eventpublisher_process(self.sock_dir):
@@ -352,3 +390,150 @@ class TestEventReturn(TestCase):
         finally:
             if evt is not None:
                 terminate_process(evt.pid, kill_children=True)
+
+
+    def test_handle_signals(self):
+        '''
+        Test the signal handler only stops the writers, leaving the flush to
+        run()
+        '''
+        with patch('salt.minion.MasterMinion', MagicMock()):
+            evt = salt.utils.event.EventReturn(salt.config.DEFAULT_MASTER_OPTS.copy())
+        writer = MagicMock()
+        evt.writers.append(writer)
+        with patch('salt.utils.process.SignalHandlingProcess._handle_signals') as handle:
+            evt._handle_signals(15, None)
+        handle.assert_called_once_with(15, None)
+        writer.stop.assert_called_once_with()
+        writer.join.assert_not_called()
+        self.assertTrue(evt.stop)
+
+    def test_flush_events_timeout(self):
+        '''
+        Test a stuck returner does not hold up the exit of EventReturn
+        '''
+        release = threading.Event()
+        self.addCleanup(release.set)
+        with patch('salt.minion.MasterMinion', MagicMock()):
+            evt = salt.utils.event.EventReturn(salt.config.DEFAULT_MASTER_OPTS.copy())
+        writer = salt.utils.event.EventReturnWriter(
+            'test.event_return', lambda events: release.wait(10))
+        writer.put({'tag': 'evt', 'data': {}})
+        writer.start()
+        evt.writers.append(writer)
+        start = time.time()
+        evt.flush_events(timeout=0.2)
+        self.assertLess(time.time() - start, 5)
+        self.assertEqual(evt.writers, [])
+
+
+class TestEventReturnWriter(TestCase):
+
+    def _events(self, count):
+        return [{'tag': 'evt{0}'.format(num), 'data': {}} for num in range(count)]
+
+    def test_batches(self):
+        stored = []
+        writer = salt.utils.event.EventReturnWriter('test.event_return',
+                                                    stored.append,
+                                                    batch_size=3)
+        for event in self._events(7):
+            writer.put(event)
+        writer.start()
+        writer.stop()
+        writer.join(5)
+        self.assertFalse(writer.is_alive())
+        # Everything is stored, the remainder when the writer stops
+        self.assertEqual([len(batch) for batch in stored], [3, 3, 1])
+        self.assertEqual([event for batch in stored for event in batch],
+                         self._events(7))
+        self.assertEqual(writer.stored, 7)
+        self.assertEqual(writer.dropped, 0)
+
+    def test_batch_size(self):
+        stored = []
+        writer = salt.utils.event.EventReturnWriter('test.event_return',
+                                                    stored.append,
+                                                    batch_size=3)
+        writer.start()
+        try:
+            for event in self._events(3):
+                writer.put(event)
+            timeout = time.time() + 5
+            while not stored and time.time() < timeout:
+                time.sleep(0.01)
+            self.assertEqual(stored, [self._events(3)])
+        finally:
+            writer.stop()
+            writer.join(5)
+
+    def test_max_seconds(self):
+        stored = []
+        writer = salt.utils.event.EventReturnWriter('test.event_return',
+                                                    stored.append,
+                                                    batch_size=100,
+                                                    max_seconds=1)
+        writer.start()
+        try:
+            writer.put(self._events(1)[0])
+            timeout = time.time() + 5
+            while not stored and time.time() < timeout:
+                time.sleep(0.01)
+            self.assertEqual(stored, [self._events(1)])
+        finally:
+            writer.stop()
+            writer.join(5)
+
+    def test_buffer_full(self):
+        stored = []
+        writer = salt.utils.event.EventReturnWriter('test.event_return',
+                                                    stored.append,
+                                                    batch_size=100,
+                                                    buffer_size=5)
+        for event in self._events(8):
+            writer.put(event)
+        writer.start()
+        writer.stop()
+        writer.join(5)
+        # The oldest events are dropped
+        self.assertEqual(stored, [self._events(8)[3:]])
+        self.assertEqual(writer.dropped, 3)
+
+    def test_buffer_full_oldest(self):
+        writer = salt.utils.event.EventReturnWriter('test.event_return',
+                                                    None,
+                                                    batch_size=100,
+                                                    max_seconds=10,
+                                                    buffer_size=2)
+        for now, event in enumerate(self._events(3), 100):
+            with patch('time.time', MagicMock(return_value=now)):
+                writer.put(event)
+        # The age of the queue is the one of the oldest event left in it
+        self.assertEqual(writer.oldest, 101)
+        self.assertEqual(writer.dropped, 1)
+        with patch('time.time', MagicMock(return_value=111)):
+            self.assertEqual(writer._next_batch(), self._events(3)[1:])
+        self.assertIsNone(writer.oldest)
+
+    def test_retry(self):
+        stored = []
+
+        def returner(events):
+            if not stored:
+                stored.append(None)
+                raise Exception('returner is down')
+            stored.append(events)
+
+        writer = salt.utils.event.EventReturnWriter('test.event_return',
+                                                    returner)
+        writer.start()
+        try:
+            writer.put(self._events(1)[0])
+            timeout = time.time() + 5
+            while len(stored) < 2 and time.time() < timeout:
+                time.sleep(0.01)
+            self.assertEqual(stored, [None, self._events(1)])
+            self.assertEqual(writer.dropped, 0)
+        finally:
+            writer.stop()
+            writer.join(5)
@@ -657,6 +657,39 @@ class TestJinjaDefaultOptions(TestCase):
                                      dict(opts=self.local_opts, saltenv='test', salt=self.local_salt))
         self.assertEqual(rendered, 'onetwothree')
 
+    def test_compiled_template_cache(self):
+        template = """
+            {%- set myvar = 'two' %}
+            %- set myvar = 'one'
+            {{- myvar -}}
+            """
+        cached_opts = dict(self.local_opts, __jinja_code_cache=True)
+        opts = dict(cached_opts, jinja_env={})
+        with patch.object(Environment, 'compile',
+                          side_effect=Environment.compile, autospec=True) as compile_:
+            for _ in range(3):
+                rendered = render_jinja_tmpl(
+                    template,
+                    dict(opts=cached_opts, saltenv='test', salt=self.local_salt))
+                self.assertEqual(rendered, 'one')
+            # Compiled with other options the same source renders differently
+            rendered = render_jinja_tmpl(
+                template,
+                dict(opts=opts, saltenv='test', salt=self.local_salt))
+            self.assertIn("%- set myvar = 'one'two", rendered)
+        self.assertLessEqual(compile_.call_count, 2)
+
+    def test_compiled_template_cache_not_used(self):
+        template = "{{ 'one' }}"
+        with patch.object(Environment, 'compile',
+                          side_effect=Environment.compile, autospec=True) as compile_:
+            for _ in range(2):
+                rendered = render_jinja_tmpl(
+                    template,
+                    dict(opts=self.local_opts, saltenv='test', salt=self.local_salt))
+                self.assertEqual(rendered, 'one')
+        self.assertEqual(compile_.call_count, 2)
+
 
 class TestCustomExtensions(TestCase):
 
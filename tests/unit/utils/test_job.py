@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+'''
+Unit tests for salt.utils.job
+'''
+
+# Import Python libs
+from __future__ import absolute_import, print_function, unicode_literals
+
+# Import Salt Testing libs
+from tests.support.unit import TestCase
+from tests.support.mock import MagicMock
+
+# Import Salt libs
+import salt.utils.job
+
+
+class StoreJobsTestCase(TestCase):
+    '''
+    Test storing batches of job returns
+    '''
+    def setUp(self):
+        self.opts = {'master_job_cache': 'cache',
+                     'pki_dir': '/etc/salt/pki/master',
+                     'job_cache': True,
+                     'job_cache_store_endtime': False}
+        self.returners = {'cache.prep_jid': MagicMock(),
+                          'cache.save_load': MagicMock(),
+                          'cache.get_load': MagicMock(),
+                          'cache.returner': MagicMock()}
+        self.mminion = MagicMock(returners=self.returners)
+        self.rets = [
+            {'jid': '20190101000000000000', 'id': 'web1', 'return': True},
+            {'jid': '20190101000000000000', 'id': 'web2', 'return': True},
+            {'jid': '20190101000000000001', 'id': 'web1', 'return': True},
+            {'jid': '20190101000000000001', 'return': 'missing the id'},
+        ]
+
+    def test_store_jobs(self):
+        event = MagicMock()
+        salt.utils.job.store_jobs(self.opts, self.rets, event=event,
+                                  mminion=self.mminion)
+        self.assertEqual(self.returners['cache.prep_jid'].call_count, 2)
+        self.assertEqual(self.returners['cache.save_load'].call_count, 2)
+        self.assertEqual(self.returners['cache.returner'].call_count, 3)
+        self.assertEqual(event.fire_event.call_count, 3)
+
+    def test_store_jobs_multi(self):
+        self.returners['cache.returner_multi'] = MagicMock()
+        salt.utils.job.store_jobs(self.opts, self.rets, mminion=self.mminion)
+        self.returners['cache.returner'].assert_not_called()
+        self.returners['cache.returner_multi'].assert_called_once_with(
+            self.rets[:3])
+
+    def test_store_jobs_ext_job_cache(self):
+        self.opts['ext_job_cache'] = 'other'
+        salt.utils.job.store_jobs(self.opts, self.rets, mminion=self.mminion)
+        self.assertEqual(self.returners['cache.prep_jid'].call_count, 2)
+        self.returners['cache.returner'].assert_not_called()
@@ -57,6 +57,44 @@ class CkMinionsTestCase(TestCase):
     def setUp(self):
         self.ckminions = salt.utils.minions.CkMinions({'minion_data_cache': True})
 
+    def test_check_grain_minions_bulk_fetch(self):
+        cache = MagicMock()
+        cache.list.return_value = ['web1', 'web2', 'db1']
+        cache.fetch_many.return_value = {
+            'minions/web1': {'grains': {'role': 'web'}},
+            'minions/web2': {'grains': {'role': 'web'}},
+            'minions/db1': {'grains': {'role': 'db'}},
+        }
+        with patch.object(self.ckminions, 'cache', cache):
+            ret = self.ckminions._check_grain_minions('role:web', ':', False)
+        self.assertEqual(sorted(ret['minions']), ['web1', 'web2'])
+        cache.fetch.assert_not_called()
+        self.assertEqual(cache.fetch_many.call_count, 1)
+
+    def test_connected_ids_grains_cached(self):
+        cache = MagicMock()
+        cache.list.return_value = ['web1', 'web2', 'db1']
+        cache.fetch_many.return_value = {
+            'minions/web1': {'grains': {'ipv4': ['10.0.0.1'], 'ipv6': []}},
+            'minions/web2': {'grains': {'ipv4': ['10.0.0.2'], 'ipv6': []}},
+            'minions/db1': None,
+        }
+        presence = MagicMock(return_value=(['10.0.0.1'], {}))
+        with patch.object(self.ckminions, 'cache', cache), \
+                patch('salt.utils.presence.read_presence', presence):
+            self.assertEqual(self.ckminions.connected_ids(), {'web1'})
+            self.assertEqual(self.ckminions.connected_ids(show_ip=True),
+                             {('web1', '10.0.0.1')})
+            self.assertEqual(cache.fetch_many.call_count, 1)
+            # A connection from an address not seen before reads the grains again
+            presence.return_value = (['10.0.0.1', '10.0.0.2'], {})
+            self.assertEqual(self.ckminions.connected_ids(), {'web1', 'web2'})
+            self.assertEqual(cache.fetch_many.call_count, 2)
+            self.assertEqual(self.ckminions.connected_ids(subset=['web2']),
+                             {'web2'})
+            self.assertEqual(cache.fetch_many.call_count, 2)
+        cache.fetch.assert_not_called()
+
     def test_spec_check(self):
         # Test spec-only rule
         auth_list = ['@runner']
@@ -516,3 +554,90 @@ class NodegroupCompTest(TestCase):
         # If this works, it should also print an error to the console
         ret = salt.utils.minions.nodegroup_comp('group1', referenced_nodegroups)
         self.assertEqual(ret, [])
+
+
+class CompoundMatchTestCase(TestCase):
+    '''
+    Test the compiled compound matcher of salt.utils.minions.CkMinions
+    '''
+    def setUp(self):
+        self.ckminions = salt.utils.minions.CkMinions({
+            'minion_data_cache': True,
+            'nodegroups': {'webs': 'L@web1,web2'},
+        })
+        self.pki_minions = ['db1', 'db2', 'web1', 'web2', 'web3']
+        patcher = patch.object(self.ckminions, '_pki_minions',
+                               MagicMock(side_effect=lambda: list(self.pki_minions)))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        grains = {'G@role:db': ['db1', 'db2'], 'G@role:web': ['web1', 'web2', 'web3']}
+        self.grain_check = MagicMock(
+            side_effect=lambda expr, delim, greedy: {
+                'minions': grains['G@' + expr], 'missing': []})
+        patcher = patch.object(self.ckminions, '_check_grain_minions',
+                               self.grain_check)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        salt.utils.minions._COMPOUND_CACHE.clear()
+
+    def check(self, expr):
+        ret = self.ckminions._check_compound_minions(expr, ':', True)
+        return sorted(ret['minions']), sorted(ret['missing'])
+
+    def test_compound(self):
+        self.assertEqual(self.check('G@role:web and not web3'),
+                         (['web1', 'web2'], []))
+        self.assertEqual(self.check('db* or web1 and G@role:db'),
+                         (['db1', 'db2'], []))
+        self.assertEqual(self.check('( db* or web1 ) and not G@role:db'),
+                         (['web1'], []))
+        self.assertEqual(self.check('not ( G@role:web or db1 )'),
+                         (['db2'], []))
+        self.assertEqual(self.check('N@webs or L@db1,db9'),
+                         (['db1', 'web1', 'web2'], ['db9']))
+        self.assertEqual(self.check(['E@db[0-9]', 'and', 'not', 'L@db2,db9']),
+                         (['db1'], []))
+
+    def test_invalid_compound(self):
+        self.assertEqual(self.check('db1 web1'), ([], []))
+        self.assertEqual(self.check('db1 and'), ([], []))
+        self.assertEqual(self.check('and db1'), ([], []))
+        self.assertEqual(self.check('db1 )'), ([], []))
+        self.assertEqual(self.check(''), ([], []))
+
+    def test_compound_cached(self):
+        with patch('salt.utils.minions._compile_compound',
+                   MagicMock(wraps=salt.utils.minions._compile_compound)) as compile_:
+            self.check('G@role:web and not web3')
+            self.check('G@role:web and not web3')
+            self.assertEqual(compile_.call_count, 1)
+            # Minion data matches are evaluated again on every call
+            self.assertEqual(self.grain_check.call_count, 2)
+
+            # A nodegroup change recompiles expressions
+            self.check('N@webs')
+            self.ckminions.opts['nodegroups'] = {'webs': 'L@web3'}
+            self.assertEqual(self.check('N@webs'), (['web3'], []))
+            self.assertEqual(compile_.call_count, 3)
+
+    def test_key_matches_evicted(self):
+        with patch('salt.utils.minions.KEY_MATCH_CACHE_SIZE', 2), \
+                patch.object(self.ckminions, '_check_glob_minions',
+                             MagicMock(wraps=self.ckminions._check_glob_minions)) as glob_:
+            self.check('db*')
+            self.check('web*')
+            # Using db* makes web* the least recently used match
+            self.check('db*')
+            self.assertEqual(glob_.call_count, 2)
+            self.check('web1')
+            self.assertEqual(len(self.ckminions._key_match_cache), 2)
+            self.assertEqual(self.check('db*'), (['db1', 'db2'], []))
+            self.assertEqual(glob_.call_count, 3)
+            self.assertEqual(self.check('web*'), (['web1', 'web2', 'web3'], []))
+            self.assertEqual(glob_.call_count, 4)
+
+    def test_key_matches_invalidated(self):
+        self.assertEqual(self.check('web*'), (['web1', 'web2', 'web3'], []))
+        self.pki_minions.append('web4')
+        self.assertEqual(self.check('web*'),
+                         (['web1', 'web2', 'web3', 'web4'], []))
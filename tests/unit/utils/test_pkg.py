@@ -1,9 +1,13 @@
 # -*- coding: utf-8 -*-
 
 from __future__ import absolute_import, unicode_literals, print_function
+import os
+import shutil
+import tempfile
 
 from tests.support.unit import TestCase
 from tests.support.mock import MagicMock, patch
+import salt.utils.files
 import salt.utils.pkg
 from salt.utils.pkg import rpm
 
@@ -47,6 +51,61 @@ class PkgUtilsTestCase(TestCase):
             self.assertEqual(test_parameter[2], verstr)
 
 
+class PkgCacheTestCase(TestCase):
+    '''
+    TestCase for the package cache of salt.utils.pkg
+    '''
+    def setUp(self):
+        self.cachedir = tempfile.mkdtemp()
+        self.opts = {'cachedir': self.cachedir}
+        self.db_path = os.path.join(self.cachedir, 'status')
+        self.write_db('zsh')
+
+    def tearDown(self):
+        shutil.rmtree(self.cachedir)
+
+    def write_db(self, content, age=10):
+        with salt.utils.files.fopen(self.db_path, 'w') as fp_:
+            fp_.write(content)
+        mtime = os.stat(self.db_path).st_mtime - age
+        os.utime(self.db_path, (mtime, mtime))
+
+    def test_cache(self):
+        stamp = salt.utils.pkg.db_stamp([self.db_path, '/nonexistent'])
+        self.assertEqual(len(stamp), 1)
+        self.assertIsNone(salt.utils.pkg.read_cache(self.opts, 'list_pkgs', stamp))
+        salt.utils.pkg.write_cache(self.opts, 'list_pkgs', stamp, {'zsh': ['5.8']})
+        self.assertEqual(salt.utils.pkg.read_cache(self.opts, 'list_pkgs', stamp),
+                         {'zsh': ['5.8']})
+
+    def test_cache_db_changed(self):
+        stamp = salt.utils.pkg.db_stamp([self.db_path])
+        salt.utils.pkg.write_cache(self.opts, 'list_pkgs', stamp, {'zsh': ['5.8']})
+        self.write_db('zsh bash', age=5)
+        stamp = salt.utils.pkg.db_stamp([self.db_path])
+        self.assertIsNone(salt.utils.pkg.read_cache(self.opts, 'list_pkgs', stamp))
+
+    def test_cache_db_just_changed(self):
+        self.write_db('zsh bash', age=0)
+        stamp = salt.utils.pkg.db_stamp([self.db_path])
+        salt.utils.pkg.write_cache(self.opts, 'list_pkgs', stamp, {'zsh': ['5.8']})
+        self.assertIsNone(salt.utils.pkg.read_cache(self.opts, 'list_pkgs', stamp))
+
+    def test_cache_ttl(self):
+        stamp = salt.utils.pkg.db_stamp([self.db_path])
+        name = salt.utils.pkg.cache_name('upgrades', True, None)
+        salt.utils.pkg.write_cache(self.opts, name, stamp, {})
+        self.assertEqual(salt.utils.pkg.read_cache(self.opts, name, stamp, 300), {})
+        with patch('time.time', MagicMock(return_value=os.stat(self.db_path).st_mtime + 3600)):
+            self.assertIsNone(salt.utils.pkg.read_cache(self.opts, name, stamp, 300))
+
+    def test_clear_cache(self):
+        stamp = salt.utils.pkg.db_stamp([self.db_path])
+        salt.utils.pkg.write_cache(self.opts, 'list_pkgs', stamp, {'zsh': ['5.8']})
+        salt.utils.pkg.clear_cache(self.opts)
+        self.assertIsNone(salt.utils.pkg.read_cache(self.opts, 'list_pkgs', stamp))
+
+
 class PkgRPMTestCase(TestCase):
     '''
     Test case for pkg.rpm utils
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+'''
+Unit tests for salt.utils.presence
+'''
+
+# Import Python libs
+from __future__ import absolute_import, print_function, unicode_literals
+import os
+import shutil
+import socket
+import tempfile
+
+# Import Salt Testing libs
+from tests.support.unit import TestCase
+from tests.support.mock import patch, MagicMock
+
+# Import Salt libs
+import salt.utils.minions
+import salt.utils.presence
+
+
+class PresenceTestCase(TestCase):
+    '''
+    Test the presence files shared by the master publishers
+    '''
+    def setUp(self):
+        self.cachedir = tempfile.mkdtemp()
+        self.opts = {'cachedir': self.cachedir,
+                     'transport': 'zeromq',
+                     'minion_data_cache': True,
+                     'publish_port': 4505,
+                     'ipv6': False}
+        salt.utils.presence._PRESENCE_CACHE.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.cachedir)
+        salt.utils.presence._PRESENCE_CACHE.clear()
+
+    def test_read_presence(self):
+        self.assertIsNone(salt.utils.presence.read_presence(self.opts))
+        salt.utils.presence.write_presence(self.opts, 'zeromq', addrs=['10.0.0.1'])
+        self.assertEqual(salt.utils.presence.read_presence(self.opts),
+                         ({'10.0.0.1'}, {}))
+
+    def test_read_presence_all_transports(self):
+        self.opts['transport_opts'] = {'tcp': {'publish_port': 4605}}
+        salt.utils.presence.write_presence(self.opts, 'zeromq', addrs=['10.0.0.1'])
+        # The presence of the TCP transport is not known yet
+        self.assertIsNone(salt.utils.presence.read_presence(self.opts))
+        salt.utils.presence.write_presence(self.opts, 'tcp',
+                                           minions={'web1': '10.0.0.2'})
+        self.assertEqual(salt.utils.presence.read_presence(self.opts),
+                         ({'10.0.0.1'}, {'web1': '10.0.0.2'}))
+
+    def test_read_presence_publisher_stopped(self):
+        salt.utils.presence.write_presence(self.opts, 'zeromq', addrs=['10.0.0.1'])
+        with patch('salt.utils.process.os_is_running', MagicMock(return_value=False)):
+            self.assertIsNone(salt.utils.presence.read_presence(self.opts))
+        salt.utils.presence.clear_presence(self.opts, 'zeromq')
+        self.assertFalse(os.path.exists(
+            salt.utils.presence.presence_path(self.opts, 'zeromq')))
+        self.assertIsNone(salt.utils.presence.read_presence(self.opts))
+
+    def test_read_presence_disabled(self):
+        salt.utils.presence.write_presence(self.opts, 'zeromq', addrs=['10.0.0.1'])
+        self.opts['presence_tracking'] = False
+        self.assertIsNone(salt.utils.presence.read_presence(self.opts))
+
+    def test_tracker(self):
+        tracker = salt.utils.presence.PresenceTracker(self.opts, 'zeromq')
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            server.bind(('127.0.0.1', 0))
+            server.listen(1)
+            client.connect(server.getsockname())
+            conn, _ = server.accept()
+            try:
+                tracker.connected(conn.fileno())
+                tracker.flush()
+                self.assertEqual(salt.utils.presence.read_presence(self.opts),
+                                 ({'127.0.0.1'}, {}))
+                tracker.disconnected(conn.fileno())
+                self.assertEqual(tracker.addrs(), set())
+                # Writes are limited to one per interval
+                tracker.flush()
+                self.assertEqual(salt.utils.presence.read_presence(self.opts),
+                                 ({'127.0.0.1'}, {}))
+                tracker.flush(force=True)
+                self.assertEqual(salt.utils.presence.read_presence(self.opts),
+                                 (set(), {}))
+            finally:
+                conn.close()
+        finally:
+            client.close()
+            server.close()
+
+    def test_connected_ids(self):
+        salt.utils.presence.write_presence(self.opts, 'zeromq', addrs=['10.0.0.1'])
+        cache = MagicMock()
+        cache.list.return_value = ['web1', 'web2']
+        cache.fetch_many.return_value = {
+            'minions/web1': {'grains': {'ipv4': ['10.0.0.1']}},
+            'minions/web2': {'grains': {'ipv4': ['10.0.0.2']}}}
+        local_port_tcp = MagicMock()
+        with patch('salt.cache.factory', MagicMock(return_value=cache)), \
+                patch('salt.utils.network.local_port_tcp', local_port_tcp):
+            ckminions = salt.utils.minions.CkMinions(self.opts)
+            self.assertEqual(ckminions.connected_ids(), {'web1'})
+            self.assertEqual(ckminions.connected_ids(show_ip=True),
+                             {('web1', '10.0.0.1')})
+        local_port_tcp.assert_not_called()
+
+    def test_connected_ids_by_id(self):
+        self.opts['transport'] = 'tcp'
+        salt.utils.presence.write_presence(
+            self.opts, 'tcp', minions={'web1': '10.0.0.1', 'web2': '10.0.0.2'})
+        cache = MagicMock()
+        with patch('salt.cache.factory', MagicMock(return_value=cache)):
+            ckminions = salt.utils.minions.CkMinions(self.opts)
+            self.assertEqual(ckminions.connected_ids(), {'web1', 'web2'})
+            self.assertEqual(ckminions.connected_ids(subset=['web2'], show_ip=True),
+                             {('web2', '10.0.0.2')})
+        cache.list.assert_not_called()
+        cache.fetch.assert_not_called()
@@ -2,6 +2,7 @@
 
 from __future__ import absolute_import, print_function, unicode_literals
 import codecs
+import fnmatch
 import glob
 import logging
 import os
@@ -12,6 +13,7 @@ import salt.utils.data
 import salt.utils.files
 import salt.utils.reactor as reactor
 import salt.utils.yaml
+from salt.ext import six
 
 from tests.support.unit import TestCase
 from tests.support.mixins import AdaptedConfigurationTestCaseMixin
@@ -459,6 +461,85 @@ class TestReactor(TestCase, AdaptedConfigurationTestCaseMixin):
                                     self.assertEqual(reactions, LOW_CHUNKS[tag])
 
 
+class TestReactMap(TestCase):
+    '''
+    Tests for matching event tags against the compiled reactor map
+    '''
+    react_map = [
+        {'salt/minion/*/start': ['/srv/reactor/start.sls']},
+        {'salt/minion/web1/start': '/srv/reactor/web1.sls'},
+        {'salt/*': ['/srv/reactor/all.sls']},
+        {'salt/minion/web?/st[a-z]rt': ['/srv/reactor/web.sls']},
+        {'salt/beacon/*/inotify/*': ['/srv/reactor/inotify.sls']},
+        {'salt/key': ['/srv/reactor/key.sls']},
+        'not a dict',
+        {'salt/ignored': {'not': 'a list'}},
+    ]
+
+    def test_match(self):
+        react_map = reactor.ReactMap(self.react_map)
+        for tag in ('salt/minion/web1/start', 'salt/minion/web2/start',
+                    'salt/minion/db1/start', 'salt/beacon/web1/inotify/etc',
+                    'salt/key', 'salt/keys', 'other/tag', 'salt/ignored'):
+            expected = []
+            for ropt in self.react_map:
+                if not isinstance(ropt, dict):
+                    continue
+                key, val = next(iter(ropt.items()))
+                if fnmatch.fnmatch(tag, key):
+                    if isinstance(val, list):
+                        expected.extend(val)
+                    elif isinstance(val, six.string_types):
+                        expected.append(val)
+            self.assertEqual(react_map.match(tag), expected, tag)
+
+    def test_match_order(self):
+        react_map = reactor.ReactMap(self.react_map)
+        self.assertEqual(react_map.match('salt/minion/web1/start'),
+                         ['/srv/reactor/start.sls', '/srv/reactor/web1.sls',
+                          '/srv/reactor/all.sls', '/srv/reactor/web.sls'])
+
+
+class TestReactorDispatch(TestCase, AdaptedConfigurationTestCaseMixin):
+    '''
+    Tests for the reactor map cache and the render pool
+    '''
+    def setUp(self):
+        self.opts = self.get_temp_config('master')
+        self.opts['reactor'] = [{'salt/test': ['/srv/reactor/test.sls']}]
+        self.reactor = reactor.Reactor(self.opts)
+
+    def test_react_map_cached(self):
+        with patch.object(reactor, 'ReactMap',
+                          MagicMock(side_effect=reactor.ReactMap)) as react_map:
+            self.assertEqual(self.reactor.list_reactors('salt/test'),
+                             ['/srv/reactor/test.sls'])
+            self.reactor.list_reactors('salt/test')
+            self.assertEqual(react_map.call_count, 1)
+            self.reactor.add_reactor('salt/other', ['/srv/reactor/other.sls'])
+            self.assertEqual(self.reactor.list_reactors('salt/other'),
+                             ['/srv/reactor/other.sls'])
+            self.assertEqual(react_map.call_count, 2)
+
+    def test_dispatch(self):
+        self.reactor.render_pool = MagicMock()
+        self.reactor.render_pool.fire_async.side_effect = [True, False]
+        self.reactor.render_pool._job_queue.qsize.return_value = 1
+        self.reactor.dispatch('salt/test', {}, ['/srv/reactor/test.sls'])
+        self.reactor.dispatch('salt/test', {}, ['/srv/reactor/test.sls'])
+        self.assertEqual(self.reactor.get_stats(),
+                         {'queued': 1, 'dropped': 1, 'done': 0,
+                          'max_backlog': 1, 'backlog': 1})
+
+    def test_dispatch_inline(self):
+        with patch.object(self.reactor, 'reactions',
+                          MagicMock(return_value=[{'state': 'local'}])), \
+                patch.object(self.reactor, 'call_reactions') as call_reactions:
+            self.reactor.dispatch('salt/test', {}, ['/srv/reactor/test.sls'])
+        call_reactions.assert_called_once_with([{'state': 'local'}])
+        self.assertEqual(self.reactor.get_stats()['done'], 1)
+
+
 class TestReactWrap(TestCase, AdaptedConfigurationTestCaseMixin):
     '''
     Tests that we are formulating the wrapper calls properly
@@ -5,7 +5,9 @@
 from __future__ import absolute_import, print_function, unicode_literals
 
 import os
+import shutil
 import sys
+import tempfile
 from tests.support.unit import TestCase, skipIf
 from tests.support.helpers import TstSuiteLoggingHandler
 from tests.support.mock import (
@@ -13,6 +15,8 @@ from tests.support.mock import (
     patch)
 
 import salt.exceptions
+import salt.utils.files
+import salt.utils.hashutils
 import salt.utils.json
 from salt.utils import thin
 import salt.utils.stringutils
@@ -664,6 +668,55 @@ class SSHThinTestCase(TestCase):
             files.pop(files.index(arcname))
         self.assertFalse(files)
 
+    @patch('salt.utils.path.which', MagicMock(return_value=''))
+    @patch('salt.utils.thin.get_ext_tops', MagicMock(return_value={}))
+    def test_gen_thin_keeps_unchanged_archive(self):
+        '''
+        Test thin.gen_thin function keeps the existing archive (and thus its
+        checksum) when it is regenerated with unchanged content.
+
+        :return:
+        '''
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        cachedir = os.path.join(tmp_dir, 'cache')
+        pkg_dir = os.path.join(tmp_dir, 'site', 'thinpkg')
+        os.makedirs(pkg_dir)
+        with salt.utils.files.fopen(os.path.join(pkg_dir, '__init__.py'), 'w') as fp_:
+            fp_.write('VALUE = 1\n')
+
+        with patch('salt.utils.thin.get_tops', MagicMock(return_value=[pkg_dir])):
+            thintar = thin.gen_thin(cachedir)
+            first_sum = salt.utils.hashutils.get_hash(thintar)
+            manifest = thin._read_thin_manifest(thintar + '.manifest')
+            self.assertIn(
+                os.path.join('py{0}'.format(sys.version_info[0]), 'thinpkg', '__init__.py'),
+                manifest)
+            self.assertIn('version', manifest)
+
+            # Regenerating with the same content keeps the same archive,
+            # without packing it again nor hashing the unchanged files
+            with patch('salt.utils.thin.tarfile.open') as tar_open, \
+                    patch('salt.utils.hashutils.get_hash',
+                          side_effect=salt.utils.hashutils.get_hash) as get_hash:
+                thin.gen_thin(cachedir, overwrite=True)
+            tar_open.assert_not_called()
+            self.assertNotIn(os.path.join(pkg_dir, '__init__.py'),
+                             [call[0][0] for call in get_hash.call_args_list])
+            self.assertEqual(salt.utils.hashutils.get_hash(thintar), first_sum)
+
+            # The zip archive has a manifest of its own
+            thinzip = thin.gen_thin(cachedir, compress='zip')
+            self.assertTrue(thinzip.endswith('thin.zip'))
+            self.assertTrue(os.path.isfile(thinzip))
+            self.assertTrue(os.path.isfile(thinzip + '.manifest'))
+
+            # Changed content produces a new archive
+            with salt.utils.files.fopen(os.path.join(pkg_dir, '__init__.py'), 'w') as fp_:
+                fp_.write('VALUE = 2\n')
+            thin.gen_thin(cachedir, overwrite=True)
+            self.assertNotEqual(salt.utils.hashutils.get_hash(thintar), first_sum)
+
     def test_get_supported_py_config_typecheck(self):
         '''
         Test collecting proper py-versions. Should return bytes type.
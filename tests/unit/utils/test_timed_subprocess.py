@@ -2,11 +2,16 @@
 
 # Import python libs
 from __future__ import absolute_import, print_function, unicode_literals
+import shutil
+import subprocess
+import sys
+import tempfile
 
 # Import Salt Testing libs
 from tests.support.unit import TestCase
 
 # Import salt libs
+import salt.utils.files
 import salt.utils.timed_subprocess as timed_subprocess
 
 
@@ -20,3 +25,40 @@ class TestTimedSubprocess(TestCase):
         '''
         p = timed_subprocess.TimedProc(['echo', 'foo'], shell=True)
         del p  # Don't need this anymore
+
+    def test_timedproc_output_spool(self):
+        '''
+        Test that the output of a process streamed to spools is truncated in
+        memory and written to the spool file in full
+        '''
+        spool_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, spool_dir)
+        chunks = []
+        stdout = timed_subprocess.OutputSpool(limit=100, spool_dir=spool_dir,
+                                              suffix='.stdout',
+                                              callback=chunks.append)
+        stderr = timed_subprocess.OutputSpool(limit=100, spool_dir=spool_dir,
+                                              suffix='.stderr')
+        proc = timed_subprocess.TimedProc(
+            [sys.executable, '-c',
+             'import sys\n'
+             'sys.stdout.write(sys.stdin.read() * 10000)\n'
+             'sys.stderr.write("error")'],
+            stdin='0123456789',
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            stdout_spool=stdout,
+            stderr_spool=stderr)
+        proc.run()
+        expected = b'0123456789' * 10000
+        self.assertEqual(b''.join(chunks), expected)
+        self.assertTrue(stdout.truncated)
+        self.assertEqual(
+            proc.stdout,
+            expected[:100] + '\n... 99800 bytes truncated, full output in {0} ...\n'
+            .format(stdout.path).encode() + expected[-100:])
+        with salt.utils.files.fopen(stdout.path, 'rb') as fp_:
+            self.assertEqual(fp_.read(), expected)
+        self.assertFalse(stderr.truncated)
+        self.assertIsNone(stderr.path)
+        self.assertEqual(proc.stderr, b'error')